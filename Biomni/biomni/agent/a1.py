@@ -1,22 +1,44 @@
+import functools
 import glob
 import inspect
 import os
 import re
+import time
+from collections import Counter
 from pathlib import Path
 from typing import Any, Literal, TypedDict
 
-import pandas as pd
 from dotenv import load_dotenv
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 
+from biomni.agent.checkpoint import make_checkpointer
+from biomni.agent.context import ContextBudget
+from biomni.agent.ensemble import SolutionTally, extract_solution
+from biomni.datalake import (
+    DataLakeDownloader,
+    LazyDataLake,
+    annotate_data_lake_dict,
+    compact_data_lake,
+    get_dataset_cache,
+    load_data_lake,
+    read_dataset,
+)
+from biomni.datalake.columnar import COLUMNAR_DIR_NAME
 from biomni.env_desc import data_lake_dict, library_content_dict
-from biomni.llm import SourceType, get_llm
+from biomni.llm import SourceType, apply_prompt_caching, cache_usage, get_llm
+from biomni.model.embedding import HashingTfidfEmbedder, index_dir_name
+from biomni.model.retrieval_cache import RetrievalCache, fingerprint_resources
 from biomni.model.retriever import ToolRetriever
+from biomni.tool.projection import load_artifact, spill_text
+from biomni.tool.query_engine import gather_queries
+from biomni.tool.schema_registry import get_schema_registry
 from biomni.tool.support_tools import run_python_repl
 from biomni.tool.tool_registry import ToolRegistry
+from biomni.tool.worker_pool import WorkerPool
+from biomni.tracing import Tracer, invoke_llm, peak_rss_mb, reset_peak_rss
 from biomni.utils import (
     check_and_download_s3_files,
     download_and_unzip,
@@ -49,6 +71,19 @@ class A1:
         timeout_seconds=600,
         base_url: str | None = None,
         api_key: str = "EMPTY",
+        retrieval_mode: str = "prompt",
+        embedder=None,
+        lazy_data_lake: bool = False,
+        data_lake_quota_gb: float | None = None,
+        execution_backend: str = "thread",
+        max_workers: int = 4,
+        worker_memory_limit_mb: int | None = None,
+        worker_cpu_limit_seconds: float | None = None,
+        context_max_tokens: int | None = 60000,
+        context_keep_recent: int = 6,
+        checkpointer="memory",
+        thread_id: str | None = None,
+        trace: bool | str = False,
     ):
         """Initialize the biomni agent.
 
@@ -60,6 +95,31 @@ class A1:
             timeout_seconds: Timeout for code execution in seconds
             base_url: Base URL for custom model serving (e.g., "http://localhost:8000/v1")
             api_key: API key for the custom LLM
+            retrieval_mode: Resource retrieval mode: "prompt" (LLM over all resources), "embedding"
+                (local vector top-k search) or "embedding_rerank" (vector search, then LLM over the shortlist)
+            embedder: Embedder of the embedding retrieval modes, e.g. ``LangChainEmbedder(OpenAIEmbeddings())``
+                from ``biomni.model.embedding``; defaults to the offline ``HashingTfidfEmbedder``. Each embedder
+                keeps its own index under ``retriever_index/``
+            lazy_data_lake: If True, skip the up-front data lake and benchmark downloads. Data lake files are
+                fetched on first use instead; the benchmark is fetched when ``ensure_benchmark`` is called
+            data_lake_quota_gb: Disk quota for lazily fetched data lake files; least recently used files are
+                evicted when it is exceeded (only used with ``lazy_data_lake``)
+            execution_backend: How generated Python code is run: "thread" (in this process, sharing one namespace)
+                or "process" (in pre-forked worker processes, one per conversation thread, killed on timeout)
+            max_workers: Maximum number of worker processes (only used with the "process" backend)
+            worker_memory_limit_mb: Address-space limit of each worker process in MB
+            worker_cpu_limit_seconds: CPU-time limit of each execution in a worker process
+            context_max_tokens: Token budget of each LLM prompt; older steps are compacted to stay under it
+                (None only compacts large older observations)
+            context_keep_recent: Number of most recent messages that are always sent verbatim
+            checkpointer: Where conversation state is kept: "memory" (in this process, the default), "sqlite"
+                (a file in the data directory, so threads resume after a restart), a path to a SQLite file, or a
+                LangGraph checkpoint saver. Only the latest checkpoints of each thread are kept and idle threads
+                expire, see ``BIOMNI_CHECKPOINT_KEEP`` and ``BIOMNI_CHECKPOINT_TTL_DAYS``
+            thread_id: Conversation thread id of this agent; defaults to a new random id. Pass the id of an
+                earlier run together with a persistent checkpointer to resume its conversation
+            trace: Record spans of each run (retrieval, LLM calls, code executions, database tool calls) in
+                ``self.tracer``; a path also appends them to that JSONL file (see ``biomni.tracing``)
 
         """
         self.path = path
@@ -78,32 +138,34 @@ class A1:
 
         expected_data_lake_files = list(data_lake_dict.keys())
 
-        # Check and download missing data lake files
-        print("Checking and downloading missing data lake files...")
-        check_and_download_s3_files(
-            s3_bucket_url="https://biomni-release.s3.amazonaws.com",
-            local_data_lake_path=data_lake_dir,
-            expected_files=expected_data_lake_files,
-            folder="data_lake",
-        )
-
-        # Check if benchmark directory structure is complete
-        benchmark_ok = False
-        if os.path.isdir(benchmark_dir):
-            patient_gene_detection_dir = os.path.join(benchmark_dir, "hle")
-            if os.path.isdir(patient_gene_detection_dir):
-                benchmark_ok = True
-
-        if not benchmark_ok:
-            print("Checking and downloading benchmark files...")
+        self.data_lake = None
+        if lazy_data_lake:
+            # Start from the list of known files only; each file is fetched the first time it is used
+            quota_bytes = int(data_lake_quota_gb * 1024**3) if data_lake_quota_gb is not None else None
+            self.data_lake = LazyDataLake(
+                data_lake_dir,
+                DataLakeDownloader(
+                    "https://biomni-release.s3.amazonaws.com", data_lake_dir, folder="data_lake", show_progress=False
+                ),
+                expected_data_lake_files,
+                quota_bytes=quota_bytes,
+            )
+            print("Data lake files will be downloaded on first use")
+        else:
+            # Check and download missing data lake files
+            print("Checking and downloading missing data lake files...")
             check_and_download_s3_files(
                 s3_bucket_url="https://biomni-release.s3.amazonaws.com",
-                local_data_lake_path=benchmark_dir,
-                expected_files=[],  # Empty list - will download entire folder
-                folder="benchmark",
+                local_data_lake_path=data_lake_dir,
+                expected_files=expected_data_lake_files,
+                folder="data_lake",
             )
 
         self.path = os.path.join(path, "biomni_data")
+
+        # The agent itself never reads the benchmark, so a lazy data lake defers it to ensure_benchmark()
+        if not lazy_data_lake:
+            self.ensure_benchmark()
         module2api = read_module2api()
 
         self.llm = get_llm(
@@ -114,10 +176,50 @@ class A1:
 
         if self.use_tool_retriever:
             self.tool_registry = ToolRegistry(module2api)
-            self.retriever = ToolRetriever()
+            embedder = embedder or HashingTfidfEmbedder()
+            self.retriever = ToolRetriever(
+                mode=retrieval_mode,
+                index_path=os.path.join(self.path, "retriever_index", index_dir_name(embedder)),
+                embedder=embedder,
+            )
+            if retrieval_mode != "prompt":
+                self.retriever.build_index(self.tool_registry.document_df, data_lake_dict, library_content_dict)
+            # Memoized resource selections and rendered system prompts, keyed on the normalized query
+            self.retrieval_cache = RetrievalCache()
 
         # Add timeout parameter
         self.timeout_seconds = timeout_seconds  # 10 minutes default timeout
+
+        # Keeps each generate prompt under the token budget and records the prompt size of every step
+        self.context_budget = ContextBudget(max_tokens=context_max_tokens, keep_recent=context_keep_recent)
+
+        # Load the database tools' API schemas in the background so the first query does not wait on disk
+        get_schema_registry().preload(background=True)
+
+        # Per-step latency, token and memory spans of each run; a disabled tracer records nothing
+        self.tracer = Tracer(path=trace if isinstance(trace, str) else None, enabled=bool(trace))
+
+        # Conversation state of all threads; shared with session clones, which use their own thread ids
+        self.checkpointer = make_checkpointer(checkpointer, os.path.join(self.path, "checkpoints.sqlite"))
+
+        import uuid
+
+        # Conversation thread and Python namespace of this agent; None means the shared module-level namespace
+        self.thread_id = thread_id if thread_id is not None else uuid.uuid4().hex
+        self.repl_namespace = None
+
+        self.worker_pool = None
+        if execution_backend == "process":
+            import weakref
+
+            self.worker_pool = WorkerPool(
+                max_workers=max_workers,
+                memory_limit_mb=worker_memory_limit_mb,
+                cpu_limit_seconds=worker_cpu_limit_seconds,
+            )
+            self._worker_pool_finalizer = weakref.finalize(self, self.worker_pool.shutdown)
+        elif execution_backend != "thread":
+            raise ValueError(f"Unknown execution_backend '{execution_backend}', expected 'thread' or 'process'")
         self.configure()
 
     def add_tool(self, api):
@@ -195,22 +297,6 @@ class A1:
                 self.module2api[module_name].append(schema)
                 print(f"Added new tool '{schema['name']}' to module '{module_name}'")
 
-            # Update the tool registry's document dataframe if it exists
-            if hasattr(self, "tool_registry") and self.tool_registry is not None:
-                try:
-                    # Rebuild the document dataframe
-                    docs = []
-                    for tool_id in range(len(self.tool_registry.tools)):
-                        docs.append(
-                            [
-                                int(tool_id),
-                                self.tool_registry.get_tool_by_id(int(tool_id)),
-                            ]
-                        )
-                    self.tool_registry.document_df = pd.DataFrame(docs, columns=["docid", "document_content"])
-                except Exception as e:
-                    print(f"Warning: Failed to update tool registry document dataframe: {e}")
-
             # Store the original function for potential future use
             if not hasattr(self, "_custom_functions"):
                 self._custom_functions = {}
@@ -235,6 +321,7 @@ class A1:
             print(
                 f"Tool '{schema['name']}' successfully added and ready for use in both direct execution and retrieval"
             )
+            self._invalidate_retrieval_cache()
             self.configure()
             return schema
 
@@ -264,76 +351,29 @@ class A1:
             yaml.YAMLError: If the config file is malformed
             RuntimeError: If MCP server initialization fails
         """
-        import asyncio
         import os
         import sys
         import types
+        import weakref
         from pathlib import Path
 
-        import nest_asyncio
         import yaml
-        from mcp import ClientSession
-        from mcp.client.stdio import StdioServerParameters, stdio_client
 
-        nest_asyncio.apply()
+        from biomni.tool.mcp_session import MCPSessionManager
 
-        def discover_mcp_tools_sync(server_params: StdioServerParameters) -> list[dict]:
-            """Discover available tools from MCP server synchronously."""
-            try:
+        # One long-lived session per server, shared by all tools of that server
+        if getattr(self, "_mcp_manager", None) is None:
+            self._mcp_manager = MCPSessionManager()
+            self._mcp_finalizer = weakref.finalize(self, self._mcp_manager.shutdown)
+        mcp_manager = self._mcp_manager
 
-                async def _discover_async():
-                    async with stdio_client(server_params) as (reader, writer):
-                        async with ClientSession(reader, writer) as session:
-                            await session.initialize()
-
-                            # Get available tools
-                            tools_result = await session.list_tools()
-                            tools = tools_result.tools if hasattr(tools_result, "tools") else tools_result
-
-                            discovered_tools = []
-                            for tool in tools:
-                                if hasattr(tool, "name"):
-                                    discovered_tools.append(
-                                        {
-                                            "name": tool.name,
-                                            "description": tool.description,
-                                            "inputSchema": tool.inputSchema,
-                                        }
-                                    )
-                                else:
-                                    print(f"Warning: Skipping tool with no name attribute: {tool}")
-
-                            return discovered_tools
-
-                return asyncio.run(_discover_async())
-            except Exception as e:
-                print(f"Failed to discover tools: {e}")
-                return []
-
-        def make_mcp_wrapper(cmd: str, args: list[str], tool_name: str, doc: str, env_vars: dict = None):
-            """Create a synchronous wrapper for an async MCP tool call."""
+        def make_mcp_wrapper(server_name: str, tool_name: str, doc: str):
+            """Create a synchronous wrapper that routes the call through the pooled server session."""
 
             def sync_tool_wrapper(**kwargs):
                 """Synchronous wrapper for MCP tool execution."""
                 try:
-                    server_params = StdioServerParameters(command=cmd, args=args, env=env_vars)
-
-                    async def async_tool_call():
-                        async with stdio_client(server_params) as (reader, writer):
-                            async with ClientSession(reader, writer) as session:
-                                await session.initialize()
-                                result = await session.call_tool(tool_name, kwargs)
-                                content = result.content[0]
-                                if hasattr(content, "json"):
-                                    return content.json()
-                                return content.text
-
-                    try:
-                        loop = asyncio.get_running_loop()
-                        return loop.create_task(async_tool_call())
-                    except RuntimeError:
-                        return asyncio.run(async_tool_call())
-
+                    return mcp_manager.call_tool(server_name, tool_name, kwargs)
                 except Exception as e:
                     raise RuntimeError(f"MCP tool execution failed for '{tool_name}': {e}") from e
 
@@ -384,6 +424,15 @@ class A1:
                         processed_env[key] = value
                 env_vars = processed_env
 
+            mcp_manager.register_server(
+                server_name,
+                cmd,
+                args,
+                env=env_vars or None,
+                call_timeout=server_meta.get("timeout"),
+                retry_on_crash=server_meta.get("retry_on_crash", False),
+            )
+
             # Create module namespace for this MCP server
             mcp_module_name = f"mcp_servers.{server_name}"
             if mcp_module_name not in sys.modules:
@@ -394,8 +443,7 @@ class A1:
 
             if not tools_config:
                 try:
-                    server_params = StdioServerParameters(command=cmd, args=args, env=env_vars)
-                    tools_config = discover_mcp_tools_sync(server_params)
+                    tools_config = mcp_manager.list_tools(server_name)
 
                     if tools_config:
                         print(f"Discovered {len(tools_config)} tools from {server_name} MCP server")
@@ -425,7 +473,7 @@ class A1:
                     continue
 
                 # Create wrapper function
-                wrapper_function = make_mcp_wrapper(cmd, args, tool_name, description, env_vars)
+                wrapper_function = make_mcp_wrapper(server_name, tool_name, description)
 
                 # Add to module namespace
                 setattr(server_module, tool_name, wrapper_function)
@@ -473,8 +521,94 @@ class A1:
                 }
 
         # Update agent configuration
+        self._invalidate_retrieval_cache()
         self.configure()
 
+    def get_mcp_stats(self) -> dict[str, dict]:
+        """Get per-server call counts and latency counters for MCP servers added via ``add_mcp``.
+
+        Returns:
+            A dictionary mapping server names to their counters, or an empty dictionary if no MCP server was added
+
+        """
+        if getattr(self, "_mcp_manager", None) is None:
+            return {}
+        return self._mcp_manager.get_stats()
+
+    def close_mcp(self):
+        """Shut down the MCP server processes started by ``add_mcp``.
+
+        This also happens automatically when the agent is garbage collected or the interpreter exits.
+        """
+        if getattr(self, "_mcp_finalizer", None) is not None:
+            self._mcp_finalizer()
+        self._mcp_manager = None
+        self._mcp_finalizer = None
+
+    def _list_data_lake_items(self):
+        """Return the names of the data lake files available to the agent.
+
+        With a lazy data lake this includes known files that have not been downloaded yet.
+        """
+        data_lake_path = self.path + "/data_lake"
+        data_lake_items = [x.split("/")[-1] for x in glob.glob(data_lake_path + "/*")]
+        if self.data_lake is not None:
+            present = set(data_lake_items)
+            data_lake_items += [name for name in self.data_lake.files if name not in present]
+        # Skip partial downloads and the compacted Parquet copies, which are read through load_data_lake
+        return [item for item in data_lake_items if not item.endswith(".part") and item != COLUMNAR_DIR_NAME]
+
+    def ensure_benchmark(self) -> str:
+        """Download the benchmark folder if it is not present yet.
+
+        This runs at startup unless ``lazy_data_lake`` is set; a lazy agent only fetches it when this is called.
+
+        Returns:
+            The local benchmark directory
+
+        """
+        benchmark_dir = os.path.join(self.path, "benchmark")
+        if not os.path.isdir(os.path.join(benchmark_dir, "hle")):
+            print("Checking and downloading benchmark files...")
+            check_and_download_s3_files(
+                s3_bucket_url="https://biomni-release.s3.amazonaws.com",
+                local_data_lake_path=benchmark_dir,
+                expected_files=[],  # Empty list - will download entire folder
+                folder="benchmark",
+            )
+        return benchmark_dir
+
+    def get_data_lake_stats(self) -> dict:
+        """Return fetch, hit and eviction counts of the lazy data lake (empty if it is not enabled)."""
+        return self.data_lake.get_stats() if self.data_lake is not None else {}
+
+    def get_dataset_cache_stats(self) -> dict:
+        """Return hit, miss, eviction and memory statistics of the process-wide dataset cache."""
+        return get_dataset_cache().stats()
+
+    def compact_data_lake(self, names: list[str] | None = None, min_size_mb: float = 50, force: bool = False):
+        """Convert large CSV/TSV/pickle data lake tables to Parquet for fast column and row selective loads.
+
+        Args:
+            names: Files to compact; defaults to every convertible file present locally
+            min_size_mb: Skip files smaller than this
+            force: Recompact files even if their compacted copy is up to date
+
+        Returns:
+            The compaction catalog mapping file names to their Parquet copy and column types
+
+        """
+        catalog = compact_data_lake(self.path + "/data_lake", names=names, min_size_mb=min_size_mb, force=force)
+        # Pick up the column annotations in the system prompt
+        self._invalidate_retrieval_cache()
+        self.configure(self_critic=self.self_critic, test_time_scale_round=self.test_time_scale_round)
+        return catalog
+
+    def _invalidate_retrieval_cache(self):
+        """Drop memoized resource selections after the set of tools, data or software changed."""
+        if getattr(self, "retrieval_cache", None) is not None:
+            self.retrieval_cache.clear()
+
     def get_custom_tool(self, name):
         """Get a custom tool by name.
 
@@ -532,19 +666,6 @@ class A1:
         if hasattr(self, "tool_registry") and self.tool_registry is not None:
             if self.tool_registry.remove_tool_by_name(name):
                 removed = True
-                # Rebuild the document dataframe
-                try:
-                    docs = []
-                    for tool_id in range(len(self.tool_registry.tools)):
-                        docs.append(
-                            [
-                                int(tool_id),
-                                self.tool_registry.get_tool_by_id(int(tool_id)),
-                            ]
-                        )
-                    self.tool_registry.document_df = pd.DataFrame(docs, columns=["docid", "document_content"])
-                except Exception as e:
-                    print(f"Warning: Failed to update tool registry document dataframe: {e}")
 
         # Remove from module2api
         if hasattr(self, "module2api"):
@@ -556,6 +677,7 @@ class A1:
                         break
 
         if removed:
+            self._invalidate_retrieval_cache()
             print(f"Custom tool '{name}' has been removed")
         else:
             print(f"Custom tool '{name}' was not found")
@@ -598,6 +720,7 @@ class A1:
                 self.data_lake_dict[filename] = description
 
                 print(f"Added data item '{filename}': {description}")
+            self._invalidate_retrieval_cache()
             self.configure()
             print(f"Successfully added {len(data)} data item(s) to the data lake")
             return True
@@ -657,6 +780,7 @@ class A1:
             removed = True
 
         if removed:
+            self._invalidate_retrieval_cache()
             print(f"Custom data item '{name}' has been removed")
         else:
             print(f"Custom data item '{name}' was not found")
@@ -698,6 +822,7 @@ class A1:
                 print(f"Added software '{software_name}': {description}")
 
             print(f"Successfully added {len(software)} software item(s) to the library")
+            self._invalidate_retrieval_cache()
             self.configure()
             return True
 
@@ -756,6 +881,7 @@ class A1:
             removed = True
 
         if removed:
+            self._invalidate_retrieval_cache()
             print(f"Custom software item '{name}' has been removed")
         else:
             print(f"Custom software item '{name}' was not found")
@@ -789,6 +915,18 @@ class A1:
             The generated system prompt
 
         """
+        # Custom tools the worker processes cannot receive would only fail with a NameError, so they are not offered
+        unavailable = self._unavailable_custom_functions()
+        if unavailable:
+            tool_desc = {
+                module: [tool for tool in tools if tool.get("name") not in unavailable]
+                for module, tools in tool_desc.items()
+            }
+            custom_tools = [
+                tool
+                for tool in custom_tools or []
+                if (tool.get("name") if isinstance(tool, dict) else tool) not in unavailable
+            ] or None
 
         def format_item_with_description(name, description):
             """Format an item with its description in a readable way."""
@@ -1003,6 +1141,23 @@ In each response, you must include EITHER <execute> or <solution> tag. Not both
 You may or may not receive feedbacks from human. If so, address the feedbacks by following the same procedure of multiple rounds of thinking, execution, and then coming up with a new solution.
 """
 
+        # Conventions and helpers that do not depend on the query. Together with the instructions above they form
+        # a byte-stable prefix that provider-side prompt caches can reuse across queries; everything that changes
+        # with the selected resources goes after it.
+        prompt_modifier += """
+Common helpers (available in every code block without import):
+- gather_queries([(query_uniprot, {{"prompt": ...}}), (query_kegg, {{"prompt": ...}})]) calls several independent database tools concurrently and returns one dict per call with "result", "error" and "seconds", in order.
+- Large database responses and long outputs are saved to compressed artifacts; read them back with load_artifact(path) or load_artifact(path, fields=["$.data[*].id"]). Pass fields=[...] to query_reactome, query_opentarget or query_cbioportal to return only the JSON paths you need.
+- The biological data lake is at {data_lake_path}. For large tables, prefer load_data_lake(name, columns=[...], filters=[("column", "==", value)]), which reads only the requested columns and rows instead of parsing the whole file.
+- To read any other table file, prefer read_dataset(path, **pandas_kwargs), which returns a cached copy if the file was parsed before.
+
+Note on using R packages and Bash scripts:
+  - R packages: Use subprocess.run(['Rscript', '-e', 'your R code here']) in Python, or use the #!R marker in your execute block.
+  - Bash scripts and commands: Use the #!BASH marker in your execute block for both simple commands and complex shell scripts with variables, loops, conditionals, etc.
+"""
+        stable_prefix = prompt_modifier.format(data_lake_path=self.path + "/data_lake")
+        prompt_modifier = ""
+
         # Add custom resources section first (highlighted)
         has_custom_resources = any([custom_tools_formatted, custom_data_formatted, custom_software_formatted])
 
@@ -1068,11 +1223,7 @@ Each library is listed with its description to help you understand its functiona
 ----
 {library_content_formatted}
 ----
-
-- Note on using R packages and Bash scripts:
-  - R packages: Use subprocess.run(['Rscript', '-e', 'your R code here']) in Python, or use the #!R marker in your execute block.
-  - Bash scripts and commands: Use the #!BASH marker in your execute block for both simple commands and complex shell scripts with variables, loops, conditionals, etc.
-        """
+"""
 
         # Set appropriate text based on whether this is initial configuration or after retrieval
         if is_retrieval:
@@ -1112,7 +1263,8 @@ Each library is listed with its description to help you understand its functiona
         if custom_software_formatted:
             format_dict["custom_software"] = "\n".join(custom_software_formatted)
 
-        formatted_prompt = prompt_modifier.format(**format_dict)
+        formatted_prompt = stable_prefix + prompt_modifier.format(**format_dict)
+        self.system_prompt_prefix = stable_prefix
 
         return formatted_prompt
 
@@ -1126,14 +1278,17 @@ Each library is listed with its description to help you understand its functiona
         """
         # Store self_critic for later use
         self.self_critic = self_critic
+        self.test_time_scale_round = test_time_scale_round
 
         # Get data lake content
-        data_lake_path = self.path + "/data_lake"
-        data_lake_content = glob.glob(data_lake_path + "/*")
-        data_lake_items = [x.split("/")[-1] for x in data_lake_content]
+        data_lake_items = self._list_data_lake_items()
 
-        # Store data_lake_dict as instance variable for use in retrieval
-        self.data_lake_dict = data_lake_dict
+        # Store data_lake_dict as instance variable for use in retrieval, with the columns of each local table
+        # appended so the LLM knows the schema without loading the file
+        self.data_lake_dict = annotate_data_lake_dict(data_lake_dict, self.path + "/data_lake")
+        if hasattr(self, "_custom_data") and self._custom_data:
+            for name, info in self._custom_data.items():
+                self.data_lake_dict.setdefault(name, info["description"])
         # Store library_content_dict directly without library_content
         self.library_content_dict = library_content_dict
 
@@ -1194,8 +1349,11 @@ Each library is listed with its description to help you understand its functiona
 
         # Define the nodes
         def generate(state: AgentState) -> AgentState:
-            messages = [SystemMessage(content=self.system_prompt)] + state["messages"]
-            response = self.llm.invoke(messages)
+            messages = self.context_budget.build(self.system_prompt, state["messages"])
+            messages = apply_prompt_caching(messages, self.llm, getattr(self, "system_prompt_prefix", None))
+            start = time.perf_counter()
+            response = invoke_llm(self.llm, messages, name="generate", tracer=self.tracer, message_count=len(messages))
+            self.context_budget.record_usage(cache_usage(response), time.perf_counter() - start)
 
             # Parse the response
             msg = str(response.content)
@@ -1248,7 +1406,7 @@ Each library is listed with its description to help you understand its functiona
                     state["next_step"] = "generate"
             return state
 
-        def execute(state: AgentState) -> AgentState:
+        def execute(state: AgentState, config: RunnableConfig) -> AgentState:
             last_message = state["messages"][-1].content
             # Only add the closing tag if it's not already there
             if "<execute>" in last_message and "</execute>" not in last_message:
@@ -1258,45 +1416,71 @@ Each library is listed with its description to help you understand its functiona
             if execute_match:
                 code = execute_match.group(1)
 
-                # Set timeout duration (10 minutes = 600 seconds)
-                timeout = self.timeout_seconds
-
-                # Check if the code is R code
-                if (
-                    code.strip().startswith("#!R")
-                    or code.strip().startswith("# R code")
-                    or code.strip().startswith("# R script")
-                ):
-                    # Remove the R marker and run as R code
-                    r_code = re.sub(r"^#!R|^# R code|^# R script", "", code, 1).strip()  # noqa: B034
-                    result = run_with_timeout(run_r_code, [r_code], timeout=timeout)
-                # Check if the code is a Bash script or CLI command
-                elif (
-                    code.strip().startswith("#!BASH")
-                    or code.strip().startswith("# Bash script")
-                    or code.strip().startswith("#!CLI")
-                ):
-                    # Handle both Bash scripts and CLI commands with the same function
-                    if code.strip().startswith("#!CLI"):
-                        # For CLI commands, extract the command and run it as a simple bash script
-                        cli_command = re.sub(r"^#!CLI", "", code, 1).strip()  # noqa: B034
-                        # Remove any newlines to ensure it's a single command
-                        cli_command = cli_command.replace("\n", " ")
-                        result = run_with_timeout(run_bash_script, [cli_command], timeout=timeout)
-                    else:
-                        # For Bash scripts, remove the marker and run as a bash script
-                        bash_script = re.sub(r"^#!BASH|^# Bash script", "", code, 1).strip()  # noqa: B034
-                        result = run_with_timeout(run_bash_script, [bash_script], timeout=timeout)
-                # Otherwise, run as Python code
+                stripped = code.strip()
+                if stripped.startswith(("#!R", "# R code", "# R script")):
+                    language = "r"
+                elif stripped.startswith(("#!BASH", "# Bash script", "#!CLI")):
+                    language = "bash"
                 else:
-                    # Inject custom functions into the Python execution environment
-                    self._inject_custom_functions_to_repl()
-                    result = run_with_timeout(run_python_repl, [code], timeout=timeout)
+                    language = "python"
+                thread_id = config.get("configurable", {}).get("thread_id", "default")
+                in_worker = language == "python" and self.worker_pool is not None
+                with self.tracer.span("execute", kind="execute", language=language, code_chars=len(code)) as span:
+                    # Set timeout duration (10 minutes = 600 seconds)
+                    timeout = self.timeout_seconds
+
+                    # Fetch any lazily materialized data lake files the code refers to before running it
+                    if self.data_lake is not None:
+                        try:
+                            self.data_lake.materialize_referenced(code)
+                        except FileNotFoundError as e:
+                            print(f"Warning: {e}")
+
+                    if self.tracer.enabled:
+                        # Measure the memory peak of this execution rather than of the process lifetime
+                        pid = self.worker_pool.get_stats()["worker_pids"].get(str(thread_id)) if in_worker else None
+                        peak_reset = (not in_worker or pid is not None) and reset_peak_rss(pid)
+
+                    if language == "r":
+                        # Remove the R marker and run as R code
+                        r_code = re.sub(r"^#!R|^# R code|^# R script", "", stripped, count=1).strip()
+                        result = run_with_timeout(run_r_code, [r_code], timeout=timeout)
+                    elif language == "bash":
+                        # Handle both Bash scripts and CLI commands with the same function
+                        if stripped.startswith("#!CLI"):
+                            # For CLI commands, extract the command and run it as a simple bash script
+                            cli_command = re.sub(r"^#!CLI", "", stripped, count=1).strip()
+                            # Remove any newlines to ensure it's a single command
+                            cli_command = cli_command.replace("\n", " ")
+                            result = run_with_timeout(run_bash_script, [cli_command], timeout=timeout)
+                        else:
+                            # For Bash scripts, remove the marker and run as a bash script
+                            bash_script = re.sub(r"^#!BASH|^# Bash script", "", stripped, count=1).strip()
+                            result = run_with_timeout(run_bash_script, [bash_script], timeout=timeout)
+                    elif in_worker:
+                        # Run in the conversation thread's own worker process, which is killed on timeout
+                        result = self.worker_pool.execute(
+                            code, thread_id=thread_id, timeout=timeout, namespace=self._repl_namespace()
+                        )
+                    else:
+                        # Inject custom functions into the Python execution environment
+                        self._inject_custom_functions_to_repl()
+                        args = [code] if self.repl_namespace is None else [code, self.repl_namespace]
+                        result = run_with_timeout(run_python_repl, args, timeout=timeout)
+                    if self.tracer.enabled:
+                        pid = self.worker_pool.get_stats()["worker_pids"].get(str(thread_id)) if in_worker else None
+                        span["backend"] = "process" if in_worker else "thread"
+                        span["output_chars"] = len(result)
+                        # Without a reset (e.g. not on Linux) only the peak since the process started is known
+                        span["peak_rss_mb" if peak_reset else "process_peak_rss_mb"] = peak_rss_mb(pid)
 
                 if len(result) > 10000:
+                    # Keep the full output on disk so later steps can read it instead of re-running the code
+                    artifact = spill_text(result, label="observation")
                     result = (
-                        "The output is too long to be added to context. Here are the first 10K characters...\n"
-                        + result[:10000]
+                        f"The output is too long to be added to context ({len(result)} characters). The full output "
+                        f"was saved to {artifact} and can be read with load_artifact('{artifact}'). "
+                        "Here are the first 10K characters...\n" + result[:10000]
                     )
                 observation = f"\n<observation>{result}</observation>"
                 state["messages"].append(AIMessage(content=observation.strip()))
@@ -1389,30 +1573,23 @@ Each library is listed with its description to help you understand its functiona
         workflow.add_edge(START, "generate")
 
         # Compile the workflow
-        self.app = workflow.compile()
-        self.checkpointer = MemorySaver()
-        self.app.checkpointer = self.checkpointer
+        self.app = workflow.compile(checkpointer=self.checkpointer)
         # display(Image(self.app.get_graph().draw_mermaid_png()))
 
-    def go(self, prompt):
-        """Execute the agent with the given prompt.
+    def _select_resources(self, prompt):
+        """Set the system prompt to the tools, data and libraries retrieved for a query.
 
         Args:
             prompt: The user's query
 
         """
-        self.critic_count = 0
-        self.user_task = prompt
-
         if self.use_tool_retriever:
             # Gather all available resources
             # 1. Tools from the registry
             all_tools = self.tool_registry.tools if hasattr(self, "tool_registry") else []
 
             # 2. Data lake items with descriptions
-            data_lake_path = self.path + "/data_lake"
-            data_lake_content = glob.glob(data_lake_path + "/*")
-            data_lake_items = [x.split("/")[-1] for x in data_lake_content]
+            data_lake_items = self._list_data_lake_items()
 
             # Create data lake descriptions for retrieval
             data_lake_descriptions = []
@@ -1444,42 +1621,240 @@ Each library is listed with its description to help you understand its functiona
                 "libraries": library_descriptions,
             }
 
-            # Use prompt-based retrieval with the agent's LLM
-            selected_resources = self.retriever.prompt_based_retrieval(prompt, resources, llm=self.llm)
-            print("Using prompt-based retrieval with the agent's LLM")
+            cache = getattr(self, "retrieval_cache", None)
+            cache_key = RetrievalCache.make_key(
+                prompt, fingerprint_resources(resources), self.retriever.mode, getattr(self, "self_critic", False)
+            )
+            cached = cache.get(cache_key) if cache is not None else None
 
-            # Extract the names from the selected resources for the system prompt
-            selected_resources_names = {
-                "tools": selected_resources["tools"],
-                "data_lake": [],
-                "libraries": [lib["name"] if isinstance(lib, dict) else lib for lib in selected_resources["libraries"]],
-            }
+            if cached is not None:
+                # Same query against the same resources: skip the retrieval call and reuse the rendered prompt
+                print("Using cached resource selection")
+                self.system_prompt = cached["system_prompt"]
+            else:
+                # Use the configured retrieval mode (prompt-based retrieval uses the agent's LLM)
+                with self.tracer.span("retrieval", kind="retrieval", mode=self.retriever.mode):
+                    selected_resources = self.retriever.retrieve(prompt, resources, llm=self.llm)
+                print(f"Using {self.retriever.mode} retrieval")
+
+                # Extract the names from the selected resources for the system prompt
+                selected_resources_names = {
+                    "tools": selected_resources["tools"],
+                    "data_lake": [],
+                    "libraries": [
+                        lib["name"] if isinstance(lib, dict) else lib for lib in selected_resources["libraries"]
+                    ],
+                }
 
-            # Process data lake items to extract just the names
-            for item in selected_resources["data_lake"]:
-                if isinstance(item, dict):
-                    selected_resources_names["data_lake"].append(item["name"])
-                elif isinstance(item, str) and ": " in item:
-                    # If the item already has a description, extract just the name
-                    name = item.split(": ")[0]
-                    selected_resources_names["data_lake"].append(name)
-                else:
-                    selected_resources_names["data_lake"].append(item)
+                # Process data lake items to extract just the names
+                for item in selected_resources["data_lake"]:
+                    if isinstance(item, dict):
+                        selected_resources_names["data_lake"].append(item["name"])
+                    elif isinstance(item, str) and ": " in item:
+                        # If the item already has a description, extract just the name
+                        name = item.split(": ")[0]
+                        selected_resources_names["data_lake"].append(name)
+                    else:
+                        selected_resources_names["data_lake"].append(item)
+
+                # Update the system prompt with the selected resources
+                self.update_system_prompt_with_selected_resources(selected_resources_names)
+
+                if cache is not None:
+                    cache.put(
+                        cache_key,
+                        {"selected_resources": selected_resources_names, "system_prompt": self.system_prompt},
+                    )
 
-            # Update the system prompt with the selected resources
-            self.update_system_prompt_with_selected_resources(selected_resources_names)
+            # Start fetching the datasets the agent is most likely to read while it plans
+            if self.data_lake is not None:
+                selected = cached["selected_resources"] if cached is not None else selected_resources_names
+                self.data_lake.prefetch(selected["data_lake"])
 
-        inputs = {"messages": [HumanMessage(content=prompt)], "next_step": None}
-        config = {"recursion_limit": 500, "configurable": {"thread_id": 42}}
-        self.log = []
+    def go(self, prompt):
+        """Execute the agent with the given prompt.
+
+        Args:
+            prompt: The user's query
+
+        """
+        self.critic_count = 0
+        self.user_task = prompt
+
+        with self.tracer.run("a1.go", prompt=prompt[:200], thread_id=str(self.thread_id)):
+            self._select_resources(prompt)
+
+            inputs = {"messages": [HumanMessage(content=prompt)], "next_step": None}
+            config = {"recursion_limit": 500, "configurable": {"thread_id": self.thread_id}}
+            self.log = []
+            self.context_budget.reset()
 
-        for s in self.app.stream(inputs, stream_mode="values", config=config):
-            message = s["messages"][-1]
-            out = pretty_print(message)
-            self.log.append(out)
+            for s in self.app.stream(inputs, stream_mode="values", config=config):
+                message = s["messages"][-1]
+                out = pretty_print(message)
+                self.log.append(out)
 
+        usage = self.context_budget.summary()
+        if usage["saved_tokens"]:
+            print(
+                f"Context: {usage['prompt_tokens']} prompt tokens over {usage['steps']} steps "
+                f"({usage['saved_fraction']:.0%} saved by compaction, largest prompt {usage['max_prompt_tokens']})"
+            )
+        if usage["cache_read_tokens"]:
+            print(
+                f"Prompt cache: {usage['cache_read_tokens']} of {usage['input_tokens']} input tokens read from cache "
+                f"({usage['cached_fraction']:.0%}), {usage['llm_seconds']:.1f}s in LLM calls"
+            )
+        if self.tracer.enabled:
+            print(self.tracer.format_summary())
         return self.log, message.content
 
+    def go_parallel(self, prompt, n_trajectories=3, max_parallel=None, quorum=None, aggregate="vote"):
+        """Solve a task with several independent trajectories run concurrently and select one solution.
+
+        Each trajectory is a session clone with its own thread id and Python namespace; Python code of all
+        trajectories shares this agent's worker pool when the "process" backend is used. Trajectories report
+        their ``<solution>`` when they finish, and as soon as ``quorum`` of them agree the remaining ones are
+        cancelled at their next step (their worker processes are stopped). Without a quorum the most voted
+        solution is returned, or with ``aggregate="judge"`` the LLM picks or merges the candidates.
+
+        Args:
+            prompt: The user's query
+            n_trajectories: Number of trajectories to run
+            max_parallel: Maximum number of trajectories running at once; defaults to ``n_trajectories``
+            quorum: Number of agreeing solutions that ends the search early; defaults to a majority
+            aggregate: How to choose without a quorum: "vote" (most common answer, first reached on ties)
+                or "judge" (ask the LLM to select or combine the candidate solutions)
+
+        Returns:
+            The log of the selected trajectory and the final answer; per-trajectory results are kept in
+            ``self.trajectories``
+
+        """
+        import contextvars
+        import uuid
+        from concurrent.futures import ThreadPoolExecutor
+
+        if aggregate not in ("vote", "judge"):
+            raise ValueError(f"Unknown aggregate '{aggregate}', expected 'vote' or 'judge'")
+        quorum = quorum or n_trajectories // 2 + 1
+        self.critic_count = 0
+        self.user_task = prompt
+        with self.tracer.run("a1.go_parallel", prompt=prompt[:200], trajectories=n_trajectories):
+            self._select_resources(prompt)
+
+            run_id = uuid.uuid4().hex[:8]
+            clones = []
+            for i in range(n_trajectories):
+                clone = self.clone_for_session(thread_id=f"{self.thread_id}-{run_id}-{i}")
+                # Every trajectory starts from the prompt selected for this query
+                clone.system_prompt = self.system_prompt
+                clone.system_prompt_prefix = getattr(self, "system_prompt_prefix", None)
+                clone.critic_count = 0
+                clone.user_task = prompt
+                clone.tracer = self.tracer
+                clones.append(clone)
+
+            tally = SolutionTally(quorum)
+            records = [None] * n_trajectories
+
+            def run(i):
+                clone = clones[i]
+                config = {"recursion_limit": 500, "configurable": {"thread_id": clone.thread_id}}
+                inputs = {"messages": [HumanMessage(content=prompt)], "next_step": None}
+                log, message, status, error = [], None, "finished", None
+                start = time.perf_counter()
+                if tally.stop.is_set():
+                    status = "cancelled"
+                else:
+                    try:
+                        for s in clone.app.stream(inputs, stream_mode="values", config=config):
+                            message = s["messages"][-1]
+                            log.append(pretty_print(message))
+                            if tally.stop.is_set():
+                                status = "cancelled"
+                                break
+                    except Exception as e:
+                        status, error = "error", str(e)
+                solution = extract_solution(str(message.content)) if message is not None else None
+                records[i] = {
+                    "trajectory": i,
+                    "thread_id": clone.thread_id,
+                    "status": status,
+                    "solution": solution if status == "finished" else None,
+                    "final": str(message.content) if message is not None else "",
+                    "steps": len(log),
+                    "seconds": round(time.perf_counter() - start, 3),
+                    "error": error,
+                    "log": log,
+                }
+                if status == "finished" and tally.add(i, solution):
+                    # Settled: stop the code the other trajectories are running so they reach a step boundary
+                    for other in clones:
+                        if other is not clone and other.worker_pool is not None:
+                            other.worker_pool.release(other.thread_id)
+
+            def traced_run(i):
+                with self.tracer.span("trajectory", kind="trajectory", index=i, thread_id=clones[i].thread_id) as span:
+                    run(i)
+                    span.update({"status": records[i]["status"], "steps": records[i]["steps"]})
+
+            start = time.perf_counter()
+            # Each trajectory runs in a copy of this context so its spans nest under this run
+            contexts = [contextvars.copy_context() for _ in range(n_trajectories)]
+            try:
+                with ThreadPoolExecutor(max_workers=max_parallel or n_trajectories) as executor:
+                    list(executor.map(lambda i: contexts[i].run(traced_run, i), range(n_trajectories)))
+            finally:
+                for clone in clones:
+                    clone.release_session()
+                    self.checkpointer.delete_thread(clone.thread_id)
+            elapsed = time.perf_counter() - start
+
+            self.trajectories = records
+            best, votes = tally.best()
+            if best is None:
+                # No trajectory produced a solution; fall back to the one that got furthest
+                best = max(range(n_trajectories), key=lambda i: records[i]["steps"])
+            chosen = records[best]
+            self.log = list(chosen["log"])
+            answer = chosen["final"]
+
+            if tally.winner is None and aggregate == "judge" and tally.distinct() > 1:
+                candidates = "\n\n".join(
+                    f"Candidate {r['trajectory'] + 1}:\n{r['solution']}" for r in records if r["solution"] is not None
+                )
+                judge_prompt = (
+                    f"Task:\n{prompt}\n\nIndependent attempts produced these candidate solutions:\n\n{candidates}\n\n"
+                    "Select the best supported candidate, or combine them where they agree and complement each other. "
+                    "Reply with the final answer inside <solution></solution> tags."
+                )
+                response = invoke_llm(self.llm, [HumanMessage(content=judge_prompt)], name="judge", tracer=self.tracer)
+                answer = str(response.content)
+                self.log.append(pretty_print(AIMessage(content=answer)))
+
+        statuses = Counter(r["status"] for r in records)
+        print(
+            f"Parallel trajectories: {n_trajectories} in {elapsed:.1f}s "
+            f"({', '.join(f'{n} {s}' for s, n in statuses.items())}); selected trajectory {best + 1} "
+            f"with {votes} of {n_trajectories} votes" + (" (early stop)" if tally.winner is not None else "")
+        )
+        if self.tracer.enabled:
+            print(self.tracer.format_summary())
+        return self.log, answer
+
+    def _find_tool_module(self, tool_name):
+        """Return the module a tool belongs to, or None if it is unknown."""
+        if getattr(self, "tool_registry", None) is not None:
+            module_name = self.tool_registry.get_module_by_name(tool_name)
+            if module_name:
+                return module_name
+        for mod, apis in getattr(self, "module2api", {}).items():
+            for api in apis:
+                if api.get("name") == tool_name:
+                    return mod
+        return None
+
     def update_system_prompt_with_selected_resources(self, selected_resources):
         """Update the system prompt with the selected resources."""
         # Extract tool descriptions for the selected tools
@@ -1489,17 +1864,12 @@ Each library is listed with its description to help you understand its functiona
             if isinstance(tool, dict):
                 module_name = tool.get("module", None)
 
-                # If module is not specified, try to find it in the module2api
-                if not module_name and hasattr(self, "module2api"):
-                    for mod, apis in self.module2api.items():
-                        for api in apis:
-                            if api.get("name") == tool.get("name"):
-                                module_name = mod
-                                # Update the tool with the module information
-                                tool["module"] = module_name
-                                break
-                        if module_name:
-                            break
+                # If module is not specified, look it up in the registry's module index
+                if not module_name:
+                    module_name = self._find_tool_module(tool.get("name"))
+                    if module_name:
+                        # Update the tool with the module information
+                        tool["module"] = module_name
 
                 # If still not found, use a default
                 if not module_name:
@@ -1508,18 +1878,12 @@ Each library is listed with its description to help you understand its functiona
             else:
                 module_name = getattr(tool, "module_name", None)
 
-                # If module is not specified, try to find it in the module2api
-                if not module_name and hasattr(self, "module2api"):
-                    tool_name = getattr(tool, "name", str(tool))
-                    for mod, apis in self.module2api.items():
-                        for api in apis:
-                            if api.get("name") == tool_name:
-                                module_name = mod
-                                # Set the module_name attribute
-                                tool.module_name = module_name
-                                break
-                        if module_name:
-                            break
+                # If module is not specified, look it up in the registry's module index
+                if not module_name:
+                    module_name = self._find_tool_module(getattr(tool, "name", str(tool)))
+                    if module_name:
+                        # Set the module_name attribute
+                        tool.module_name = module_name
 
                 # If still not found, use a default
                 if not module_name:
@@ -1609,18 +1973,59 @@ Each library is listed with its description to help you understand its functiona
         result = checker_llm.invoke({"messages": [("user", str(self.log))]}).dict()
         return result
 
+    def _repl_namespace(self) -> dict:
+        """Return the helpers and custom functions that generated code can use without importing them.
+
+        The helpers are built once per agent (and shared with its clones): worker processes only receive namespace
+        entries whose object identity changed, so a fresh ``functools.partial`` per call would be re-sent every time.
+        """
+        helpers = getattr(self, "_repl_helpers", None)
+        if helpers is None:
+            helpers = {
+                # load_data_lake("name.csv", columns=[...], filters=[...]) reads only the requested columns and
+                # rows; both it and read_dataset(path) reuse parsed tables across runs through the process-wide cache
+                "load_data_lake": functools.partial(
+                    load_data_lake, data_lake_path=self.path + "/data_lake", cache=True
+                ),
+                "read_dataset": read_dataset,
+                # gather_queries([(query_x, {...}), ...]) runs independent database calls concurrently
+                "gather_queries": gather_queries,
+                # load_artifact(path, fields=["$.a[*].b"]) reads a spilled tool response or truncated output back
+                "load_artifact": load_artifact,
+            }
+            if self.worker_pool is None:
+                helpers["dataset_cache"] = get_dataset_cache()
+            if self.data_lake is not None:
+                # data_lake_file("name.parquet") returns a local path, downloading the file if needed. Worker
+                # processes get a plain path lookup; referenced files are fetched by the execute node before the
+                # code is sent
+                if self.worker_pool is None:
+                    helpers["data_lake_file"] = self.data_lake.path
+                else:
+                    helpers["data_lake_file"] = functools.partial(os.path.join, self.data_lake.local_dir)
+            self._repl_helpers = helpers
+        namespace = dict(helpers)
+        if hasattr(self, "_custom_functions") and self._custom_functions:
+            namespace.update(self._custom_functions)
+        return namespace
+
+    def _unavailable_custom_functions(self) -> set[str]:
+        """Return the custom tools that cannot be sent to the worker processes of the "process" backend."""
+        if self.worker_pool is None or not getattr(self, "_custom_functions", None):
+            return set()
+        return set(self.worker_pool.unavailable(self._custom_functions))
+
     def _inject_custom_functions_to_repl(self):
         """Inject custom functions into the Python REPL execution environment.
         This makes custom tools available during code execution.
         """
-        if hasattr(self, "_custom_functions") and self._custom_functions:
-            # Access the persistent namespace used by run_python_repl
-            from biomni.tool.support_tools import _persistent_namespace
+        # Access the persistent namespace used by run_python_repl
+        from biomni.tool.support_tools import _persistent_namespace
 
-            # Inject all custom functions into the execution namespace
-            for name, func in self._custom_functions.items():
-                _persistent_namespace[name] = func
+        namespace = _persistent_namespace if self.repl_namespace is None else self.repl_namespace
+        namespace.update(self._repl_namespace())
 
+        if hasattr(self, "_custom_functions") and self._custom_functions:
             # Also make them available in builtins for broader access
             import builtins
 
@@ -1628,6 +2033,67 @@ Each library is listed with its description to help you understand its functiona
                 builtins._biomni_custom_functions = {}
             builtins._biomni_custom_functions.update(self._custom_functions)
 
+    def clone_for_session(self, thread_id=None) -> "A1":
+        """Return an agent for a separate conversation that shares this agent's expensive components.
+
+        Shared with this agent (thread-safe or read-only during a conversation): the LLM client, retriever and
+        its vector index, retrieval cache (keyed by the resources offered, so clones with different custom
+        tools do not see each other's selections), data lake, dataset cache, worker pool, MCP servers and
+        checkpointer.
+
+        Copied per conversation: the conversation thread, workflow, system prompt, log, context budget,
+        tracer and Python namespace, and the tool registry, ``module2api`` and custom tool, data and software
+        dictionaries, so ``add_tool``/``add_data``/``add_software`` on a clone only affect that conversation.
+
+        Args:
+            thread_id: Conversation thread id of the clone; defaults to a new random id
+
+        Returns:
+            The new agent
+
+        """
+        import copy
+        import uuid
+
+        clone = copy.copy(self)
+        clone.thread_id = thread_id if thread_id is not None else uuid.uuid4().hex
+        clone.repl_namespace = {}
+        clone.log = []
+        clone.critic_count = 0
+        clone.user_task = None
+        clone.module2api = {module: [dict(tool) for tool in tools] for module, tools in self.module2api.items()}
+        if getattr(self, "tool_registry", None) is not None:
+            clone.tool_registry = self.tool_registry.copy()
+        for name in ("_custom_functions", "_custom_tools", "_custom_data", "_custom_software"):
+            if hasattr(self, name):
+                setattr(clone, name, dict(getattr(self, name)))
+        budget = self.context_budget
+        clone.context_budget = ContextBudget(
+            max_tokens=budget.max_tokens,
+            keep_recent=budget.keep_recent,
+            max_observation_tokens=budget.max_observation_tokens,
+            head_lines=budget.head_lines,
+            tail_lines=budget.tail_lines,
+            cache_size=budget.cache_size,
+        )
+        clone.tracer = Tracer(path=self.tracer.path, enabled=self.tracer.enabled)
+        clone.configure(
+            self_critic=getattr(self, "self_critic", False),
+            test_time_scale_round=getattr(self, "test_time_scale_round", 0),
+        )
+        return clone
+
+    def release_session(self):
+        """Free the per-conversation resources of this agent, i.e. its worker process."""
+        if self.worker_pool is not None:
+            self.worker_pool.release(self.thread_id)
+        if self.repl_namespace is not None:
+            self.repl_namespace.clear()
+
+    def get_worker_pool_stats(self) -> dict:
+        """Return execution, timeout, crash and worker counts of the process worker pool (empty if not enabled)."""
+        return self.worker_pool.get_stats() if self.worker_pool is not None else {}
+
     def create_mcp_server(self, tool_modules=None):
         """
         Create an MCP server object that exposes internal Biomni tools.
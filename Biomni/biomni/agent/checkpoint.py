@@ -0,0 +1,418 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    "thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, parent_id TEXT, type TEXT, checkpoint BLOB, "
+    "metadata_type TEXT, metadata BLOB, created REAL, PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    "thread_id TEXT, checkpoint_ns TEXT, channel TEXT, version TEXT, type TEXT, value BLOB, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    "thread_id TEXT, checkpoint_ns TEXT, checkpoint_id TEXT, task_id TEXT, idx INTEGER, channel TEXT, "
+    "type TEXT, value BLOB, task_path TEXT, PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+    "CREATE TABLE IF NOT EXISTS threads (thread_id TEXT PRIMARY KEY, updated REAL)",
+    "CREATE INDEX IF NOT EXISTS threads_updated ON threads (updated)",
+)
+
+
+class SqliteCheckpointer(BaseCheckpointSaver[str]):
+    """Bounded LangGraph checkpointer backed by SQLite.
+
+    Works offline, with a file (threads survive a restart and resume from their latest checkpoint, which is
+    read with a single indexed query) or with ``":memory:"``. Only the ``keep_last`` most recent checkpoints
+    of each thread are kept, together with the channel values they reference, and threads that have not
+    been written to for ``ttl_seconds`` are deleted. Serialized values are zlib-compressed.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        keep_last: int | None = 5,
+        ttl_seconds: float | None = 7 * 24 * 3600,
+        gc_interval: float = 600.0,
+        serde=None,
+    ):
+        """Initialize the checkpointer.
+
+        Args:
+            path: SQLite file, or ":memory:" for a bounded in-process store
+            keep_last: Checkpoints kept per thread and namespace; None keeps all
+            ttl_seconds: Threads idle for longer than this are deleted; None keeps them forever
+            gc_interval: Minimum seconds between automatic expiry passes
+            serde: Serializer; defaults to LangGraph's ``JsonPlusSerializer``
+
+        """
+        super().__init__(serde=serde)
+        self.path = path
+        self.keep_last = keep_last
+        self.ttl_seconds = ttl_seconds
+        self.gc_interval = gc_interval
+        self._lock = threading.RLock()
+        self._last_gc = 0.0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        if path != ":memory:":
+            # WAL lets several agent processes share one checkpoint file
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        self.gc()
+
+    def _dump(self, value) -> tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        return type_, zlib.compress(data, 3)
+
+    def _load(self, type_: str, data: bytes):
+        return self.serde.loads_typed((type_, zlib.decompress(data)))
+
+    def _tuple(self, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, data, metadata_type, metadata = row
+        checkpoint = self._load(type_, data)
+        values = {}
+        for channel, version in checkpoint.get("channel_versions", {}).items():
+            blob = self._conn.execute(
+                "SELECT type, value FROM blobs WHERE thread_id=? AND checkpoint_ns=? AND channel=? AND version=?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            if blob is not None and blob[0] != "empty":
+                values[channel] = self._load(*blob)
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id=? AND checkpoint_ns=? "
+            "AND checkpoint_id=? ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}
+            },
+            checkpoint={**checkpoint, "channel_values": values},
+            metadata=self._load(metadata_type, metadata),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id
+                else None
+            ),
+            pending_writes=[(task_id, channel, self._load(t, v)) for task_id, channel, t, v in writes],
+        )
+
+    def threads(self) -> list[dict]:
+        """Return the stored threads with their last update time and checkpoint count, most recent first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.thread_id, t.updated, COUNT(c.checkpoint_id) FROM threads t "
+                "LEFT JOIN checkpoints c ON c.thread_id = t.thread_id GROUP BY t.thread_id ORDER BY t.updated DESC"
+            ).fetchall()
+        return [{"thread_id": t, "updated": u, "checkpoints": n} for t, u, n in rows]
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata"
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id=? AND checkpoint_ns=? AND checkpoint_id=?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id=? AND checkpoint_ns=? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._tuple(thread_id, checkpoint_ns, row) if row is not None else None
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id=?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns=?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id=?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id<?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata "
+                f"FROM checkpoints {where} ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC",
+                params,
+            ).fetchall()
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self._load(row[4], row[5])
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            with self._lock:
+                item = self._tuple(thread_id, checkpoint_ns, row)
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values", {})
+        blobs = [
+            (thread_id, checkpoint_ns, channel, str(version), *self._dump(values[channel]))
+            if channel in values
+            else (thread_id, checkpoint_ns, channel, str(version), "empty", b"")
+            for channel, version in new_versions.items()
+        ]
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blobs)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    *self._dump(stored),
+                    *self._dump(get_checkpoint_metadata(config, metadata)),
+                    now,
+                ),
+            )
+            self._conn.execute("INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, now))
+            if self.keep_last is not None:
+                self._prune(thread_id, checkpoint_ns, self.keep_last)
+            self._conn.commit()
+        if self.ttl_seconds is not None and now - self._last_gc > self.gc_interval:
+            self.gc()
+        return {
+            "configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    *self._dump(value),
+                    task_path,
+                )
+            )
+        # Special writes (errors, interrupts) have fixed negative indexes and are replaced; others are kept once
+        with self._lock:
+            for row in rows:
+                verb = "INSERT OR REPLACE" if row[4] < 0 else "INSERT OR IGNORE"
+                self._conn.execute(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            self._conn.commit()
+
+    def _prune(self, thread_id: str, checkpoint_ns: str, keep: int) -> None:
+        """Delete all but the ``keep`` latest checkpoints of a thread and the writes and values only they used."""
+        stale = [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT checkpoint_id FROM checkpoints WHERE thread_id=? AND checkpoint_ns=? "
+                "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+                (thread_id, checkpoint_ns, keep),
+            )
+        ]
+        if not stale:
+            return
+        for checkpoint_id in stale:
+            self._conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id=? AND checkpoint_ns=? AND checkpoint_id=?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+            self._conn.execute(
+                "DELETE FROM writes WHERE thread_id=? AND checkpoint_ns=? AND checkpoint_id=?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+        referenced = set()
+        for type_, data in self._conn.execute(
+            "SELECT type, checkpoint FROM checkpoints WHERE thread_id=? AND checkpoint_ns=?", (thread_id, checkpoint_ns)
+        ):
+            versions = self._load(type_, data).get("channel_versions", {})
+            referenced.update((channel, str(version)) for channel, version in versions.items())
+        for channel, version in self._conn.execute(
+            "SELECT channel, version FROM blobs WHERE thread_id=? AND checkpoint_ns=?", (thread_id, checkpoint_ns)
+        ).fetchall():
+            if (channel, version) not in referenced:
+                self._conn.execute(
+                    "DELETE FROM blobs WHERE thread_id=? AND checkpoint_ns=? AND channel=? AND version=?",
+                    (thread_id, checkpoint_ns, channel, version),
+                )
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """Keep only the latest checkpoint of each thread ("keep_latest") or delete the threads ("delete")."""
+        if strategy == "delete":
+            for thread_id in thread_ids:
+                self.delete_thread(thread_id)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"Unknown prune strategy '{strategy}', expected 'keep_latest' or 'delete'")
+        with self._lock:
+            for thread_id in thread_ids:
+                namespaces = self._conn.execute(
+                    "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id=?", (thread_id,)
+                ).fetchall()
+                for (checkpoint_ns,) in namespaces:
+                    self._prune(thread_id, checkpoint_ns, 1)
+            self._conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("checkpoints", "blobs", "writes", "threads"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id=?", (thread_id,))
+            self._conn.commit()
+
+    def gc(self, max_age_seconds: float | None = None) -> int:
+        """Delete threads not written to for ``max_age_seconds`` (default ``ttl_seconds``); returns how many."""
+        max_age_seconds = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        self._last_gc = time.time()
+        if max_age_seconds is None:
+            return 0
+        with self._lock:
+            expired = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated < ?", (time.time() - max_age_seconds,)
+                )
+            ]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        return len(expired)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("threads", "checkpoints", "blobs", "writes")
+            }
+            size = sum(
+                self._conn.execute(f"SELECT COALESCE(SUM(LENGTH({column})), 0) FROM {table}").fetchone()[0]
+                for table, column in (("checkpoints", "checkpoint"), ("blobs", "value"), ("writes", "value"))
+            )
+        return {
+            "path": self.path,
+            "keep_last": self.keep_last,
+            "ttl_seconds": self.ttl_seconds,
+            **counts,
+            "bytes": size,
+        }
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        self.prune(thread_ids, strategy=strategy)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def make_checkpointer(checkpointer, default_path: str) -> BaseCheckpointSaver:
+    """Resolve the ``checkpointer`` argument of an agent.
+
+    Args:
+        checkpointer: "sqlite" (a file at ``default_path``), "memory" (bounded, in-process), a path to a
+            SQLite file, or any LangGraph ``BaseCheckpointSaver``
+        default_path: File used by "sqlite"
+
+    """
+    if isinstance(checkpointer, BaseCheckpointSaver):
+        return checkpointer
+    keep_last = int(os.environ.get("BIOMNI_CHECKPOINT_KEEP", "5"))
+    ttl_days = float(os.environ.get("BIOMNI_CHECKPOINT_TTL_DAYS", "7"))
+    if checkpointer == "memory":
+        path = ":memory:"
+    elif checkpointer == "sqlite":
+        path = default_path
+    elif isinstance(checkpointer, str):
+        path = checkpointer
+    else:
+        raise ValueError(f"Unknown checkpointer {checkpointer!r}, expected 'sqlite', 'memory', a path or a saver")
+    return SqliteCheckpointer(path, keep_last=keep_last, ttl_seconds=ttl_days * 24 * 3600 if ttl_days > 0 else None)
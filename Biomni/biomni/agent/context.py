@@ -0,0 +1,241 @@
+import functools
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from biomni.tool.projection import spill_text
+
+_OBSERVATION = re.compile(r"^\s*<observation>(.*?)(</observation>)?\s*$", re.DOTALL)
+_EXECUTE = re.compile(r"<execute>(.*?)</execute>", re.DOTALL)
+_ERROR_LINE = re.compile(r"(Traceback|Error|Exception|Timed out|timeout)", re.IGNORECASE)
+# Long execution outputs are already saved by the execute step, which points to them like this
+_ARTIFACT = re.compile(r"load_artifact\('([^']+)'\)")
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text with ``tiktoken`` if installed, otherwise estimate four characters per token.
+
+    The count is an approximation for non-OpenAI models, which is enough to hold a prompt under a budget.
+    """
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _message_tokens(message: BaseMessage) -> int:
+    # A few tokens of per-message overhead for the role and separators
+    return count_tokens(str(message.content)) + 4
+
+
+class ContextBudget:
+    """Token-budgeted view of an agent trajectory for the generate step.
+
+    The full trajectory stays in the graph state; only the messages sent to the LLM are compacted. The task
+    and the most recent ``keep_recent`` messages are always sent verbatim. Older observations larger than
+    ``max_observation_tokens`` are replaced by a structured summary (size, error lines, head and tail) that
+    points to the full text saved on disk. If the prompt is still over ``max_tokens``, older steps are
+    compacted from the oldest onwards: observations are summarized, and reasoning is shortened with its code
+    kept. As a last resort the oldest compacted steps are dropped. Compaction depends only on a message's
+    content, so earlier parts of the prompt stay identical from step to step; the last ``cache_size``
+    compacted messages are remembered so that they are not summarized again at every step.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int | None = 60000,
+        keep_recent: int = 6,
+        max_observation_tokens: int = 1500,
+        head_lines: int = 15,
+        tail_lines: int = 10,
+        cache_size: int = 512,
+    ):
+        """Initialize the budget.
+
+        Args:
+            max_tokens: Maximum prompt size in tokens including the system prompt; None only compacts large
+                older observations
+            keep_recent: Number of most recent messages that are never compacted
+            max_observation_tokens: Older observations above this size are always summarized
+            head_lines: Lines kept from the start of a summarized observation
+            tail_lines: Lines kept from the end of a summarized observation
+            cache_size: Number of compacted messages kept for reuse in later steps
+
+        """
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.max_observation_tokens = max_observation_tokens
+        self.head_lines = head_lines
+        self.tail_lines = tail_lines
+        self.cache_size = cache_size
+        self.history: list[dict] = []
+        self._compacted: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Clear the per-step statistics, e.g. at the start of a new task."""
+        self.history = []
+
+    def build(self, system_prompt: str, messages: list[BaseMessage]) -> list[BaseMessage]:
+        """Return the messages to send for the next step, with the system prompt first, and record their size."""
+        system = SystemMessage(content=system_prompt)
+        raw_tokens = [_message_tokens(m) for m in messages]
+        system_tokens = _message_tokens(system)
+        raw_total = system_tokens + sum(raw_tokens)
+
+        # The first human message is the task; the recent window is sent as is
+        protected = set(range(max(0, len(messages) - self.keep_recent), len(messages)))
+        protected.update(i for i, m in enumerate(messages[:1]) if isinstance(m, HumanMessage))
+
+        outgoing = list(messages)
+        tokens = list(raw_tokens)
+        compacted = set()
+
+        def compact(i, level):
+            replacement = self._compact(outgoing[i], level)
+            if replacement is not None and replacement.content != outgoing[i].content:
+                outgoing[i] = replacement
+                tokens[i] = _message_tokens(replacement)
+                compacted.add(i)
+
+        for i, message in enumerate(messages):
+            if i not in protected and _is_observation(message) and raw_tokens[i] > self.max_observation_tokens:
+                compact(i, "observation")
+
+        dropped = []
+        if self.max_tokens is not None:
+            for i in range(len(messages)):
+                if system_tokens + sum(tokens) <= self.max_tokens:
+                    break
+                if i not in protected:
+                    compact(i, "observation" if _is_observation(messages[i]) else "step")
+
+            # Still over budget: drop the oldest unprotected messages, leaving a marker in their place
+            for i in range(len(messages)):
+                if system_tokens + sum(tokens) <= self.max_tokens:
+                    break
+                if i not in protected and outgoing[i] is not None:
+                    dropped.append(i)
+                    outgoing[i], tokens[i] = None, 0
+            if dropped:
+                marker = HumanMessage(
+                    content=f"[{len(dropped)} earlier messages were omitted to stay within the context budget.]"
+                )
+                outgoing[dropped[0]] = marker
+                tokens[dropped[0]] = _message_tokens(marker)
+
+        outgoing = [m for m in outgoing if m is not None]
+        prompt_tokens = system_tokens + sum(tokens)
+        self.history.append(
+            {
+                "step": len(self.history) + 1,
+                "messages": len(messages),
+                "raw_tokens": raw_total,
+                "prompt_tokens": prompt_tokens,
+                "system_tokens": system_tokens,
+                "compacted_messages": len(compacted - set(dropped)),
+                "dropped_messages": len(dropped),
+                "over_budget": self.max_tokens is not None and prompt_tokens > self.max_tokens,
+            }
+        )
+        return [system] + outgoing
+
+    def record_usage(self, usage: dict, seconds: float) -> None:
+        """Attach the provider-reported token usage (see ``biomni.llm.cache_usage``) and latency to the last step."""
+        if self.history:
+            self.history[-1].update(usage)
+            self.history[-1]["seconds"] = round(seconds, 3)
+
+    def _compact(self, message: BaseMessage, level: str) -> BaseMessage | None:
+        content = str(message.content)
+        key = (level, hashlib.sha256(content.encode("utf-8")).hexdigest())
+        with self._lock:
+            cached = self._compacted.get(key)
+            if cached is not None:
+                self._compacted.move_to_end(key)
+        if cached is None:
+            if level == "observation" and _is_observation(message):
+                cached = self._summarize_observation(_OBSERVATION.match(content).group(1))
+            elif isinstance(message, AIMessage):
+                cached = self._shorten_step(content)
+            else:
+                cached = _truncate(content, 1000)
+            with self._lock:
+                self._compacted[key] = cached
+                while len(self._compacted) > self.cache_size:
+                    self._compacted.popitem(last=False)
+        return type(message)(content=cached)
+
+    def _summarize_observation(self, text: str) -> str:
+        lines = text.strip().splitlines()
+        saved = _ARTIFACT.search(text)
+        if saved and os.path.exists(saved.group(1)):
+            path = saved.group(1)
+        else:
+            path = spill_text(text, label="observation")
+        errors = [line.strip() for line in lines if _ERROR_LINE.search(line)][:5]
+        parts = [
+            f"[Compacted observation: {len(text)} characters, {len(lines)} lines. Full text: load_artifact('{path}')]"
+        ]
+        if errors:
+            parts.append("Error lines:\n" + "\n".join(_truncate(line, 200) for line in errors))
+        if len(lines) <= self.head_lines + self.tail_lines:
+            parts.append("\n".join(_truncate(line, 300) for line in lines))
+        else:
+            parts.append("\n".join(_truncate(line, 300) for line in lines[: self.head_lines]))
+            parts.append(f"... ({len(lines) - self.head_lines - self.tail_lines} lines omitted) ...")
+            parts.append("\n".join(_truncate(line, 300) for line in lines[-self.tail_lines :]))
+        return "<observation>" + "\n".join(parts) + "</observation>"
+
+    @staticmethod
+    def _shorten_step(content: str) -> str:
+        """Keep the code of an earlier step (later code may depend on it) and shorten the reasoning around it."""
+        match = _EXECUTE.search(content)
+        if not match:
+            return _truncate(content, 600)
+        reasoning = content[: match.start()].strip()
+        return f"{_truncate(reasoning, 400)}\n<execute>{_truncate(match.group(1), 4000)}</execute>".strip()
+
+    def summary(self) -> dict:
+        """Return totals over the recorded steps: prompt tokens sent versus the uncompacted trajectory, and the
+        input tokens the provider reported as read from its prompt cache."""
+        raw = sum(step["raw_tokens"] for step in self.history)
+        sent = sum(step["prompt_tokens"] for step in self.history)
+        reported = sum(step.get("input_tokens", 0) for step in self.history)
+        cached = sum(step.get("cache_read_tokens", 0) for step in self.history)
+        return {
+            "steps": len(self.history),
+            "raw_tokens": raw,
+            "prompt_tokens": sent,
+            "saved_tokens": raw - sent,
+            "saved_fraction": (raw - sent) / raw if raw else 0.0,
+            "max_prompt_tokens": max((step["prompt_tokens"] for step in self.history), default=0),
+            "input_tokens": reported,
+            "cache_read_tokens": cached,
+            "cache_write_tokens": sum(step.get("cache_write_tokens", 0) for step in self.history),
+            "cached_fraction": cached / reported if reported else 0.0,
+            "llm_seconds": round(sum(step.get("seconds", 0.0) for step in self.history), 3),
+        }
+
+
+def _is_observation(message: BaseMessage) -> bool:
+    return isinstance(message, AIMessage) and str(message.content).lstrip().startswith("<observation>")
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit] + f"... [{len(text) - limit} more characters]"
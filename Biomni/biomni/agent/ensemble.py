@@ -0,0 +1,69 @@
+import re
+import threading
+from collections import Counter
+
+_SOLUTION = re.compile(r"<solution>(.*?)</solution>", re.DOTALL)
+
+
+def extract_solution(text: str) -> str | None:
+    """Return the content of the last ``<solution>`` tag of a message, or None if it has none."""
+    matches = _SOLUTION.findall(text or "")
+    return matches[-1].strip() if matches else None
+
+
+def normalize_answer(answer: str) -> str:
+    """Normalize an answer for voting: case, surrounding whitespace and punctuation, and repeated spaces."""
+    return re.sub(r"\s+", " ", answer).strip().strip(".").strip().lower()
+
+
+class SolutionTally:
+    """Thread-safe vote count over the solutions of parallel trajectories.
+
+    Trajectories report their solution when they finish. As soon as ``quorum`` of them agree on the same
+    (normalized) answer, ``stop`` is set so the others can be cancelled.
+    """
+
+    def __init__(self, quorum: int):
+        """Initialize the tally.
+
+        Args:
+            quorum: Number of agreeing solutions that settles the answer
+
+        """
+        self.quorum = quorum
+        self.stop = threading.Event()
+        self.winner: str | None = None
+        self._votes: Counter = Counter()
+        self._order: list[tuple[int, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, index: int, solution: str | None) -> bool:
+        """Record the solution of trajectory ``index``; returns True if it settled the answer."""
+        if solution is None:
+            return False
+        key = normalize_answer(solution)
+        with self._lock:
+            self._order.append((index, key))
+            self._votes[key] += 1
+            if self.winner is None and self._votes[key] >= self.quorum:
+                self.winner = key
+                self.stop.set()
+                return True
+        return False
+
+    def best(self) -> tuple[int | None, int]:
+        """Return the trajectory that first reached the most voted answer, and that answer's vote count."""
+        with self._lock:
+            if self.winner is not None:
+                key = self.winner
+            elif self._votes:
+                top = max(self._votes.values())
+                # Ties go to the answer that was reached first
+                key = next(k for _, k in self._order if self._votes[k] == top)
+            else:
+                return None, 0
+            return next(i for i, k in self._order if k == key), self._votes[key]
+
+    def distinct(self) -> int:
+        with self._lock:
+            return len(self._votes)
@@ -18,6 +18,7 @@ from biomni.env_desc import data_lake_dict, library_content_dict
 from biomni.llm import get_llm
 from biomni.model.retriever import ToolRetriever
 from biomni.tool.tool_registry import ToolRegistry
+from biomni.tracing import Tracer, invoke_llm
 from biomni.utils import (
     api_schema_to_langchain_tool,
     function_to_api_schema,
@@ -41,8 +42,11 @@ class react:
         llm="claude-3-7-sonnet-latest",
         use_tool_retriever=False,
         timeout_seconds=600,
+        trace: bool | str = False,
     ):
         self.path = path
+        # Spans of each run (LLM calls and tool calls); a path also appends them to that JSONL file
+        self.tracer = Tracer(path=trace if isinstance(trace, str) else None, enabled=bool(trace))
         if not os.path.exists(path):
             os.makedirs(path)
             print(f"Created directory: {path}")
@@ -267,7 +271,7 @@ Here is the list of available libraries with their descriptions:
             """Node that calls the language model to get the next action."""
             system_message = SystemMessage(content=self.system_prompt)
             messages = [system_message] + state["messages"]
-            response = llm_with_tools.invoke(messages, config=config)
+            response = invoke_llm(llm_with_tools, messages, name="agent", tracer=self.tracer, config=config)
             return {"messages": [response]}
 
         # Define the node that executes tools
@@ -276,7 +280,9 @@ Here is the list of available libraries with their descriptions:
             outputs = []
             for tool_call in state["messages"][-1].tool_calls:
                 try:
-                    tool_result = tools_by_name[tool_call["name"]].invoke(tool_call["args"])
+                    # "tool_call" rather than "tool": functions decorated with @trace_tool record their own "tool" span
+                    with self.tracer.span(tool_call["name"], kind="tool_call", arguments=tool_call["args"]):
+                        tool_result = tools_by_name[tool_call["name"]].invoke(tool_call["args"])
                     outputs.append(
                         ToolMessage(
                             content=json.dumps(tool_result),
@@ -340,6 +346,14 @@ Here is the list of available libraries with their descriptions:
             prompt: The user's query
 
         """
+        with self.tracer.run("react.go", prompt=prompt[:200]):
+            result = self._go(prompt)
+        if self.tracer.enabled:
+            print(self.tracer.format_summary())
+        return result
+
+    def _go(self, prompt):
+        """Run one query for ``go``, inside its trace run."""
         if self.use_tool_retriever:
             # Gather all available tools from the registry
             all_tools = self.tool_registry.tools if hasattr(self, "tool_registry") else []
@@ -368,7 +382,8 @@ Here is the list of available libraries with their descriptions:
             }
 
             # Use prompt-based retrieval with the agent's LLM
-            selected_resources = self.retriever.prompt_based_retrieval(prompt, resources, llm=self.llm)
+            with self.tracer.span("retrieval", kind="retrieval", mode="prompt"):
+                selected_resources = self.retriever.prompt_based_retrieval(prompt, resources, llm=self.llm)
             print("Using prompt-based retrieval with the agent's LLM")
 
             # If we're using prompt or embedding based retrieval, print the selected resources
@@ -0,0 +1,4 @@
+from biomni.datalake.cache import DatasetCache, get_dataset_cache, read_dataset
+from biomni.datalake.columnar import annotate_data_lake_dict, compact_data_lake, describe_schema, load_data_lake
+from biomni.datalake.downloader import DataLakeDownloader, load_manifest, write_manifest
+from biomni.datalake.lazy import LazyDataLake
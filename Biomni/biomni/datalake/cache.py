@@ -0,0 +1,217 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("BIOMNI_DATASET_CACHE_GB", "4")) * 1024**3)
+
+
+def estimate_size(obj) -> int:
+    """Estimate the in-memory size of a loaded dataset in bytes."""
+    try:
+        import pandas as pd
+
+        if isinstance(obj, pd.DataFrame):
+            return int(obj.memory_usage(deep=True).sum())
+        if isinstance(obj, pd.Series):
+            return int(obj.memory_usage(deep=True))
+    except ImportError:
+        pass
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(obj)
+
+
+def _copy_on_write() -> bool:
+    """Return True if pandas copies shared data lazily on the first write (always the case since pandas 3.0)."""
+    import pandas as pd
+
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        # pandas < 2.0 has no Copy-on-Write mode
+        return False
+
+
+def _copy(obj):
+    # Callers get their own copy so in-place edits in one analysis do not leak into the next
+    try:
+        import pandas as pd
+
+        if isinstance(obj, pd.DataFrame | pd.Series) and _copy_on_write():
+            # A shallow copy shares the cached data until either side writes to it, so a hit costs no memory
+            return obj.copy(deep=False)
+    except ImportError:
+        pass
+    copy = getattr(obj, "copy", None)
+    return copy() if callable(copy) else obj
+
+
+def _default_loader(path: str, **kwargs):
+    import pandas as pd
+
+    lower = path.lower()
+    if lower.endswith(".parquet"):
+        return pd.read_parquet(path, **kwargs)
+    if lower.endswith((".pkl", ".pickle")):
+        return pd.read_pickle(path, **kwargs)
+    if lower.endswith((".tsv", ".tsv.gz", ".txt", ".txt.gz")):
+        kwargs.setdefault("sep", "\t")
+    if lower.endswith((".xlsx", ".xls")):
+        return pd.read_excel(path, **kwargs)
+    if lower.endswith(".feather"):
+        return pd.read_feather(path, **kwargs)
+    return pd.read_csv(path, **kwargs)
+
+
+class DatasetCache:
+    """Process-wide, memory-bounded LRU cache of parsed datasets.
+
+    Entries are keyed by absolute file path, modification time and size, plus the loader and its
+    arguments, so a file that changes on disk is re-read. When the total estimated size (via
+    ``DataFrame.memory_usage(deep=True)``) exceeds ``max_bytes``, the least recently used entries are
+    evicted. Objects larger than the whole budget are returned without being cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-key load locks with the number of threads holding or waiting for them
+        self._key_locks: dict[tuple, list] = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+        self.saved_seconds = 0.0
+        self._load_times: dict[tuple, float] = {}
+
+    @staticmethod
+    def make_key(path: str, loader: Callable | None = None, args: tuple = (), kwargs: dict | None = None) -> tuple:
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = (None, None)
+        loader_name = f"{loader.__module__}.{loader.__qualname__}" if loader is not None else "default"
+        arguments = json.dumps([args, kwargs or {}], sort_keys=True, default=repr)
+        return (path, *signature, loader_name, arguments)
+
+    def get_or_load(self, path: str, loader: Callable | None = None, *args, copy: bool = True, **kwargs):
+        """Return the dataset at ``path``, parsing it only if it is not cached for the file's current mtime.
+
+        Args:
+            path: Path of the file
+            loader: Function called as ``loader(path, *args, **kwargs)``; defaults to a pandas reader
+                chosen by file extension
+            copy: Return a copy of the cached object, so it can be modified freely. With pandas Copy-on-Write
+                (the default since pandas 3.0, or ``pd.set_option("mode.copy_on_write", True)``) DataFrames are
+                copied lazily; otherwise every hit makes a deep copy
+            *args, **kwargs: Passed to the loader and part of the cache key
+
+        Returns:
+            The loaded dataset
+
+        """
+        key = self.make_key(path, loader, args, kwargs)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            # Concurrent requests for the same dataset wait for a single load, then find it in the cache
+            with key_lock[0]:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        self.saved_seconds += self._load_times.get(key, 0.0)
+                        return _copy(entry[0]) if copy else entry[0]
+                    self.misses += 1
+
+                start = time.perf_counter()
+                obj = (loader or _default_loader)(path, *args, **kwargs)
+                elapsed = time.perf_counter() - start
+                self._put(key, obj, elapsed)
+        finally:
+            # The lock is dropped only once no thread holds or waits for it, so a later request cannot get a
+            # second lock for the same key while a load is still in flight
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    self._key_locks.pop(key, None)
+        return _copy(obj) if copy else obj
+
+    def _put(self, key: tuple, obj, load_seconds: float) -> None:
+        size = estimate_size(obj)
+        with self._lock:
+            self.load_seconds += load_seconds
+            if size > self.max_bytes:
+                return
+            # Drop stale entries for older versions of the same file
+            for old_key in [k for k in self._entries if k[0] == key[0] and k[1:3] != key[1:3]]:
+                self._evict(old_key)
+            self._entries[key] = (obj, size)
+            self._load_times[key] = load_seconds
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                self._evict(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _evict(self, key: tuple) -> None:
+        _, size = self._entries.pop(key)
+        self._load_times.pop(key, None)
+        self.current_bytes -= size
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Drop all cached versions of a file, or the whole cache if ``path`` is None."""
+        with self._lock:
+            if path is None:
+                keys = list(self._entries)
+            else:
+                path = os.path.abspath(path)
+                keys = [k for k in self._entries if k[0] == path]
+            for key in keys:
+                self._evict(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "load_seconds": self.load_seconds,
+                "saved_seconds": self.saved_seconds,
+                "datasets": [{"path": k[0], "bytes": v[1]} for k, v in self._entries.items()],
+            }
+
+
+_dataset_cache = None
+_dataset_cache_lock = threading.Lock()
+
+
+def get_dataset_cache() -> DatasetCache:
+    """Return the process-wide dataset cache, shared by all agents and REPL sessions."""
+    global _dataset_cache
+    with _dataset_cache_lock:
+        if _dataset_cache is None:
+            _dataset_cache = DatasetCache()
+        return _dataset_cache
+
+
+def read_dataset(path: str, *args, copy: bool = True, **kwargs):
+    """Read a table through the process-wide cache. Arguments are passed to the pandas reader for the file type."""
+    return get_dataset_cache().get_or_load(path, None, *args, copy=copy, **kwargs)
@@ -0,0 +1,360 @@
+import json
+import os
+
+COLUMNAR_DIR_NAME = "_columnar"
+CATALOG_NAME = "catalog.json"
+
+# Source formats that compaction converts; parquet files are already columnar and are read in place
+_TEXT_FORMATS = {".csv": ",", ".tsv": "\t", ".txt": "\t"}
+_PICKLE_FORMATS = (".pkl", ".pickle")
+
+# Number of columns spelled out in a schema annotation; wide matrices such as DepMap have ~18k columns
+_MAX_ANNOTATED_COLUMNS = 12
+
+# Bytes of CSV text parsed at a time during compaction; column types are inferred from the first block
+_CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for columnar data lake access. Install it with: pip install pyarrow"
+        ) from e
+
+
+def _catalog_path(data_lake_path: str) -> str:
+    return os.path.join(data_lake_path, COLUMNAR_DIR_NAME, CATALOG_NAME)
+
+
+def load_catalog(data_lake_path: str) -> dict[str, dict]:
+    """Load the catalog of compacted files, mapping source names to their Parquet copy and schema."""
+    try:
+        with open(_catalog_path(data_lake_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_catalog(data_lake_path: str, catalog: dict) -> None:
+    path = _catalog_path(data_lake_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(catalog, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _source_signature(path: str) -> dict:
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime": stat.st_mtime}
+
+
+def _is_fresh(entry: dict | None, source_path: str, data_lake_path: str) -> bool:
+    if not entry or not os.path.exists(os.path.join(data_lake_path, entry["path"])):
+        return False
+    if not os.path.exists(source_path):
+        # The source may have been evicted by the lazy data lake; the compacted copy is still valid
+        return True
+    signature = _source_signature(source_path)
+    return entry["source_size"] == signature["source_size"] and entry["source_mtime"] == signature["source_mtime"]
+
+
+def _read_source_table(source_path: str):
+    """Read a CSV/TSV/pickle data lake file into an Arrow table with inferred column types."""
+    import pyarrow as pa
+    from pyarrow import csv
+
+    ext = os.path.splitext(source_path)[1].lower()
+    if ext in _TEXT_FORMATS:
+        return csv.read_csv(source_path, parse_options=csv.ParseOptions(delimiter=_TEXT_FORMATS[ext]))
+    if ext in _PICKLE_FORMATS:
+        import pandas as pd
+
+        obj = pd.read_pickle(source_path)
+        if isinstance(obj, pd.Series):
+            obj = obj.to_frame()
+        if not isinstance(obj, pd.DataFrame):
+            raise ValueError(f"pickle contains a {type(obj).__name__}, not a DataFrame")
+        # Non-string column labels (e.g. integers) are not valid Parquet field names
+        obj.columns = [str(c) for c in obj.columns]
+        return pa.Table.from_pandas(obj, preserve_index=not isinstance(obj.index, pd.RangeIndex))
+    raise ValueError(f"unsupported format '{ext}'")
+
+
+def _open_csv(source_path: str, column_types: dict | None = None):
+    """Open a CSV/TSV file as a stream of record batches; column types are inferred from the first block."""
+    from pyarrow import csv
+
+    ext = os.path.splitext(source_path)[1].lower()
+    return csv.open_csv(
+        source_path,
+        read_options=csv.ReadOptions(block_size=_CSV_BLOCK_SIZE),
+        parse_options=csv.ParseOptions(delimiter=_TEXT_FORMATS[ext]),
+        convert_options=csv.ConvertOptions(column_types=column_types),
+    )
+
+
+def _widened_types(source_path: str) -> dict:
+    """Column types for a second pass over a CSV whose later rows did not fit the types of the first block.
+
+    Integer columns become float64 (decimals or missing values further down) and columns without any value in
+    the first block become strings.
+    """
+    import pyarrow as pa
+
+    schema = _open_csv(source_path).schema
+    types = {}
+    for field in schema:
+        if pa.types.is_integer(field.type):
+            types[field.name] = pa.float64()
+        elif pa.types.is_null(field.type):
+            types[field.name] = pa.string()
+    return types
+
+
+def _write_csv_parquet(source_path: str, out_path: str, row_group_size: int, compression: str, column_types=None):
+    """Stream a CSV/TSV file into a Parquet file, holding about one row group in memory at a time.
+
+    Returns:
+        ``(num_rows, schema)`` of the written file
+
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    reader = _open_csv(source_path, column_types)
+    num_rows, pending = 0, []
+    with pq.ParquetWriter(out_path, reader.schema, compression=compression) as writer:
+        for batch in reader:
+            pending.append(batch)
+            num_rows += batch.num_rows
+            # Gather batches into full row groups; a block of a wide table may hold only a few rows
+            buffered = pa.Table.from_batches(pending, schema=reader.schema)
+            full = buffered.num_rows - buffered.num_rows % row_group_size
+            if full:
+                writer.write_table(buffered.slice(0, full), row_group_size=row_group_size)
+                pending = buffered.slice(full).to_batches()
+        if pending or num_rows == 0:
+            writer.write_table(pa.Table.from_batches(pending, schema=reader.schema))
+    return num_rows, reader.schema
+
+
+def _schema_summary(schema) -> dict[str, str]:
+    return {field.name: str(field.type) for field in schema}
+
+
+def compact_file(data_lake_path: str, name: str, row_group_size: int = 128_000, compression: str = "zstd") -> dict:
+    """Convert one data lake file to Parquet under ``<data_lake_path>/_columnar``.
+
+    CSV/TSV files are streamed block by block into the Parquet writer, so tables larger than memory can be
+    compacted; pickles are loaded whole.
+
+    Args:
+        data_lake_path: Path to the data lake directory
+        name: File name of the source table (e.g. "DepMap_CRISPRGeneEffect.csv")
+        row_group_size: Rows per Parquet row group; smaller groups make row filters more selective
+        compression: Parquet compression codec
+
+    Returns:
+        The catalog entry for the compacted file
+
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    source_path = os.path.join(data_lake_path, name)
+    # Keep the source extension so that X.csv and X.tsv do not share a Parquet copy
+    rel_path = os.path.join(COLUMNAR_DIR_NAME, name + ".parquet")
+    out_path = os.path.join(data_lake_path, rel_path)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    try:
+        if os.path.splitext(source_path)[1].lower() in _TEXT_FORMATS:
+            try:
+                num_rows, schema = _write_csv_parquet(source_path, tmp_path, row_group_size, compression)
+            except pa.ArrowInvalid:
+                column_types = _widened_types(source_path)
+                num_rows, schema = _write_csv_parquet(source_path, tmp_path, row_group_size, compression, column_types)
+        else:
+            table = _read_source_table(source_path)
+            pq.write_table(table, tmp_path, row_group_size=row_group_size, compression=compression)
+            num_rows, schema = table.num_rows, table.schema
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return {
+        "path": rel_path,
+        "num_rows": num_rows,
+        "columns": _schema_summary(schema),
+        **_source_signature(source_path),
+    }
+
+
+def compact_data_lake(
+    data_lake_path: str,
+    names: list[str] | None = None,
+    min_size_mb: float = 0,
+    row_group_size: int = 128_000,
+    force: bool = False,
+) -> dict[str, dict]:
+    """Convert CSV/TSV/pickle tables in the data lake to typed, memory-mappable Parquet files.
+
+    Files whose compacted copy is up to date (same source size and mtime) are skipped, so this can be
+    re-run after new files were downloaded.
+
+    Args:
+        data_lake_path: Path to the data lake directory
+        names: Files to compact; defaults to every convertible file present in the directory
+        min_size_mb: Skip files smaller than this, since small tables parse quickly anyway
+        row_group_size: Rows per Parquet row group
+        force: Recompact files even if their compacted copy is up to date
+
+    Returns:
+        The updated catalog
+
+    """
+    _require_pyarrow()
+    catalog = load_catalog(data_lake_path)
+    if names is None:
+        names = sorted(os.listdir(data_lake_path))
+    for name in names:
+        ext = os.path.splitext(name)[1].lower()
+        source_path = os.path.join(data_lake_path, name)
+        if (ext not in _TEXT_FORMATS and ext not in _PICKLE_FORMATS) or not os.path.isfile(source_path):
+            continue
+        if os.path.getsize(source_path) < min_size_mb * 1e6:
+            continue
+        if not force and _is_fresh(catalog.get(name), source_path, data_lake_path):
+            continue
+        print(f"Compacting {name} to Parquet...")
+        try:
+            catalog[name] = compact_file(data_lake_path, name, row_group_size=row_group_size)
+        except Exception as e:
+            print(f"Warning: Could not compact {name}: {e}")
+            continue
+        _save_catalog(data_lake_path, catalog)
+    return catalog
+
+
+def _columnar_path(data_lake_path: str, name: str) -> str | None:
+    """Return the Parquet file to read for a data lake item, or None if it has no columnar form."""
+    if name.lower().endswith(".parquet"):
+        path = os.path.join(data_lake_path, name)
+        return path if os.path.exists(path) else None
+    entry = load_catalog(data_lake_path).get(name)
+    if _is_fresh(entry, os.path.join(data_lake_path, name), data_lake_path):
+        return os.path.join(data_lake_path, entry["path"])
+    return None
+
+
+def _read_selected(path: str, columns: list[str] | None = None, filters: list | None = None):
+    """Read the selected columns and rows of a Parquet, CSV/TSV or pickle file into a DataFrame."""
+    import pyarrow.parquet as pq
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return pq.read_table(path, columns=columns, filters=filters, memory_map=True).to_pandas()
+
+    expression = pq.filters_to_expression(filters) if filters else None
+    if ext in _TEXT_FORMATS:
+        import pyarrow.dataset as ds
+        from pyarrow import csv
+
+        fmt = ds.CsvFileFormat(parse_options=csv.ParseOptions(delimiter=_TEXT_FORMATS[ext]))
+        return ds.dataset(path, format=fmt).to_table(columns=columns, filter=expression).to_pandas()
+
+    table = _read_source_table(path)
+    if expression is not None:
+        table = table.filter(expression)
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def load_data_lake(
+    name: str,
+    columns: list[str] | None = None,
+    filters: list | None = None,
+    data_lake_path: str = "./data/biomni_data/data_lake",
+    cache: bool = False,
+):
+    """Load a data lake table, reading only the requested columns and matching rows.
+
+    Compacted and native Parquet files are memory-mapped and only the row groups that can match
+    ``filters`` are read. Files without a columnar copy fall back to a streaming CSV scan with the same
+    column and row selection.
+
+    Args:
+        name: File name as listed in the data lake (e.g. "DepMap_CRISPRGeneEffect.csv")
+        columns: Columns to load; defaults to all columns
+        filters: Row filters in pyarrow/DNF form, e.g. ``[("gene", "in", ["TP53", "EGFR"]), ("score", ">", 0.5)]``
+        data_lake_path: Path to the data lake directory
+        cache: Serve repeated loads of the same selection from the process-wide dataset cache
+
+    Returns:
+        pandas.DataFrame with the selected data
+
+    """
+    _require_pyarrow()
+
+    name = os.path.basename(name)
+    path = _columnar_path(data_lake_path, name) or os.path.join(data_lake_path, name)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Data lake file not found: {path}")
+    if cache:
+        from biomni.datalake.cache import get_dataset_cache
+
+        return get_dataset_cache().get_or_load(path, _read_selected, columns, filters)
+    return _read_selected(path, columns, filters)
+
+
+def describe_schema(data_lake_path: str, name: str, catalog: dict | None = None) -> str | None:
+    """Return a one-line column summary of a data lake table without loading its data.
+
+    Uses the compaction catalog, Parquet footers, or the header line of text files, in that order.
+    """
+    path = os.path.join(data_lake_path, name)
+    entry = (catalog if catalog is not None else load_catalog(data_lake_path)).get(name)
+    columns = None
+    if entry and _is_fresh(entry, path, data_lake_path):
+        columns = entry["columns"]
+    elif name.lower().endswith(".parquet") and os.path.exists(path):
+        try:
+            import pyarrow.parquet as pq
+
+            columns = _schema_summary(pq.read_schema(path))
+        except Exception:
+            return None
+    elif os.path.splitext(name)[1].lower() in _TEXT_FORMATS and os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                header = f.readline().rstrip("\r\n")
+        except OSError:
+            return None
+        delimiter = _TEXT_FORMATS[os.path.splitext(name)[1].lower()]
+        columns = dict.fromkeys(col.strip('"') for col in header.split(delimiter))
+    if not columns:
+        return None
+
+    shown = [f"{col} ({dtype})" if dtype else col for col, dtype in list(columns.items())[:_MAX_ANNOTATED_COLUMNS]]
+    summary = ", ".join(shown)
+    if len(columns) > _MAX_ANNOTATED_COLUMNS:
+        summary += f", ... ({len(columns)} columns total)"
+    return f"Columns: {summary}"
+
+
+def annotate_data_lake_dict(data_lake_dict: dict[str, str], data_lake_path: str) -> dict[str, str]:
+    """Return a copy of ``data_lake_dict`` with each description followed by the table's columns.
+
+    Files that are not present locally (e.g. not yet fetched by a lazy data lake) keep their description.
+    """
+    catalog = load_catalog(data_lake_path)
+    annotated = {}
+    for name, description in data_lake_dict.items():
+        schema = describe_schema(data_lake_path, name, catalog)
+        annotated[name] = f"{description} {schema}" if schema else description
+    return annotated
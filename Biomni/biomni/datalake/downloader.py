@@ -0,0 +1,346 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import unquote, urljoin, urlparse
+
+import requests
+import tqdm
+from requests.adapters import HTTPAdapter
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(source: str | dict | None) -> dict[str, dict]:
+    """Load an integrity manifest mapping file names to ``{"size": int, "sha256": str}``.
+
+    Args:
+        source: A dictionary, a local path, or an http(s)/file URL to a JSON manifest. The JSON may
+                either be the mapping itself or have it under a ``"files"`` key.
+
+    Returns:
+        The file mapping, or an empty dictionary if no manifest is available
+
+    """
+    if source is None:
+        return {}
+    if isinstance(source, dict):
+        data = source
+    else:
+        parsed = urlparse(source)
+        try:
+            if parsed.scheme in ("http", "https"):
+                response = requests.get(source, timeout=30)
+                if response.status_code in (403, 404):
+                    # S3 answers 403 for missing keys in buckets without list permission
+                    return {}
+                response.raise_for_status()
+                data = response.json()
+            else:
+                path = unquote(parsed.path) if parsed.scheme == "file" else source
+                if not os.path.exists(path):
+                    return {}
+                with open(path) as f:
+                    data = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load manifest from {source}: {e}")
+            return {}
+    return data.get("files", data)
+
+
+class DataLakeDownloader:
+    """Parallel, resumable downloader for data lake files.
+
+    Files are fetched by a bounded pool of worker threads into ``<name>.part`` files and resumed with
+    HTTP Range requests if a transfer is interrupted. Completed files are checked against the size and
+    SHA-256 listed in an optional manifest before being moved into place. The source can be an
+    http(s) base URL, a ``file://`` URL, or a local mirror directory, so it can be exercised offline.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        dest_dir: str,
+        folder: str = "data_lake",
+        max_workers: int = 8,
+        chunk_size: int = 1 << 20,
+        manifest: str | dict | None = None,
+        retries: int = 3,
+        timeout: float = 60,
+        mirror_dir: str | None = None,
+        show_progress: bool = True,
+    ):
+        """Initialize the downloader.
+
+        Args:
+            base_url: Base URL of the bucket (e.g. "https://biomni-release.s3.amazonaws.com") or a file:// URL
+            dest_dir: Local directory the files are written to
+            folder: Folder under ``base_url`` that holds the files
+            max_workers: Maximum number of concurrent transfers
+            chunk_size: Read/write buffer size in bytes
+            manifest: Integrity manifest (see ``load_manifest``); defaults to ``<folder>/manifest.json`` at the source
+            retries: Attempts per file before giving up; each retry resumes the partial file
+            timeout: Connect/read timeout in seconds for HTTP transfers
+            mirror_dir: Local directory to copy files from instead of downloading them
+            show_progress: Whether to show an aggregate progress bar
+
+        """
+        self.base_url = base_url.rstrip("/")
+        self.dest_dir = dest_dir
+        self.folder = folder
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.timeout = timeout
+        self.mirror_dir = mirror_dir
+        self.show_progress = show_progress
+
+        self._manifest_source = manifest
+        self._manifest = None
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pbar = None
+        self._reset_report()
+
+    @property
+    def manifest(self) -> dict[str, dict]:
+        # Loaded on first use so that a warm start with every file present makes no request
+        if self._manifest is None:
+            source = self._manifest_source
+            self._manifest = load_manifest(source if source is not None else self.source_for(MANIFEST_NAME))
+        return self._manifest
+
+    def _reset_report(self):
+        self._report = {
+            "files_total": 0,
+            "files_downloaded": 0,
+            "files_skipped": 0,
+            "files_failed": 0,
+            "files_resumed": 0,
+            "bytes_downloaded": 0,
+            "elapsed_seconds": 0.0,
+            "failures": {},
+        }
+
+    def source_for(self, filename: str) -> str:
+        """Return the URL or local path a file is fetched from."""
+        if self.mirror_dir:
+            return os.path.join(self.mirror_dir, filename)
+        prefix = f"{self.base_url}/{self.folder}/" if self.folder else f"{self.base_url}/"
+        return urljoin(prefix, filename)
+
+    def _session(self) -> requests.Session:
+        # One keep-alive session per worker thread
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _progress(self, nbytes: int):
+        with self._lock:
+            self._report["bytes_downloaded"] += nbytes
+            if self._pbar is not None:
+                self._pbar.update(nbytes)
+
+    def _add_expected_bytes(self, nbytes: int):
+        with self._lock:
+            if self._pbar is not None and nbytes > 0:
+                self._pbar.total = (self._pbar.total or 0) + nbytes
+                self._pbar.refresh()
+
+    def _fetch_local(self, source: str, part_path: str) -> None:
+        """Copy from a local path or file:// URL, resuming from the current size of the partial file."""
+        parsed = urlparse(source)
+        path = unquote(parsed.path) if parsed.scheme == "file" else source
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        total = os.path.getsize(path)
+        if offset > total:
+            offset = 0
+        self._add_expected_bytes(total - offset)
+        with open(path, "rb") as src, open(part_path, "r+b" if offset else "wb") as dst:
+            src.seek(offset)
+            dst.seek(offset)
+            dst.truncate()
+            for chunk in iter(lambda: src.read(self.chunk_size), b""):
+                dst.write(chunk)
+                self._progress(len(chunk))
+
+    def _fetch_http(self, url: str, part_path: str) -> None:
+        """Download over HTTP, resuming an existing partial file with a Range request."""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with self._session().get(url, stream=True, headers=headers, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # Requested range not satisfiable: the partial file is already complete
+                return
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # The server ignored the Range header; start over
+                offset = 0
+            self._add_expected_bytes(int(response.headers.get("content-length", 0)))
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        self._progress(len(chunk))
+
+    def _verify(self, filename: str, path: str) -> None:
+        expected = self.manifest.get(filename)
+        if not expected:
+            return
+        if "size" in expected and os.path.getsize(path) != int(expected["size"]):
+            raise ValueError(f"size mismatch: expected {expected['size']} bytes, got {os.path.getsize(path)}")
+        if expected.get("sha256") and file_sha256(path, self.chunk_size) != expected["sha256"]:
+            raise ValueError("sha256 mismatch")
+
+    def fetch(self, filename: str, dest_path: str | None = None, source: str | None = None) -> bool:
+        """Fetch one file into place, resuming and retrying as needed.
+
+        Returns:
+            True if the file was downloaded and verified, False otherwise
+
+        """
+        dest_path = dest_path or os.path.join(self.dest_dir, filename)
+        source = source or self.source_for(filename)
+        part_path = dest_path + ".part"
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+
+        if os.path.exists(part_path):
+            with self._lock:
+                self._report["files_resumed"] += 1
+
+        last_error = None
+        for attempt in range(self.retries):
+            try:
+                if urlparse(source).scheme in ("http", "https"):
+                    self._fetch_http(source, part_path)
+                else:
+                    self._fetch_local(source, part_path)
+                try:
+                    self._verify(filename, part_path)
+                except ValueError:
+                    # A corrupt partial file cannot be resumed
+                    os.remove(part_path)
+                    raise
+                os.replace(part_path, dest_path)
+                return True
+            except Exception as e:
+                last_error = e
+                if attempt < self.retries - 1:
+                    time.sleep(min(2**attempt, 30))
+
+        print(f"✗ Failed to download {filename}: {last_error}")
+        with self._lock:
+            self._report["failures"][filename] = str(last_error)
+        return False
+
+    def is_complete(self, filename: str) -> bool:
+        """Check whether a file is already in place. Partial transfers only ever live in ``.part`` files."""
+        return os.path.exists(os.path.join(self.dest_dir, filename))
+
+    def download(self, filenames: list[str]) -> dict[str, bool]:
+        """Download all missing files concurrently.
+
+        Args:
+            filenames: File names relative to the source folder
+
+        Returns:
+            Dictionary mapping file names to download success status
+
+        """
+        os.makedirs(self.dest_dir, exist_ok=True)
+        self._reset_report()
+        self._report["files_total"] = len(filenames)
+        results = {}
+        missing = []
+        for filename in filenames:
+            if self.is_complete(filename):
+                results[filename] = True
+                self._report["files_skipped"] += 1
+            else:
+                missing.append(filename)
+
+        if not missing:
+            return results
+
+        # Load the manifest once, before the workers need it
+        _ = self.manifest
+        print(f"Downloading {len(missing)} file(s) with {min(self.max_workers, len(missing))} worker(s)...")
+        start = time.perf_counter()
+        self._pbar = (
+            tqdm.tqdm(total=0, unit="B", unit_scale=True, desc="Data lake", ncols=80) if self.show_progress else None
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(missing)))) as executor:
+                futures = {executor.submit(self.fetch, filename): filename for filename in missing}
+                for future in as_completed(futures):
+                    filename = futures[future]
+                    ok = future.result()
+                    results[filename] = ok
+                    with self._lock:
+                        self._report["files_downloaded" if ok else "files_failed"] += 1
+        finally:
+            if self._pbar is not None:
+                self._pbar.close()
+                self._pbar = None
+            self._report["elapsed_seconds"] = time.perf_counter() - start
+        results = {filename: results[filename] for filename in filenames}
+
+        report = self.report()
+        print(
+            f"✓ Downloaded {report['files_downloaded']}/{len(missing)} file(s), "
+            f"{report['bytes_downloaded'] / 1e6:.1f} MB in {report['elapsed_seconds']:.1f}s "
+            f"({report['throughput_mb_per_s']:.1f} MB/s)"
+        )
+        return results
+
+    def report(self) -> dict:
+        """Return aggregate progress and throughput of the last ``download`` call."""
+        with self._lock:
+            report = dict(self._report)
+            report["failures"] = dict(self._report["failures"])
+        elapsed = report["elapsed_seconds"]
+        report["throughput_mb_per_s"] = report["bytes_downloaded"] / 1e6 / elapsed if elapsed else 0.0
+        return report
+
+
+def write_manifest(directory: str, filenames: list[str] | None = None, path: str | None = None) -> dict:
+    """Compute sizes and SHA-256 checksums of files in a directory and write them as a manifest.
+
+    Args:
+        directory: Directory containing the files (e.g. a data lake mirror)
+        filenames: Files to include; defaults to every regular file in the directory
+        path: Where to write the manifest; defaults to ``<directory>/manifest.json``
+
+    Returns:
+        The manifest mapping
+
+    """
+    if filenames is None:
+        filenames = sorted(
+            f
+            for f in os.listdir(directory)
+            if os.path.isfile(os.path.join(directory, f)) and f != MANIFEST_NAME and not f.endswith(".part")
+        )
+    files = {}
+    for filename in filenames:
+        file_path = os.path.join(directory, filename)
+        files[filename] = {"size": os.path.getsize(file_path), "sha256": file_sha256(file_path)}
+    with open(path or os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump({"files": files}, f, indent=2)
+    return files
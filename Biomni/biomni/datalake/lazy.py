@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from biomni.datalake.downloader import DataLakeDownloader
+
+ACCESS_LOG_NAME = ".access_log.json"
+
+
+class LazyDataLake:
+    """Materialize data lake files on first access instead of downloading everything up front.
+
+    The agent starts with only the list of known files (e.g. the keys of ``data_lake_dict``). A file is
+    fetched the first time it is requested through ``path``, referenced in code passed to
+    ``materialize_referenced``, or scheduled with ``prefetch``. An optional disk quota is enforced by
+    evicting the least recently used files.
+
+    Access times are persisted in ``.access_log.json`` in the cache directory so the LRU order survives
+    restarts. The log is rewritten at most every ``access_log_interval`` seconds while files are used, and
+    once more on ``shutdown`` or when the object is garbage collected or the interpreter exits.
+    """
+
+    def __init__(
+        self,
+        local_dir: str,
+        downloader: DataLakeDownloader,
+        files: list[str],
+        quota_bytes: int | None = None,
+        prefetch_workers: int = 2,
+        access_log_interval: float = 30.0,
+    ):
+        """Initialize the lazy data lake.
+
+        Args:
+            local_dir: Local cache directory (the regular data lake directory)
+            downloader: Downloader used to fetch missing files
+            files: Names of all files that can be materialized
+            quota_bytes: Maximum total size of cached data lake files, or None for no limit
+            prefetch_workers: Number of background threads used for prefetching
+            access_log_interval: Minimum number of seconds between two writes of the access log
+
+        """
+        self.local_dir = local_dir
+        self.downloader = downloader
+        self.files = list(files)
+        self._known = set(self.files)
+        self.quota_bytes = quota_bytes
+        self._lock = threading.Lock()
+        self._file_locks: dict[str, threading.Lock] = {}
+        self._in_use: set[str] = set()
+        self._pinned: set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="biomni-prefetch")
+        self._access_log_path = os.path.join(local_dir, ACCESS_LOG_NAME)
+        self._last_access = self._read_access_log()
+        self.access_log_interval = access_log_interval
+        self._access_log_written = time.monotonic()
+        self.stats = {
+            "hits": 0,
+            "fetches": 0,
+            "failed_fetches": 0,
+            "bytes_fetched": 0,
+            "evictions": 0,
+            "bytes_evicted": 0,
+        }
+        os.makedirs(local_dir, exist_ok=True)
+        # The finalizer holds the log path and dict but not self, so it runs on collection and at exit
+        self._finalizer = weakref.finalize(
+            self, _write_access_log, self._access_log_path, self._last_access, self._lock
+        )
+
+    def _read_access_log(self) -> dict[str, float]:
+        try:
+            with open(self._access_log_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_access_log(self):
+        _write_access_log(self._access_log_path, self._last_access, self._lock)
+        self._access_log_written = time.monotonic()
+
+    def _record_access(self, name: str):
+        with self._lock:
+            self._last_access[name] = time.time()
+        if time.monotonic() - self._access_log_written >= self.access_log_interval:
+            self._write_access_log()
+
+    def _file_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._file_locks.setdefault(name, threading.Lock())
+
+    def local_path(self, name: str) -> str:
+        return os.path.join(self.local_dir, name)
+
+    def is_cached(self, name: str) -> bool:
+        return os.path.exists(self.local_path(name))
+
+    def path(self, name: str) -> str:
+        """Return the local path of a data lake file, fetching it first if it is not cached yet.
+
+        Args:
+            name: File name as listed in the data lake (e.g. "DepMap_CRISPRGeneEffect.csv")
+
+        Returns:
+            The local path of the file
+
+        """
+        name = os.path.basename(name)
+        if name not in self._known and not self.is_cached(name):
+            raise FileNotFoundError(f"'{name}' is not a known data lake file")
+        with self._file_lock(name):
+            with self._lock:
+                self._in_use.add(name)
+            try:
+                if self.is_cached(name):
+                    self.stats["hits"] += 1
+                else:
+                    print(f"Fetching data lake file {name}...")
+                    if not self.downloader.fetch(name, dest_path=self.local_path(name)):
+                        self.stats["failed_fetches"] += 1
+                        raise FileNotFoundError(f"Failed to fetch data lake file '{name}'")
+                    self.stats["fetches"] += 1
+                    self.stats["bytes_fetched"] += os.path.getsize(self.local_path(name))
+                self._record_access(name)
+                self._enforce_quota(keep=name)
+            finally:
+                with self._lock:
+                    self._in_use.discard(name)
+        return self.local_path(name)
+
+    def prefetch(self, names: list[str]) -> None:
+        """Fetch files in the background. Later calls to ``path`` wait for an in-flight prefetch."""
+        for name in names:
+            name = os.path.basename(name)
+            if name in self._known and not self.is_cached(name):
+                self._executor.submit(self._prefetch_one, name)
+
+    def _prefetch_one(self, name: str):
+        try:
+            self.path(name)
+        except Exception as e:
+            print(f"Warning: Prefetch of {name} failed: {e}")
+
+    def referenced_files(self, text: str) -> list[str]:
+        """Return the known data lake files whose names appear in a piece of code or text."""
+        return [name for name in self.files if name in text]
+
+    def materialize_referenced(self, code: str) -> list[str]:
+        """Fetch every known data lake file referenced by name in ``code`` before it runs.
+
+        Returns:
+            The local paths of the referenced files
+
+        """
+        names = self.referenced_files(code)
+        # Keep the whole batch on disk even if it exceeds the quota, so earlier files are not evicted
+        with self._lock:
+            self._pinned.update(names)
+        try:
+            return [self.path(name) for name in names]
+        finally:
+            with self._lock:
+                self._pinned.difference_update(names)
+
+    def cached_bytes(self) -> int:
+        total = 0
+        for name in self.files:
+            path = self.local_path(name)
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+        return total
+
+    def _enforce_quota(self, keep: str | None = None):
+        """Evict least recently used files until the cache fits in the quota."""
+        if self.quota_bytes is None:
+            return
+        sizes = {name: os.path.getsize(self.local_path(name)) for name in self.files if self.is_cached(name)}
+        total = sum(sizes.values())
+        if total <= self.quota_bytes:
+            return
+        with self._lock:
+            protected = self._in_use | self._pinned | {keep}
+            last_access = dict(self._last_access)
+        candidates = sorted((n for n in sizes if n not in protected), key=lambda n: last_access.get(n, 0.0))
+        for name in candidates:
+            if total <= self.quota_bytes:
+                break
+            try:
+                os.remove(self.local_path(name))
+            except OSError:
+                continue
+            total -= sizes[name]
+            with self._lock:
+                self._last_access.pop(name, None)
+            self.stats["evictions"] += 1
+            self.stats["bytes_evicted"] += sizes[name]
+            print(f"Evicted data lake file {name} to stay within the disk quota")
+        self._write_access_log()
+
+    def get_stats(self) -> dict:
+        stats = dict(self.stats)
+        stats["cached_files"] = sum(1 for name in self.files if self.is_cached(name))
+        stats["cached_bytes"] = self.cached_bytes()
+        stats["quota_bytes"] = self.quota_bytes
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._finalizer()
+
+
+def _write_access_log(path: str, last_access: dict[str, float], lock: threading.Lock):
+    with lock:
+        data = dict(last_access)
+    try:
+        with open(path, "w") as f:
+            json.dump(data, f)
+    except OSError:
+        pass
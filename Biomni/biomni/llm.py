@@ -6,6 +6,7 @@ from langchain_anthropic import ChatAnthropic
 
 # from langchain_aws import ChatBedrock
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_ollama import ChatOllama
 from langchain_openai import AzureChatOpenAI, ChatOpenAI
@@ -146,3 +147,72 @@ def get_llm(
         raise ValueError(
             f"Invalid source: {source}. Valid options are 'OpenAI', 'AzureOpenAI', 'Anthropic', 'Gemini', 'Groq', 'Bedrock', or 'Ollama'"
         )
+
+
+def prompt_cache_style(llm: BaseChatModel) -> str | None:
+    """Return how a model's provider caches prompt prefixes.
+
+    Returns:
+        "explicit" for Anthropic (cache_control breakpoints), "automatic" for OpenAI-compatible APIs
+        (prefixes of 1024+ tokens are cached without markup), or None if unknown
+
+    """
+    if isinstance(llm, ChatAnthropic):
+        return "explicit"
+    if isinstance(llm, ChatOpenAI | AzureChatOpenAI):
+        return "automatic"
+    return None
+
+
+def _with_cache_control(message: BaseMessage) -> BaseMessage:
+    """Return a copy of a message whose last content block is marked as a cache breakpoint."""
+    content = message.content
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}] if content else []
+    else:
+        blocks = [dict(b) if isinstance(b, dict) else {"type": "text", "text": str(b)} for b in content]
+    if not blocks:
+        return message
+    blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    return message.model_copy(update={"content": blocks})
+
+
+def apply_prompt_caching(
+    messages: list[BaseMessage], llm: BaseChatModel, stable_prefix: str | None = None
+) -> list[BaseMessage]:
+    """Mark cache breakpoints on a prompt for providers that need them.
+
+    For Anthropic models the system prompt is split into the byte-stable ``stable_prefix`` (shared across
+    queries) and the rest (shared by every step of one query), each ending in a breakpoint, and the last
+    message gets a third breakpoint so the next step reuses the conversation so far. Other providers get the
+    messages unchanged; OpenAI caches identical prompt prefixes automatically.
+    """
+    if prompt_cache_style(llm) != "explicit" or not messages:
+        return messages
+    messages = list(messages)
+    system = messages[0]
+    if isinstance(system, SystemMessage) and isinstance(system.content, str):
+        text = system.content
+        if stable_prefix and text.startswith(stable_prefix) and len(text) > len(stable_prefix):
+            blocks = [
+                {"type": "text", "text": stable_prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": text[len(stable_prefix) :], "cache_control": {"type": "ephemeral"}},
+            ]
+            messages[0] = SystemMessage(content=blocks)
+        else:
+            messages[0] = _with_cache_control(system)
+    if len(messages) > 1:
+        messages[-1] = _with_cache_control(messages[-1])
+    return messages
+
+
+def cache_usage(response) -> dict:
+    """Return the input, cached and cache-write token counts reported with an LLM response."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return {
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+        "cache_read_tokens": details.get("cache_read", 0) or 0,
+        "cache_write_tokens": details.get("cache_creation", 0) or 0,
+    }
@@ -0,0 +1,290 @@
+import hashlib
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def resource_name(resource) -> str:
+    """Return the name of a tool, data lake item or library in any of the formats used by the agent."""
+    if isinstance(resource, dict):
+        return str(resource.get("name", ""))
+    if isinstance(resource, str):
+        return resource.split(": ")[0]
+    return str(getattr(resource, "name", resource))
+
+
+def resource_text(resource) -> str:
+    """Build the text that is embedded for a resource: name, description and parameter descriptions."""
+    if isinstance(resource, str):
+        return resource
+    if isinstance(resource, dict):
+        get = resource.get
+    else:
+
+        def get(key, default=None):
+            return getattr(resource, key, default)
+
+    parts = [str(get("name", "") or ""), str(get("description", "") or "")]
+    for key in ("required_parameters", "optional_parameters"):
+        for param in get(key, None) or []:
+            if isinstance(param, dict):
+                parts.append(f"{param.get('name', '')}: {param.get('description', '')}")
+    return "\n".join(p for p in parts if p)
+
+
+class HashingTfidfEmbedder:
+    """Offline, dependency-free embedder using hashed word uni/bigrams weighted by TF-IDF.
+
+    Tokens are hashed into a fixed number of buckets with a stable hash (CRC32), so vectors are
+    reproducible across processes without storing a vocabulary. IDF weights are learned in ``fit``.
+    """
+
+    name = "hashing-tfidf"
+
+    def __init__(self, n_features: int = 4096, ngram_range: tuple[int, int] = (1, 2)):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.idf = np.ones(n_features, dtype=np.float32)
+
+    def _tokens(self, text: str) -> list[str]:
+        words = _TOKEN_PATTERN.findall(text.lower())
+        tokens = []
+        lo, hi = self.ngram_range
+        for n in range(lo, hi + 1):
+            tokens.extend(" ".join(words[i : i + n]) for i in range(len(words) - n + 1))
+        return tokens
+
+    def _term_counts(self, texts: list[str]) -> np.ndarray:
+        counts = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in self._tokens(text):
+                h = zlib.crc32(token.encode("utf-8"))
+                # The sign bit reduces the bias introduced by hash collisions
+                counts[row, h % self.n_features] += 1.0 if (h >> 31) & 1 else -1.0
+        return counts
+
+    def fit(self, texts: list[str]) -> "HashingTfidfEmbedder":
+        counts = self._term_counts(texts)
+        df = np.count_nonzero(counts, axis=0).astype(np.float32)
+        self.idf = (np.log((1.0 + len(texts)) / (1.0 + df)) + 1.0).astype(np.float32)
+        return self
+
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        counts = self._term_counts(texts)
+        # Sublinear term frequency, keeping the sign of the hashed bucket
+        weighted = np.sign(counts) * np.log1p(np.abs(counts)) * self.idf
+        return _normalize(weighted)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embed_documents([text])[0]
+
+    def get_state(self) -> dict:
+        return {"n_features": self.n_features, "ngram_range": list(self.ngram_range), "idf": self.idf}
+
+    def set_state(self, state: dict) -> None:
+        self.n_features = int(state["n_features"])
+        self.ngram_range = tuple(state["ngram_range"])
+        self.idf = np.asarray(state["idf"], dtype=np.float32)
+
+
+class LangChainEmbedder:
+    """Adapter for any LangChain ``Embeddings`` object (e.g. ``OpenAIEmbeddings``)."""
+
+    def __init__(self, embeddings, name: str | None = None):
+        self.embeddings = embeddings
+        self.name = name or f"langchain:{type(embeddings).__name__}:{getattr(embeddings, 'model', '')}"
+
+    def fit(self, texts: list[str]) -> "LangChainEmbedder":
+        return self
+
+    def embed_documents(self, texts: list[str]) -> np.ndarray:
+        return _normalize(np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32))
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return _normalize(np.asarray([self.embeddings.embed_query(text)], dtype=np.float32))[0]
+
+    def get_state(self) -> dict:
+        return {}
+
+    def set_state(self, state: dict) -> None:
+        pass
+
+
+def index_dir_name(embedder) -> str:
+    """Return a directory name for the index of an embedder, so indexes of different embedders do not collide."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", embedder.name).strip("-") or "index"
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ResourceIndex:
+    """On-disk NumPy vector index over tools, data lake items and software libraries.
+
+    The index is stored as a directory with ``vectors.npy`` (memory-mapped on load), ``meta.json``
+    and, for stateful embedders, ``embedder_state.npz``. Entries are keyed by category and name and
+    carry a fingerprint of their text, so only new or changed resources are re-embedded.
+    """
+
+    CATEGORIES = ("tools", "data_lake", "libraries")
+
+    def __init__(self, embedder=None, path: str | None = None):
+        self.embedder = embedder or HashingTfidfEmbedder()
+        self.path = path
+        self.entries: list[tuple[str, str, str]] = []  # (category, name, fingerprint)
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self._positions: dict[tuple[str, str], int] = {}
+
+    @classmethod
+    def from_sources(cls, document_df, data_lake_dict: dict, library_content_dict: dict, embedder=None, path=None):
+        """Build an index from the tool registry's ``document_df`` and the data lake / library dictionaries."""
+        resources = {
+            "tools": list(document_df["document_content"]),
+            "data_lake": [{"name": k, "description": v} for k, v in data_lake_dict.items()],
+            "libraries": [{"name": k, "description": v} for k, v in library_content_dict.items()],
+        }
+        index = cls(embedder=embedder, path=path)
+        index.build(resources)
+        return index
+
+    def build(self, resources: dict) -> "ResourceIndex":
+        """(Re)build the whole index, refitting the embedder on the full corpus."""
+        entries, texts = self._collect(resources)
+        self.embedder.fit(texts)
+        self.entries = entries
+        self.vectors = self.embedder.embed_documents(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+        self._reindex()
+        if self.path:
+            self.save(self.path)
+        return self
+
+    def sync(self, resources: dict) -> int:
+        """Embed resources that are missing from the index or whose text changed.
+
+        Returns:
+            Number of entries that were (re-)embedded
+
+        """
+        entries, texts = self._collect(resources)
+        stale = [i for i, e in enumerate(entries) if self._positions.get(e[:2]) is None or self._stale(e)]
+        if not stale:
+            return 0
+        if not self.entries:
+            self.build(resources)
+            return len(entries)
+
+        new_vectors = self.embedder.embed_documents([texts[i] for i in stale])
+        vectors = np.array(self.vectors, dtype=np.float32)
+        appended = []
+        for row, i in enumerate(stale):
+            pos = self._positions.get(entries[i][:2])
+            if pos is None:
+                appended.append(new_vectors[row])
+                self.entries.append(entries[i])
+            else:
+                vectors[pos] = new_vectors[row]
+                self.entries[pos] = entries[i]
+        if appended:
+            vectors = np.vstack([vectors, np.stack(appended)])
+        self.vectors = vectors
+        self._reindex()
+        if self.path:
+            self.save(self.path)
+        return len(stale)
+
+    def _stale(self, entry: tuple[str, str, str]) -> bool:
+        return self.entries[self._positions[entry[:2]]][2] != entry[2]
+
+    def _collect(self, resources: dict) -> tuple[list[tuple[str, str, str]], list[str]]:
+        entries, texts, seen = [], [], set()
+        for category in self.CATEGORIES:
+            for resource in resources.get(category, []):
+                name = resource_name(resource)
+                if not name or (category, name) in seen:
+                    continue
+                seen.add((category, name))
+                text = resource_text(resource)
+                entries.append((category, name, _fingerprint(text)))
+                texts.append(text)
+        return entries, texts
+
+    def _reindex(self):
+        self._positions = {(c, n): i for i, (c, n, _) in enumerate(self.entries)}
+
+    def search(self, query: str, category: str, top_k: int, names: set[str] | None = None) -> list[tuple[str, float]]:
+        """Return the ``top_k`` most similar entries of a category as ``(name, score)`` pairs.
+
+        Args:
+            query: The user's query
+            category: One of ``tools``, ``data_lake`` or ``libraries``
+            top_k: Number of entries to return
+            names: If given, restrict the search to entries with these names
+
+        """
+        rows = [i for i, (c, n, _) in enumerate(self.entries) if c == category and (names is None or n in names)]
+        if not rows or top_k <= 0:
+            return []
+        q = self.embedder.embed_query(query)
+        scores = np.asarray(self.vectors[rows]) @ q
+        k = min(top_k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.entries[rows[i]][1], float(scores[i])) for i in best]
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), np.asarray(self.vectors, dtype=np.float32))
+        state = self.embedder.get_state()
+        arrays = {k: v for k, v in state.items() if isinstance(v, np.ndarray)}
+        if arrays:
+            np.savez(os.path.join(path, "embedder_state.npz"), **arrays)
+        meta = {
+            "format_version": 1,
+            "embedder": self.embedder.name,
+            "embedder_state": {k: v for k, v in state.items() if k not in arrays},
+            "entries": self.entries,
+        }
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, embedder=None) -> "ResourceIndex":
+        """Load an index saved with ``save``. The vectors are memory-mapped read-only."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        index = cls(embedder=embedder, path=path)
+        if meta.get("embedder") != index.embedder.name:
+            raise ValueError(f"Index at {path} was built with '{meta.get('embedder')}', not '{index.embedder.name}'")
+        state = dict(meta.get("embedder_state", {}))
+        state_path = os.path.join(path, "embedder_state.npz")
+        if os.path.exists(state_path):
+            with np.load(state_path) as arrays:
+                state.update({k: arrays[k] for k in arrays.files})
+        if state:
+            index.embedder.set_state(state)
+        index.entries = [tuple(e) for e in meta["entries"]]
+        index.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        index._reindex()
+        return index
+
+    @classmethod
+    def load_or_create(cls, path: str | None, embedder=None) -> "ResourceIndex":
+        """Load the index at ``path`` if it exists and matches the embedder, otherwise start an empty one."""
+        if path and os.path.exists(os.path.join(path, "meta.json")):
+            try:
+                return cls.load(path, embedder=embedder)
+            except Exception as e:
+                print(f"Warning: Could not load retriever index from {path}, rebuilding: {e}")
+        return cls(embedder=embedder, path=path)
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookups: lowercase, strip punctuation and collapse whitespace.
+
+    Every word is kept, since question words and conjunctions ("why", "how", "and", "or") change what is asked.
+    """
+    words = re.findall(r"[a-z0-9][a-z0-9_\-\.]*", query.lower())
+    return " ".join(w.strip(".") for w in words)
+
+
+def fingerprint_resources(resources: dict) -> str:
+    """Hash the names and descriptions of all registered tools, data lake items and libraries."""
+    h = hashlib.sha256()
+    for category in sorted(resources):
+        h.update(category.encode("utf-8"))
+        for item in resources[category]:
+            if isinstance(item, dict):
+                parts = (item.get("name", ""), item.get("description", ""), item.get("module", ""))
+            else:
+                parts = (getattr(item, "name", str(item)), getattr(item, "description", ""), "")
+            h.update(json.dumps(parts, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+class RetrievalCache:
+    """Thread-safe LRU cache with TTL for resource-selection results and their rendered system prompts."""
+
+    def __init__(self, max_size: int = 128, ttl_seconds: float | None = 3600):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached selections before the least recently used one is evicted
+            ttl_seconds: Lifetime of an entry in seconds, or None for no expiry
+
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, resources_fingerprint: str, *extra) -> str:
+        """Build a cache key from the normalized query, the resource fingerprint and any extra settings."""
+        payload = json.dumps([normalize_query(query), resources_fingerprint, *extra], default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached value for a key, or None on a miss or if the entry expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and time.time() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries, e.g. after the set of registered resources changed."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
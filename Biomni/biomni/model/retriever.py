@@ -8,8 +8,96 @@ from langchain_openai import ChatOpenAI
 class ToolRetriever:
     """Retrieve tools from the tool registry."""
 
-    def __init__(self):
-        pass
+    DEFAULT_TOP_K = {"tools": 30, "data_lake": 10, "libraries": 20}
+
+    def __init__(self, mode: str = "prompt", index_path: str | None = None, embedder=None, top_k: dict | None = None):
+        """Initialize the retriever.
+
+        Args:
+            mode: "prompt" sends every resource to the LLM, "embedding" does a local vector top-k search,
+                  "embedding_rerank" does the vector search and lets the LLM select from the shortlist
+            index_path: Directory of the on-disk vector index used by the embedding modes
+            embedder: Embedder for the embedding modes (defaults to the offline HashingTfidfEmbedder)
+            top_k: Number of candidates per category for the embedding modes, e.g. {"tools": 30}
+
+        """
+        if mode not in ("prompt", "embedding", "embedding_rerank"):
+            raise ValueError(
+                f"Invalid retrieval mode: {mode}. Valid options are 'prompt', 'embedding', 'embedding_rerank'"
+            )
+        self.mode = mode
+        self.index_path = index_path
+        self.embedder = embedder
+        self.top_k = {**self.DEFAULT_TOP_K, **(top_k or {})}
+        self._index = None
+
+    def retrieve(self, query: str, resources: dict, llm=None) -> dict:
+        """Select the most relevant resources for a query using the configured mode."""
+        if self.mode == "prompt":
+            return self.prompt_based_retrieval(query, resources, llm=llm)
+        return self.embedding_based_retrieval(query, resources, llm=llm, rerank=self.mode == "embedding_rerank")
+
+    def get_index(self):
+        """Return the vector index, loading it from ``index_path`` on first use."""
+        if self._index is None:
+            from biomni.model.embedding import ResourceIndex
+
+            self._index = ResourceIndex.load_or_create(self.index_path, embedder=self.embedder)
+        return self._index
+
+    def build_index(self, document_df, data_lake_dict: dict, library_content_dict: dict, force: bool = False):
+        """Embed the tool registry, data lake and library descriptions into the vector index once.
+
+        Args:
+            document_df: The tool registry's document dataframe
+            data_lake_dict: Data lake file names mapped to descriptions
+            library_content_dict: Library names mapped to descriptions
+            force: Rebuild even if an index already exists at ``index_path``
+
+        """
+        from biomni.model.embedding import ResourceIndex
+
+        index = self.get_index()
+        if index.entries and not force:
+            return index
+        print("Building retriever vector index...")
+        self._index = ResourceIndex.from_sources(
+            document_df, data_lake_dict, library_content_dict, embedder=index.embedder, path=self.index_path
+        )
+        return self._index
+
+    def embedding_based_retrieval(self, query: str, resources: dict, llm=None, rerank: bool = False) -> dict:
+        """Retrieve resources with a vectorized top-k similarity search over a precomputed index.
+
+        Resources missing from the index (e.g. custom tools added at runtime) are embedded incrementally.
+
+        Args:
+            query: The user's query
+            resources: A dictionary with keys 'tools', 'data_lake', and 'libraries'
+            llm: LLM used for the optional rerank step
+            rerank: If True, let the LLM select from the shortlist with the prompt-based method
+
+        Returns:
+            A dictionary with the same keys, but containing only the most relevant resources
+
+        """
+        from biomni.model.embedding import resource_name
+
+        index = self.get_index()
+        index.sync(resources)
+
+        shortlist = {}
+        for category in ("tools", "data_lake", "libraries"):
+            items = resources.get(category, [])
+            by_name = {}
+            for item in items:
+                by_name.setdefault(resource_name(item), item)
+            hits = index.search(query, category, self.top_k.get(category, 0), names=set(by_name))
+            shortlist[category] = [by_name[name] for name, _ in hits]
+
+        if rerank:
+            return self.prompt_based_retrieval(query, shortlist, llm=llm)
+        return shortlist
 
     def prompt_based_retrieval(self, query: str, resources: dict, llm=None) -> dict:
         """Use a prompt-based approach to retrieve the most relevant resources for a query.
@@ -0,0 +1,327 @@
+"""Offline latency benchmark for the database tools.
+
+Each case calls one tool from ``biomni.tool.database`` while its HTTP requests and query-translation LLM
+calls are recorded to, or replayed from, a cassette (see ``biomni.tool.cassette``). Cassettes are recorded
+once against the live services and then replayed locally with configurable injected latency, so pooling,
+caching and batching changes can be measured on every commit without network access.
+
+Benchmark numbers are only meaningful on cassettes recorded against the live services; cases without a
+recording in the cassette directory are reported as errors.
+
+Usage:
+    python -m biomni.tool.benchmark --mode record            # needs network access and an LLM API key
+    python -m biomni.tool.benchmark --latency-scale 1.0 --output after.json --baseline before.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from biomni.tool import response_cache
+from biomni.tool.cassette import CASSETTE_MODES, use_cassette
+
+DEFAULT_CASES = [
+    {
+        "name": "uniprot_entry",
+        "tool": "query_uniprot",
+        "kwargs": {"endpoint": "https://rest.uniprot.org/uniprotkb/P04637"},
+    },
+    {
+        "name": "uniprot_prompt",
+        "tool": "query_uniprot",
+        "kwargs": {"prompt": "Find the reviewed UniProt entry of human TP53"},
+    },
+    {
+        "name": "ensembl_lookup",
+        "tool": "query_ensembl",
+        "kwargs": {"endpoint": "https://rest.ensembl.org/lookup/symbol/homo_sapiens/BRCA2"},
+    },
+    {
+        "name": "kegg_prompt",
+        "tool": "query_kegg",
+        "kwargs": {"prompt": "Find the KEGG pathways that involve human TP53"},
+    },
+    {
+        "name": "reactome_prompt",
+        "tool": "query_reactome",
+        "kwargs": {"prompt": "Find the Reactome pathways that involve human TP53"},
+    },
+    {
+        "name": "clinvar_search",
+        "tool": "query_clinvar",
+        "kwargs": {"search_term": "BRCA1[gene] AND pathogenic[clinsig]", "max_results": 20},
+    },
+    {
+        "name": "gwas_prompt",
+        "tool": "query_gwas_catalog",
+        "kwargs": {"prompt": "Find GWAS associations for type 2 diabetes"},
+    },
+    {
+        "name": "batch_uniprot",
+        "tool": "batch_query_uniprot",
+        "kwargs": {"identifiers": ["P04637", "P38398", "P51587", "Q00987", "P00533", "P01116"]},
+    },
+    {
+        "name": "batch_ensembl",
+        "tool": "batch_query_ensembl",
+        "kwargs": {"identifiers": ["TP53", "BRCA1", "BRCA2", "EGFR", "KRAS", "MDM2"], "id_type": "symbol"},
+    },
+]
+
+
+def default_cassette_dir() -> str:
+    """Return ``$BIOMNI_CASSETTE_DIR`` or ``~/.cache/biomni/cassettes``."""
+    path = os.environ.get("BIOMNI_CASSETTE_DIR")
+    return path or os.path.join(os.path.expanduser("~"), ".cache", "biomni", "cassettes")
+
+
+@contextlib.contextmanager
+def _isolated_caches(directory: str, enabled: bool = True):
+    """Swap the process-wide response and translation caches for empty ones under ``directory``."""
+    mode = "read_write" if enabled else "off"
+    with response_cache._response_cache_lock:
+        previous = response_cache._response_cache, response_cache._translation_cache
+        response_cache._response_cache = response_cache.ResponseCache(
+            path=os.path.join(directory, "http_cache.sqlite"), mode=mode
+        )
+        response_cache._translation_cache = response_cache.ResponseCache(
+            path=os.path.join(directory, "query_translations.sqlite"),
+            mode=mode,
+            default_ttl=30 * response_cache.DAY,
+            stale_while_revalidate=False,
+        )
+    try:
+        yield response_cache._response_cache, response_cache._translation_cache
+    finally:
+        with response_cache._response_cache_lock:
+            response_cache._response_cache, response_cache._translation_cache = previous
+
+
+def _failed(result) -> str | None:
+    """Return the error reported by a tool result, if any."""
+    if isinstance(result, dict):
+        if result.get("success") is False or (result.get("error") and "success" not in result):
+            return str(result.get("error", "failed"))
+    elif isinstance(result, str) and result.startswith("Error"):
+        return result
+    return None
+
+
+def run_case(
+    case: dict,
+    cassette_dir: str,
+    mode: str = "replay",
+    repeat: int = 3,
+    latency: float = 0.0,
+    latency_scale: float = 1.0,
+    llm_latency: float = 0.0,
+    cache: bool = True,
+) -> list[dict]:
+    """Run one benchmark case ``repeat`` times against its cassette.
+
+    The first run starts with empty response and translation caches ("cold"); later runs reuse what the
+    earlier ones stored ("warm"), which measures how much the caches save.
+
+    Returns:
+        One row per run with wall time, HTTP and LLM time, request count, bytes received and cache hits
+
+    """
+    from biomni.tool import database
+
+    tool = getattr(database, case["tool"])
+    path = os.path.join(cassette_dir, f"{case['name']}.json")
+    if mode == "replay" and not os.path.exists(path):
+        return [{"case": case["name"], "run": 0, "error": f"No cassette at {path}; record it with --mode record"}]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as cache_dir, _isolated_caches(cache_dir, cache) as (responses, translations):
+        with use_cassette(path, mode, latency, latency_scale, llm_latency) as cassette:
+            for run in range(1 if mode == "record" else repeat):
+                cassette.rewind()
+                cassette.stats.reset()
+                before = (responses.hits + responses.stale_hits, translations.hits)
+                start = time.perf_counter()
+                try:
+                    error = _failed(tool(**case.get("kwargs", {})))
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                rows.append(
+                    {
+                        "case": case["name"],
+                        "tool": case["tool"],
+                        "run": run,
+                        "cache": "cold" if run == 0 or not cache else "warm",
+                        "seconds": round(time.perf_counter() - start, 4),
+                        **cassette.stats.summary(),
+                        "response_cache_hits": responses.hits + responses.stale_hits - before[0],
+                        "translation_cache_hits": translations.hits - before[1],
+                        "error": error,
+                    }
+                )
+    return rows
+
+
+def summarize_results(rows: list[dict]) -> pd.DataFrame:
+    """Aggregate per-run rows into one line per case: cold and warm latency, HTTP/LLM split and bytes."""
+    summary = []
+    for name, runs in pd.DataFrame(rows).groupby("case", sort=False):
+        cold = runs.iloc[0]
+        warm = runs[runs["cache"] == "warm"] if "cache" in runs else runs.iloc[0:0]
+        errors = runs["error"].dropna()
+        summary.append(
+            {
+                "case": name,
+                "cold_seconds": cold.get("seconds"),
+                "warm_seconds": statistics.median(warm["seconds"]) if len(warm) else None,
+                "http_seconds": cold.get("http_seconds"),
+                "llm_seconds": cold.get("llm_seconds"),
+                "http_requests": cold.get("http_requests"),
+                "http_bytes": cold.get("http_bytes"),
+                "warm_http_requests": statistics.median(warm["http_requests"]) if len(warm) else None,
+                "cassette_misses": runs["misses"].sum() if "misses" in runs else None,
+                "errors": len(errors),
+                "first_error": errors.iloc[0] if len(errors) else None,
+            }
+        )
+    return pd.DataFrame(summary)
+
+
+def compare_results(baseline: pd.DataFrame | str, current: pd.DataFrame | str) -> pd.DataFrame:
+    """Compare two benchmark summaries (DataFrames or saved result files) case by case.
+
+    Returns:
+        Cold and warm latency of both runs and the speed-up (baseline / current; above 1 is faster)
+
+    """
+    baseline, current = (_load_summary(x) for x in (baseline, current))
+    merged = baseline.merge(current, on="case", suffixes=("_baseline", "_current"))
+    columns = ["case"]
+    for metric in ("cold_seconds", "warm_seconds", "http_requests", "http_bytes"):
+        columns += [f"{metric}_baseline", f"{metric}_current"]
+    merged = merged[columns].copy()
+    for metric in ("cold_seconds", "warm_seconds"):
+        merged[f"{metric}_speedup"] = merged[f"{metric}_baseline"] / merged[f"{metric}_current"]
+    return merged
+
+
+def _load_summary(results: pd.DataFrame | str) -> pd.DataFrame:
+    if isinstance(results, pd.DataFrame):
+        return results
+    with open(results) as f:
+        return summarize_results(json.load(f)["rows"])
+
+
+def run_benchmark(
+    cases: list[dict] | None = None,
+    cassette_dir: str | None = None,
+    mode: str = "replay",
+    repeat: int = 3,
+    latency: float = 0.0,
+    latency_scale: float = 1.0,
+    llm_latency: float = 0.0,
+    cache: bool = True,
+    output: str | None = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """Run the benchmark cases and return their summary.
+
+    Args:
+        cases: Dicts with ``name``, ``tool`` (a function in ``biomni.tool.database``) and ``kwargs``;
+            defaults to ``DEFAULT_CASES``
+        cassette_dir: Directory of the per-case cassettes; defaults to ``default_cassette_dir()``
+        mode: "replay", "record" or "new_episodes"
+        repeat: Runs per case; the first is cold, the rest warm
+        latency: Seconds added to every replayed HTTP response
+        latency_scale: Multiple of the recorded HTTP response time added to every replayed response
+            (1.0 approximates the live services)
+        llm_latency: Seconds added to every replayed LLM translation
+        cache: Use the response and translation caches; False measures every run uncached
+        output: JSON file to save the settings and per-run rows to, for ``compare_results``
+        verbose: Print the summary table
+
+    Returns:
+        Summary DataFrame with one row per case (see ``summarize_results``)
+
+    """
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {CASSETTE_MODES}")
+    cases = cases or DEFAULT_CASES
+    cassette_dir = cassette_dir or default_cassette_dir()
+    settings = {
+        "mode": mode,
+        "repeat": repeat,
+        "latency": latency,
+        "latency_scale": latency_scale,
+        "llm_latency": llm_latency,
+        "cache": cache,
+    }
+
+    rows = []
+    for case in cases:
+        rows.extend(run_case(case, cassette_dir, **settings))
+
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump({"created": time.time(), "settings": settings, "rows": rows}, f, indent=1, default=str)
+
+    summary = summarize_results(rows)
+    if verbose:
+        with pd.option_context("display.max_columns", None, "display.width", 200):
+            print(summary.drop(columns=["first_error"]).to_string(index=False))
+        for _, row in summary[summary["errors"] > 0].iterrows():
+            print(f"{row['case']}: {row['first_error']}")
+    return summary
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Record or replay database tool calls and report their latency")
+    parser.add_argument("--mode", choices=CASSETTE_MODES, default="replay", help="Cassette mode (default: replay)")
+    parser.add_argument("--cases", help="JSON file with a list of cases (default: the built-in cases)")
+    parser.add_argument("--only", nargs="+", help="Run only the cases with these names")
+    parser.add_argument("--cassettes", help="Cassette directory (default: $BIOMNI_CASSETTE_DIR)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the first is cold (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each replayed response")
+    parser.add_argument(
+        "--latency-scale", type=float, default=1.0, help="Multiple of the recorded response time to inject"
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds added to each replayed LLM call")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response and translation caches")
+    parser.add_argument("--output", help="Save per-run results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results saved earlier with --output")
+    args = parser.parse_args()
+
+    cases = DEFAULT_CASES
+    if args.cases:
+        with open(args.cases) as f:
+            cases = json.load(f)
+    if args.only:
+        cases = [case for case in cases if case["name"] in args.only]
+
+    summary = run_benchmark(
+        cases,
+        cassette_dir=args.cassettes,
+        mode=args.mode,
+        repeat=args.repeat,
+        latency=args.latency,
+        latency_scale=args.latency_scale,
+        llm_latency=args.llm_latency,
+        cache=not args.no_cache,
+        output=args.output,
+    )
+    if args.baseline:
+        print()
+        print(compare_results(args.baseline, summary).to_string(index=False))
+    return 1 if summary["errors"].sum() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
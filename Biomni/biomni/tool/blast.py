@@ -0,0 +1,521 @@
+import asyncio
+import hashlib
+import io
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from biomni.tool.response_cache import DAY, ResponseCache, _default_path
+from biomni.tool.transport import get_transport
+
+BLAST_URL = "https://blast.ncbi.nlm.nih.gov/Blast.cgi"
+BACKENDS = ("remote", "local", "diamond")
+
+# Tabular fields requested from BLAST+ and DIAMOND; both tools support the same names
+TABULAR_FIELDS = [
+    "qseqid",
+    "qlen",
+    "sseqid",
+    "stitle",
+    "slen",
+    "pident",
+    "length",
+    "nident",
+    "gaps",
+    "qstart",
+    "qend",
+    "sstart",
+    "send",
+    "evalue",
+    "bitscore",
+]
+
+RESULT_COLUMNS = [
+    "query",
+    "query_length",
+    "hit_id",
+    "hit_def",
+    "accession",
+    "hit_length",
+    "hsp",
+    "evalue",
+    "bitscore",
+    "identities",
+    "align_length",
+    "pct_identity",
+    "query_coverage",
+    "gaps",
+    "query_start",
+    "query_end",
+    "subject_start",
+    "subject_end",
+]
+
+_job_ids = itertools.count(1)
+
+
+def parse_sequences(sequences) -> dict[str, str]:
+    """Normalize sequence input to ``{name: sequence}``.
+
+    Accepts a single sequence, FASTA text, a list of sequences (named ``query_1``, ``query_2``, ...)
+    or a dict of named sequences.
+    """
+    if isinstance(sequences, dict):
+        return {str(k): re.sub(r"\s+", "", str(v)).upper() for k, v in sequences.items()}
+    if isinstance(sequences, str):
+        if sequences.lstrip().startswith(">"):
+            from Bio import SeqIO
+
+            return {r.id: str(r.seq).upper() for r in SeqIO.parse(io.StringIO(sequences), "fasta")}
+        sequences = [sequences]
+    return {f"query_{i}": re.sub(r"\s+", "", str(s)).upper() for i, s in enumerate(sequences, start=1)}
+
+
+def _to_fasta(queries: dict[str, str]) -> str:
+    return "".join(f">{name}\n{seq}\n" for name, seq in queries.items())
+
+
+def _sequence_hash(sequence: str) -> str:
+    return hashlib.sha256(sequence.encode("utf-8")).hexdigest()
+
+
+def parse_blast_xml(handle, names: list[str]) -> dict[str, list[dict]]:
+    """Parse BLAST XML into result rows per query, one row per HSP. Records are matched to ``names`` in order."""
+    from Bio.Blast import NCBIXML
+
+    rows: dict[str, list[dict]] = {name: [] for name in names}
+    for name, record in zip(names, NCBIXML.parse(handle), strict=False):
+        for alignment in record.alignments:
+            for number, hsp in enumerate(alignment.hsps, start=1):
+                query_span = abs(hsp.query_end - hsp.query_start) + 1
+                rows[name].append(
+                    {
+                        "query": name,
+                        "query_length": record.query_length,
+                        "hit_id": alignment.hit_id,
+                        "hit_def": alignment.hit_def,
+                        "accession": alignment.accession,
+                        "hit_length": alignment.length,
+                        "hsp": number,
+                        "evalue": hsp.expect,
+                        "bitscore": hsp.bits,
+                        "identities": hsp.identities,
+                        "align_length": hsp.align_length,
+                        "pct_identity": 100.0 * hsp.identities / hsp.align_length if hsp.align_length else None,
+                        "query_coverage": 100.0 * query_span / record.query_length if record.query_length else None,
+                        "gaps": hsp.gaps if isinstance(hsp.gaps, int) else 0,
+                        "query_start": hsp.query_start,
+                        "query_end": hsp.query_end,
+                        "subject_start": hsp.sbjct_start,
+                        "subject_end": hsp.sbjct_end,
+                    }
+                )
+    return rows
+
+
+def parse_tabular(text: str, names: list[str]) -> dict[str, list[dict]]:
+    """Parse BLAST+/DIAMOND tabular output written with ``TABULAR_FIELDS`` into result rows per query."""
+    rows: dict[str, list[dict]] = {name: [] for name in names}
+    hsp_numbers: dict[tuple[str, str], int] = {}
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        values = dict(zip(TABULAR_FIELDS, line.split("\t"), strict=False))
+        query, subject = values["qseqid"], values["sseqid"]
+        hsp_numbers[query, subject] = hsp_numbers.get((query, subject), 0) + 1
+        query_length = int(values["qlen"])
+        query_start, query_end = int(values["qstart"]), int(values["qend"])
+        rows.setdefault(query, []).append(
+            {
+                "query": query,
+                "query_length": query_length,
+                "hit_id": subject,
+                "hit_def": values.get("stitle", subject),
+                "accession": subject.split("|")[1] if subject.count("|") >= 2 else subject,
+                "hit_length": int(values["slen"]),
+                "hsp": hsp_numbers[query, subject],
+                "evalue": float(values["evalue"]),
+                "bitscore": float(values["bitscore"]),
+                "identities": int(values["nident"]),
+                "align_length": int(values["length"]),
+                "pct_identity": float(values["pident"]),
+                "query_coverage": 100.0 * (abs(query_end - query_start) + 1) / query_length if query_length else None,
+                "gaps": int(values["gaps"]),
+                "query_start": query_start,
+                "query_end": query_end,
+                "subject_start": int(values["sstart"]),
+                "subject_end": int(values["send"]),
+            }
+        )
+    return rows
+
+
+class BlastJob:
+    """State of one submitted batch of BLAST queries."""
+
+    def __init__(self, backend: str, program: str, database: str, queries: dict[str, str], options: dict):
+        self.id = f"blast-{next(_job_ids)}"
+        self.backend = backend
+        self.program = program
+        self.database = database
+        self.queries = queries
+        self.options = options
+        self.pending: list[str] = []  # query names that are not answered from the cache
+        self.rows: dict[str, list[dict]] = {}
+        self.status = "submitted"
+        self.error: str | None = None
+        self.submitted = time.time()
+        self.finished: float | None = None
+        self.done = threading.Event()
+        # Remote jobs
+        self.rid: str | None = None
+        self.next_poll = 0.0
+        self.poll_interval = 0.0
+        self.polls = 0
+        # Local jobs
+        self.process: subprocess.Popen | None = None
+        self.workdir: str | None = None
+
+    def summary(self) -> dict:
+        return {
+            "job_id": self.id,
+            "backend": self.backend,
+            "program": self.program,
+            "database": self.database,
+            "status": self.status,
+            "error": self.error,
+            "queries": len(self.queries),
+            "cached_queries": len(self.queries) - len(self.pending),
+            "rid": self.rid,
+            "polls": self.polls,
+            "elapsed_seconds": round((self.finished or time.time()) - self.submitted, 1),
+        }
+
+
+class BlastJobManager:
+    """Submit BLAST searches without blocking and collect their results as a DataFrame.
+
+    All queries of a submission are sent in one request: a multi-FASTA ``Put`` to NCBI BLAST for the
+    remote backend, or one ``blastn``/``blastp``/... or ``diamond`` process over a user-provided database
+    for the local backends. A background thread tracks the jobs, polling NCBI with backoff starting at the
+    estimated completion time that NCBI returns (RTOE), and parses results as soon as a job is ready. Results
+    are cached per query sequence hash, program, database, backend and options, so an identical query is
+    never searched twice. Finished jobs are kept for ``job_retention`` seconds, and at most ``max_jobs`` of
+    them, so that their results can be collected.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        poll_min: float = 60.0,
+        poll_max: float = 300.0,
+        poll_factor: float = 1.5,
+        job_retention: float = 3600.0,
+        max_jobs: int = 1000,
+    ):
+        """Initialize the manager.
+
+        Args:
+            cache: Result cache; defaults to ``blast_results.sqlite`` next to the HTTP response cache
+            poll_min: First and minimum delay between status checks of a remote job in seconds (NCBI asks
+                for at most one check per minute)
+            poll_max: Maximum delay between status checks
+            poll_factor: Growth factor of the delay after each check
+            job_retention: Seconds a finished job is kept before it is forgotten
+            max_jobs: Maximum number of finished jobs kept; the oldest are forgotten first
+
+        """
+        self.cache = cache or ResponseCache(
+            path=_default_path("blast_results.sqlite"),
+            max_bytes=256 * 1024 * 1024,
+            default_ttl=30 * DAY,
+            stale_while_revalidate=False,
+        )
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        self.job_retention = job_retention
+        self.max_jobs = max_jobs
+        self.jobs: dict[str, BlastJob] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._polling = False
+
+    def _cache_key(self, job: BlastJob, sequence: str) -> str:
+        return self.cache.make_key(
+            "BLAST", f"blast://{job.backend}/{job.program}/{job.database}", job.options, _sequence_hash(sequence)
+        )
+
+    def submit(
+        self,
+        sequences,
+        program: str,
+        database: str,
+        backend: str = "remote",
+        use_cache: bool = True,
+        **options,
+    ) -> str:
+        """Submit a batch of queries and return a job ID immediately.
+
+        Args:
+            sequences: One sequence, FASTA text, a list of sequences or a dict of named sequences
+            program: blastn, blastp, blastx, tblastn or tblastx (DIAMOND: blastp or blastx)
+            database: NCBI database name for the remote backend (e.g. core_nt, nr), or the path of a local
+                BLAST+/DIAMOND database
+            backend: "remote" (NCBI), "local" (BLAST+) or "diamond"
+            use_cache: Answer previously searched sequences from the result cache
+            **options: expect, hitlist_size, word_size, megablast (remote) or threads (local backends)
+
+        Returns:
+            The job ID
+
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown BLAST backend '{backend}', expected one of {BACKENDS}")
+        queries = parse_sequences(sequences)
+        if not queries:
+            raise ValueError("No sequences to search")
+        job = BlastJob(backend, program, database, queries, dict(sorted(options.items())))
+
+        for name, sequence in queries.items():
+            status = "miss"
+            if use_cache:
+                status, cached, _ = self.cache.lookup(self._cache_key(job, sequence))
+            if status == "hit":
+                job.rows[name] = [{**row, "query": name} for row in cached]
+            else:
+                job.pending.append(name)
+
+        with self._lock:
+            self._prune()
+            self.jobs[job.id] = job
+        if not job.pending:
+            self._finish(job, "done")
+            return job.id
+
+        try:
+            if backend == "remote":
+                self._submit_remote(job)
+            else:
+                self._submit_local(job)
+        except Exception as e:
+            self._finish(job, "failed", f"{type(e).__name__}: {e}")
+            return job.id
+
+        self._ensure_thread()
+        self._wakeup.set()
+        return job.id
+
+    def _submit_remote(self, job: BlastJob):
+        data = {
+            "CMD": "Put",
+            "PROGRAM": job.program,
+            "DATABASE": job.database,
+            "QUERY": _to_fasta({name: job.queries[name] for name in job.pending}),
+            "EXPECT": job.options.get("expect", 10.0),
+            "HITLIST_SIZE": job.options.get("hitlist_size", 50),
+            "TOOL": "biomni",
+        }
+        if job.options.get("word_size"):
+            data["WORD_SIZE"] = job.options["word_size"]
+        if job.options.get("megablast") and job.program == "blastn":
+            data["MEGABLAST"] = "on"
+        if os.environ.get("NCBI_EMAIL"):
+            data["EMAIL"] = os.environ["NCBI_EMAIL"]
+        # Every Put starts a new search on NCBI's side, so it is never re-sent
+        response = get_transport().post(BLAST_URL, data=data, retries=0)
+        response.raise_for_status()
+        rid = re.search(r"RID = (\S+)", response.text)
+        if not rid:
+            message = re.search(r'<p class="error">(.*?)</p>', response.text, re.S)
+            raise RuntimeError(message.group(1).strip() if message else "NCBI BLAST did not return a request ID")
+        rtoe = re.search(r"RTOE = (\d+)", response.text)
+        job.rid = rid.group(1)
+        job.status = "running"
+        job.poll_interval = self.poll_min
+        job.next_poll = time.time() + max(self.poll_min, int(rtoe.group(1)) if rtoe else 0)
+        print(f"Submitted BLAST job {job.id} ({len(job.pending)} queries, RID {job.rid})")
+
+    def _submit_local(self, job: BlastJob):
+        workdir = tempfile.mkdtemp(prefix="biomni-blast-")
+        query_path = os.path.join(workdir, "query.fasta")
+        output_path = os.path.join(workdir, "hits.tsv")
+        with open(query_path, "w") as f:
+            f.write(_to_fasta({name: job.queries[name] for name in job.pending}))
+        threads = str(job.options.get("threads", os.cpu_count() or 1))
+        evalue = str(job.options.get("expect", 10.0))
+        max_hits = str(job.options.get("hitlist_size", 50))
+        if job.backend == "diamond":
+            command = ["diamond", job.program, "--db", job.database, "--query", query_path, "--out", output_path]
+            command += ["--outfmt", "6", *TABULAR_FIELDS, "--threads", threads, "--evalue", evalue]
+            command += ["--max-target-seqs", max_hits, "--quiet"]
+        else:
+            command = [job.program, "-db", job.database, "-query", query_path, "-out", output_path]
+            command += ["-outfmt", "6 " + " ".join(TABULAR_FIELDS), "-num_threads", threads, "-evalue", evalue]
+            command += ["-max_target_seqs", max_hits]
+        if shutil.which(command[0]) is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise FileNotFoundError(f"'{command[0]}' is not installed or not on PATH")
+        job.workdir = workdir
+        with open(os.path.join(workdir, "stderr.txt"), "w") as stderr:
+            job.process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr)
+        job.status = "running"
+
+    def _prune(self):
+        """Forget finished jobs past the retention time or beyond ``max_jobs``. Called with the lock held."""
+        finished = sorted((job for job in self.jobs.values() if job.finished is not None), key=lambda job: job.finished)
+        cutoff = time.time() - self.job_retention
+        excess = len(finished) - self.max_jobs
+        for i, job in enumerate(finished):
+            if i < excess or job.finished < cutoff:
+                del self.jobs[job.id]
+
+    def _ensure_thread(self):
+        # The poller clears ``_polling`` under the lock in the same step in which it finds no running jobs, so a
+        # job marked running before this check is either seen by the current poller or starts a new one
+        with self._lock:
+            if not self._polling:
+                self._polling = True
+                self._thread = threading.Thread(target=self._run, daemon=True, name="biomni-blast-poller")
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = [job for job in self.jobs.values() if job.status == "running"]
+                if not active:
+                    self._polling = False
+                    return
+            now = time.time()
+            for job in active:
+                try:
+                    if job.backend == "remote":
+                        if now >= job.next_poll:
+                            self._poll_remote(job)
+                    else:
+                        self._poll_local(job)
+                except Exception as e:
+                    self._finish(job, "failed", f"{type(e).__name__}: {e}")
+            remote = [job.next_poll for job in active if job.backend == "remote" and job.status == "running"]
+            delay = min([max(0.0, t - time.time()) for t in remote] + [1.0 if len(remote) < len(active) else 60.0])
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+    def _poll_remote(self, job: BlastJob):
+        job.polls += 1
+        response = get_transport().get(BLAST_URL, params={"CMD": "Get", "FORMAT_OBJECT": "SearchInfo", "RID": job.rid})
+        response.raise_for_status()
+        status = re.search(r"Status=(\w+)", response.text)
+        status = status.group(1) if status else "UNKNOWN"
+        if status == "WAITING":
+            job.poll_interval = min(self.poll_max, job.poll_interval * self.poll_factor)
+            job.next_poll = time.time() + job.poll_interval
+            return
+        if status != "READY":
+            self._finish(job, "failed", f"NCBI BLAST reported status {status} for RID {job.rid}")
+            return
+        if "ThereAreHits=yes" not in response.text:
+            self._store(job, {name: [] for name in job.pending})
+            return
+        response = get_transport().get(BLAST_URL, params={"CMD": "Get", "FORMAT_TYPE": "XML", "RID": job.rid})
+        response.raise_for_status()
+        self._store(job, parse_blast_xml(io.StringIO(response.text), job.pending))
+
+    def _poll_local(self, job: BlastJob):
+        if job.process.poll() is None:
+            return
+        try:
+            if job.process.returncode != 0:
+                with open(os.path.join(job.workdir, "stderr.txt")) as f:
+                    message = f.read().strip()[-2000:]
+                program = job.process.args[0]
+                self._finish(job, "failed", f"{program} exited with code {job.process.returncode}: {message}")
+                return
+            with open(os.path.join(job.workdir, "hits.tsv")) as f:
+                self._store(job, parse_tabular(f.read(), job.pending))
+        finally:
+            shutil.rmtree(job.workdir, ignore_errors=True)
+
+    def _store(self, job: BlastJob, rows: dict[str, list[dict]]):
+        for name in job.pending:
+            job.rows[name] = rows.get(name, [])
+            self.cache.put(self._cache_key(job, job.queries[name]), f"blast://{job.backend}", job.rows[name])
+        self._finish(job, "done")
+
+    def _finish(self, job: BlastJob, status: str, error: str | None = None):
+        job.status = status
+        job.error = error
+        job.finished = time.time()
+        job.done.set()
+        if error:
+            print(f"BLAST job {job.id} failed: {error}")
+
+    def _job(self, job_id: str) -> BlastJob:
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown BLAST job '{job_id}'")
+        return job
+
+    def status(self, job_id: str) -> dict:
+        return self._job(job_id).summary()
+
+    def wait(self, job_id: str, timeout: float | None = None) -> bool:
+        """Block until the job has finished; return False if ``timeout`` passed first."""
+        return self._job(job_id).done.wait(timeout)
+
+    async def wait_async(self, job_id: str, timeout: float | None = None) -> bool:
+        """Await the job without blocking the event loop."""
+        return await asyncio.to_thread(self._job(job_id).done.wait, timeout)
+
+    def results(self, job_id: str):
+        """Return all hits and HSPs of a finished job as a DataFrame (empty while the job is running)."""
+        import pandas as pd
+
+        job = self._job(job_id)
+        rows = [row for name in job.queries for row in job.rows.get(name, [])]
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    def cancel(self, job_id: str):
+        job = self._job(job_id)
+        if job.process is not None and job.process.poll() is None:
+            job.process.kill()
+        if job.status == "running":
+            self._finish(job, "cancelled")
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_blast_manager() -> BlastJobManager:
+    """Return the process-wide BLAST job manager."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = BlastJobManager()
+        return _manager
+
+
+def make_local_database(fasta_path: str, db_path: str | None = None, dbtype: str = "prot", backend: str = "local"):
+    """Build a BLAST+ (``makeblastdb``) or DIAMOND (``diamond makedb``) database from a FASTA file.
+
+    Returns:
+        The database path to pass as ``database`` with the matching backend
+
+    """
+    db_path = db_path or os.path.splitext(fasta_path)[0]
+    if backend == "diamond":
+        command = ["diamond", "makedb", "--in", fasta_path, "--db", db_path, "--quiet"]
+    else:
+        command = ["makeblastdb", "-in", fasta_path, "-dbtype", dbtype, "-out", db_path, "-parse_seqids"]
+    if shutil.which(command[0]) is None:
+        raise FileNotFoundError(f"'{command[0]}' is not installed or not on PATH")
+    subprocess.run(command, check=True, capture_output=True, text=True)
+    return db_path
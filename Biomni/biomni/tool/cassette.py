@@ -0,0 +1,359 @@
+import base64
+import contextlib
+import datetime
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from biomni.tool.transport import get_transport
+
+CASSETTE_MODES = ("replay", "record", "new_episodes")
+
+# Credentials and contact details are dropped from request keys and never written to a cassette
+REDACTED_PARAMS = frozenset({"api_key", "apikey", "key", "token", "access_token", "email", "tool"})
+
+# Hop-by-hop and encoding headers do not apply to the decoded body stored in the cassette
+_DROPPED_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length", "connection", "set-cookie"})
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+def _redact_query(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in REDACTED_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+
+
+def _body_digest(body, content_type: str) -> str | None:
+    """Hash a request body so that key order in JSON and credentials in form data do not matter."""
+    if body is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if "json" in content_type:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True).encode("utf-8")
+        except ValueError:
+            pass
+    elif "x-www-form-urlencoded" in content_type:
+        fields = [(k, v) for k, v in parse_qsl(body.decode("utf-8", "replace")) if k.lower() not in REDACTED_PARAMS]
+        body = urlencode(sorted(fields)).encode("utf-8")
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """Return the matching key of a request: method, redacted URL with sorted query and a body digest."""
+    digest = _body_digest(request.body, request.headers.get("Content-Type", ""))
+    return " ".join(filter(None, [request.method.upper(), _redact_query(request.url), digest]))
+
+
+class CassetteStats:
+    """Counters collected while a cassette is in use; ``reset`` between measurements."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.http_requests = 0
+        self.http_seconds = 0.0
+        self.http_bytes = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.misses = 0
+
+    def add_http(self, seconds: float, size: int) -> None:
+        with self._lock:
+            self.http_requests += 1
+            self.http_seconds += seconds
+            self.http_bytes += size
+
+    def add_llm(self, seconds: float) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+
+    def add_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "http_requests": self.http_requests,
+                "http_seconds": round(self.http_seconds, 4),
+                "http_bytes": self.http_bytes,
+                "llm_calls": self.llm_calls,
+                "llm_seconds": round(self.llm_seconds, 4),
+                "misses": self.misses,
+            }
+
+
+class Cassette:
+    """Recorded HTTP and LLM interactions of one session, stored as a JSON file.
+
+    Interactions are matched by key (see ``request_key``). Repeated identical requests replay their
+    recordings in order, and the last recording is reused once they run out, so polling loops and
+    retries replay deterministically.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.http: dict[str, list[dict]] = {}
+        self.llm: dict[str, list[dict]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.http = data.get("http", {})
+            self.llm = data.get("llm", {})
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.http.values()) + sum(len(v) for v in self.llm.values())
+
+    def _next(self, kind: str, key: str) -> dict | None:
+        recordings = getattr(self, kind).get(key)
+        if not recordings:
+            return None
+        with self._lock:
+            position = self._cursors.get((kind, key), 0)
+            self._cursors[(kind, key)] = position + 1
+        return recordings[min(position, len(recordings) - 1)]
+
+    def _append(self, kind: str, key: str, entry: dict) -> None:
+        with self._lock:
+            getattr(self, kind).setdefault(key, []).append(entry)
+            self.dirty = True
+
+    def play_http(self, key: str) -> dict | None:
+        return self._next("http", key)
+
+    def record_http(self, key: str, url: str, response: requests.Response, content: bytes, elapsed: float) -> None:
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        entry = {
+            "url": _redact_query(url),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": headers,
+            "elapsed": round(elapsed, 4),
+        }
+        try:
+            entry["text"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["base64"] = base64.b64encode(content).decode("ascii")
+        self._append("http", key, entry)
+
+    def play_llm(self, key: str) -> dict | None:
+        return self._next("llm", key)
+
+    def record_llm(self, key: str, text: str, elapsed: float) -> None:
+        self._append("llm", key, {"text": text, "elapsed": round(elapsed, 4)})
+
+    def clear(self) -> None:
+        with self._lock:
+            self.http, self.llm, self._cursors = {}, {}, {}
+            self.dirty = True
+
+    def rewind(self) -> None:
+        """Replay every key from its first recording again."""
+        with self._lock:
+            self._cursors.clear()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": 1, "http": self.http, "llm": self.llm}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+class CassetteAdapter(HTTPAdapter):
+    """``requests`` transport adapter that records responses to, or replays them from, a cassette.
+
+    Mounted on the shared transport session, it sits below the rate limiter, retry policy and latency
+    metrics, so replayed runs exercise the same code paths as live ones.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = "replay",
+        latency: float = 0.0,
+        latency_scale: float = 0.0,
+        stats: CassetteStats | None = None,
+        **kwargs,
+    ):
+        """Initialize the adapter.
+
+        Args:
+            cassette: Cassette to read from and write to
+            mode: "replay" (never touch the network), "record" (always fetch and record) or "new_episodes"
+                (replay recorded requests and record the rest)
+            latency: Seconds of delay added to every replayed response
+            latency_scale: Multiple of the recorded response time added to every replayed response
+            stats: Counters to update; a new ``CassetteStats`` by default
+            **kwargs: Passed to ``HTTPAdapter`` for the live connections
+
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {CASSETTE_MODES}")
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.stats = stats or CassetteStats()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = request_key(request)
+        start = time.perf_counter()
+        entry = None if self.mode == "record" else self.cassette.play_http(key)
+        if entry is not None:
+            delay = self.latency + self.latency_scale * entry.get("elapsed", 0.0)
+            if delay > 0:
+                time.sleep(delay)
+            content = base64.b64decode(entry["base64"]) if "base64" in entry else entry.get("text", "").encode()
+            response = self._build(request, entry["status"], entry.get("reason"), entry.get("headers", {}), content)
+        elif self.mode == "replay":
+            self.stats.add_miss()
+            raise CassetteMiss(f"No recorded response for {key}", request=request)
+        else:
+            live = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+            content = live.content
+            self.cassette.record_http(key, request.url, live, content, time.perf_counter() - start)
+            headers = {k: v for k, v in live.headers.items() if k.lower() not in _DROPPED_HEADERS}
+            response = self._build(request, live.status_code, live.reason, headers, content)
+        elapsed = time.perf_counter() - start
+        response.elapsed = datetime.timedelta(seconds=elapsed)
+        self.stats.add_http(elapsed, len(content))
+        return response
+
+    def _build(self, request, status: int, reason: str | None, headers: dict, content: bytes) -> requests.Response:
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers=headers,
+            status=status,
+            reason=reason,
+            preload_content=False,
+            decode_content=False,
+            request_method=request.method,
+        )
+        return self.build_response(request, raw)
+
+
+def _llm_key(model: str, messages) -> str:
+    text = "\n".join(f"{type(m).__name__}:{' '.join(str(m.content).split())}" for m in messages)
+    return f"{model} {hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}"
+
+
+class CassetteLLM:
+    """Stand-in for the query-translation LLM that records or replays its responses."""
+
+    def __init__(self, cassette: Cassette, model: str, factory, mode: str, stats: CassetteStats, latency: float):
+        self.cassette = cassette
+        self.model = model
+        self.factory = factory  # builds the real client, only when something has to be recorded
+        self.mode = mode
+        self.stats = stats
+        self.latency = latency
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage
+
+        key = _llm_key(self.model, messages)
+        start = time.perf_counter()
+        entry = None if self.mode == "record" else self.cassette.play_llm(key)
+        if entry is not None:
+            if self.latency > 0:
+                time.sleep(self.latency)
+            text = entry["text"]
+        elif self.mode == "replay":
+            self.stats.add_miss()
+            raise CassetteMiss(f"No recorded LLM response for {key}")
+        else:
+            text = self.factory().invoke(messages).content
+            self.cassette.record_llm(key, text, time.perf_counter() - start)
+        self.stats.add_llm(time.perf_counter() - start)
+        return AIMessage(content=text)
+
+    async def ainvoke(self, messages):
+        from biomni.tool.query_engine import run_blocking
+
+        return await run_blocking(self.invoke, messages)
+
+
+@contextlib.contextmanager
+def use_cassette(
+    path: str,
+    mode: str = "replay",
+    latency: float = 0.0,
+    latency_scale: float = 0.0,
+    llm_latency: float = 0.0,
+    stats: CassetteStats | None = None,
+):
+    """Record or replay the HTTP requests and query-translation LLM calls of the database tools.
+
+    The cassette adapter is mounted on the shared transport session and the tools' LLM factory is swapped
+    for a recording stand-in, so this affects every thread in the process until the block exits.
+
+    Example:
+        with use_cassette("cassettes/uniprot.json", mode="record"):
+            query_uniprot(endpoint="https://rest.uniprot.org/uniprotkb/P04637")
+        with use_cassette("cassettes/uniprot.json", latency=0.05) as cassette:
+            query_uniprot(endpoint="https://rest.uniprot.org/uniprotkb/P04637")
+            print(cassette.stats.summary())
+
+    Args:
+        path: Cassette JSON file
+        mode: "replay", "record" (start from an empty cassette) or "new_episodes"
+        latency: Seconds of delay added to every replayed HTTP response
+        latency_scale: Multiple of the recorded HTTP response time added to every replayed response
+        llm_latency: Seconds of delay added to every replayed LLM response
+        stats: Counters to update; a new ``CassetteStats`` by default
+
+    Yields:
+        The ``Cassette``, with the counters of this block under ``cassette.stats``
+
+    """
+    from biomni.tool import database
+
+    cassette = Cassette(path)
+    if mode == "record":
+        cassette.clear()
+    cassette.stats = stats or CassetteStats()
+
+    session = get_transport().session
+    previous_adapters = dict(session.adapters)
+    adapter = CassetteAdapter(cassette, mode, latency, latency_scale, cassette.stats)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    real_llm = database._get_query_llm
+
+    def cassette_llm(model, temperature, api_key):
+        factory = lambda: real_llm(model, temperature, api_key)
+        return CassetteLLM(cassette, model, factory, mode, cassette.stats, llm_latency)
+
+    database._get_query_llm = cassette_llm
+    try:
+        yield cassette
+    finally:
+        database._get_query_llm = real_llm
+        session.adapters.clear()
+        session.adapters.update(previous_adapters)
+        adapter.close()
+        if cassette.dirty:
+            cassette.save()
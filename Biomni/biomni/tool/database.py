@@ -1,15 +1,24 @@
+import functools
+import hashlib
 import json
 import os
-import pickle
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
-from Bio.Blast import NCBIWWW, NCBIXML
-from Bio.Seq import Seq
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from biomni.llm import get_llm
+from biomni.tool.blast import get_blast_manager, make_local_database
+from biomni.tool.eutils import EutilsClient, EutilsError
+from biomni.tool.projection import SPILL_BYTES, project, read_response, spilled_result
+from biomni.tool.response_cache import get_response_cache, get_translation_cache
+from biomni.tool.schema_registry import get_schema, get_schema_registry
+from biomni.tool.transport import get_transport
+from biomni.tracing import trace_tool
 from biomni.utils import parse_hpo_obo
 
 
@@ -33,45 +42,94 @@ def get_hpo_names(hpo_terms: list[str], data_lake_path: str) -> list[str]:
     return hpo_names
 
 
-def _query_llm_for_api(prompt, schema, system_template, api_key=None, model="claude-3-5-haiku-20241022"):
-    """Helper function to query LLMs for generating API calls based on natural language prompts.
+_SYSTEM_PROMPTS: dict[tuple[str, str], str] = {}
+_SYSTEM_PROMPTS_LOCK = threading.Lock()
 
-    Supports multiple model providers including Claude, Gemini, GPT, and others via the unified get_llm interface.
 
-    Parameters
-    ----------
-    prompt (str): Natural language query to process
-    schema (dict): API schema to include in the system prompt
-    system_template (str): Template string for the system prompt (should have {schema} placeholder)
-    api_key (str, optional): API key for the model provider. If None, will use appropriate env variable
-    model (str): Model to use (defaults to claude-3-5-haiku-20241022)
+def _schema_version(schema):
+    """Return a short content hash identifying a version of an API schema."""
+    if schema is None:
+        return "none"
+    version = get_schema_registry().version_of(schema)
+    if version is not None:
+        return version
+    payload = json.dumps(schema, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _render_system_prompt(system_template, schema, schema_version):
+    """Format a system prompt with its schema once per process.
+
+    Reusing the identical string on every call also lets provider-side prompt caching apply.
+    """
+    key = (system_template, schema_version)
+    with _SYSTEM_PROMPTS_LOCK:
+        system_prompt = _SYSTEM_PROMPTS.get(key)
+    if system_prompt is None:
+        if schema is None:
+            system_prompt = system_template
+        else:
+            system_prompt = system_template.format(schema=json.dumps(schema, indent=2))
+        with _SYSTEM_PROMPTS_LOCK:
+            _SYSTEM_PROMPTS[key] = system_prompt
+    return system_prompt
+
+
+@functools.lru_cache(maxsize=16)
+def _get_query_llm(model, temperature, api_key):
+    """Return a shared LLM client per (model, temperature, api_key)."""
+    return get_llm(model=model, temperature=temperature, api_key=api_key)
+
+
+def _normalize_prompt(prompt):
+    return " ".join(str(prompt).split())
+
+
+def _prepare_llm_request(prompt, schema, system_template, api_key, model, use_cache):
+    """Resolve the cached translation or build the LLM request for ``_query_llm_for_api``.
 
     Returns
     -------
-    dict: Dictionary with 'success', 'data' (if successful), 'error' (if failed), and optional 'raw_response'
+    tuple: (result, llm, messages, store) where ``result`` is set when no LLM call is needed, and
+        ``store(output)``, if not None, saves a successful translation to the cache
 
     """
-    try:
-        # Format the system prompt with schema if provided
-        if schema is not None:
-            schema_json = json.dumps(schema, indent=2)
-            system_prompt = system_template.format(schema=schema_json)
-        else:
-            system_prompt = system_template
+    schema_version = _schema_version(schema)
+    system_prompt = _render_system_prompt(system_template, schema, schema_version)
+
+    store = None
+    cache = get_translation_cache() if use_cache else None
+    if cache is not None and cache.enabled:
+        template_hash = hashlib.sha256(system_template.encode("utf-8")).hexdigest()[:16]
+        cache_key = cache.make_key(
+            "LLM",
+            f"llm://{model}",
+            {"template": template_hash, "schema": schema_version},
+            _normalize_prompt(prompt),
+        )
+        status, cached, _ = cache.lookup(cache_key)
+        if status == "hit":
+            return {**cached, "cached": True}, None, None, store
+        if cache.mode == "cache_only":
+            error = {"success": False, "error": "No cached API translation for this prompt in cache-only mode"}
+            return error, None, None, store
 
-        # Get LLM instance using the unified interface
-        llm = get_llm(model=model, temperature=0.0, api_key=api_key or "EMPTY")
+        store = functools.partial(cache.put, cache_key, f"llm://{model}")
 
-        # Compose messages
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=prompt),
-        ]
+    # Reuse the LLM client for this model instead of building a new one per call
+    llm = _get_query_llm(model, 0.0, api_key or "EMPTY")
 
-        # Query the LLM
-        response = llm.invoke(messages)
-        llm_text = response.content.strip()
+    # Compose messages
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=prompt),
+    ]
+    return None, llm, messages, store
 
+
+def _parse_llm_response(llm_text, store):
+    """Extract the JSON object from an LLM response and cache it on success."""
+    try:
         # Find JSON boundaries (in case LLM adds explanations)
         json_start = llm_text.find("{")
         json_end = llm_text.rfind("}") + 1
@@ -82,22 +140,76 @@ def _query_llm_for_api(prompt, schema, system_template, api_key=None, model="cla
         else:
             # If no JSON found, try the whole response
             result = json.loads(llm_text)
-
-        return {"success": True, "data": result, "raw_response": llm_text}
-
     except (json.JSONDecodeError, KeyError, IndexError) as e:
         return {
             "success": False,
             "error": f"Failed to parse LLM response: {str(e)}",
-            "raw_response": llm_text if "llm_text" in locals() else "No content found",
+            "raw_response": llm_text,
         }
+
+    output = {"success": True, "data": result, "raw_response": llm_text}
+    if store is not None:
+        store(output)
+    return {**output, "cached": False}
+
+
+def _query_llm_for_api(
+    prompt, schema, system_template, api_key=None, model="claude-3-5-haiku-20241022", use_cache=True
+):
+    """Helper function to query LLMs for generating API calls based on natural language prompts.
+
+    Supports multiple model providers including Claude, Gemini, GPT, and others via the unified get_llm interface.
+    Successful translations are memoized on disk per (system template, whitespace-normalized prompt,
+    schema version, model), so repeating a query skips the LLM round trip.
+
+    Parameters
+    ----------
+    prompt (str): Natural language query to process
+    schema (dict): API schema to include in the system prompt
+    system_template (str): Template string for the system prompt (should have {schema} placeholder)
+    api_key (str, optional): API key for the model provider. If None, will use appropriate env variable
+    model (str): Model to use (defaults to claude-3-5-haiku-20241022)
+    use_cache (bool): Reuse a stored translation of the same prompt if available
+
+    Returns
+    -------
+    dict: Dictionary with 'success', 'data' (if successful), 'error' (if failed), optional 'raw_response',
+        and 'cached' (True if the translation came from the cache)
+
+    """
+    try:
+        result, llm, messages, store = _prepare_llm_request(prompt, schema, system_template, api_key, model, use_cache)
+        if result is not None:
+            return result
+
+        # Query the LLM
+        response = llm.invoke(messages)
+        return _parse_llm_response(response.content.strip(), store)
     except Exception as e:
         return {"success": False, "error": f"Error querying LLM: {str(e)}"}
 
 
-def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data=None, description=None):
+def _query_rest_api(
+    endpoint,
+    method="GET",
+    params=None,
+    headers=None,
+    json_data=None,
+    description=None,
+    use_cache=True,
+    fields=None,
+    spill_bytes=None,
+):
     """General helper function to query REST APIs with consistent error handling.
 
+    Successful responses are stored in the persistent response cache (see ``biomni.tool.response_cache``)
+    and served from it until their per-source TTL expires. The cache status and cumulative hit/miss
+    counts are reported under ``query_info["cache"]``.
+
+    With ``spill_bytes`` set, the body is streamed and a response larger than that is written to a
+    compressed artifact instead of being parsed in memory; the result then holds the artifact path, a
+    compact summary and the requested ``fields`` (see ``biomni.tool.projection``).
+
     Parameters
     ----------
     endpoint (str): Full URL endpoint to query
@@ -106,6 +218,9 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
     headers (dict, optional): HTTP headers for the request
     json_data (dict, optional): JSON data for POST requests
     description (str, optional): Description of this query for error messages
+    use_cache (bool): Whether to use the persistent response cache
+    fields (list[str], optional): JSONPath expressions (e.g. "$.data[*].id") to keep instead of the full result
+    spill_bytes (int, optional): Size above which the response is spilled to an on-disk artifact
 
     Returns
     -------
@@ -120,26 +235,107 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
     if description is None:
         description = f"{method} request to {endpoint}"
 
+    cache = get_response_cache() if use_cache else None
+    if cache is None or not cache.enabled:
+        return _send_rest_request(endpoint, method, params, headers, json_data, description, fields, spill_bytes)
+
+    # Projected and spilled results have a different shape, so they are cached under their own key
+    shape = [json_data, fields, spill_bytes] if fields or spill_bytes else json_data
+    key = cache.make_key(method, endpoint, params, shape, headers)
+    status, cached_result, age = cache.lookup(key)
+    if status in ("hit", "stale") and _artifact_missing(cached_result):
+        status = "miss"
+
+    def cache_info(status, age=None):
+        info = {"status": status, "hits": cache.hits + cache.stale_hits, "misses": cache.misses}
+        if age is not None:
+            info["age_seconds"] = round(age, 1)
+        return info
+
+    if status in ("hit", "stale"):
+        if status == "stale":
+
+            def fetch():
+                fresh = _send_rest_request(
+                    endpoint, method, params, headers, json_data, description, fields, spill_bytes
+                )
+                return fresh["result"] if fresh.get("success") else None
+
+            cache.revalidate(key, endpoint, fetch)
+        return {
+            "success": True,
+            "query_info": {
+                "endpoint": endpoint,
+                "method": method,
+                "description": description,
+                "cache": cache_info(status, age),
+            },
+            "result": cached_result,
+        }
+
+    if cache.mode == "cache_only":
+        return {
+            "success": False,
+            "error": "No cached response for this query and the response cache is in cache-only mode",
+            "query_info": {
+                "endpoint": endpoint,
+                "method": method,
+                "description": description,
+                "cache": cache_info("miss"),
+            },
+        }
+
+    api_result = _send_rest_request(endpoint, method, params, headers, json_data, description, fields, spill_bytes)
+    if api_result.get("success"):
+        cache.put(key, endpoint, api_result["result"])
+    api_result.setdefault("query_info", {})["cache"] = cache_info("miss")
+    return api_result
+
+
+def _artifact_missing(result):
+    """Whether a cached spilled result points at an artifact that has since been deleted."""
+    return isinstance(result, dict) and "artifact" in result and not os.path.exists(str(result["artifact"]))
+
+
+def _send_rest_request(endpoint, method, params, headers, json_data, description, fields=None, spill_bytes=None):
+    """Send a REST request through the shared transport and wrap the response as ``_query_rest_api`` does."""
     url_error = None
+    stream = spill_bytes is not None
 
     try:
         # Make the API request
         if method.upper() == "GET":
-            response = requests.get(endpoint, params=params, headers=headers)
+            response = get_transport().get(endpoint, params=params, headers=headers, stream=stream)
         elif method.upper() == "POST":
-            response = requests.post(endpoint, params=params, headers=headers, json=json_data)
+            response = get_transport().post(endpoint, params=params, headers=headers, json=json_data, stream=stream)
         else:
             return {"error": f"Unsupported HTTP method: {method}"}
 
-        url_error = str(response.text)
+        if not stream or response.status_code >= 400:
+            url_error = str(response.text)
         response.raise_for_status()
 
-        # Try to parse JSON response
-        try:
-            result = response.json()
-        except ValueError:
-            # Return raw text if not JSON
-            result = {"raw_text": response.text}
+        if stream:
+            with response:
+                body, artifact, size = read_response(response, spill_bytes, label=endpoint)
+            if artifact is not None:
+                result = spilled_result(artifact, size, fields)
+                fields = None
+            else:
+                try:
+                    result = json.loads(body)
+                except ValueError:
+                    result = {"raw_text": body.decode(response.encoding or "utf-8", errors="replace")}
+        else:
+            # Try to parse JSON response
+            try:
+                result = response.json()
+            except ValueError:
+                # Return raw text if not JSON
+                result = {"raw_text": response.text}
+
+        if fields:
+            result = project(result, fields)
 
         return {
             "success": True,
@@ -201,6 +397,9 @@ def _query_ncbi_database(
 ) -> dict[str, Any]:
     """Core function to query NCBI databases using Claude for query interpretation and NCBI eutils.
 
+    The search runs on the NCBI history server and summaries are retrieved in pages through
+    ``EutilsClient``, so large ``max_results`` values are paged instead of truncated.
+
     Parameters
     ----------
     database (str): NCBI database to query (e.g., "clinvar", "gds", "geoprofiles")
@@ -215,101 +414,43 @@ def _query_ncbi_database(
     dict: Dictionary containing both the structured query and the results
 
     """
-    # Query NCBI API using the structured search term
-    esearch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-    esearch_params = {
-        "db": database,
-        "term": search_term,
-        "retmode": "json",
-        "retmax": 100,
-        "usehistory": "y",  # Use history server to store results
-    }
-
-    # Get IDs of matching entries
-    search_response = _query_rest_api(
-        endpoint=esearch_url,
-        method="GET",
-        params=esearch_params,
-        description="NCBI ESearch API query",
-    )
-
-    if not search_response["success"]:
-        return search_response
-
-    search_data = search_response["result"]
-
-    # If we have results, fetch the details
-    if "esearchresult" in search_data and int(search_data["esearchresult"]["count"]) > 0:
-        # Extract WebEnv and query_key from the search results
-        webenv = search_data["esearchresult"].get("webenv", "")
-        query_key = search_data["esearchresult"].get("querykey", "")
-
-        # Use WebEnv and query_key if available
-        if webenv and query_key:
-            # Get details using eSummary
-            esummary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-            esummary_params = {
-                "db": database,
-                "query_key": query_key,
-                "WebEnv": webenv,
-                "retmode": "json",
-                "retmax": max_results,
-            }
-
-            details_response = _query_rest_api(
-                endpoint=esummary_url,
-                method="GET",
-                params=esummary_params,
-                description="NCBI ESummary API query",
-            )
-
-            if not details_response["success"]:
-                return details_response
-
-            results = details_response["result"]
-
-        else:
-            # Fall back to direct ID fetch
-            id_list = search_data["esearchresult"]["idlist"][:max_results]
-
-            # Get details for each ID
-            esummary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-            esummary_params = {
-                "db": database,
-                "id": ",".join(id_list),
-                "retmode": "json",
+    client = EutilsClient()
+    try:
+        search = client.esearch(database, search_term)
+        if search["count"] == 0:
+            return {
+                "database": database,
+                "query_interpretation": search_term,
+                "total_results": 0,
+                "formatted_results": [],
             }
 
-            details_response = _query_rest_api(
-                endpoint=esummary_url,
-                method="GET",
-                params=esummary_params,
-                description="NCBI ESummary API query",
-            )
-
-            if not details_response["success"]:
-                return details_response
-
-            results = details_response["result"]
-
-        # Format results using the provided formatter
-        formatted_results = result_formatter(results) if result_formatter else results
-
-        # Return the combined information
+        # Keep the ESummary JSON layout ({"result": {"uids": [...], uid: summary}}) the formatters expect
+        results = {"result": {"uids": []}}
+        for summary in client.iter_summaries(
+            database, search["webenv"], search["query_key"], search["count"], max_records=max_results
+        ):
+            uid = str(summary.get("uid", len(results["result"]["uids"])))
+            results["result"]["uids"].append(uid)
+            results["result"][uid] = summary
+    except (requests.exceptions.RequestException, EutilsError) as e:
         return {
-            "database": database,
-            "query_interpretation": search_term,
-            "total_results": int(search_data["esearchresult"]["count"]),
-            "formatted_results": formatted_results,
-        }
-    else:
-        return {
-            "database": database,
-            "query_interpretation": search_term,
-            "total_results": 0,
-            "formatted_results": [],
+            "success": False,
+            "error": f"API error: {e}",
+            "query_info": {"database": database, "search_term": search_term, "description": "NCBI E-utilities query"},
         }
 
+    # Format results using the provided formatter
+    formatted_results = result_formatter(results) if result_formatter else results
+
+    # Return the combined information
+    return {
+        "database": database,
+        "query_interpretation": search_term,
+        "total_results": search["count"],
+        "formatted_results": formatted_results,
+    }
+
 
 def _format_query_results(result, options=None):
     """A general-purpose formatter for query function results to reduce output size.
@@ -442,6 +583,7 @@ def _format_query_results(result, options=None):
     return formatted
 
 
+@trace_tool
 def query_uniprot(
     prompt=None,
     endpoint=None,
@@ -480,9 +622,7 @@ def query_uniprot(
     # If using prompt, parse with Claude
     if prompt:
         # Load UniProt schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "uniprot.pkl")
-        with open(schema_path, "rb") as f:
-            uniprot_schema = pickle.load(f)
+        uniprot_schema = get_schema("uniprot")
 
         # Create system prompt template
         system_template = """
@@ -544,6 +684,7 @@ def query_uniprot(
     return api_result
 
 
+@trace_tool
 def query_alphafold(
     uniprot_id,
     endpoint="prediction",
@@ -604,7 +745,7 @@ def query_alphafold(
 
     try:
         # Make the API request
-        response = requests.get(url)
+        response = get_transport().get(url)
         response.raise_for_status()
 
         # Parse the response as JSON
@@ -627,7 +768,7 @@ def query_alphafold(
             download_url = f"https://alphafold.ebi.ac.uk/files/{filename}"
 
             # Download the file
-            download_response = requests.get(download_url)
+            download_response = get_transport().get(download_url)
             if download_response.status_code == 200:
                 with open(file_path, "wb") as f:
                     f.write(download_response.content)
@@ -693,6 +834,7 @@ def query_alphafold(
         }
 
 
+@trace_tool
 def query_interpro(
     prompt=None,
     endpoint=None,
@@ -734,9 +876,7 @@ def query_interpro(
     # If using prompt, parse with Claude
     if prompt:
         # Load InterPro schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "interpro.pkl")
-        with open(schema_path, "rb") as f:
-            interpro_schema = pickle.load(f)
+        interpro_schema = get_schema("interpro")
 
         # Create system prompt template
         system_template = """
@@ -806,6 +946,7 @@ def query_interpro(
     return api_result
 
 
+@trace_tool
 def query_pdb(
     prompt=None,
     query=None,
@@ -840,11 +981,7 @@ def query_pdb(
 
     # Generate search query from natural language if prompt is provided and query is not
     if prompt and not query:
-        # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pdb.pkl")
-
-        with open(schema_path, "rb") as f:
-            schema = pickle.load(f)
+        schema = get_schema("pdb")
 
         # Create system prompt template
         system_template = """
@@ -929,6 +1066,7 @@ def query_pdb(
     return api_result
 
 
+@trace_tool
 def query_pdb_identifiers(identifiers, return_type="entry", download=False, attributes=None):
     """Retrieve detailed data and/or download files for PDB identifiers.
 
@@ -952,89 +1090,85 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
     if not identifiers:
         return {"error": "No identifiers provided"}
 
+    def fetch_details(identifier):
+        try:
+            # Determine the appropriate endpoint based on return_type and identifier format
+            if return_type == "entry":
+                data_url = f"https://data.rcsb.org/rest/v1/core/entry/{identifier}"
+            elif return_type == "polymer_entity":
+                entry_id, entity_id = identifier.split("_")
+                data_url = f"https://data.rcsb.org/rest/v1/core/polymer_entity/{entry_id}/{entity_id}"
+            elif return_type == "nonpolymer_entity":
+                entry_id, entity_id = identifier.split("_")
+                data_url = f"https://data.rcsb.org/rest/v1/core/nonpolymer_entity/{entry_id}/{entity_id}"
+            elif return_type == "polymer_instance":
+                entry_id, asym_id = identifier.split(".")
+                data_url = f"https://data.rcsb.org/rest/v1/core/polymer_entity_instance/{entry_id}/{asym_id}"
+            elif return_type == "assembly":
+                entry_id, assembly_id = identifier.split("-")
+                data_url = f"https://data.rcsb.org/rest/v1/core/assembly/{entry_id}/{assembly_id}"
+            elif return_type == "mol_definition":
+                data_url = f"https://data.rcsb.org/rest/v1/core/chem_comp/{identifier}"
+
+            # Fetch data
+            data_response = get_transport().get(data_url)
+            data_response.raise_for_status()
+            entity_data = data_response.json()
+
+            # Filter attributes if specified
+            if attributes:
+                filtered_data = {}
+                for attr in attributes:
+                    parts = attr.split(".")
+                    current = entity_data
+                    try:
+                        for part in parts[:-1]:
+                            current = current[part]
+                        filtered_data[attr] = current[parts[-1]]
+                    except (KeyError, TypeError):
+                        filtered_data[attr] = None
+                entity_data = filtered_data
+
+            return {"identifier": identifier, "data": entity_data}
+        except Exception as e:
+            return {"identifier": identifier, "error": str(e)}
+
+    def download_structure(pdb_id):
+        try:
+            # Download PDB file
+            pdb_url = f"https://files.rcsb.org/download/{pdb_id}.pdb"
+            pdb_response = get_transport().get(pdb_url)
+
+            if pdb_response.status_code == 200:
+                # Create data directory if it doesn't exist
+                data_dir = os.path.join(os.path.dirname(__file__), "data", "pdb")
+                os.makedirs(data_dir, exist_ok=True)
+
+                # Save PDB file
+                pdb_file_path = os.path.join(data_dir, f"{pdb_id}.pdb")
+                with open(pdb_file_path, "wb") as pdb_file:
+                    pdb_file.write(pdb_response.content)
+                return {"pdb_file_path": pdb_file_path}
+            return {}
+        except Exception as e:
+            return {"download_error": str(e)}
+
     try:
-        # Fetch detailed data using Data API
-        detailed_results = []
-        for identifier in identifiers:
-            try:
-                # Determine the appropriate endpoint based on return_type and identifier format
-                if return_type == "entry":
-                    data_url = f"https://data.rcsb.org/rest/v1/core/entry/{identifier}"
-                elif return_type == "polymer_entity":
-                    entry_id, entity_id = identifier.split("_")
-                    data_url = f"https://data.rcsb.org/rest/v1/core/polymer_entity/{entry_id}/{entity_id}"
-                elif return_type == "nonpolymer_entity":
-                    entry_id, entity_id = identifier.split("_")
-                    data_url = f"https://data.rcsb.org/rest/v1/core/nonpolymer_entity/{entry_id}/{entity_id}"
-                elif return_type == "polymer_instance":
-                    entry_id, asym_id = identifier.split(".")
-                    data_url = f"https://data.rcsb.org/rest/v1/core/polymer_entity_instance/{entry_id}/{asym_id}"
-                elif return_type == "assembly":
-                    entry_id, assembly_id = identifier.split("-")
-                    data_url = f"https://data.rcsb.org/rest/v1/core/assembly/{entry_id}/{assembly_id}"
-                elif return_type == "mol_definition":
-                    data_url = f"https://data.rcsb.org/rest/v1/core/chem_comp/{identifier}"
-
-                # Fetch data
-                data_response = requests.get(data_url)
-                data_response.raise_for_status()
-                entity_data = data_response.json()
-
-                # Filter attributes if specified
-                if attributes:
-                    filtered_data = {}
-                    for attr in attributes:
-                        parts = attr.split(".")
-                        current = entity_data
-                        try:
-                            for part in parts[:-1]:
-                                current = current[part]
-                            filtered_data[attr] = current[parts[-1]]
-                        except (KeyError, TypeError):
-                            filtered_data[attr] = None
-                    entity_data = filtered_data
-
-                detailed_results.append({"identifier": identifier, "data": entity_data})
-            except Exception as e:
-                detailed_results.append({"identifier": identifier, "error": str(e)})
+        # Fetch detailed data using Data API, a bounded number of identifiers at a time
+        detailed_results = _fan_out(fetch_details, identifiers)
 
         # Download structure files if requested
         if download:
+            pdb_ids = {}
             for identifier in identifiers:
-                if "_" in identifier or "." in identifier or "-" in identifier:
-                    # For non-entry identifiers, extract the PDB ID
-                    if "_" in identifier:
-                        pdb_id = identifier.split("_")[0]
-                    elif "." in identifier:
-                        pdb_id = identifier.split(".")[0]
-                    elif "-" in identifier:
-                        pdb_id = identifier.split("-")[0]
-                else:
-                    pdb_id = identifier
+                # For non-entry identifiers, extract the PDB ID
+                pdb_ids[identifier] = re.split(r"[_.\-]", identifier, maxsplit=1)[0]
+            unique_pdb_ids = list(dict.fromkeys(pdb_ids.values()))
+            downloads = dict(zip(unique_pdb_ids, _fan_out(download_structure, unique_pdb_ids), strict=True))
 
-                try:
-                    # Download PDB file
-                    pdb_url = f"https://files.rcsb.org/download/{pdb_id}.pdb"
-                    pdb_response = requests.get(pdb_url)
-
-                    if pdb_response.status_code == 200:
-                        # Create data directory if it doesn't exist
-                        data_dir = os.path.join(os.path.dirname(__file__), "data", "pdb")
-                        os.makedirs(data_dir, exist_ok=True)
-
-                        # Save PDB file
-                        pdb_file_path = os.path.join(data_dir, f"{pdb_id}.pdb")
-                        with open(pdb_file_path, "wb") as pdb_file:
-                            pdb_file.write(pdb_response.content)
-
-                        # Add download information to results
-                        for result in detailed_results:
-                            if result["identifier"] == identifier or result["identifier"].startswith(pdb_id):
-                                result["pdb_file_path"] = pdb_file_path
-                except Exception as e:
-                    for result in detailed_results:
-                        if result["identifier"] == identifier or result["identifier"].startswith(pdb_id):
-                            result["download_error"] = str(e)
+            # Add download information to results
+            for result in detailed_results:
+                result.update(downloads[pdb_ids[result["identifier"]]])
 
         return {"detailed_results": detailed_results}
 
@@ -1042,6 +1176,7 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
         return {"error": f"Error retrieving PDB details: {str(e)}"}
 
 
+@trace_tool
 def query_kegg(prompt, endpoint=None, api_key=None, model="claude-3-5-haiku-20241022", verbose=True):
     """Take a natural language prompt and convert it to a structured KEGG API query.
 
@@ -1063,10 +1198,7 @@ def query_kegg(prompt, endpoint=None, api_key=None, model="claude-3-5-haiku-2024
         return {"error": "Either a prompt or an endpoint must be provided"}
 
     if prompt:
-        # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "kegg.pkl")
-        with open(schema_path, "rb") as f:
-            kegg_schema = pickle.load(f)
+        kegg_schema = get_schema("kegg")
 
         # Create system prompt template
         system_template = """
@@ -1134,6 +1266,7 @@ def query_kegg(prompt, endpoint=None, api_key=None, model="claude-3-5-haiku-2024
     return api_result
 
 
+@trace_tool
 def query_stringdb(
     prompt=None,
     endpoint=None,
@@ -1174,9 +1307,7 @@ def query_stringdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load STRING schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "stringdb.pkl")
-        with open(schema_path, "rb") as f:
-            stringdb_schema = pickle.load(f)
+        stringdb_schema = get_schema("stringdb")
 
         # Create system prompt template
         system_template = """
@@ -1244,7 +1375,7 @@ def query_stringdb(
         if download_image:
             # For images, we need to handle the download manually
             try:
-                response = requests.get(endpoint, stream=True)
+                response = get_transport().get(endpoint, stream=True)
                 response.raise_for_status()
 
                 # Create output directory if needed
@@ -1307,6 +1438,7 @@ def query_stringdb(
     return api_result
 
 
+@trace_tool
 def query_iucn(
     prompt=None,
     endpoint=None,
@@ -1349,9 +1481,7 @@ def query_iucn(
     # If using prompt, parse with Claude
     if prompt:
         # Load IUCN schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "iucn.pkl")
-        with open(schema_path, "rb") as f:
-            iucn_schema = pickle.load(f)
+        iucn_schema = get_schema("iucn")
 
         # Create system prompt template
         system_template = """
@@ -1419,6 +1549,7 @@ def query_iucn(
     return api_result
 
 
+@trace_tool
 def query_paleobiology(
     prompt=None,
     endpoint=None,
@@ -1455,9 +1586,7 @@ def query_paleobiology(
     # If using prompt, parse with Claude
     if prompt:
         # Load PBDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pbdb.pkl")
-        with open(schema_path, "rb") as f:
-            pbdb_schema = pickle.load(f)
+        pbdb_schema = get_schema("paleobiology")
 
         # Create system prompt template
         system_template = """
@@ -1519,7 +1648,7 @@ def query_paleobiology(
     if is_image:
         # For image queries, we need special handling
         try:
-            response = requests.get(endpoint)
+            response = get_transport().get(endpoint)
             response.raise_for_status()
 
             # Return image metadata without the binary data
@@ -1552,6 +1681,7 @@ def query_paleobiology(
     return api_result
 
 
+@trace_tool
 def query_jaspar(
     prompt=None,
     endpoint=None,
@@ -1588,9 +1718,7 @@ def query_jaspar(
     # If using prompt, parse with Claude
     if prompt:
         # Load JASPAR schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "jaspar.pkl")
-        with open(schema_path, "rb") as f:
-            jaspar_schema = pickle.load(f)
+        jaspar_schema = get_schema("jaspar")
 
         # Create system prompt template
         system_template = """
@@ -1661,6 +1789,7 @@ def query_jaspar(
     return api_result
 
 
+@trace_tool
 def query_worms(
     prompt=None,
     endpoint=None,
@@ -1697,9 +1826,7 @@ def query_worms(
     # If using prompt, parse with Claude
     if prompt:
         # Load WoRMS schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "worms.pkl")
-        with open(schema_path, "rb") as f:
-            worms_schema = pickle.load(f)
+        worms_schema = get_schema("worms")
 
         # Create system prompt template
         system_template = """
@@ -1763,21 +1890,26 @@ def query_worms(
     return api_result
 
 
+@trace_tool
 def query_cbioportal(
     prompt=None,
     endpoint=None,
     api_key=None,
     model="claude-3-5-haiku-20241022",
     verbose=True,
+    fields=None,
 ):
     """Query the cBioPortal REST API using natural language or a direct endpoint.
 
+    Responses larger than ``BIOMNI_SPILL_BYTES`` are saved to a compressed artifact and summarized.
+
     Parameters
     ----------
     prompt (str, required): Natural language query about cancer genomics data
     endpoint (str, optional): API endpoint path (e.g., "/studies/brca_tcga/patients") or full URL
     api_key (str, optional): Anthropic API key. If None, will use ANTHROPIC_API_KEY env variable
     model (str): Anthropic model to use for natural language processing
+    fields (list[str], optional): JSONPath expressions (e.g. "$[*].sampleId") to return instead of the full response
 
     Returns
     -------
@@ -1799,9 +1931,7 @@ def query_cbioportal(
     # If using prompt, parse with Claude
     if prompt:
         # Load cBioPortal schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "cbioportal.pkl")
-        with open(schema_path, "rb") as f:
-            cbioportal_schema = pickle.load(f)
+        cbioportal_schema = get_schema("cbioportal")
 
         # Create system prompt template
         system_template = """
@@ -1862,14 +1992,17 @@ def query_cbioportal(
         description = "Direct query to cBioPortal API"
 
     # Execute the cBioPortal API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(
+        endpoint=endpoint, method="GET", description=description, fields=fields, spill_bytes=SPILL_BYTES
+    )
 
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
+    if not verbose and not fields and api_result.get("success") and "result" in api_result:
         return _format_query_results(api_result["result"])
 
     return api_result
 
 
+@trace_tool
 def query_clinvar(
     prompt=None,
     search_term=None,
@@ -1897,9 +2030,7 @@ def query_clinvar(
 
     if prompt:
         # Load ClinVar schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "clinvar.pkl")
-        with open(schema_path, "rb") as f:
-            clinvar_schema = pickle.load(f)
+        clinvar_schema = get_schema("clinvar")
 
         # ClinVar system prompt template
         system_prompt_template = """
@@ -1959,6 +2090,7 @@ def query_clinvar(
     )
 
 
+@trace_tool
 def query_geo(
     prompt=None,
     search_term=None,
@@ -1994,9 +2126,7 @@ def query_geo(
 
     if prompt:
         # Load GEO schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "geo.pkl")
-        with open(schema_path, "rb") as f:
-            geo_schema = pickle.load(f)
+        geo_schema = get_schema("geo")
 
         # Create system prompt template
         system_template = """
@@ -2064,6 +2194,7 @@ def query_geo(
     return result
 
 
+@trace_tool
 def query_dbsnp(
     prompt=None,
     search_term=None,
@@ -2097,9 +2228,7 @@ def query_dbsnp(
 
     if prompt:
         # Load dbSNP schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "dbsnp.pkl")
-        with open(schema_path, "rb") as f:
-            dbsnp_schema = pickle.load(f)
+        dbsnp_schema = get_schema("dbsnp")
 
         # Create system prompt template
         system_template = """
@@ -2159,6 +2288,7 @@ def query_dbsnp(
     return result
 
 
+@trace_tool
 def query_ucsc(
     prompt=None,
     endpoint=None,
@@ -2197,9 +2327,7 @@ def query_ucsc(
     # If using prompt, parse with Claude
     if prompt:
         # Load UCSC schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ucsc.pkl")
-        with open(schema_path, "rb") as f:
-            ucsc_schema = pickle.load(f)
+        ucsc_schema = get_schema("ucsc")
 
         # Create system prompt template
         system_template = """
@@ -2268,6 +2396,7 @@ def query_ucsc(
     return api_result
 
 
+@trace_tool
 def query_ensembl(
     prompt=None,
     endpoint=None,
@@ -2306,9 +2435,7 @@ def query_ensembl(
     # If using prompt, parse with Claude
     if prompt:
         # Load Ensembl schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ensembl.pkl")
-        with open(schema_path, "rb") as f:
-            ensembl_schema = pickle.load(f)
+        ensembl_schema = get_schema("ensembl")
 
         # Create system prompt template
         system_template = """
@@ -2395,6 +2522,7 @@ def query_ensembl(
     return api_result
 
 
+@trace_tool
 def query_opentarget_genetics(
     prompt=None,
     query=None,
@@ -2433,9 +2561,7 @@ def query_opentarget_genetics(
     # If using prompt, parse with Claude
     if prompt:
         # Load OpenTargets schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "opentarget_genetics.pkl")
-        with open(schema_path, "rb") as f:
-            opentarget_schema = pickle.load(f)
+        opentarget_schema = get_schema("opentarget_genetics")
 
         # Create system prompt template
         system_template = """
@@ -2500,6 +2626,7 @@ def query_opentarget_genetics(
     return api_result
 
 
+@trace_tool
 def query_opentarget(
     prompt=None,
     query=None,
@@ -2507,9 +2634,12 @@ def query_opentarget(
     api_key=None,
     model="claude-3-5-haiku-20241022",
     verbose=False,
+    fields=None,
 ):
     """Query the OpenTargets Platform API using natural language or a direct GraphQL query.
 
+    Responses larger than ``BIOMNI_SPILL_BYTES`` are saved to a compressed artifact and summarized.
+
     Parameters
     ----------
     prompt (str, required): Natural language query about drug targets, diseases, and mechanisms
@@ -2518,6 +2648,8 @@ def query_opentarget(
     api_key (str, optional): Anthropic API key. If None, will use ANTHROPIC_API_KEY env variable
     model (str): Anthropic model to use for natural language processing
     verbose (bool): Whether to return detailed results
+    fields (list[str], optional): JSONPath expressions to return instead of the full response,
+        e.g. "$.data.target.associatedDiseases.rows[*].disease.name"
 
     Returns
     -------
@@ -2540,9 +2672,7 @@ def query_opentarget(
     # If using prompt, parse with Claude
     if prompt:
         # Load OpenTargets schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "opentarget.pkl")
-        with open(schema_path, "rb") as f:
-            opentarget_schema = pickle.load(f)
+        opentarget_schema = get_schema("opentarget")
 
         # Create system prompt template
         system_template = """
@@ -2597,16 +2727,19 @@ def query_opentarget(
         json_data={"query": query, "variables": variables or {}},
         headers={"Content-Type": "application/json"},
         description="OpenTargets Platform GraphQL query",
+        fields=fields,
+        spill_bytes=SPILL_BYTES,
     )
 
     # Format the results if not verbose and successful
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
+    if not verbose and not fields and api_result.get("success") and "result" in api_result:
         api_result["result"] = _format_query_results(api_result["result"])
 
     return api_result
 
 
 # Monarch Initiative integration
+@trace_tool
 def query_monarch(
     prompt=None,
     endpoint=None,
@@ -2643,12 +2776,7 @@ def query_monarch(
 
     # If using prompt, use Claude to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "monarch.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                monarch_schema = pickle.load(f)
-        else:
-            monarch_schema = None
+        monarch_schema = get_schema("monarch") if get_schema_registry().has("monarch") else None
 
         system_template = """
         You are an expert in translating natural language requests into REST API calls for the Monarch Initiative Platform API.
@@ -2726,6 +2854,7 @@ def query_monarch(
 
 
 # OpenFDA integration
+@trace_tool
 def query_openfda(
     prompt=None,
     endpoint=None,
@@ -2761,12 +2890,7 @@ def query_openfda(
 
     # If using prompt, use Claude or Gemini to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "openfda.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                openfda_schema = pickle.load(f)
-        else:
-            openfda_schema = None
+        openfda_schema = get_schema("openfda") if get_schema_registry().has("openfda") else None
 
         system_template = """
         You are a biomedical informatics expert specialized in using the OpenFDA API.\n\nBased on the user's natural language request, determine the appropriate OpenFDA API endpoint and parameters.\n\nOPENFDA API SCHEMA:\n{schema}\n\nYour response should be a JSON object with the following fields:\n1. \"full_url\": The complete URL to query (including the base URL \"https://api.fda.gov\" and any parameters)\n2. \"description\": A brief description of what the query is doing\n\nSPECIAL NOTES:\n- For drug event queries, use /drug/event.json?search=...\n- For drug label queries, use /drug/label.json?search=...\n- For recall queries, use /drug/enforcement.json?search=...\n- Use max_results to limit the number of returned items if supported (limit=)\n- Always URL-encode search terms\n- Return ONLY the JSON object with no additional text.\n        """
@@ -2811,6 +2935,7 @@ def query_openfda(
     return api_result
 
 
+@trace_tool
 def query_gwas_catalog(
     prompt=None,
     endpoint=None,
@@ -2849,9 +2974,7 @@ def query_gwas_catalog(
     # If using prompt, parse with Claude
     if prompt:
         # Load GWAS Catalog schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gwas_catalog.pkl")
-        with open(schema_path, "rb") as f:
-            gwas_schema = pickle.load(f)
+        gwas_schema = get_schema("gwas_catalog")
 
         # Create system prompt template
         system_template = """
@@ -2919,6 +3042,7 @@ def query_gwas_catalog(
     return api_result
 
 
+@trace_tool
 def query_gnomad(
     prompt=None,
     gene_symbol=None,
@@ -2955,9 +3079,7 @@ def query_gnomad(
     # If using prompt, parse with Claude
     if prompt and not gene_symbol:
         # Load gnomAD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gnomad.pkl")
-        with open(schema_path, "rb") as f:
-            gnomad_schema = pickle.load(f)
+        gnomad_schema = get_schema("gnomad")
 
         # Create system prompt template
         system_template = """
@@ -3023,9 +3145,12 @@ def query_gnomad(
     return api_result
 
 
+@trace_tool
 def blast_sequence(sequence: str, database: str, program: str) -> dict[str, str | float] | str:
     """Identifies a DNA sequence using NCBI BLAST with improved error handling, timeout management, and debugging.
 
+    The search runs through the BLAST job manager, so an identical sequence is answered from the result cache.
+
     Args:
         sequence (str): The sequence to identify. If DNA, use database: core_nt, program: blastn;
                         if protein, use database: nr, program: blastp
@@ -3036,95 +3161,113 @@ def blast_sequence(sequence: str, database: str, program: str) -> dict[str, str
         dict: A dictionary containing the title, e-value, identity percentage, and coverage percentage of the best alignment
 
     """
-    max_attempts = 1  # One initial attempt plus one retry
-    attempts = 0
     max_runtime = 600  # 10 minutes in seconds
+    manager = get_blast_manager()
+    try:
+        print("Submitting BLAST job...")
+        job_id = manager.submit(sequence, program, database, expect=100, word_size=7, megablast=True, hitlist_size=50)
+        if not manager.wait(job_id, timeout=max_runtime):
+            manager.cancel(job_id)
+            return "BLAST search failed after maximum attempts due to timeout"
+        status = manager.status(job_id)
+        if status["error"]:
+            return f"Error during BLAST search after maximum attempts: {status['error']}"
+
+        hits = manager.results(job_id)
+        print(f"Number of alignments found: {hits['hit_id'].nunique()}")
+        if hits.empty:
+            return "No alignments found - sequence might be too short or low complexity"
+
+        best = hits.sort_values(["evalue", "bitscore"], ascending=[True, False]).iloc[0]
+        return {
+            "hit_id": best["hit_id"],
+            "hit_def": best["hit_def"],
+            "accession": best["accession"],
+            "e_value": float(best["evalue"]),
+            "identity": float(best["pct_identity"]),
+            "coverage": float(best["query_coverage"]),
+        }
+    except Exception as e:
+        return f"Error during BLAST search after maximum attempts: {str(e)}"
 
-    while attempts < max_attempts:
-        try:
-            attempts += 1
-            query_sequence = Seq(sequence)
-
-            # Start timer
-            start_time = time.time()
-
-            # Submit BLAST job
-            print(f"Submitting BLAST job (attempt {attempts}/{max_attempts})...")
-            result_handle = NCBIWWW.qblast(
-                program,
-                database,
-                query_sequence,
-                expect=100,
-                word_size=7,
-                megablast=True,
-            )
 
-            # Parse results with timeout check
-            blast_records = NCBIXML.parse(result_handle)
-            blast_record = None
+@trace_tool
+def submit_blast_job(sequences, database, program, backend="remote", expect=10.0, hitlist_size=50):
+    """Submit one or many sequences to BLAST without waiting for the search to finish.
 
-            # Try to get the first record with timeout check
-            while time.time() - start_time < max_runtime:
-                try:
-                    # Set a short timeout for next operation
-                    blast_record = next(blast_records)  # Get first record
-                    break  # Successfully got the record
-                except StopIteration:
-                    # No more records
-                    return "No BLAST results found"
-                except Exception:
-                    # Check if we've exceeded the time limit
-                    if time.time() - start_time >= max_runtime:
-                        if attempts < max_attempts:
-                            print("BLAST job timeout exceeded. Resubmitting...")
-                            break  # Break to retry
-                        else:
-                            return "BLAST search failed after maximum attempts due to timeout"
-                    # Brief pause before trying again
-                    time.sleep(1)
-
-            # Check if we timed out during record retrieval
-            if blast_record is None:
-                if attempts < max_attempts:
-                    continue  # Retry
-                else:
-                    return "BLAST search failed after maximum attempts due to timeout"
-
-            # Debug information
-            print(f"Number of alignments found: {len(blast_record.alignments)}")
-
-            if blast_record.alignments:
-                for alignment in blast_record.alignments:
-                    print("\nAlignment:")
-                    print(f"hit_id: {alignment.hit_id}")
-                    print(f"hit_def: {alignment.hit_def}")
-                    print(f"accession: {alignment.accession}")
-                    for hsp in alignment.hsps:
-                        print(f"E-value: {hsp.expect}")
-                        print(f"Score: {hsp.score}")
-                        print(f"Identities: {hsp.identities}/{hsp.align_length}")
-
-                        return {
-                            "hit_id": alignment.hit_id,
-                            "hit_def": alignment.hit_def,
-                            "accession": alignment.accession,
-                            "e_value": hsp.expect,
-                            "identity": (hsp.identities / float(hsp.align_length)) * 100,
-                            "coverage": len(hsp.query) / len(sequence) * 100,
-                        }
-            else:
-                return "No alignments found - sequence might be too short or low complexity"
+    All sequences are sent in a single batched request and tracked in the background; previously searched
+    sequences are answered from the result cache. Collect the results with ``get_blast_results``.
 
-        except Exception as e:
-            if attempts < max_attempts:
-                print(f"Error during BLAST search: {str(e)}. Retrying...")
-                time.sleep(2)  # Wait briefly before retrying
-            else:
-                return f"Error during BLAST search after maximum attempts: {str(e)}"
+    Parameters
+    ----------
+    sequences (str | list | dict): One sequence, FASTA text, a list of sequences or a dict of named sequences
+    database (str): NCBI database (e.g. "core_nt", "nr", "swissprot") for the remote backend, or the path of a
+        local BLAST+/DIAMOND database built with ``make_local_database``
+    program (str): "blastn", "blastp", "blastx", "tblastn" or "tblastx"
+    backend (str): "remote" (NCBI BLAST), "local" (BLAST+) or "diamond"
+    expect (float): E-value threshold
+    hitlist_size (int): Maximum number of hits per query
 
-    return "BLAST search failed after maximum attempts"
+    Returns
+    -------
+    str: The job ID
 
+    """
+    return get_blast_manager().submit(
+        sequences, program, database, backend=backend, expect=expect, hitlist_size=hitlist_size
+    )
 
+
+@trace_tool
+def get_blast_results(job_id, wait=True, timeout=900):
+    """Return all hits and HSPs of a BLAST job as a DataFrame.
+
+    Parameters
+    ----------
+    job_id (str): ID returned by ``submit_blast_job``
+    wait (bool): Wait for the job to finish; if False, a running job returns its status instead
+    timeout (float): Maximum number of seconds to wait
+
+    Returns
+    -------
+    pandas.DataFrame | dict: One row per HSP (query, hit_id, hit_def, accession, evalue, bitscore,
+        pct_identity, query_coverage and alignment coordinates), or the job status if it is not finished
+        or failed
+
+    """
+    manager = get_blast_manager()
+    if wait:
+        manager.wait(job_id, timeout=timeout)
+    status = manager.status(job_id)
+    if status["status"] != "done":
+        return status
+    return manager.results(job_id)
+
+
+@trace_tool
+def blast_sequences(sequences, database, program, backend="remote", expect=10.0, hitlist_size=50, timeout=900):
+    """Search many sequences with BLAST in one batched job and return every hit and HSP as a DataFrame.
+
+    Parameters
+    ----------
+    sequences (str | list | dict): One sequence, FASTA text, a list of sequences or a dict of named sequences
+    database (str): NCBI database for the remote backend, or the path of a local BLAST+/DIAMOND database
+    program (str): "blastn", "blastp", "blastx", "tblastn" or "tblastx"
+    backend (str): "remote" (NCBI BLAST), "local" (BLAST+) or "diamond"
+    expect (float): E-value threshold
+    hitlist_size (int): Maximum number of hits per query
+    timeout (float): Maximum number of seconds to wait
+
+    Returns
+    -------
+    pandas.DataFrame | dict: One row per HSP, or the job status if it failed or did not finish in time
+
+    """
+    job_id = submit_blast_job(sequences, database, program, backend, expect=expect, hitlist_size=hitlist_size)
+    return get_blast_results(job_id, wait=True, timeout=timeout)
+
+
+@trace_tool
 def query_reactome(
     prompt=None,
     endpoint=None,
@@ -3133,9 +3276,12 @@ def query_reactome(
     api_key=None,
     model="claude-3-5-haiku-20241022",
     verbose=True,
+    fields=None,
 ):
     """Query the Reactome database using natural language or a direct endpoint.
 
+    Responses larger than ``BIOMNI_SPILL_BYTES`` are saved to a compressed artifact and summarized.
+
     Parameters
     ----------
     prompt (str, required): Natural language query about biological pathways
@@ -3145,6 +3291,7 @@ def query_reactome(
     api_key (str, optional): Anthropic API key. If None, will use ANTHROPIC_API_KEY env variable
     model (str): Anthropic model to use for natural language processing
     verbose (bool): Whether to return detailed results
+    fields (list[str], optional): JSONPath expressions (e.g. "$[*].stId") to return instead of the full response
 
     Returns
     -------
@@ -3171,9 +3318,7 @@ def query_reactome(
     # If using prompt, parse with Claude
     if prompt:
         # Load Reactome schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "reactome.pkl")
-        with open(schema_path, "rb") as f:
-            reactome_schema = pickle.load(f)
+        reactome_schema = get_schema("reactome")
 
         # Create system prompt template
         system_template = """
@@ -3257,7 +3402,9 @@ def query_reactome(
         url = f"{base_url}/{endpoint}"
 
     # Execute the Reactome API request using the helper function
-    api_result = _query_rest_api(endpoint=url, method="GET", params=params, description=description)
+    api_result = _query_rest_api(
+        endpoint=url, method="GET", params=params, description=description, fields=fields, spill_bytes=SPILL_BYTES
+    )
 
     # Handle downloading pathway diagrams if requested
     if should_download and api_result.get("success") and "result" in api_result:
@@ -3272,7 +3419,7 @@ def query_reactome(
         if pathway_id and output_dir:
             diagram_url = f"{content_base_url}/data/pathway/{pathway_id}/diagram"
             try:
-                diagram_response = requests.get(diagram_url)
+                diagram_response = get_transport().get(diagram_url)
                 diagram_response.raise_for_status()
 
                 # Save diagram file
@@ -3284,12 +3431,13 @@ def query_reactome(
             except Exception as e:
                 api_result["diagram_error"] = f"Failed to download diagram: {str(e)}"
 
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
+    if not verbose and not fields and api_result.get("success") and "result" in api_result:
         return _format_query_results(api_result["result"])
 
     return api_result
 
 
+@trace_tool
 def query_regulomedb(
     prompt=None,
     endpoint=None,
@@ -3385,6 +3533,7 @@ def query_regulomedb(
     return api_result
 
 
+@trace_tool
 def query_pride(
     prompt=None,
     endpoint=None,
@@ -3423,9 +3572,7 @@ def query_pride(
     # If using prompt, parse with Claude
     if prompt:
         # Load PRIDE schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pride.pkl")
-        with open(schema_path, "rb") as f:
-            pride_schema = pickle.load(f)
+        pride_schema = get_schema("pride")
 
         # Create system prompt template
         system_template = """
@@ -3491,6 +3638,7 @@ def query_pride(
     return api_result
 
 
+@trace_tool
 def query_gtopdb(
     prompt=None,
     endpoint=None,
@@ -3528,9 +3676,7 @@ def query_gtopdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load GtoPdb schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gtopdb.pkl")
-        with open(schema_path, "rb") as f:
-            gtopdb_schema = pickle.load(f)
+        gtopdb_schema = get_schema("gtopdb")
 
         # Create system prompt template
         system_template = r"""
@@ -3599,6 +3745,7 @@ def query_gtopdb(
     return api_result
 
 
+@trace_tool
 def region_to_ccre_screen(coord_chrom: str, coord_start: int, coord_end: int, assembly: str = "GRCh38") -> str:
     """Given starting and ending coordinates, this function retrieves information of intersecting cCREs.
 
@@ -3631,7 +3778,7 @@ def region_to_ccre_screen(coord_chrom: str, coord_start: int, coord_end: int, as
         steps.append(str(data))
 
         # Make the request
-        response = requests.post(url, json=data)
+        response = get_transport().post(url, json=data)
 
         # Check if the response is successful
         if not response.ok:
@@ -3706,6 +3853,7 @@ def region_to_ccre_screen(coord_chrom: str, coord_start: int, coord_end: int, as
         return "\n".join(steps + [f"Error: {str(e)}"])
 
 
+@trace_tool
 def get_genes_near_ccre(accession: str, assembly: str, chromosome: str, k: int = 10) -> str:
     """Given a cCRE (Candidate cis-Regulatory Element), this function returns a string containing the
     steps it performs and the k nearest genes sorted by distance.
@@ -3730,7 +3878,7 @@ def get_genes_near_ccre(accession: str, assembly: str, chromosome: str, k: int =
     data = {"accession": accession, "assembly": assembly, "coord_chrom": chromosome}
 
     steps_log += "Sending POST request to API with given data.\n"
-    response = requests.post(url, json=data)
+    response = get_transport().post(url, json=data)
 
     if not response.ok:
         steps_log += f"API request failed with response: {response.text}\n"
@@ -3765,6 +3913,7 @@ def get_genes_near_ccre(accession: str, assembly: str, chromosome: str, k: int =
     return steps_log
 
 
+@trace_tool
 def query_remap(
     prompt=None,
     endpoint=None,
@@ -3802,9 +3951,7 @@ def query_remap(
     # If using prompt, parse with Claude
     if prompt:
         # Load ReMap schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "remap.pkl")
-        with open(schema_path, "rb") as f:
-            remap_schema = pickle.load(f)
+        remap_schema = get_schema("remap")
 
         # Create system prompt template
         system_template = """
@@ -3872,6 +4019,7 @@ def query_remap(
     return api_result
 
 
+@trace_tool
 def query_mpd(
     prompt=None,
     endpoint=None,
@@ -3909,9 +4057,7 @@ def query_mpd(
     # If using prompt, parse with Claude
     if prompt:
         # Load MPD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "mpd.pkl")
-        with open(schema_path, "rb") as f:
-            mpd_schema = pickle.load(f)
+        mpd_schema = get_schema("mpd")
 
         # Create system prompt template
         system_template = """
@@ -3979,6 +4125,7 @@ def query_mpd(
     return api_result
 
 
+@trace_tool
 def query_emdb(
     prompt=None,
     endpoint=None,
@@ -4016,9 +4163,7 @@ def query_emdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load EMDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "emdb.pkl")
-        with open(schema_path, "rb") as f:
-            emdb_schema = pickle.load(f)
+        emdb_schema = get_schema("emdb")
 
         # Create system prompt template
         system_template = """
@@ -4088,3 +4233,351 @@ def query_emdb(
         api_result["result"] = _format_query_results(api_result["result"])
 
     return api_result
+
+
+# Batch queries for identifier lists
+def _fan_out(func, items, max_workers=8):
+    """Apply ``func`` to each item with bounded concurrency and return the results in input order."""
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def _chunks(items, size):
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _unique_ids(identifiers):
+    """Strip identifiers and drop duplicates and blanks while keeping the input order."""
+    if isinstance(identifiers, str):
+        identifiers = [identifiers]
+    return list(dict.fromkeys(str(i).strip() for i in identifiers if str(i).strip()))
+
+
+def _flatten_cell(value):
+    # Collapse the small lists GraphQL and REST APIs return (e.g. [{"method": "X-RAY"}]) into scalars
+    if isinstance(value, list):
+        parts = []
+        for item in value:
+            if isinstance(item, dict):
+                parts.extend(str(v) for v in item.values() if v is not None)
+            elif item is not None:
+                parts.append(item)
+        if len(parts) == 1:
+            return parts[0]
+        return "; ".join(str(p) for p in parts) if parts else None
+    return value
+
+
+def _tidy_frame(rows, identifiers, errors=None):
+    """Build one DataFrame with a leading ``query`` column and a row for every identifier without a result."""
+    import pandas as pd
+
+    frame = pd.json_normalize(rows) if rows else pd.DataFrame(columns=["query"])
+    for column in frame.columns:
+        if frame[column].map(lambda v: isinstance(v, list)).any():
+            frame[column] = frame[column].map(_flatten_cell)
+    found = set(frame["query"])
+    missing = [i for i in identifiers if i not in found]
+    if missing:
+        errors = errors or {}
+        frame = pd.concat(
+            [frame, pd.DataFrame({"query": missing, "error": [errors.get(i, "not found") for i in missing]})],
+            ignore_index=True,
+        )
+    columns = ["query"] + [c for c in frame.columns if c != "query"]
+    return frame[columns]
+
+
+UNIPROT_BATCH_FIELDS = ["accession", "id", "gene_names", "protein_name", "organism_name", "length", "reviewed"]
+
+
+@trace_tool
+def batch_query_uniprot(identifiers, id_type="accession", fields=None, organism_id=9606, batch_size=100):
+    """Look up many UniProt entries at once with OR-joined queries to the UniProtKB stream endpoint.
+
+    Parameters
+    ----------
+    identifiers (list): UniProt accessions (e.g. ["P04637", "P38398"]) or gene symbols
+    id_type (str): "accession" or "gene" (exact gene name, restricted to reviewed entries of ``organism_id``)
+    fields (list, optional): UniProt return fields; defaults to accession, entry name, gene names,
+        protein name, organism, length and review status
+    organism_id (int): NCBI taxonomy ID used for gene lookups (default human, 9606)
+    batch_size (int): Identifiers per request
+
+    Returns
+    -------
+    pandas.DataFrame: One row per matching entry, with the input identifier in the ``query`` column.
+        Identifiers without a match get a row with an ``error`` message.
+
+    """
+    import io
+
+    import pandas as pd
+
+    if id_type not in ("accession", "gene"):
+        return pd.DataFrame({"error": [f"Unsupported id_type '{id_type}', expected 'accession' or 'gene'"]})
+    identifiers = _unique_ids(identifiers)
+    fields = fields or UNIPROT_BATCH_FIELDS
+    if "accession" not in fields:
+        fields = ["accession", *fields]
+    if id_type == "gene" and "gene_names" not in fields:
+        fields = [*fields, "gene_names"]
+    field_prefix = "accession" if id_type == "accession" else "gene_exact"
+
+    def fetch(batch):
+        query = " OR ".join(f"{field_prefix}:{i}" for i in batch)
+        if id_type == "gene":
+            query = f"({query}) AND organism_id:{organism_id} AND reviewed:true"
+        result = _query_rest_api(
+            endpoint="https://rest.uniprot.org/uniprotkb/stream",
+            params={"query": query, "format": "tsv", "fields": ",".join(fields)},
+            headers={"Accept": "text/plain"},
+            description=f"UniProt batch lookup of {len(batch)} identifiers",
+        )
+        if not result.get("success"):
+            return batch, None, result.get("error")
+        text = result["result"].get("raw_text", "") if isinstance(result["result"], dict) else str(result["result"])
+        return batch, pd.read_csv(io.StringIO(text), sep="\t") if text.strip() else pd.DataFrame(), None
+
+    frames, errors = [], {}
+    pending = _chunks(identifiers, batch_size)
+    while pending:
+        retry = []
+        for batch, frame, error in _fan_out(fetch, pending, max_workers=4):
+            if frame is not None:
+                frames.append(frame)
+            elif len(batch) > 1:
+                # One malformed identifier fails the whole OR query; retry the batch one identifier at a time
+                retry.extend([i] for i in batch)
+            else:
+                errors[batch[0]] = error
+        pending = retry
+
+    rows = []
+    wanted = {i.upper(): i for i in identifiers}
+    for frame in frames:
+        for record in frame.to_dict("records"):
+            if id_type == "accession":
+                match = wanted.get(str(record.get("Entry", "")).upper())
+                rows.append({"query": match or record.get("Entry"), **record})
+            else:
+                genes = str(record.get("Gene Names", "")).upper().split()
+                matches = [wanted[g] for g in genes if g in wanted] or [None]
+                rows.extend({"query": m, **record} for m in matches)
+    return _tidy_frame(rows, identifiers, errors)
+
+
+PDB_BATCH_FIELDS = """
+    rcsb_id
+    struct { title }
+    exptl { method }
+    rcsb_entry_info { resolution_combined molecular_weight polymer_entity_count deposited_atom_count }
+    rcsb_accession_info { initial_release_date }
+"""
+
+
+@trace_tool
+def batch_query_pdb(identifiers, fields=None, batch_size=200):
+    """Retrieve summary data for many PDB entries in one RCSB GraphQL request per batch.
+
+    Parameters
+    ----------
+    identifiers (list): PDB entry IDs (e.g. ["4HHB", "1TUP"])
+    fields (str, optional): GraphQL selection of ``CoreEntry`` fields; defaults to ID, title, method,
+        resolution, molecular weight, entity and atom counts and release date. Must include ``rcsb_id``.
+    batch_size (int): Entries per request
+
+    Returns
+    -------
+    pandas.DataFrame: One row per entry with nested fields flattened into dotted columns, with the input
+        ID in the ``query`` column. IDs that were not found get a row with an ``error`` message.
+
+    """
+    identifiers = [i.upper() for i in _unique_ids(identifiers)]
+    graphql_query = f"query($ids: [String!]!) {{ entries(entry_ids: $ids) {{ {fields or PDB_BATCH_FIELDS} }} }}"
+
+    def fetch(batch):
+        result = _query_rest_api(
+            endpoint="https://data.rcsb.org/graphql",
+            method="POST",
+            json_data={"query": graphql_query, "variables": {"ids": batch}},
+            description=f"RCSB GraphQL lookup of {len(batch)} entries",
+        )
+        if not result.get("success"):
+            return [], {i: result.get("error") for i in batch}
+        payload = result["result"]
+        if payload.get("errors") and not payload.get("data"):
+            message = "; ".join(e.get("message", "") for e in payload["errors"])
+            return [], dict.fromkeys(batch, message)
+        entries = (payload.get("data") or {}).get("entries") or []
+        return [{"query": e.get("rcsb_id"), **e} for e in entries if e], {}
+
+    rows, errors = [], {}
+    for batch_rows, batch_errors in _fan_out(fetch, _chunks(identifiers, batch_size), max_workers=4):
+        rows.extend(batch_rows)
+        errors.update(batch_errors)
+    return _tidy_frame(rows, identifiers, errors)
+
+
+@trace_tool
+def batch_query_ensembl(identifiers, id_type="id", species="homo_sapiens", expand=False, batch_size=1000):
+    """Look up many Ensembl stable IDs or gene symbols with the Ensembl REST POST lookup endpoints.
+
+    Parameters
+    ----------
+    identifiers (list): Ensembl stable IDs (e.g. ["ENSG00000141510"]) or gene symbols (e.g. ["TP53"])
+    id_type (str): "id" for ``POST /lookup/id`` or "symbol" for ``POST /lookup/symbol/{species}``
+    species (str): Species for symbol lookups
+    expand (bool): Include transcripts (and their translations and exons) as nested columns
+    batch_size (int): Identifiers per request (the Ensembl maximum is 1000)
+
+    Returns
+    -------
+    pandas.DataFrame: One row per identifier with location, biotype and description columns, with the
+        input identifier in the ``query`` column. Unknown identifiers get a row with an ``error`` message.
+
+    """
+    if id_type == "id":
+        endpoint, key = "https://rest.ensembl.org/lookup/id", "ids"
+    elif id_type == "symbol":
+        endpoint, key = f"https://rest.ensembl.org/lookup/symbol/{species}", "symbols"
+    else:
+        import pandas as pd
+
+        return pd.DataFrame({"error": [f"Unsupported id_type '{id_type}', expected 'id' or 'symbol'"]})
+    identifiers = _unique_ids(identifiers)
+
+    def fetch(batch):
+        result = _query_rest_api(
+            endpoint=endpoint,
+            method="POST",
+            params={"expand": int(bool(expand))},
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+            json_data={key: batch},
+            description=f"Ensembl batch lookup of {len(batch)} identifiers",
+        )
+        if not result.get("success"):
+            return [], {i: result.get("error") for i in batch}
+        return [{"query": q, **record} for q, record in result["result"].items() if record], {}
+
+    rows, errors = [], {}
+    for batch_rows, batch_errors in _fan_out(fetch, _chunks(identifiers, batch_size), max_workers=2):
+        rows.extend(batch_rows)
+        errors.update(batch_errors)
+    return _tidy_frame(rows, identifiers, errors)
+
+
+@trace_tool
+def batch_query_ncbi(identifiers, database="gene", rettype=None, batch_size=500):
+    """Fetch many NCBI records at once by posting the IDs to the history server (EPost).
+
+    Summaries are then retrieved with ESummary, or full records with EFetch when ``rettype`` is given,
+    in pages of ``batch_size`` records from the same WebEnv.
+
+    Parameters
+    ----------
+    identifiers (list): NCBI UIDs or accessions (e.g. Gene IDs ["7157", "672"] or ["NM_000546.6"])
+    database (str): Entrez database, e.g. "gene", "protein", "nuccore", "pubmed", "snp"
+    rettype (str, optional): None for document summaries, or "fasta" / "gb" to fetch sequences
+    batch_size (int): Records per ESummary/EFetch page
+
+    Returns
+    -------
+    pandas.DataFrame: One row per record with the input identifier in the ``query`` column. Sequence
+        records have ``id``, ``description``, ``length`` and ``sequence`` columns. Identifiers without
+        a record, or whose page failed, get a row with an ``error`` message.
+
+    """
+    import io
+
+    import pandas as pd
+    from Bio import SeqIO
+
+    identifiers = _unique_ids(identifiers)
+    if not identifiers:
+        return pd.DataFrame(columns=["query"])
+    if rettype not in (None, "fasta", "gb"):
+        return pd.DataFrame({"error": [f"Unsupported rettype '{rettype}', expected None, 'fasta' or 'gb'"]})
+
+    # Records come back keyed by UID or accession.version; map every form back to the identifier that was asked for
+    wanted = {}
+    for identifier in identifiers:
+        for key in _ncbi_keys(identifier):
+            wanted.setdefault(key, identifier)
+
+    def match(*names):
+        for name in names:
+            for key in _ncbi_keys(name):
+                if key in wanted:
+                    return wanted[key]
+        return None
+
+    client = EutilsClient(batch_size=batch_size)
+    try:
+        posted = client.epost(database, identifiers)
+    except Exception as e:
+        return _tidy_frame([], identifiers, dict.fromkeys(identifiers, f"NCBI EPost error: {e}"))
+    history = (database, posted["webenv"], posted["query_key"])
+
+    def fetch_summaries(page):
+        summaries = client.summary_page(*history, *page)
+        return [
+            {"query": match(s.get("uid"), s.get("accessionversion"), s.get("caption")) or str(s.get("uid")), **s}
+            for s in summaries
+        ]
+
+    def fetch_sequences(page):
+        text = client.fetch_text_page(*history, *page, rettype=rettype)
+        rows = []
+        for record in SeqIO.parse(io.StringIO(text), "fasta" if rettype == "fasta" else "genbank"):
+            # FASTA ids may carry database prefixes, e.g. "ref|NM_000546.6|"
+            names = [record.id, *record.id.split("|"), *record.annotations.get("accessions", [])]
+            rows.append(
+                {
+                    "query": match(*names) or record.id,
+                    "id": record.id,
+                    "description": record.description,
+                    "length": len(record.seq),
+                    "sequence": str(record.seq),
+                }
+            )
+        return rows
+
+    def fetch_page(page):
+        try:
+            return (fetch_summaries if rettype is None else fetch_sequences)(page), None
+        except Exception as e:
+            return [], f"NCBI error: {e}"
+
+    if rettype is not None and any(i.isdigit() for i in identifiers):
+        # Sequences are identified by accession, so resolve the UIDs that were asked for through their summaries
+        for page in client.pages(posted["count"]):
+            try:
+                for summary in client.summary_page(*history, *page):
+                    uid = str(summary.get("uid"))
+                    if uid in wanted and summary.get("accessionversion"):
+                        for key in _ncbi_keys(summary["accessionversion"]):
+                            wanted.setdefault(key, wanted[uid])
+            except Exception as e:
+                print(f"Warning: Could not resolve NCBI UIDs to accessions: {e}")
+
+    rows, errors = [], {}
+    pages = client.pages(posted["count"])
+    for page, (page_rows, error) in zip(pages, _fan_out(fetch_page, pages, max_workers=3), strict=True):
+        rows.extend(page_rows)
+        if error is not None:
+            # Records come back in posted order, so a failed page covers the same slice of the input
+            retstart, retmax = page
+            errors.update(dict.fromkeys(identifiers[retstart : retstart + retmax], error))
+    return _tidy_frame(rows, identifiers, errors)
+
+
+def _ncbi_keys(name):
+    """Return the lookup keys of an NCBI identifier: itself and, for accession.version, the bare accession."""
+    if not name:
+        return []
+    name = str(name).strip().upper()
+    return [name, name.rsplit(".", 1)[0]] if "." in name else [name]
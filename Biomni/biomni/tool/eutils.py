@@ -0,0 +1,192 @@
+import os
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+
+from biomni.tool.transport import NCBI_KEYED_BUCKET, get_transport
+
+EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+
+class EutilsError(Exception):
+    """Raised when an E-utilities request returns an error instead of results."""
+
+
+class EutilsClient:
+    """Client for the NCBI E-utilities that keeps large result sets on the history server.
+
+    Searches are run with ``usehistory=y`` and ID lists are uploaded with EPost, so only a WebEnv and
+    query key are kept locally. Summaries and records are then streamed back in pages of ``batch_size``
+    with generator methods, and XML records are parsed incrementally, so a result set of any size never
+    has to be held in memory. Requests go through the shared transport, limited to 3 requests per second,
+    or 10 for clients that send an API key (which draw from a separate rate-limit bucket).
+    """
+
+    def __init__(self, api_key: str | None = None, email: str | None = None, batch_size: int = 500):
+        """Initialize the client.
+
+        Args:
+            api_key: NCBI API key; defaults to the ``NCBI_API_KEY`` environment variable
+            email: Contact address sent with each request, as NCBI recommends for heavy use
+            batch_size: Records per ESummary/EFetch page (NCBI allows up to 10,000; 500 keeps pages small)
+
+        """
+        self.api_key = api_key or os.environ.get("NCBI_API_KEY")
+        self.email = email or os.environ.get("NCBI_EMAIL")
+        self.batch_size = batch_size
+        self.transport = get_transport()
+        # The keyed rate only applies to requests that carry the key, so it must not raise the limit of other clients
+        self.rate_key = NCBI_KEYED_BUCKET if self.api_key else None
+
+    def _params(self, **params) -> dict:
+        params = {k: v for k, v in params.items() if v is not None}
+        params["tool"] = "biomni"
+        if self.api_key:
+            params["api_key"] = self.api_key
+        if self.email:
+            params["email"] = self.email
+        return params
+
+    def _get(self, utility: str, stream: bool = False, **params):
+        response = self.transport.get(
+            f"{EUTILS_URL}/{utility}.fcgi", params=self._params(**params), stream=stream, rate_key=self.rate_key
+        )
+        response.raise_for_status()
+        return response
+
+    def esearch(self, db: str, term: str, retmax: int = 0, **params) -> dict:
+        """Run a search and keep its results on the history server.
+
+        Returns:
+            Dict with ``count``, ``webenv``, ``query_key`` and the first ``retmax`` ``ids``
+
+        """
+        data = self._get("esearch", db=db, term=term, retmax=retmax, usehistory="y", retmode="json", **params).json()
+        result = data.get("esearchresult", {})
+        if "ERROR" in result:
+            raise EutilsError(result["ERROR"])
+        return {
+            "count": int(result.get("count", 0)),
+            "webenv": result.get("webenv"),
+            "query_key": result.get("querykey"),
+            "ids": result.get("idlist", []),
+            "query_translation": result.get("querytranslation"),
+        }
+
+    def epost(self, db: str, ids: list[str], webenv: str | None = None) -> dict:
+        """Upload UIDs to the history server.
+
+        The whole list is sent in the body of a single POST, so it gets one query key that covers every UID
+        (each EPost call creates a new query key, so a list split across calls could not be paged as one set).
+
+        Returns:
+            Dict with ``count``, ``webenv`` and ``query_key``
+
+        """
+        ids = [str(i) for i in ids]
+        data = self._params(db=db, id=",".join(ids), WebEnv=webenv)
+        response = self.transport.post(f"{EUTILS_URL}/epost.fcgi", data=data, rate_key=self.rate_key)
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+        error = root.findtext(".//ERROR")
+        if error:
+            raise EutilsError(error)
+        return {"count": len(ids), "webenv": root.findtext("WebEnv"), "query_key": root.findtext("QueryKey")}
+
+    def pages(self, count: int, max_records: int | None = None) -> list[tuple[int, int]]:
+        """Return the ``(retstart, retmax)`` pages that cover ``count`` records of a history server result."""
+        total = count if max_records is None else min(count, max_records)
+        return [(retstart, min(self.batch_size, total - retstart)) for retstart in range(0, total, self.batch_size)]
+
+    def summary_page(self, db: str, webenv: str, query_key: str, retstart: int, retmax: int) -> list[dict]:
+        """Return one page of document summaries (ESummary JSON)."""
+        data = self._get(
+            "esummary", db=db, WebEnv=webenv, query_key=query_key, retstart=retstart, retmax=retmax, retmode="json"
+        ).json()
+        result = data.get("result", {})
+        if "error" in data and not result:
+            raise EutilsError(data["error"])
+        return [result[uid] for uid in result.get("uids", []) if uid in result]
+
+    def fetch_text_page(
+        self, db: str, webenv: str, query_key: str, retstart: int, retmax: int, rettype: str = "fasta"
+    ) -> str:
+        """Return one page of EFetch text output (e.g. FASTA or GenBank flat files)."""
+        return self._get(
+            "efetch",
+            db=db,
+            WebEnv=webenv,
+            query_key=query_key,
+            retstart=retstart,
+            retmax=retmax,
+            rettype=rettype,
+            retmode="text",
+        ).text
+
+    def iter_summaries(
+        self, db: str, webenv: str, query_key: str, count: int, max_records: int | None = None
+    ) -> Iterator[dict]:
+        """Yield document summaries (ESummary JSON) one record at a time, fetching a page per request."""
+        for retstart, retmax in self.pages(count, max_records):
+            yield from self.summary_page(db, webenv, query_key, retstart, retmax)
+
+    def iter_fetch_text(
+        self,
+        db: str,
+        webenv: str,
+        query_key: str,
+        count: int,
+        rettype: str = "fasta",
+        max_records: int | None = None,
+    ) -> Iterator[str]:
+        """Yield EFetch text output (e.g. FASTA or GenBank flat files) one page at a time."""
+        for retstart, retmax in self.pages(count, max_records):
+            yield self.fetch_text_page(db, webenv, query_key, retstart, retmax, rettype=rettype)
+
+    def iter_fetch_xml(
+        self,
+        db: str,
+        webenv: str,
+        query_key: str,
+        count: int,
+        record_tag: str,
+        rettype: str | None = None,
+        max_records: int | None = None,
+    ) -> Iterator[ET.Element]:
+        """Yield EFetch XML records (e.g. ``PubmedArticle``), parsing each page incrementally as it streams in.
+
+        Each element is cleared after it is yielded, so copy what you need before advancing the generator.
+        """
+        for retstart, retmax in self.pages(count, max_records):
+            response = self._get(
+                "efetch",
+                stream=True,
+                db=db,
+                WebEnv=webenv,
+                query_key=query_key,
+                retstart=retstart,
+                retmax=retmax,
+                rettype=rettype,
+                retmode="xml",
+            )
+            response.raw.decode_content = True
+            try:
+                for _, element in ET.iterparse(response.raw, events=("end",)):
+                    if element.tag == record_tag:
+                        yield element
+                        element.clear()
+            finally:
+                response.close()
+
+    def search_summaries(self, db: str, term: str, max_records: int | None = None) -> Iterator[dict]:
+        """Search a database and yield the summaries of the matches in search order."""
+        search = self.esearch(db, term)
+        if search["count"] == 0:
+            return
+        yield from self.iter_summaries(db, search["webenv"], search["query_key"], search["count"], max_records)
+
+    def summaries_for_ids(self, db: str, ids: list[str]) -> Iterator[dict]:
+        """Yield the summaries of a list of UIDs, posting them to the history server first."""
+        if not ids:
+            return
+        posted = self.epost(db, ids)
+        yield from self.iter_summaries(db, posted["webenv"], posted["query_key"], posted["count"])
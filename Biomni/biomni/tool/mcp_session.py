@@ -0,0 +1,338 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    """Return True if an exception means the server process or its pipes are gone."""
+    import anyio
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CONNECTION_CLOSED
+
+    if isinstance(exc, McpError):
+        return getattr(exc.error, "code", None) == CONNECTION_CLOSED
+    if isinstance(exc, TimeoutError):
+        # A slow call is not a dead server; TimeoutError is a subclass of OSError
+        return False
+    return isinstance(exc, anyio.ClosedResourceError | anyio.BrokenResourceError | EOFError | OSError)
+
+
+class _ServerState:
+    """Book-keeping for one configured MCP server."""
+
+    def __init__(
+        self,
+        name: str,
+        command: str,
+        args: list[str],
+        env: dict | None,
+        call_timeout: float,
+        retry_on_crash: bool = False,
+    ):
+        self.name = name
+        self.command = command
+        self.args = list(args)
+        self.env = env or None
+        self.call_timeout = call_timeout
+        self.retry_on_crash = retry_on_crash
+
+        # Owned by the background event loop
+        self.session = None
+        self.owner_task = None
+        self.stop_event = None
+        self.start_lock = None
+        self.crashed = False
+        # Times of recent restarts, for the restart limit
+        self.restart_times = deque()
+
+        # Latency counters, updated from caller threads and the event loop
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            "calls": 0,
+            "errors": 0,
+            "restarts": 0,
+            "starts": 0,
+            "startup_seconds": 0.0,
+            "total_call_seconds": 0.0,
+            "max_call_seconds": 0.0,
+            "last_call_seconds": None,
+        }
+
+    def count(self, **increments) -> None:
+        with self.stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+
+class MCPSessionManager:
+    """Keep one initialized MCP ``ClientSession`` per configured server alive on a background event loop.
+
+    The stdio server process is spawned once, on first use, and shared by every tool of that server.
+    Tool calls coming from any thread are scheduled onto the background loop, so concurrent calls are
+    multiplexed over the same session. If the server process dies, the call fails and the server is
+    restarted on the next call; servers registered with ``retry_on_crash`` (only safe for idempotent tools)
+    also re-send the failed call once. Per-server latency counters are available through ``get_stats``.
+    """
+
+    def __init__(
+        self,
+        call_timeout: float = 300,
+        startup_timeout: float = 60,
+        max_restarts: int = 3,
+        restart_window: float = 600,
+    ):
+        """Start the background event loop.
+
+        Args:
+            call_timeout: Default timeout in seconds for a single tool call
+            startup_timeout: Timeout in seconds for spawning and initializing a server
+            max_restarts: Maximum number of automatic restarts per server within ``restart_window``
+            restart_window: Seconds over which restarts are counted; older restarts no longer count
+
+        """
+        self.call_timeout = call_timeout
+        self.startup_timeout = startup_timeout
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self._servers: dict[str, _ServerState] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="biomni-mcp-sessions", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coro, timeout: float | None):
+        """Run a coroutine on the background loop and block until it finishes."""
+        if self._closed:
+            coro.close()
+            raise RuntimeError("MCP session manager has been shut down")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"MCP request timed out after {timeout} seconds") from None
+
+    def register_server(
+        self,
+        name: str,
+        command: str,
+        args: list[str] | None = None,
+        env: dict | None = None,
+        call_timeout: float | None = None,
+        retry_on_crash: bool = False,
+    ) -> None:
+        """Register a stdio MCP server. The process is started lazily on the first request.
+
+        Args:
+            name: Server name used to route tool calls
+            command: Executable used to start the server
+            args: Command line arguments for the server
+            env: Environment variables for the server process
+            call_timeout: Per-server override of the default call timeout
+            retry_on_crash: Re-send a call once on a fresh process if the server died during it; only
+                enable this for servers whose tools are idempotent
+
+        """
+        with self._lock:
+            existing = self._servers.get(name)
+            if existing and (existing.command, existing.args, existing.env) == (command, list(args or []), env or None):
+                return
+            if existing:
+                # Configuration changed: stop the old process before replacing it
+                self._submit(self._stop_server(existing), self.startup_timeout)
+            self._servers[name] = _ServerState(
+                name, command, args or [], env, call_timeout or self.call_timeout, retry_on_crash
+            )
+
+    def _get_server(self, name: str) -> _ServerState:
+        server = self._servers.get(name)
+        if server is None:
+            raise KeyError(f"MCP server '{name}' is not registered")
+        return server
+
+    async def _serve(self, server: _ServerState, ready: asyncio.Future):
+        """Own the stdio transport and the client session for the lifetime of the server.
+
+        The transport context managers must be entered and exited from the same task, so a dedicated
+        task holds them open until ``stop_event`` is set or the server process exits.
+        """
+        from mcp import ClientSession
+        from mcp.client.stdio import StdioServerParameters, stdio_client
+
+        params = StdioServerParameters(command=server.command, args=server.args, env=server.env)
+        try:
+            async with stdio_client(params) as (reader, writer):
+                async with ClientSession(reader, writer) as session:
+                    await session.initialize()
+                    server.session = session
+                    if not ready.done():
+                        ready.set_result(session)
+                    await server.stop_event.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e if isinstance(e, Exception) else RuntimeError(str(e)))
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            server.session = None
+
+    async def _ensure_session(self, server: _ServerState):
+        """Return a live session, spawning or respawning the server process if necessary."""
+        if server.start_lock is None:
+            server.start_lock = asyncio.Lock()
+
+        async with server.start_lock:
+            if server.session is not None and server.owner_task is not None and not server.owner_task.done():
+                return server.session
+
+            if server.crashed or server.owner_task is not None:
+                # The previous process exited or failed; count it as a restart
+                now = time.monotonic()
+                while server.restart_times and now - server.restart_times[0] > self.restart_window:
+                    server.restart_times.popleft()
+                if len(server.restart_times) >= self.max_restarts:
+                    raise RuntimeError(
+                        f"MCP server '{server.name}' died and exceeded the maximum of {self.max_restarts} restarts "
+                        f"within {self.restart_window:g} seconds"
+                    )
+                server.restart_times.append(now)
+                server.count(restarts=1)
+                print(f"Restarting MCP server '{server.name}'...")
+
+            server.crashed = False
+            start = time.perf_counter()
+            server.stop_event = asyncio.Event()
+            ready = self._loop.create_future()
+            server.owner_task = self._loop.create_task(self._serve(server, ready))
+            session = await asyncio.wait_for(ready, self.startup_timeout)
+            server.count(starts=1, startup_seconds=time.perf_counter() - start)
+            return session
+
+    async def _stop_server(self, server: _ServerState):
+        if server.stop_event is not None:
+            server.stop_event.set()
+        if server.owner_task is not None and not server.owner_task.done():
+            try:
+                await asyncio.wait_for(server.owner_task, 10)
+            except BaseException:
+                server.owner_task.cancel()
+        server.owner_task = None
+        server.session = None
+
+    async def _call_tool(self, server: _ServerState, tool_name: str, arguments: dict):
+        attempts = 2 if server.retry_on_crash else 1
+        for attempt in range(attempts):
+            session = await self._ensure_session(server)
+            try:
+                return await session.call_tool(tool_name, arguments)
+            except Exception as e:
+                if not _is_connection_error(e):
+                    raise
+                # The server died underneath the call: tear it down so the next call starts a fresh process.
+                # The call may have had side effects, so it is only re-sent when the server allows it.
+                await self._stop_server(server)
+                server.crashed = True
+                if attempt == attempts - 1:
+                    raise
+
+    async def _list_tools(self, server: _ServerState):
+        session = await self._ensure_session(server)
+        result = await session.list_tools()
+        return result.tools if hasattr(result, "tools") else result
+
+    def call_tool(self, server_name: str, tool_name: str, arguments: dict | None = None) -> Any:
+        """Call a tool on a registered server and return the first content item.
+
+        Args:
+            server_name: Name of the registered server
+            tool_name: Name of the tool on that server
+            arguments: Tool arguments
+
+        Returns:
+            The JSON payload of the first content item if it has one, otherwise its text
+
+        """
+        server = self._get_server(server_name)
+        start = time.perf_counter()
+        try:
+            result = self._submit(self._call_tool(server, tool_name, arguments or {}), server.call_timeout)
+        except Exception:
+            server.count(errors=1)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with server.stats_lock:
+                server.stats["calls"] += 1
+                server.stats["total_call_seconds"] += elapsed
+                server.stats["max_call_seconds"] = max(server.stats["max_call_seconds"], elapsed)
+                server.stats["last_call_seconds"] = elapsed
+
+        content = result.content[0]
+        if hasattr(content, "model_dump_json"):
+            return content.model_dump_json()
+        return content.text
+
+    def list_tools(self, server_name: str) -> list[dict]:
+        """Discover the tools exposed by a registered server.
+
+        Returns:
+            A list of dictionaries with ``name``, ``description`` and ``inputSchema``
+
+        """
+        server = self._get_server(server_name)
+        tools = self._submit(self._list_tools(server), self.startup_timeout + server.call_timeout)
+
+        discovered_tools = []
+        for tool in tools:
+            if hasattr(tool, "name"):
+                discovered_tools.append(
+                    {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "inputSchema": tool.inputSchema,
+                    }
+                )
+            else:
+                print(f"Warning: Skipping tool with no name attribute: {tool}")
+        return discovered_tools
+
+    def get_stats(self) -> dict[str, dict]:
+        """Return per-server latency counters.
+
+        Returns:
+            A dictionary mapping server names to their counters, including the mean call latency
+
+        """
+        stats = {}
+        for name, server in list(self._servers.items()):
+            with server.stats_lock:
+                s = dict(server.stats)
+            s["mean_call_seconds"] = s["total_call_seconds"] / s["calls"] if s["calls"] else None
+            s["alive"] = server.session is not None
+            stats[name] = s
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop every server process and the background event loop."""
+        if self._closed:
+            return
+        try:
+            for server in list(self._servers.values()):
+                try:
+                    self._submit(self._stop_server(server), 15)
+                except Exception as e:
+                    print(f"Warning: Failed to stop MCP server '{server.name}': {e}")
+        finally:
+            self._closed = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            if not self._loop.is_running():
+                self._loop.close()
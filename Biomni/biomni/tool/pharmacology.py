@@ -1969,45 +1969,32 @@ def analyze_western_blot(
 
 def _load_ddinter_data(data_lake_path):
     """
-    Load DDInter datasets from pickle files, processing if needed.
+    Load DDInter datasets through the schema registry, processing them if needed.
+
+    The processed tables are read from disk once per process and then served from memory.
 
     Parameters
     ----------
     data_lake_path : str
-        Path to data lake directory containing DDInter pickle files
+        Path to data lake directory containing the raw DDInter CSV files
 
     Returns
     -------
     tuple
         (drug_info, interaction_matrix, name_mapping) dictionaries
     """
-    import os
-    import pickle
-
-    # Define schema directory (following established pattern)
-    schema_dir = os.path.join(os.path.dirname(__file__), "schema_db")
+    from biomni.tool.schema_registry import get_schema_registry
 
-    # Define paths to DDInter pickle files
-    drug_info_path = os.path.join(schema_dir, "ddinter_drugs.pkl")
-    interaction_path = os.path.join(schema_dir, "ddinter_interactions.pkl")
-    mapping_path = os.path.join(schema_dir, "ddinter_name_mapping.pkl")
+    registry = get_schema_registry()
+    names = ["ddinter_drugs", "ddinter_interactions", "ddinter_name_mapping"]
 
     # Check if processing is needed (lazy loading pattern)
-    pkl_files = [drug_info_path, interaction_path, mapping_path]
-    if not all(os.path.exists(f) for f in pkl_files):
-        _process_ddinter_data_inline(data_lake_path, schema_dir)
+    if not all(registry.has(name) for name in names):
+        _process_ddinter_data_inline(data_lake_path, registry.directory)
 
     # Load data
     try:
-        with open(drug_info_path, "rb") as f:
-            drug_info = pickle.load(f)
-
-        with open(interaction_path, "rb") as f:
-            interaction_matrix = pickle.load(f)
-
-        with open(mapping_path, "rb") as f:
-            name_mapping = pickle.load(f)
-
+        drug_info, interaction_matrix, name_mapping = (registry.get(name) for name in names)
         return drug_info, interaction_matrix, name_mapping
 
     except Exception as e:
@@ -2016,7 +2003,7 @@ def _load_ddinter_data(data_lake_path):
 
 def _process_ddinter_data_inline(data_lake_path, output_dir):
     """
-    Process DDInter CSV files into standardized pickle files.
+    Process DDInter CSV files into standardized JSON files.
 
     This function processes raw DDInter 2.0 CSV files and creates standardized
     data structures for use in Biomni drug-drug interaction analysis.
@@ -2026,10 +2013,9 @@ def _process_ddinter_data_inline(data_lake_path, output_dir):
     data_lake_path : str
         Path to data lake directory containing raw DDInter CSV files
     output_dir : str
-        Directory to save processed pickle files
+        Directory to save processed JSON files
     """
     import os
-    import pickle
     from collections import defaultdict
     from pathlib import Path
 
@@ -2070,19 +2056,16 @@ def _process_ddinter_data_inline(data_lake_path, output_dir):
     name_mapping = _create_name_mapping_inline(drug_info)
 
     # Save processed data
-    with open(os.path.join(output_dir, "ddinter_drugs.pkl"), "wb") as f:
-        pickle.dump(drug_info, f)
-
-    with open(os.path.join(output_dir, "ddinter_interactions.pkl"), "wb") as f:
-        pickle.dump(interaction_matrix, f)
+    from biomni.tool.schema_registry import get_schema_registry
 
-    with open(os.path.join(output_dir, "ddinter_name_mapping.pkl"), "wb") as f:
-        pickle.dump(name_mapping, f)
+    registry = get_schema_registry(output_dir)
+    registry.save("ddinter_drugs", drug_info)
+    registry.save("ddinter_interactions", interaction_matrix)
+    registry.save("ddinter_name_mapping", name_mapping)
 
     # Generate and save statistics
     stats = _generate_ddinter_statistics_inline(drug_info, interaction_matrix)
-    with open(os.path.join(output_dir, "ddinter_statistics.pkl"), "wb") as f:
-        pickle.dump(stats, f)
+    registry.save("ddinter_statistics", stats)
 
 
 def _standardize_drug_name_processing(drug_name):
@@ -2143,7 +2126,7 @@ def _build_drug_registry_inline(dataframes):
             drug_registry[drug_a_id]["interactions"].add(drug_b_id)
             drug_registry[drug_b_id]["interactions"].add(drug_a_id)
 
-    # Convert sets to lists for pickle serialization
+    # Convert sets to lists for JSON serialization
     for drug_id in drug_registry:
         drug_registry[drug_id]["categories"] = list(drug_registry[drug_id]["categories"])
         drug_registry[drug_id]["interactions"] = list(drug_registry[drug_id]["interactions"])
@@ -2180,7 +2163,7 @@ def _create_interaction_matrix_inline(dataframes):
         interaction_matrix[drug_a_std][drug_b_std].append(interaction_data)
         interaction_matrix[drug_b_std][drug_a_std].append(interaction_data)
 
-    # Convert to regular dict for pickle
+    # Convert to regular dict for JSON serialization
     interaction_matrix = dict(interaction_matrix)
     for drug in interaction_matrix:
         interaction_matrix[drug] = dict(interaction_matrix[drug])
@@ -2979,24 +2962,17 @@ class OpenFDAClient:
 
         import requests
 
+        from biomni.tool.transport import get_transport
+
         self.requests = requests
         self.time = time
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "Biomni-Agent/1.0 (https://biomni.stanford.edu)"})
+        # The shared transport pools connections and applies the api.fda.gov rate limit across all clients
+        self.session = get_transport()
         self.retry_attempts = 3
         self.timeout = 30
-        self.rate_limit_delay = 0.2  # 5 requests/second
-        self.last_request_time = 0
 
     def _handle_rate_limiting(self):
-        """Implement rate limiting to respect FDA API limits."""
-        current_time = self.time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < self.rate_limit_delay:
-            self.time.sleep(self.rate_limit_delay - time_since_last)
-
-        self.last_request_time = self.time.time()
+        """Rate limiting to respect FDA API limits is applied per host by the shared transport."""
 
     def _validate_response(self, response_data: dict) -> dict:
         """Validate FDA API response structure and handle variations."""
@@ -0,0 +1,354 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# Responses larger than this are written to a compressed artifact instead of being parsed into memory
+SPILL_BYTES = int(os.environ.get("BIOMNI_SPILL_BYTES", str(1024 * 1024)))
+
+# Limits of the artifact directory, enforced at most every CLEANUP_INTERVAL seconds after an artifact is written
+ARTIFACT_MAX_BYTES = int(float(os.environ.get("BIOMNI_ARTIFACT_MAX_MB", "2048")) * 1024 * 1024)
+ARTIFACT_MAX_AGE_DAYS = float(os.environ.get("BIOMNI_ARTIFACT_MAX_AGE_DAYS", "7"))
+CLEANUP_INTERVAL = 600.0
+
+_PATH_TOKEN = re.compile(r"\.\.|\.([A-Za-z_][\w\-]*|\*)|\[(\d+|\*)\]|\[['\"]([^'\"]+)['\"]\]")
+_WILDCARD = object()
+_last_cleanup = 0.0
+_cleanup_lock = threading.Lock()
+
+
+def artifact_dir() -> str:
+    """Return the directory for spilled payloads (``$BIOMNI_ARTIFACT_DIR`` or ``~/.cache/biomni/artifacts``)."""
+    path = os.environ.get("BIOMNI_ARTIFACT_DIR")
+    if not path:
+        path = os.path.join(os.path.expanduser("~"), ".cache", "biomni", "artifacts")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def parse_path(expression: str) -> list:
+    """Parse a JSONPath subset into steps.
+
+    Supported: ``$`` root, ``.key`` / ``['key']`` members, ``[0]`` indexes and ``[*]`` / ``.*`` wildcards.
+    A bare ``a.b[*].c`` without ``$`` is accepted as well.
+
+    """
+    expression = expression.strip()
+    if expression.startswith("$"):
+        expression = expression[1:]
+    if expression and not expression.startswith((".", "[")):
+        expression = "." + expression
+    steps, position = [], 0
+    while position < len(expression):
+        match = _PATH_TOKEN.match(expression, position)
+        if not match or match.group(0) == "..":
+            raise ValueError(f"Unsupported path expression near '{expression[position:]}'")
+        member, index, quoted = match.groups()
+        if member == "*" or index == "*":
+            steps.append(_WILDCARD)
+        elif index is not None:
+            steps.append(int(index))
+        else:
+            steps.append(member if member is not None else quoted)
+        position = match.end()
+    return steps
+
+
+def extract(obj, expression: str) -> list:
+    """Return all values of ``obj`` matched by a path expression (see ``parse_path``)."""
+    current = [obj]
+    for step in parse_path(expression):
+        matched = []
+        for value in current:
+            if step is _WILDCARD:
+                if isinstance(value, dict):
+                    matched.extend(value.values())
+                elif isinstance(value, list):
+                    matched.extend(value)
+            elif isinstance(step, int):
+                if isinstance(value, list) and -len(value) <= step < len(value):
+                    matched.append(value[step])
+            elif isinstance(value, dict) and step in value:
+                matched.append(value[step])
+        current = matched
+    return current
+
+
+def project(obj, fields: list[str] | str) -> dict:
+    """Keep only the requested fields.
+
+    Returns:
+        ``{expression: value}``; a single match is unwrapped, several matches are returned as a list and no match
+        gives None
+
+    """
+    if isinstance(fields, str):
+        fields = [fields]
+    projected = {}
+    for expression in fields:
+        values = extract(obj, expression)
+        wildcard = any(step is _WILDCARD for step in parse_path(expression))
+        projected[expression] = values if wildcard else (values[0] if values else None)
+    return projected
+
+
+def _iter_events(obj, prefix=""):
+    """Yield ijson-style ``(prefix, event, value)`` events for an in-memory object."""
+    if isinstance(obj, dict):
+        yield prefix, "start_map", None
+        for key, value in obj.items():
+            yield prefix, "map_key", key
+            yield from _iter_events(value, f"{prefix}.{key}" if prefix else str(key))
+        yield prefix, "end_map", None
+    elif isinstance(obj, list):
+        yield prefix, "start_array", None
+        for value in obj:
+            yield from _iter_events(value, f"{prefix}.item" if prefix else "item")
+        yield prefix, "end_array", None
+    else:
+        yield prefix, "scalar", obj
+
+
+def _summarize_events(events, max_depth: int, max_items: int, max_string: int):
+    """Build a compact sketch of a JSON document from a stream of events.
+
+    Objects keep their keys down to ``max_depth``; arrays are reported as their length plus a sample of the
+    first ``max_items`` elements; long strings are truncated. Only the sketch is kept in memory.
+    """
+    root = {}
+    stack = []  # open containers: {"kind", "out", "keep", "count", "key"}
+
+    def attach(value):
+        if not stack:
+            root["value"] = value
+            return
+        parent = stack[-1]
+        if parent["kind"] == "map":
+            if parent["keep"]:
+                parent["out"][parent["key"]] = value
+            parent["count"] += 1
+        else:
+            if parent["keep"] and len(parent["out"]["_sample"]) < max_items:
+                parent["out"]["_sample"].append(value)
+            parent["count"] += 1
+
+    def child_kept():
+        if len(stack) >= max_depth:
+            return False
+        if not stack:
+            return True
+        parent = stack[-1]
+        return parent["keep"] and (parent["kind"] == "map" or len(parent["out"]["_sample"]) < max_items)
+
+    for _, event, value in events:
+        if event in ("start_map", "start_array"):
+            keep = child_kept()
+            kind = "map" if event == "start_map" else "array"
+            out = {} if kind == "map" else {"_summary": None, "_sample": []}
+            node = {"kind": kind, "out": out, "keep": keep, "count": 0, "key": None}
+            if keep or not stack or stack[-1]["keep"]:
+                attach(out)
+            else:
+                stack[-1]["count"] += 1
+            stack.append(node)
+        elif event in ("end_map", "end_array"):
+            node = stack.pop()
+            if node["kind"] == "array":
+                node["out"]["_summary"] = f"List with {node['count']} items"
+                if not node["keep"]:
+                    del node["out"]["_sample"]
+            elif not node["keep"]:
+                node["out"]["_summary"] = f"Object with {node['count']} keys"
+        elif event == "map_key":
+            stack[-1]["key"] = value
+        else:
+            if isinstance(value, str) and len(value) > max_string:
+                value = value[:max_string] + "... (truncated)"
+            elif value is not None and not isinstance(value, str | bool | int | float):
+                value = float(value)  # ijson yields Decimal for non-integers
+            if not stack or stack[-1]["keep"]:
+                attach(value)
+            else:
+                stack[-1]["count"] += 1
+    return root.get("value")
+
+
+def summarize(obj, max_depth: int = 4, max_items: int = 3, max_string: int = 100):
+    """Return a compact sketch of a JSON-like object: keys, list lengths, a few samples and truncated strings."""
+    return _summarize_events(_iter_events(obj), max_depth, max_items, max_string)
+
+
+def _ijson():
+    try:
+        import ijson
+
+        return ijson
+    except ImportError:
+        return None
+
+
+def _ijson_prefix(expression: str) -> str | None:
+    """Translate a path of members and ``[*]`` into an ijson prefix, or None if it needs random access."""
+    parts = []
+    for step in parse_path(expression):
+        if step is _WILDCARD:
+            parts.append("item")
+        elif isinstance(step, int):
+            return None
+        else:
+            parts.append(step)
+    return ".".join(parts)
+
+
+def read_response(response, spill_bytes: int, label: str = "response") -> tuple:
+    """Read a streamed ``requests`` response, spilling it to a gzip artifact once it exceeds ``spill_bytes``.
+
+    Returns:
+        ``(body, None, size)`` for small responses, or ``(None, artifact_path, size)`` for spilled ones
+
+    """
+    buffered, size, handle, path = [], 0, None, None
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if not chunk:
+                continue
+            size += len(chunk)
+            if handle is None:
+                buffered.append(chunk)
+                if size > spill_bytes:
+                    path = _artifact_path(label, ".json.gz")
+                    handle = gzip.open(path + ".part", "wb", compresslevel=5)
+                    handle.writelines(buffered)
+                    buffered = []
+            else:
+                handle.write(chunk)
+    except BaseException:
+        if handle is not None:
+            handle.close()
+            os.remove(path + ".part")
+        raise
+    if handle is None:
+        return b"".join(buffered), None, size
+    handle.close()
+    os.replace(path + ".part", path)
+    _maybe_cleanup()
+    return None, path, size
+
+
+def _artifact_path(label: str, suffix: str) -> str:
+    digest = hashlib.sha256(f"{label}:{time.time_ns()}".encode()).hexdigest()[:16]
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_")[-60:] or "payload"
+    return os.path.join(artifact_dir(), f"{slug}_{digest}{suffix}")
+
+
+def spill_text(text: str, label: str = "output") -> str:
+    """Write text to a gzip artifact and return its path."""
+    path = _artifact_path(label, ".txt.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(text)
+    _maybe_cleanup()
+    return path
+
+
+def load_artifact(path: str, fields: list[str] | str | None = None):
+    """Load a spilled artifact: the parsed JSON (or text), or only the requested path expressions.
+
+    With ``ijson`` installed, member/``[*]`` paths are streamed from the file without loading the whole payload.
+    """
+    if path.endswith(".txt.gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    if fields is None:
+        with gzip.open(path, "rb") as f:
+            return json.load(f)
+    if isinstance(fields, str):
+        fields = [fields]
+    ijson = _ijson()
+    prefixes = {expression: _ijson_prefix(expression) for expression in fields}
+    if ijson is None or any(prefix is None for prefix in prefixes.values()):
+        with gzip.open(path, "rb") as f:
+            return project(json.load(f), fields)
+    projected = {}
+    for expression, prefix in prefixes.items():
+        with gzip.open(path, "rb") as f:
+            values = list(ijson.items(f, prefix, use_float=True))
+        projected[expression] = values if "item" in prefix.split(".") else (values[0] if values else None)
+    return projected
+
+
+def summarize_artifact(path: str, max_depth: int = 4, max_items: int = 3, max_string: int = 100):
+    """Sketch a spilled JSON artifact, streaming it with ``ijson`` when available."""
+    ijson = _ijson()
+    with gzip.open(path, "rb") as f:
+        events = ijson.parse(f, use_float=True) if ijson is not None else _iter_events(json.load(f))
+        if ijson is not None:
+            scalars = ("string", "number", "integer", "double", "boolean", "null")
+            events = ((prefix, "scalar" if event in scalars else event, value) for prefix, event, value in events)
+        return _summarize_events(events, max_depth, max_items, max_string)
+
+
+def spilled_result(path: str, size: int, fields: list[str] | None = None) -> dict:
+    """Describe a spilled payload: where it is, a compact sketch and any requested fields."""
+    result = {
+        "artifact": path,
+        "bytes": size,
+        "note": f"The full response ({size / 1e6:.1f} MB) was saved to the artifact; "
+        "use load_artifact(path, fields=[...]) to read specific fields.",
+        "summary": summarize_artifact(path),
+    }
+    if fields:
+        result["fields"] = load_artifact(path, fields)
+    return result
+
+
+def cleanup_artifacts(max_age_days: float = ARTIFACT_MAX_AGE_DAYS, max_bytes: int | None = ARTIFACT_MAX_BYTES) -> int:
+    """Delete artifacts older than ``max_age_days``, then the oldest ones until at most ``max_bytes`` remain.
+
+    Downloads still in progress (``.part`` files) only count towards the size and are removed by age.
+
+    Returns:
+        The number of files removed
+
+    """
+    directory = artifact_dir()
+    cutoff = time.time() - max_age_days * 86400
+    files = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue  # removed by another process
+        if os.path.isfile(path):
+            files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+
+    removed = 0
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in files:
+        expired = mtime < cutoff
+        if not expired and (max_bytes is None or total <= max_bytes or path.endswith(".part")):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def _maybe_cleanup():
+    """Run ``cleanup_artifacts`` if the last run in this process is more than ``CLEANUP_INTERVAL`` seconds ago."""
+    global _last_cleanup
+    with _cleanup_lock:
+        if time.time() - _last_cleanup < CLEANUP_INTERVAL:
+            return
+        _last_cleanup = time.time()
+    try:
+        cleanup_artifacts(ARTIFACT_MAX_AGE_DAYS, ARTIFACT_MAX_BYTES)
+    except OSError as e:
+        print(f"Warning: Could not clean up the artifact directory: {e}")
@@ -0,0 +1,166 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Process-wide cap on database calls in flight, shared by every gather_queries call and agent thread
+MAX_CONCURRENT_QUERIES = int(os.environ.get("BIOMNI_MAX_CONCURRENT_QUERIES", "8"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_query_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool that runs blocking database calls for the async engine."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUERIES, thread_name_prefix="biomni-query")
+        return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking function on the shared query executor and await its result.
+
+    The function runs in a copy of the caller's context, so it is traced as part of the caller's run.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_query_executor(), call)
+
+
+def _normalize_call(call) -> tuple:
+    """Accept ``func``, ``(func, kwargs)``, ``(func, args)``, ``(func, args, kwargs)`` or a coroutine."""
+    if inspect.iscoroutine(call):
+        return call, (), {}
+    if callable(call):
+        return call, (), {}
+    if isinstance(call, tuple | list) and call and callable(call[0]):
+        func, rest = call[0], list(call[1:])
+        if len(rest) == 1 and isinstance(rest[0], dict):
+            return func, (), rest[0]
+        if len(rest) == 1:
+            return func, tuple(rest[0]), {}
+        if len(rest) == 2:
+            return func, tuple(rest[0]), dict(rest[1])
+        if not rest:
+            return func, (), {}
+    raise TypeError(f"Cannot run {call!r}; pass a function, a (function, kwargs) tuple or a coroutine")
+
+
+def _call_name(func) -> str:
+    if inspect.iscoroutine(func):
+        return func.__qualname__
+    if isinstance(func, functools.partial):
+        return _call_name(func.func)
+    return getattr(func, "__name__", repr(func))
+
+
+async def agather_queries(calls: list, max_concurrency: int | None = None, timeout: float | None = None) -> list[dict]:
+    """Run independent database calls concurrently and return their results in input order.
+
+    Blocking functions (such as the ``query_*`` tools) run on the shared query executor, so the total number
+    of calls in flight never exceeds ``BIOMNI_MAX_CONCURRENT_QUERIES``; coroutine functions are awaited
+    directly. Requests still pass through the per-host rate limits of the shared HTTP transport.
+
+    Args:
+        calls: Functions, ``(function, kwargs)``, ``(function, args)`` or ``(function, args, kwargs)`` tuples,
+            or coroutines
+        max_concurrency: Additional cap for this batch of calls
+        timeout: Seconds to wait for each call before reporting a timeout. A thread cannot be interrupted, so
+            a timed-out blocking call keeps running in its executor thread, and keeps holding one of the
+            ``BIOMNI_MAX_CONCURRENT_QUERIES`` slots, until it returns; its result is discarded
+
+    Returns:
+        One dict per call with ``name``, ``result``, ``error`` (None on success) and ``seconds``
+
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or len(calls) or 1)
+
+    async def run(call):
+        name = "call"
+        start = time.perf_counter()
+        try:
+            func, args, kwargs = _normalize_call(call)
+            name = _call_name(func)
+            async with semaphore:
+                start = time.perf_counter()
+                if inspect.iscoroutine(func):
+                    awaitable = func
+                elif inspect.iscoroutinefunction(func):
+                    awaitable = func(*args, **kwargs)
+                else:
+                    awaitable = run_blocking(func, *args, **kwargs)
+                result = await asyncio.wait_for(awaitable, timeout)
+            return {"name": name, "result": result, "error": None, "seconds": round(time.perf_counter() - start, 3)}
+        except TimeoutError:
+            error = f"Timed out after {timeout} seconds"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return {"name": name, "result": None, "error": error, "seconds": round(time.perf_counter() - start, 3)}
+
+    return list(await asyncio.gather(*(run(call) for call in calls)))
+
+
+def gather_queries(
+    calls: list, max_concurrency: int | None = None, timeout: float | None = None, verbose: bool = True
+) -> list[dict]:
+    """Synchronous entry point of ``agather_queries`` for use in generated code.
+
+    Example:
+        results = gather_queries([
+            (query_uniprot, {"prompt": "Find the UniProt entry of human TP53"}),
+            (query_kegg, {"prompt": "Find the KEGG pathways that involve TP53"}),
+        ])
+        uniprot, kegg = (r["result"] for r in results)
+
+    Args:
+        calls: See ``agather_queries``
+        max_concurrency: Additional cap for this batch of calls
+        timeout: Seconds to wait for each call before reporting a timeout; a timed-out blocking call still runs
+            to completion in the background and occupies an executor slot until then (see ``agather_queries``)
+        verbose: Print the timing of every call and the overall speed-up
+
+    Returns:
+        One dict per call with ``name``, ``result``, ``error`` (None on success) and ``seconds``
+
+    """
+    start = time.perf_counter()
+    coroutine = agather_queries(calls, max_concurrency=max_concurrency, timeout=timeout)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        results = asyncio.run(coroutine)
+    else:
+        # Already inside an event loop (e.g. a notebook): run the batch on a separate thread's loop
+        results = _run_in_thread(coroutine)
+
+    if verbose:
+        elapsed = time.perf_counter() - start
+        serial = sum(r["seconds"] for r in results)
+        for i, r in enumerate(results):
+            status = "ok" if r["error"] is None else f"error: {r['error']}"
+            print(f"[{i}] {r['name']}: {r['seconds']:.2f}s ({status})")
+        print(f"Ran {len(results)} calls in {elapsed:.2f}s (sum of call times {serial:.2f}s)")
+    return results
+
+
+def _run_in_thread(coroutine):
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = asyncio.run(coroutine)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(target,), name="biomni-gather")
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+CACHE_MODES = ("read_write", "cache_only", "refresh", "off")
+
+DAY = 24 * 3600
+
+# Time-to-live per source. Release-versioned resources change rarely; association scores and clinical
+# submissions are updated more often. Hosts are matched by suffix, so "ebi.ac.uk" covers "www.ebi.ac.uk".
+DEFAULT_TTLS = {
+    "rest.uniprot.org": 7 * DAY,
+    "rest.ensembl.org": 7 * DAY,
+    "grch37.rest.ensembl.org": 30 * DAY,
+    "reactome.org": 30 * DAY,
+    "rest.kegg.jp": 30 * DAY,
+    "data.rcsb.org": 7 * DAY,
+    "search.rcsb.org": 1 * DAY,
+    "alphafold.ebi.ac.uk": 30 * DAY,
+    "ebi.ac.uk": 7 * DAY,
+    "api.platform.opentargets.org": 1 * DAY,
+    "api.genetics.opentargets.org": 30 * DAY,
+    "eutils.ncbi.nlm.nih.gov": 1 * DAY,
+    "api.fda.gov": 1 * DAY,
+    "string-db.org": 30 * DAY,
+    "jaspar.genereg.net": 30 * DAY,
+}
+DEFAULT_TTL = 1 * DAY
+
+
+def _default_path(filename: str = "http_cache.sqlite") -> str:
+    cache_dir = os.environ.get("BIOMNI_HTTP_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "biomni")
+    return os.path.join(cache_dir, filename)
+
+
+class ResponseCache:
+    """Content-addressed SQLite cache of database API responses.
+
+    Entries are keyed by a hash of the method, URL, query parameters, request body and ``Accept``
+    header, stored zlib-compressed, and expire after a per-source TTL. When the total stored size exceeds
+    ``max_bytes``, the least recently used entries are removed. Expired entries younger than
+    ``stale_factor`` times their TTL can be served immediately while a background refresh runs
+    (stale-while-revalidate).
+
+    Modes:
+        - "read_write": serve fresh entries and store new responses (default)
+        - "cache_only": never touch the network; a miss is an error (reproducible offline reruns)
+        - "refresh": always fetch and overwrite the stored entries
+        - "off": bypass the cache entirely
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        mode: str = "read_write",
+        max_bytes: int = 512 * 1024 * 1024,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = DEFAULT_TTL,
+        stale_while_revalidate: bool = True,
+        stale_factor: float = 2.0,
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite file; defaults to ``$BIOMNI_HTTP_CACHE_DIR/http_cache.sqlite`` or ``~/.cache/biomni``
+            mode: One of "read_write", "cache_only", "refresh" or "off"
+            max_bytes: Maximum total size of the compressed entries
+            ttls: Per-host TTL overrides in seconds on top of ``DEFAULT_TTLS``
+            default_ttl: TTL for hosts without a specific entry
+            stale_while_revalidate: Serve recently expired entries while refreshing them in the background
+            stale_factor: Entries older than ``stale_factor * ttl`` are never served
+
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.path = path or _default_path()
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_factor = stale_factor
+
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            # WAL lets several agent processes share one cache file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, created REAL, accessed REAL, ttl REAL, size INTEGER, body BLOB)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(method: str, url: str, params=None, json_data=None, headers=None) -> str:
+        accept = (headers or {}).get("Accept", "")
+        payload = json.dumps([method.upper(), url, params or {}, json_data, accept], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        host = urlparse(url).netloc.lower()
+        best = None
+        for suffix, ttl in self.ttls.items():
+            if (host == suffix or host.endswith("." + suffix)) and (best is None or len(suffix) > len(best[0])):
+                best = (suffix, ttl)
+        return best[1] if best else self.default_ttl
+
+    def lookup(self, key: str) -> tuple[str, object, float | None]:
+        """Look up an entry.
+
+        Returns:
+            ``(status, value, age_seconds)`` where status is "hit", "stale" (expired but servable while
+            revalidating) or "miss"
+
+        """
+        if self.mode in ("off", "refresh"):
+            return "miss", None, None
+        with self._lock:
+            row = (
+                self._connection().execute("SELECT created, ttl, body FROM responses WHERE key = ?", (key,)).fetchone()
+            )
+            if row is None:
+                self.misses += 1
+                return "miss", None, None
+            created, ttl, body = row
+            age = time.time() - created
+            if age <= ttl or self.mode == "cache_only":
+                status = "hit"
+                self.hits += 1
+            elif self.stale_while_revalidate and age <= ttl * self.stale_factor:
+                status = "stale"
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+                return "miss", None, age
+            self._connection().execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._connection().commit()
+        return status, json.loads(zlib.decompress(body)), age
+
+    def put(self, key: str, url: str, value) -> None:
+        if self.mode in ("off", "cache_only"):
+            return
+        body = zlib.compress(json.dumps(value, default=str).encode("utf-8"), 6)
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, created, accessed, ttl, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, now, now, self.ttl_for(url), len(body), body),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Remove least recently used entries until the cache is 10% under the cap
+        target = total - int(self.max_bytes * 0.9)
+        removed = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            if removed >= target:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            removed += size
+            self.evictions += 1
+
+    def revalidate(self, key: str, url: str, fetch) -> None:
+        """Refresh an entry in the background. ``fetch`` returns the new value, or None on failure."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = fetch()
+                if value is not None:
+                    self.put(key, url, value)
+            except Exception as e:
+                print(f"Warning: Background refresh of {url} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True, name="biomni-cache-refresh").start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+            self._connection().commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = (
+                self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            )
+            total = self.hits + self.stale_hits + self.misses
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.stale_hits) / total if total else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_response_cache = None
+_translation_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, configured from ``BIOMNI_HTTP_CACHE_*`` environment variables."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                mode=os.environ.get("BIOMNI_HTTP_CACHE_MODE", "read_write"),
+                max_bytes=int(float(os.environ.get("BIOMNI_HTTP_CACHE_MAX_MB", "512")) * 1024 * 1024),
+            )
+        return _response_cache
+
+
+def get_translation_cache() -> ResponseCache:
+    """Return the process-wide cache of prompt-to-endpoint translations made by the ``query_*`` tools.
+
+    Translations depend only on the prompt, the API schema and the model, so they are kept for 30 days and
+    never served stale. The mode is read from ``BIOMNI_QUERY_CACHE_MODE``.
+    """
+    global _translation_cache
+    with _response_cache_lock:
+        if _translation_cache is None:
+            _translation_cache = ResponseCache(
+                path=_default_path("query_translations.sqlite"),
+                mode=os.environ.get("BIOMNI_QUERY_CACHE_MODE", "read_write"),
+                max_bytes=64 * 1024 * 1024,
+                default_ttl=30 * DAY,
+                stale_while_revalidate=False,
+            )
+        return _translation_cache
+
+
+def set_cache_mode(mode: str) -> None:
+    """Switch the process-wide response cache mode, e.g. to "cache_only" for an offline rerun."""
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown cache mode '{mode}', expected one of {CACHE_MODES}")
+    get_response_cache().mode = mode
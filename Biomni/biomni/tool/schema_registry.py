@@ -0,0 +1,240 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "schema_db")
+
+# Preferred first; .pkl is only read for schemas that have not been converted yet
+SCHEMA_FORMATS = (".json", ".pkl")
+
+# API schemas shipped with the package and used by the database query tools. ``schema_db`` also holds large
+# lookup tables built at runtime (e.g. the DDInter tables of ``pharmacology``), which are only loaded on demand.
+API_SCHEMAS = (
+    "cbioportal",
+    "clinvar",
+    "dbsnp",
+    "emdb",
+    "ensembl",
+    "geo",
+    "gnomad",
+    "gtopdb",
+    "gwas_catalog",
+    "interpro",
+    "iucn",
+    "jaspar",
+    "kegg",
+    "monarch",
+    "mpd",
+    "openfda",
+    "opentarget",
+    "opentarget_genetics",
+    "paleobiology",
+    "pdb",
+    "pride",
+    "reactome",
+    "remap",
+    "stringdb",
+    "ucsc",
+    "uniprot",
+    "worms",
+)
+
+
+class SchemaRegistry:
+    """In-memory registry of the API schemas and lookup tables in ``schema_db``.
+
+    Each schema is read from disk the first time it is requested and then kept for the lifetime of the
+    process together with a version hash of its file contents. Schemas are stored as JSON; legacy pickle
+    files are still read when no JSON file exists and can be converted with ``export_json``.
+
+    ``get`` hands out the cached object itself, shared by every caller in the process, so it must be treated
+    as read-only; pass ``copy=True`` to get a private deep copy that can be modified.
+    """
+
+    def __init__(self, directory: str = SCHEMA_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._name_locks: dict[str, threading.Lock] = {}
+        self._schemas: dict[str, object] = {}
+        self._versions: dict[str, str] = {}
+        # id of a loaded schema object -> version, so callers holding only the object can identify it
+        self._versions_by_id: dict[int, str] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def _path(self, name: str) -> str | None:
+        for extension in SCHEMA_FORMATS:
+            path = os.path.join(self.directory, name + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def names(self) -> list[str]:
+        """Return the names of all schemas available on disk."""
+        found = set()
+        for extension in SCHEMA_FORMATS:
+            for path in glob.glob(os.path.join(self.directory, "*" + extension)):
+                found.add(os.path.basename(path)[: -len(extension)])
+        return sorted(found)
+
+    def has(self, name: str) -> bool:
+        with self._lock:
+            if name in self._schemas:
+                return True
+        return self._path(name) is not None
+
+    def get(self, name: str, copy: bool = False):
+        """Return the schema called ``name``, loading it on first use.
+
+        Args:
+            name: Schema name, i.e. the file name in the schema directory without extension
+            copy: Return a deep copy instead of the shared cached object, which must not be modified
+
+        Raises:
+            FileNotFoundError: If there is no schema file with this name
+
+        """
+        schema = self._get(name)
+        return pickle.loads(pickle.dumps(schema)) if copy else schema
+
+    def _get(self, name: str):
+        with self._lock:
+            if name in self._schemas:
+                self.hits += 1
+                return self._schemas[name]
+            name_lock = self._name_locks.setdefault(name, threading.Lock())
+        with name_lock:
+            with self._lock:
+                if name in self._schemas:
+                    self.hits += 1
+                    return self._schemas[name]
+            path = self._path(name)
+            if path is None:
+                raise FileNotFoundError(f"No schema named '{name}' in {self.directory}")
+            with open(path, "rb") as f:
+                raw = f.read()
+            schema = json.loads(raw) if path.endswith(".json") else pickle.loads(raw)
+            version = hashlib.sha256(raw).hexdigest()[:16]
+            with self._lock:
+                self._schemas[name] = schema
+                self._versions[name] = version
+                self._versions_by_id[id(schema)] = version
+                self.loads += 1
+            return schema
+
+    def version(self, name: str) -> str:
+        """Return the version hash of a schema (loading it if needed)."""
+        self.get(name)
+        with self._lock:
+            return self._versions[name]
+
+    def version_of(self, schema) -> str | None:
+        """Return the version hash of a schema object returned by ``get``, or None for other objects."""
+        with self._lock:
+            return self._versions_by_id.get(id(schema))
+
+    def preload(self, names: list[str] | None = None, background: bool = False) -> None:
+        """Load schemas ahead of the first query.
+
+        Args:
+            names: Schemas to load; by default the ``API_SCHEMAS`` present in the directory, not the lookup tables
+            background: Load in a daemon thread instead of blocking
+
+        """
+        if names is None:
+            names = [name for name in API_SCHEMAS if self._path(name) is not None]
+
+        def load():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"Warning: Could not load schema '{name}': {e}")
+
+        if background:
+            threading.Thread(target=load, daemon=True, name="biomni-schema-preload").start()
+        else:
+            load()
+
+    def save(self, name: str, obj) -> str:
+        """Write ``obj`` as the JSON schema ``name`` and replace any cached copy.
+
+        Returns:
+            Path of the written file
+
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name + ".json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(obj, f, default=str)
+        os.replace(tmp_path, path)
+        self.invalidate(name)
+        return path
+
+    def export_json(self, names: list[str] | None = None, remove_pickle: bool = False) -> list[str]:
+        """Convert pickled schemas to JSON.
+
+        Args:
+            names: Schemas to convert; all schemas that only exist as pickle files by default
+            remove_pickle: Delete the pickle file after a successful conversion
+
+        Returns:
+            Names of the converted schemas
+
+        """
+        if names is None:
+            names = [n for n in self.names() if self._path(n).endswith(".pkl")]
+        converted = []
+        for name in names:
+            pickle_path = os.path.join(self.directory, name + ".pkl")
+            if not os.path.exists(pickle_path):
+                continue
+            with open(pickle_path, "rb") as f:
+                obj = pickle.load(f)
+            self.save(name, obj)
+            if remove_pickle:
+                os.remove(pickle_path)
+            converted.append(name)
+        return converted
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Forget a cached schema (or all of them) so it is re-read from disk on next use."""
+        with self._lock:
+            for key in [name] if name is not None else list(self._schemas):
+                schema = self._schemas.pop(key, None)
+                self._versions.pop(key, None)
+                if schema is not None:
+                    self._versions_by_id.pop(id(schema), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "loaded": sorted(self._schemas),
+                "versions": dict(self._versions),
+                "loads": self.loads,
+                "hits": self.hits,
+            }
+
+
+_registries: dict[str, SchemaRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_schema_registry(directory: str = SCHEMA_DIR) -> SchemaRegistry:
+    """Return the process-wide registry for a schema directory."""
+    directory = os.path.abspath(directory)
+    with _registries_lock:
+        registry = _registries.get(directory)
+        if registry is None:
+            registry = _registries[directory] = SchemaRegistry(directory)
+        return registry
+
+
+def get_schema(name: str):
+    """Return a bundled API schema from ``schema_db`` by name, e.g. ``get_schema("uniprot")``."""
+    return get_schema_registry().get(name)
@@ -1,31 +1,70 @@
 import sys
+import threading
 from io import StringIO
 
 # Create a persistent namespace that will be shared across all executions
 _persistent_namespace = {}
 
+_stdout_lock = threading.Lock()
 
-def run_python_repl(command: str) -> str:
+
+class _ThreadLocalStdout:
+    """``sys.stdout`` replacement that sends the output of a thread to its own buffer while it captures.
+
+    Installed once instead of swapping ``sys.stdout`` per execution, so that concurrent executions in
+    different threads neither see each other's output nor restore the wrong stream. Threads started by the
+    executed code write to the original stream.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return self._stream if buffer is None else buffer
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+def _stdout_proxy() -> _ThreadLocalStdout:
+    """Return the installed stdout proxy, wrapping the current ``sys.stdout`` if it is not one."""
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+        return sys.stdout
+
+
+def run_python_repl(command: str, namespace: dict | None = None) -> str:
     """Executes the provided Python command in a persistent environment and returns the output.
     Variables defined in one execution will be available in subsequent executions.
+    A separate ``namespace`` dict can be passed to keep the variables of concurrent sessions apart.
     """
 
     def execute_in_repl(command: str) -> str:
         """Helper function to execute the command in the persistent environment."""
-        old_stdout = sys.stdout
-        sys.stdout = mystdout = StringIO()
+        proxy = _stdout_proxy()
+        previous = getattr(proxy._local, "buffer", None)
+        proxy._local.buffer = mystdout = StringIO()
 
         # Use the persistent namespace
         global _persistent_namespace
 
         try:
             # Execute the command in the persistent namespace
-            exec(command, _persistent_namespace)
+            exec(command, _persistent_namespace if namespace is None else namespace)
             output = mystdout.getvalue()
         except Exception as e:
             output = f"Error: {str(e)}"
         finally:
-            sys.stdout = old_stdout
+            proxy._local.buffer = previous
         return output
 
     command = command.strip("```").strip()
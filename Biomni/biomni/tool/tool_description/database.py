@@ -459,6 +459,13 @@ description = [
         "direct endpoint to access cancer genomics data.",
         "name": "query_cbioportal",
         "optional_parameters": [
+            {
+                "default": None,
+                "description": "JSONPath expressions to return instead of the full response "
+                "(e.g. ['$[*].sampleId']); large responses are saved to a compressed artifact and summarized",
+                "name": "fields",
+                "type": "List[str]",
+            },
             {
                 "default": None,
                 "description": "API endpoint path (e.g., '/studies/brca_tcga/patients') or full URL",
@@ -743,6 +750,14 @@ description = [
         "description": "Query the OpenTargets Platform API using natural language or a direct GraphQL query.",
         "name": "query_opentarget",
         "optional_parameters": [
+            {
+                "default": None,
+                "description": "JSONPath expressions to return instead of the full response "
+                "(e.g. ['$.data.target.associatedDiseases.rows[*].disease.name']); "
+                "large responses are saved to a compressed artifact and summarized",
+                "name": "fields",
+                "type": "List[str]",
+            },
             {
                 "default": None,
                 "description": "Direct GraphQL query string",
@@ -937,6 +952,13 @@ description = [
         "description": "Query the Reactome database using natural language or a direct endpoint.",
         "name": "query_reactome",
         "optional_parameters": [
+            {
+                "default": None,
+                "description": "JSONPath expressions to return instead of the full response "
+                "(e.g. ['$[*].stId']); large responses are saved to a compressed artifact and summarized",
+                "name": "fields",
+                "type": "List[str]",
+            },
             {
                 "default": None,
                 "description": "Direct API endpoint or full URL",
@@ -1290,4 +1312,300 @@ description = [
             }
         ],
     },
+    {
+        "description": "Look up many UniProt entries at once (accessions or gene symbols) using batched OR-joined "
+        "queries. Returns one pandas DataFrame with a 'query' column; use instead of looping over query_uniprot.",
+        "name": "batch_query_uniprot",
+        "optional_parameters": [
+            {
+                "default": "accession",
+                "description": "'accession' or 'gene' (exact gene name, reviewed entries of organism_id)",
+                "name": "id_type",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "UniProt return fields (e.g. ['accession', 'gene_names', 'length', 'go_p'])",
+                "name": "fields",
+                "type": "List[str]",
+            },
+            {
+                "default": 9606,
+                "description": "NCBI taxonomy ID used for gene symbol lookups",
+                "name": "organism_id",
+                "type": "int",
+            },
+            {
+                "default": 100,
+                "description": "Identifiers per request",
+                "name": "batch_size",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "List of UniProt accessions or gene symbols",
+                "name": "identifiers",
+                "type": "List[str]",
+            }
+        ],
+    },
+    {
+        "description": "Retrieve summary data (title, method, resolution, weight, release date) for many PDB entries "
+        "in batched RCSB GraphQL requests. Returns one pandas DataFrame with a 'query' column.",
+        "name": "batch_query_pdb",
+        "optional_parameters": [
+            {
+                "default": None,
+                "description": "GraphQL selection of CoreEntry fields; must include rcsb_id",
+                "name": "fields",
+                "type": "str",
+            },
+            {
+                "default": 200,
+                "description": "Entries per request",
+                "name": "batch_size",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "List of PDB entry IDs",
+                "name": "identifiers",
+                "type": "List[str]",
+            }
+        ],
+    },
+    {
+        "description": "Look up many Ensembl stable IDs or gene symbols with the Ensembl POST lookup endpoints. "
+        "Returns one pandas DataFrame with location, biotype and description columns and a 'query' column.",
+        "name": "batch_query_ensembl",
+        "optional_parameters": [
+            {
+                "default": "id",
+                "description": "'id' for Ensembl stable IDs or 'symbol' for gene symbols",
+                "name": "id_type",
+                "type": "str",
+            },
+            {
+                "default": "homo_sapiens",
+                "description": "Species for symbol lookups",
+                "name": "species",
+                "type": "str",
+            },
+            {
+                "default": False,
+                "description": "Include transcripts, translations and exons",
+                "name": "expand",
+                "type": "bool",
+            },
+            {
+                "default": 1000,
+                "description": "Identifiers per request (maximum 1000)",
+                "name": "batch_size",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "List of Ensembl IDs or gene symbols",
+                "name": "identifiers",
+                "type": "List[str]",
+            }
+        ],
+    },
+    {
+        "description": "Fetch many NCBI records at once via EPost and ESummary (or EFetch for sequences). "
+        "Returns one pandas DataFrame with one row per record.",
+        "name": "batch_query_ncbi",
+        "optional_parameters": [
+            {
+                "default": "gene",
+                "description": "Entrez database, e.g. 'gene', 'protein', 'nuccore', 'pubmed', 'snp'",
+                "name": "database",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "None for document summaries, or 'fasta' / 'gb' to fetch sequences",
+                "name": "rettype",
+                "type": "str",
+            },
+            {
+                "default": 500,
+                "description": "Records per ESummary/EFetch page",
+                "name": "batch_size",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "List of NCBI UIDs or accessions",
+                "name": "identifiers",
+                "type": "List[str]",
+            }
+        ],
+    },
+    {
+        "description": "Search many sequences with BLAST in one batched job (NCBI, local BLAST+ or DIAMOND) and "
+        "return every hit and HSP as a pandas DataFrame. Identical sequences are answered from a result cache.",
+        "name": "blast_sequences",
+        "optional_parameters": [
+            {
+                "default": "remote",
+                "description": "'remote' (NCBI BLAST), 'local' (BLAST+) or 'diamond'",
+                "name": "backend",
+                "type": "str",
+            },
+            {
+                "default": 10.0,
+                "description": "E-value threshold",
+                "name": "expect",
+                "type": "float",
+            },
+            {
+                "default": 50,
+                "description": "Maximum number of hits per query",
+                "name": "hitlist_size",
+                "type": "int",
+            },
+            {
+                "default": 900,
+                "description": "Maximum number of seconds to wait",
+                "name": "timeout",
+                "type": "float",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "One sequence, FASTA text, a list of sequences or a dict of named sequences",
+                "name": "sequences",
+                "type": "str | List[str] | Dict[str, str]",
+            },
+            {
+                "default": None,
+                "description": "NCBI database (e.g. 'core_nt', 'nr', 'swissprot') for the remote backend, "
+                "or the path of a local BLAST+/DIAMOND database",
+                "name": "database",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "'blastn', 'blastp', 'blastx', 'tblastn' or 'tblastx'",
+                "name": "program",
+                "type": "str",
+            },
+        ],
+    },
+    {
+        "description": "Submit sequences to BLAST without waiting and return a job ID; the search runs in the "
+        "background while you do other work. Collect the hits with get_blast_results.",
+        "name": "submit_blast_job",
+        "optional_parameters": [
+            {
+                "default": "remote",
+                "description": "'remote' (NCBI BLAST), 'local' (BLAST+) or 'diamond'",
+                "name": "backend",
+                "type": "str",
+            },
+            {
+                "default": 10.0,
+                "description": "E-value threshold",
+                "name": "expect",
+                "type": "float",
+            },
+            {
+                "default": 50,
+                "description": "Maximum number of hits per query",
+                "name": "hitlist_size",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "One sequence, FASTA text, a list of sequences or a dict of named sequences",
+                "name": "sequences",
+                "type": "str | List[str] | Dict[str, str]",
+            },
+            {
+                "default": None,
+                "description": "NCBI database (e.g. 'core_nt', 'nr', 'swissprot') for the remote backend, "
+                "or the path of a local BLAST+/DIAMOND database",
+                "name": "database",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "'blastn', 'blastp', 'blastx', 'tblastn' or 'tblastx'",
+                "name": "program",
+                "type": "str",
+            },
+        ],
+    },
+    {
+        "description": "Return all hits and HSPs of a submitted BLAST job as a pandas DataFrame, or the job "
+        "status if it has not finished or failed.",
+        "name": "get_blast_results",
+        "optional_parameters": [
+            {
+                "default": True,
+                "description": "Wait for the job to finish; if False, a running job returns its status",
+                "name": "wait",
+                "type": "bool",
+            },
+            {
+                "default": 900,
+                "description": "Maximum number of seconds to wait",
+                "name": "timeout",
+                "type": "float",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "Job ID returned by submit_blast_job",
+                "name": "job_id",
+                "type": "str",
+            }
+        ],
+    },
+    {
+        "description": "Build a local BLAST+ (makeblastdb) or DIAMOND (diamond makedb) database from a FASTA "
+        "file and return its path for use with blast_sequences.",
+        "name": "make_local_database",
+        "optional_parameters": [
+            {
+                "default": None,
+                "description": "Output database path; defaults to the FASTA path without extension",
+                "name": "db_path",
+                "type": "str",
+            },
+            {
+                "default": "prot",
+                "description": "'prot' or 'nucl' (BLAST+ only)",
+                "name": "dbtype",
+                "type": "str",
+            },
+            {
+                "default": "local",
+                "description": "'local' (BLAST+) or 'diamond'",
+                "name": "backend",
+                "type": "str",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "Path of the FASTA file",
+                "name": "fasta_path",
+                "type": "str",
+            }
+        ],
+    },
 ]
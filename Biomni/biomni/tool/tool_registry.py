@@ -1,70 +1,133 @@
+import json
 import pickle
 
 import pandas as pd
 
+REGISTRY_FORMAT = "biomni.tool_registry"
+REGISTRY_FORMAT_VERSION = 1
+
 
 class ToolRegistry:
+    """Registry of tool schemas with O(1) lookups by name, id and module.
+
+    Tools are kept in insertion order in a dict keyed by id, with secondary indexes by name and module.
+    ``document_df`` (indexed by tool id) is materialized on first access and then kept up to date row by row
+    as tools are registered, replaced or removed.
+
+    The schemas passed to the constructor are copied, so the caller's dicts are not modified.
+    """
+
     def __init__(self, tools):
-        self.tools = []
+        self._by_id: dict[int, dict] = {}
+        self._by_name: dict[str, dict] = {}
+        self._by_module: dict[str, dict[str, dict]] = {}
         self.next_id = 0
+        self._document_df = None
 
-        for j in tools.values():
+        for module, j in tools.items():
             for tool in j:
+                tool = dict(tool)
+                tool.setdefault("module", module)
                 self.register_tool(tool)
 
-        docs = []
-        for tool_id in range(len(self.tools)):
-            docs.append([int(tool_id), self.get_tool_by_id(int(tool_id))])
-        self.document_df = pd.DataFrame(docs, columns=["docid", "document_content"])
-
         # self.langchain_tools = {}
         # for module, api_list in tools.items():
         #    self.langchain_tools.update({self.get_id_by_name(api['name']): api_schema_to_langchain_tool(api, mode = 'custom_tool', module_name = module) for api in api_list})
 
+    @property
+    def tools(self) -> list[dict]:
+        return list(self._by_id.values())
+
+    @property
+    def document_df(self) -> pd.DataFrame:
+        if self._document_df is None:
+            self._document_df = pd.DataFrame(
+                [[int(tool_id), tool] for tool_id, tool in self._by_id.items()],
+                columns=["docid", "document_content"],
+                index=list(self._by_id),
+            )
+        return self._document_df
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
     def register_tool(self, tool):
-        if self.validate_tool(tool):
+        """Register a tool schema. A tool with the same name as an existing one replaces it and keeps its id."""
+        if not self.validate_tool(tool):
+            raise ValueError("Invalid tool format")
+
+        existing = self._by_name.get(tool["name"])
+        if existing is not None:
+            tool["id"] = existing["id"]
+            self._unindex_module(existing)
+        else:
             tool["id"] = self.next_id
-            self.tools.append(tool)
             self.next_id += 1
-        else:
-            raise ValueError("Invalid tool format")
+
+        self._by_id[tool["id"]] = tool
+        self._by_name[tool["name"]] = tool
+        module = tool.get("module")
+        if module:
+            self._by_module.setdefault(module, {})[tool["name"]] = tool
+        if self._document_df is not None:
+            if existing is not None:
+                self._document_df.at[tool["id"], "document_content"] = tool
+            else:
+                self._document_df.loc[tool["id"]] = [int(tool["id"]), tool]
 
     def validate_tool(self, tool):
         required_keys = ["name", "description", "required_parameters"]
         return all(key in tool for key in required_keys)
 
     def get_tool_by_name(self, name):
-        for tool in self.tools:
-            if tool["name"] == name:
-                return tool
-        return None
+        return self._by_name.get(name)
 
     def get_tool_by_id(self, tool_id):
-        for tool in self.tools:
-            if tool["id"] == tool_id:
-                return tool
-        return None
+        return self._by_id.get(tool_id)
 
     def get_id_by_name(self, name):
-        for tool in self.tools:
-            if tool["name"] == name:
-                return tool["id"]
-        return None
+        tool = self._by_name.get(name)
+        return tool["id"] if tool else None
 
     def get_name_by_id(self, tool_id):
-        for tool in self.tools:
-            if tool["id"] == tool_id:
-                return tool["name"]
-        return None
+        tool = self._by_id.get(tool_id)
+        return tool["name"] if tool else None
+
+    def get_module_by_name(self, name):
+        tool = self._by_name.get(name)
+        return tool.get("module") if tool else None
+
+    def get_tools_by_module(self, module):
+        return list(self._by_module.get(module, {}).values())
+
+    def list_modules(self):
+        return list(self._by_module.keys())
 
     def list_tools(self):
-        return [{"name": tool["name"], "id": tool["id"]} for tool in self.tools]
+        return [{"name": tool["name"], "id": tool["id"]} for tool in self._by_id.values()]
+
+    def _unindex_module(self, tool):
+        module = tool.get("module")
+        if module and module in self._by_module:
+            self._by_module[module].pop(tool["name"], None)
+            if not self._by_module[module]:
+                del self._by_module[module]
+
+    def _remove(self, tool):
+        del self._by_id[tool["id"]]
+        del self._by_name[tool["name"]]
+        self._unindex_module(tool)
+        if self._document_df is not None:
+            self._document_df.drop(index=tool["id"], inplace=True)
 
     def remove_tool_by_id(self, tool_id):
         # Remove the tool with the given id
         tool = self.get_tool_by_id(tool_id)
         if tool:
-            self.tools = [t for t in self.tools if t["id"] != tool_id]
+            self._remove(tool)
             return True
         return False
 
@@ -72,13 +135,80 @@ class ToolRegistry:
         # Remove the tool with the given name
         tool = self.get_tool_by_name(name)
         if tool:
-            self.tools = [t for t in self.tools if t["name"] != name]
+            self._remove(tool)
             return True
         return False
 
+    def copy(self) -> "ToolRegistry":
+        """Return a registry with its own indexes, so tools can be added or removed without affecting this one.
+
+        The tool schemas themselves are shared; they are replaced rather than modified when a tool is re-registered.
+        """
+        registry = ToolRegistry({})
+        registry._by_id = dict(self._by_id)
+        registry._by_name = dict(self._by_name)
+        registry._by_module = {module: dict(tools) for module, tools in self._by_module.items()}
+        registry.next_id = self.next_id
+        if self._document_df is not None:
+            registry._document_df = self._document_df.copy()
+        return registry
+
+    def to_dict(self):
+        """Return a JSON-serializable representation of the registry.
+
+        Values that cannot be represented in JSON (e.g. the ``fn`` callables of MCP tools) are dropped.
+        """
+        tools = []
+        for tool in self._by_id.values():
+            entry = {}
+            for key, value in tool.items():
+                try:
+                    json.dumps(value)
+                except (TypeError, ValueError):
+                    continue
+                entry[key] = value
+            tools.append(entry)
+        return {
+            "format": REGISTRY_FORMAT,
+            "version": REGISTRY_FORMAT_VERSION,
+            "next_id": self.next_id,
+            "tools": tools,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("format") != REGISTRY_FORMAT:
+            raise ValueError("Not a serialized tool registry")
+        if data.get("version", 0) > REGISTRY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported tool registry format version: {data.get('version')}")
+
+        registry = cls({})
+        for tool in data["tools"]:
+            tool_id = tool["id"]
+            registry.next_id = tool_id
+            registry.register_tool(tool)
+        registry.next_id = max(data.get("next_id", 0), registry.next_id)
+        return registry
+
+    def __setstate__(self, state):
+        if "tools" in state and "_by_id" not in state:
+            # Pickles from older versions kept a plain list of tools; rebuild the indexes from it
+            tools = state.pop("tools")
+            state.pop("document_df", None)
+            self.__dict__.update(state)
+            self._by_id, self._by_name, self._by_module = {}, {}, {}
+            self._document_df = None
+            next_id = state.get("next_id", 0)
+            for tool in tools:
+                self.next_id = tool["id"]
+                self.register_tool(tool)
+            self.next_id = max(next_id, self.next_id)
+            return
+        self.__dict__.update(state)
+
     def save_registry(self, filename):
-        with open(filename, "wb") as file:
-            pickle.dump(self, file)
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, separators=(",", ":"))
 
     # def get_langchain_tool_by_id(self, id):
     #     return self.langchain_tools[id]
@@ -86,4 +216,9 @@ class ToolRegistry:
     @staticmethod
     def load_registry(filename):
         with open(filename, "rb") as file:
-            return pickle.load(file)
+            head = file.read(1)
+            file.seek(0)
+            if head == b"\x80":
+                # Registries saved by older versions were pickled whole
+                return pickle.load(file)
+            return ToolRegistry.from_dict(json.load(file))
@@ -0,0 +1,322 @@
+import bisect
+import email.utils
+import os
+import random
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "Biomni-Agent/1.0 (https://biomni.stanford.edu)"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Methods that can be re-sent safely after a read timeout or an error response; other methods (POST) are only
+# retried when the connection could not be established, i.e. the request never reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_VERSION_SEGMENT = re.compile(r"^v\d+(\.\d+)*$")
+
+
+# Rate-limit bucket for E-utilities requests that carry an API key (see ``HttpTransport.request``'s ``rate_key``)
+NCBI_KEYED_BUCKET = "eutils.ncbi.nlm.nih.gov#api_key"
+
+
+def _host_presets() -> dict[str, tuple[float, float]]:
+    """Return documented per-host rate limits as ``host -> (requests per second, burst)``."""
+    # NCBI allows 3 requests/s without an API key and 10 requests/s with one
+    ncbi_rate = 10.0 if os.environ.get("NCBI_API_KEY") else 3.0
+    return {
+        "eutils.ncbi.nlm.nih.gov": (ncbi_rate, ncbi_rate),
+        NCBI_KEYED_BUCKET: (10.0, 10),
+        "blast.ncbi.nlm.nih.gov": (0.1, 1),
+        "rest.ensembl.org": (15.0, 15),
+        "grch37.rest.ensembl.org": (15.0, 15),
+        "rest.uniprot.org": (10.0, 10),
+        "www.ebi.ac.uk": (10.0, 10),
+        "api.fda.gov": (4.0, 4),
+    }
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting
+
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound of the bucket containing the ``q`` quantile (0 < q <= 1)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        labels = [f"<={b}s" for b in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "p50_seconds": self.percentile(0.5),
+            "p95_seconds": self.percentile(0.95),
+            "max_seconds": self.max,
+            "throttled_seconds": self.throttled_seconds,
+            "histogram": {label: n for label, n in zip(labels, self.counts, strict=True) if n},
+        }
+
+
+def _retry_after_seconds(response: requests.Response) -> float | None:
+    """Parse a ``Retry-After`` header given either in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _not_sent(exc: requests.exceptions.RequestException) -> bool:
+    """Return True if a request failed while connecting, before any of it was sent to the server."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    reason = exc.args[0] if exc.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)
+
+
+def endpoint_key(url: str) -> str:
+    """Group URLs by host and leading path segments, with identifier-like segments replaced by ``{id}``."""
+    parsed = urlparse(url)
+    segments = []
+    for segment in [s for s in parsed.path.split("/") if s][:3]:
+        if any(c.isdigit() for c in segment) and not _VERSION_SEGMENT.match(segment):
+            segment = "{id}"
+        segments.append(segment)
+    return "/".join([parsed.netloc, *segments])
+
+
+class HttpTransport:
+    """Shared HTTP transport for database tools.
+
+    A single ``requests.Session`` keeps pooled keep-alive connections per host. Every request passes
+    a per-host token bucket (with presets for NCBI, Ensembl, UniProt and OpenFDA) and uses a default
+    timeout. GET, HEAD and OPTIONS requests are retried with exponential backoff and full jitter on
+    connection errors, timeouts, 429 and 5xx responses, honouring ``Retry-After``; other methods are
+    only retried when the connection could not be established, since the server may already have acted
+    on them. Latencies are recorded per endpoint.
+    """
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = (10, 120),
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        pool_maxsize: int = 16,
+        rate_limits: dict[str, tuple[float, float]] | None = None,
+    ):
+        """Initialize the transport.
+
+        Args:
+            timeout: Default (connect, read) timeout in seconds
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base: Base delay of the exponential backoff in seconds
+            backoff_max: Maximum backoff delay (and maximum honoured ``Retry-After``) in seconds
+            pool_maxsize: Maximum number of pooled connections per host
+            rate_limits: Per-host ``(requests per second, burst)`` overrides on top of the presets
+
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": USER_AGENT})
+
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._rate_limits = {**_host_presets(), **(rate_limits or {})}
+        self._metrics: dict[str, LatencyHistogram] = {}
+
+    def set_rate_limit(self, host: str, rate: float, burst: float | None = None) -> None:
+        """Set the rate limit of a host in requests per second."""
+        with self._lock:
+            self._rate_limits[host] = (rate, burst if burst is not None else rate)
+            self._buckets.pop(host, None)
+
+    def _bucket(self, host: str) -> TokenBucket | None:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None and host in self._rate_limits:
+                rate, burst = self._rate_limits[host]
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def _metric(self, url: str) -> LatencyHistogram:
+        key = endpoint_key(url)
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = self._metrics[key] = LatencyHistogram()
+            return metric
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def request(
+        self, method: str, url: str, retries: int | None = None, rate_key: str | None = None, **kwargs
+    ) -> requests.Response:
+        """Send a request through the pool, rate limiter and retry policy.
+
+        Args:
+            method: HTTP method
+            url: Full URL
+            retries: Override of ``max_retries`` for this request; 0 disables retries
+            rate_key: Rate-limit bucket to draw from instead of the URL's host, for limits that depend on the
+                caller (e.g. ``NCBI_KEYED_BUCKET`` for requests sent with an NCBI API key)
+            **kwargs: Passed to ``requests.Session.request`` (params, headers, json, data, stream, timeout, ...)
+
+        Returns:
+            The final ``requests.Response``; callers still call ``raise_for_status`` as with ``requests``
+
+        Raises:
+            requests.exceptions.RequestException: If the request failed on every attempt
+
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.max_retries if retries is None else retries
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        bucket = self._bucket(rate_key or urlparse(url).netloc)
+        metric = self._metric(url)
+
+        for attempt in range(retries + 1):
+            if bucket is not None:
+                waited = bucket.acquire()
+                if waited:
+                    with self._lock:
+                        metric.throttled_seconds += waited
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                with self._lock:
+                    metric.observe(time.perf_counter() - start)
+                    metric.errors += 1
+                if attempt >= retries or not (idempotent or _not_sent(e)):
+                    raise
+                with self._lock:
+                    metric.retries += 1
+                time.sleep(self._backoff(attempt))
+                continue
+
+            with self._lock:
+                metric.observe(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    metric.errors += 1
+            if response.status_code not in RETRY_STATUS or attempt >= retries or not idempotent:
+                return response
+
+            retry_after = _retry_after_seconds(response)
+            delay = min(self.backoff_max, retry_after) if retry_after is not None else self._backoff(attempt)
+            response.close()
+            with self._lock:
+                metric.retries += 1
+            time.sleep(delay)
+
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> dict[str, dict]:
+        """Return latency, error and retry statistics per endpoint (host plus leading path segments)."""
+        with self._lock:
+            return {key: metric.summary() for key, metric in sorted(self._metrics.items())}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """Return the process-wide transport shared by all database tools."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport
@@ -0,0 +1,401 @@
+import multiprocessing
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+# Imported once in the fork server; every worker forked from it starts with these already loaded
+DEFAULT_PRELOAD = ["numpy", "pandas", "scipy", "matplotlib", "scanpy", "anndata", "Bio", "biomni.tool.support_tools"]
+
+
+def _apply_limits(memory_limit_mb: int | None):
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _set_cpu_limit(cpu_seconds: float | None):
+    """Allow the next execution ``cpu_seconds`` of CPU time; the kernel kills the worker with SIGXCPU beyond that."""
+    try:
+        import resource
+    except ImportError:
+        return
+    if not cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (resource.RLIM_INFINITY, resource.RLIM_INFINITY))
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, resource.RLIM_INFINITY))
+
+
+def is_transferable(obj) -> bool:
+    """Return True if ``obj`` can be sent to a worker process.
+
+    Objects are pickled, so closures, lambdas, bound methods of unpicklable objects (e.g. MCP tool wrappers)
+    and open handles cannot be sent. Functions and classes defined in ``__main__`` (scripts and notebooks)
+    pickle by reference to a module the worker cannot import, so they are rejected too; define them in an
+    importable module instead, which the worker then imports by name.
+    """
+    try:
+        data = pickle.dumps(obj)
+    except Exception:
+        return False
+    return b"__main__" not in data
+
+
+def _worker_main(conn, preload: list[str], memory_limit_mb: int | None):
+    """Entry point of a worker process: execute code requests in this process's own persistent namespace."""
+    for module in preload:
+        try:
+            __import__(module)
+        except Exception:
+            pass
+    _apply_limits(memory_limit_mb)
+
+    from biomni.tool import support_tools
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        kind = request[0]
+        try:
+            if kind == "exec":
+                _, code, cpu_seconds = request
+                _set_cpu_limit(cpu_seconds)
+                output = support_tools.run_python_repl(code)
+                _set_cpu_limit(None)
+                conn.send(("ok", output))
+            elif kind == "inject":
+                support_tools._persistent_namespace.update(request[1])
+                conn.send(("ok", None))
+            elif kind == "reset":
+                support_tools._persistent_namespace.clear()
+                conn.send(("ok", None))
+            elif kind == "close":
+                break
+        except MemoryError:
+            conn.send(("error", "Error: The code exceeded the worker memory limit"))
+        except Exception as e:
+            conn.send(("error", f"Error: {e}"))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, preload: list[str], memory_limit_mb: int | None):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, preload, memory_limit_mb), daemon=True, name="biomni-repl-worker"
+        )
+        self.process.start()
+        child_conn.close()
+        self.lock = threading.Lock()
+        self.injected: dict[str, int] = {}  # name -> id of the injected object
+        self.skipped: set[str] = set()
+        self.executions = 0
+        self.pending = 0  # executions handed this worker that have not finished yet
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.join(5)
+        except Exception:
+            pass
+        self.conn.close()
+
+
+class WorkerPool:
+    """Pool of pre-forked Python worker processes for executing agent-generated code.
+
+    Workers are forked from a fork server that has already imported the scientific stack, so a new
+    worker starts warm. Each conversation thread gets a sticky worker that holds its own persistent
+    namespace. A timed-out execution is stopped by killing the worker process, which also stops work
+    inside C extensions, and a fresh worker takes its place. Optional per-worker address-space and
+    CPU-time limits are enforced with ``setrlimit``.
+
+    At most ``max_workers`` threads hold a worker. A new thread takes the worker of the least recently
+    used thread that is not running code; that thread's namespace is lost, and its next execution output
+    starts with a note saying so. If every worker is running code, the new thread waits for one to finish.
+
+    Namespace entries (custom tools and helpers) are pickled into the worker. Entries that cannot be sent
+    (see ``is_transferable``) are skipped with a warning; use ``unavailable`` to keep them out of prompts.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        min_idle: int = 1,
+        preload: list[str] | None = None,
+        memory_limit_mb: int | None = None,
+        cpu_limit_seconds: float | None = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_workers: Maximum number of threads with a worker; beyond this the least recently used idle
+                thread loses its worker and namespace, or the new thread waits if no thread is idle
+            min_idle: Number of spare workers kept started for new threads
+            preload: Modules imported once in the fork server (defaults to ``DEFAULT_PRELOAD``)
+            memory_limit_mb: Address-space limit of each worker in MB, or None for no limit
+            cpu_limit_seconds: CPU-time limit per execution in seconds, or None for no limit
+
+        """
+        self.max_workers = max_workers
+        self.min_idle = min_idle
+        self.preload = list(DEFAULT_PRELOAD if preload is None else preload)
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit_seconds = cpu_limit_seconds
+
+        if sys.platform != "win32" and "forkserver" in multiprocessing.get_all_start_methods():
+            self._ctx = multiprocessing.get_context("forkserver")
+            self._ctx.set_forkserver_preload(self.preload)
+        else:
+            self._ctx = multiprocessing.get_context("spawn")
+
+        self._lock = threading.Lock()
+        # Notified whenever an execution finishes or a worker is released, so waiting threads can claim it
+        self._available = threading.Condition(self._lock)
+        self._assigned: OrderedDict[str, _Worker] = OrderedDict()
+        self._starting = 0  # assigned slots whose worker is still being started
+        self._evicted: set[str] = set()
+        self._idle: list[_Worker] = []
+        self._closed = False
+        self.stats = {
+            "executions": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "workers_started": 0,
+            "warm_assignments": 0,
+            "evicted_threads": 0,
+        }
+        # Start the fork server and the spare workers in the background so the first execution is warm
+        threading.Thread(target=self._fill_idle, daemon=True, name="biomni-pool-warmup").start()
+
+    def _start_worker(self) -> _Worker:
+        worker = _Worker(self._ctx, self.preload, self.memory_limit_mb)
+        with self._lock:
+            self.stats["workers_started"] += 1
+        return worker
+
+    def _fill_idle(self):
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.min_idle:
+                    return
+            worker = self._start_worker()
+            with self._lock:
+                if self._closed:
+                    worker.kill()
+                    return
+                self._idle.append(worker)
+
+    def _worker_for(self, thread_id: str) -> tuple[_Worker, bool]:
+        """Return the thread's worker, marked as pending, and whether the thread's previous worker was evicted."""
+        with self._available:
+            while True:
+                worker = self._assigned.get(thread_id)
+                if worker is not None and worker.alive():
+                    self._assigned.move_to_end(thread_id)
+                    worker.pending += 1
+                    return worker, False
+                if worker is not None:
+                    del self._assigned[thread_id]
+                if len(self._assigned) + self._starting < self.max_workers or self._evict_idle_thread():
+                    break
+                # Every worker is running code; wait for one to finish rather than exceed max_workers
+                self._available.wait()
+            evicted = thread_id in self._evicted
+            self._evicted.discard(thread_id)
+            worker = None
+            while self._idle and worker is None:
+                candidate = self._idle.pop()
+                if candidate.alive():
+                    worker = candidate
+                    self.stats["warm_assignments"] += 1
+                else:
+                    candidate.kill()
+            self._starting += 1
+        try:
+            if worker is None:
+                worker = self._start_worker()
+        finally:
+            with self._lock:
+                self._starting -= 1
+                existing = self._assigned.get(thread_id)
+                if worker is not None and existing is not None and existing.alive():
+                    # A concurrent call for the same thread won the race; keep our worker as a spare
+                    self._idle.append(worker)
+                    worker = existing
+                if worker is not None:
+                    worker.pending += 1
+                    self._assigned[thread_id] = worker
+        threading.Thread(target=self._fill_idle, daemon=True).start()
+        return worker, evicted
+
+    def _evict_idle_thread(self) -> bool:
+        """Take the worker away from the least recently used thread that is not running code (lock held).
+
+        The thread's namespace is lost with its worker; its next execution is told so.
+        """
+        for old_id, old_worker in self._assigned.items():
+            if old_worker.pending == 0:
+                del self._assigned[old_id]
+                old_worker.kill()
+                self._evicted.add(old_id)
+                self.stats["evicted_threads"] += 1
+                print(f"Released the Python worker of idle thread {old_id}; its variables are no longer available")
+                return True
+        return False
+
+    def _done(self, worker: _Worker):
+        with self._available:
+            worker.pending -= 1
+            self._available.notify_all()
+
+    def _replace(self, thread_id: str, worker: _Worker):
+        worker.kill()
+        with self._available:
+            if self._assigned.get(thread_id) is worker:
+                del self._assigned[thread_id]
+            self._available.notify_all()
+        threading.Thread(target=self._fill_idle, daemon=True).start()
+
+    def _inject(self, worker: _Worker, namespace: dict | None) -> list[str]:
+        """Send new or changed namespace entries to a worker.
+
+        Returns:
+            Names of entries that cannot be sent (see ``is_transferable``) and are missing in the worker
+
+        """
+        if not namespace:
+            return []
+        payload = {}
+        skipped = []
+        for name, obj in namespace.items():
+            if worker.injected.get(name) == id(obj):
+                continue
+            if not is_transferable(obj):
+                skipped.append(name)
+                continue
+            payload[name] = obj
+        new_skips = [name for name in skipped if name not in worker.skipped]
+        if new_skips:
+            print(
+                f"Warning: {', '.join(new_skips)} cannot be sent to the Python worker process (not picklable or "
+                "defined in __main__) and will not be available to executed code"
+            )
+            worker.skipped.update(new_skips)
+        if payload:
+            worker.conn.send(("inject", payload))
+            worker.conn.recv()
+            for name, obj in payload.items():
+                worker.injected[name] = id(obj)
+        return skipped
+
+    @staticmethod
+    def unavailable(namespace: dict | None) -> list[str]:
+        """Return the names of namespace entries that cannot be sent to a worker process."""
+        return [name for name, obj in (namespace or {}).items() if not is_transferable(obj)]
+
+    def execute(self, code: str, thread_id="default", timeout: float = 600, namespace: dict | None = None) -> str:
+        """Run Python code in the thread's worker and return its captured output.
+
+        Args:
+            code: Python code to run
+            thread_id: Conversation thread; consecutive calls with the same id share variables
+            timeout: Wall-clock timeout in seconds; the worker is killed and replaced when it is exceeded
+            namespace: Extra objects (e.g. custom tools) to make available in the worker's namespace
+
+        Returns:
+            The captured output or an error message
+
+        """
+        thread_id = str(thread_id)
+        worker, evicted = self._worker_for(thread_id)
+        try:
+            output = self._execute(worker, thread_id, code, timeout, namespace)
+        finally:
+            self._done(worker)
+        if evicted:
+            output = (
+                "Note: The Python session of this thread was released while it was idle, so variables defined "
+                "earlier are no longer available.\n" + output
+            )
+        return output
+
+    def _execute(self, worker: _Worker, thread_id: str, code: str, timeout: float, namespace: dict | None) -> str:
+        with worker.lock:
+            with self._lock:
+                self.stats["executions"] += 1
+            try:
+                self._inject(worker, namespace)
+                worker.conn.send(("exec", code, self.cpu_limit_seconds))
+                if not worker.conn.poll(timeout):
+                    print(f"TIMEOUT: Code execution timed out after {timeout} seconds")
+                    with self._lock:
+                        self.stats["timeouts"] += 1
+                    self._replace(thread_id, worker)
+                    return (
+                        f"ERROR: Code execution timed out after {timeout} seconds. The Python session was restarted, "
+                        "so variables defined earlier are no longer available. Please try with simpler inputs or "
+                        "break your task into smaller steps."
+                    )
+                _, output = worker.conn.recv()
+                worker.executions += 1
+                return output
+            except (EOFError, OSError, BrokenPipeError):
+                with self._lock:
+                    self.stats["crashes"] += 1
+                worker.process.join(1)
+                exitcode = worker.process.exitcode
+                self._replace(thread_id, worker)
+                reason = "exceeded its CPU time limit" if exitcode == -24 else f"exited with code {exitcode}"
+                return (
+                    f"Error: The Python worker {reason}. The Python session was restarted, so variables defined "
+                    "earlier are no longer available."
+                )
+
+    def reset(self, thread_id="default"):
+        """Clear the namespace of a thread's worker."""
+        with self._lock:
+            worker = self._assigned.get(str(thread_id))
+        if worker is not None and worker.alive():
+            with worker.lock:
+                worker.conn.send(("reset",))
+                worker.conn.recv()
+                worker.injected.clear()
+
+    def release(self, thread_id="default"):
+        """Stop the worker of a thread, e.g. when its conversation ends."""
+        with self._available:
+            worker = self._assigned.pop(str(thread_id), None)
+            self._evicted.discard(str(thread_id))
+            self._available.notify_all()
+        if worker is not None:
+            worker.kill()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["threads"] = len(self._assigned)
+            stats["idle_workers"] = len(self._idle)
+            stats["worker_pids"] = {tid: w.process.pid for tid, w in self._assigned.items()}
+        return stats
+
+    def shutdown(self):
+        with self._available:
+            self._closed = True
+            workers = list(self._assigned.values()) + self._idle
+            self._assigned.clear()
+            self._idle = []
+            self._available.notify_all()
+        for worker in workers:
+            worker.kill()
@@ -0,0 +1,386 @@
+"""Structured tracing of agent runs.
+
+A ``Tracer`` records spans (name, kind, parent, start time, duration, status and attributes) for one or
+more agent runs: the resource retrieval, every LLM call of the graph with its token counts and time to
+first token, every code execution with its language, wall time, memory high-water mark and output size,
+and every database tool call. Spans are kept in memory, can be appended to a JSONL file per run, and are
+aggregated into a per-run summary table to find the slowest steps.
+
+The tracer of a run is looked up through a context variable, so concurrent runs (e.g. session clones or
+parallel trajectories) each record their own spans. Threads inherit it only when started with a copy of
+the run's context, as the code execution thread and the query executor do; calls from other threads are
+not traced. Database tool calls made in pre-forked worker processes (the "process" execution backend) are
+not traced either, since they run outside the agent's process; the ``execute`` span that contains them is.
+
+Usage:
+    agent = A1(trace="traces.jsonl")
+    agent.go("...")
+    print(agent.tracer.format_summary())
+    python -m biomni.tracing traces.jsonl --top 10      # summarize saved runs
+"""
+
+import argparse
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+_current_tracer = contextvars.ContextVar("biomni_tracer", default=None)
+_current_span = contextvars.ContextVar("biomni_span", default=None)
+
+
+def get_tracer():
+    """Return the tracer of the agent run in progress in this context, or None when nothing is being traced."""
+    tracer = _current_tracer.get()
+    return tracer if tracer is not None and tracer.enabled else None
+
+
+class Tracer:
+    """Collects the spans of agent runs.
+
+    A disabled tracer records nothing, so the agent can trace unconditionally at no cost.
+    """
+
+    def __init__(self, path: str | None = None, enabled: bool = True, max_spans: int = 100000):
+        """Initialize the tracer.
+
+        Args:
+            path: JSONL file the spans of each run are appended to when it ends; None keeps them in memory only
+            enabled: Whether spans are recorded
+            max_spans: Maximum number of spans kept in memory; the oldest are discarded first
+
+        """
+        self.path = path
+        self.enabled = enabled
+        self.max_spans = max_spans
+        self.spans: list[dict] = []
+        self.run_id: str | None = None
+        self._root_id: str | None = None
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def run(self, name: str, **attributes):
+        """Trace one agent run: open its root span, make this the tracer of the context, and export the run's spans.
+
+        Yields:
+            The root span's attribute dict, which can be updated before the run ends
+
+        """
+        if not self.enabled:
+            yield {}
+            return
+        self.run_id = uuid.uuid4().hex[:12]
+        token = _current_tracer.set(self)
+        try:
+            with self.span(name, kind="run", **attributes) as root:
+                self._root_id = _current_span.get()
+                yield root
+        finally:
+            _current_tracer.reset(token)
+            self._root_id = None
+            if self.path:
+                self.export_jsonl(self.path, run_id=self.run_id)
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: str = "llm", **attributes):
+        """Record a span around a block.
+
+        Exceptions mark the span as failed and are re-raised.
+
+        Yields:
+            The span's attribute dict, to which results such as token counts can be added
+
+        """
+        if not self.enabled:
+            yield {}
+            return
+        record = {
+            "trace_id": self.run_id,
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": _current_span.get() or self._root_id,
+            "name": name,
+            "kind": kind,
+            "start": time.time(),
+            "thread": threading.current_thread().name,
+            "attributes": dict(attributes),
+        }
+        token = _current_span.set(record["span_id"])
+        start = time.perf_counter()
+        try:
+            yield record["attributes"]
+            record["status"] = "error" if record["attributes"].get("success") is False else "ok"
+        except BaseException as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 6)
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(record)
+                if len(self.spans) > self.max_spans:
+                    del self.spans[: len(self.spans) - self.max_spans]
+
+    def get_spans(self, run_id: str | None = None) -> list[dict]:
+        """Return the recorded spans, of one run if ``run_id`` is given, in the order they ended."""
+        with self._lock:
+            return [s for s in self.spans if run_id is None or s["trace_id"] == run_id]
+
+    def export_jsonl(self, path: str, run_id: str | None = None) -> int:
+        """Append spans (all, or those of one run) to a JSONL file; returns the number written."""
+        spans = self.get_spans(run_id)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a") as f:
+            for span in spans:
+                f.write(json.dumps(span, default=str) + "\n")
+        return len(spans)
+
+    def summary(self, run_id: str | None = None) -> pd.DataFrame:
+        """Return the per-step summary of one run (by default the last one), see ``summarize_spans``."""
+        return summarize_spans(self.get_spans(run_id or self.run_id))
+
+    def format_summary(self, run_id: str | None = None, top: int | None = 15) -> str:
+        return format_summary(self.summary(run_id), top=top)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+
+
+def load_jsonl(path: str) -> list[dict]:
+    """Read spans exported with ``Tracer.export_jsonl``."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_spans(spans: list[dict]) -> pd.DataFrame:
+    """Aggregate spans by kind and name, slowest total first.
+
+    Columns: count, total/mean/p50/max seconds, share of the run's wall time, errors, and for LLM spans
+    the summed prompt and completion tokens and the mean time to first token.
+    """
+    columns = [
+        "kind",
+        "name",
+        "count",
+        "total_s",
+        "mean_s",
+        "p50_s",
+        "max_s",
+        "share",
+        "errors",
+        "prompt_tokens",
+        "completion_tokens",
+        "ttft_s",
+    ]
+    if not spans:
+        return pd.DataFrame(columns=columns)
+    rows = []
+    for span in spans:
+        attributes = span.get("attributes", {})
+        rows.append(
+            {
+                "trace_id": span.get("trace_id"),
+                "kind": span["kind"],
+                "name": span["name"],
+                "seconds": span["seconds"],
+                "error": span.get("status") == "error",
+                "prompt_tokens": attributes.get("prompt_tokens", 0) or 0,
+                "completion_tokens": attributes.get("completion_tokens", 0) or 0,
+                "ttft_s": attributes.get("ttft_seconds"),
+            }
+        )
+    df = pd.DataFrame(rows)
+    wall = df.loc[df["kind"] == "run"].groupby("trace_id")["seconds"].max().sum()
+    grouped = df.groupby(["kind", "name"], sort=False)
+    table = grouped.agg(
+        count=("seconds", "size"),
+        total_s=("seconds", "sum"),
+        mean_s=("seconds", "mean"),
+        p50_s=("seconds", "median"),
+        max_s=("seconds", "max"),
+        errors=("error", "sum"),
+        prompt_tokens=("prompt_tokens", "sum"),
+        completion_tokens=("completion_tokens", "sum"),
+        ttft_s=("ttft_s", "mean"),
+    ).reset_index()
+    table["share"] = table["total_s"] / wall if wall else float("nan")
+    table = table.sort_values("total_s", ascending=False, kind="stable")
+    return table[columns].round(4).reset_index(drop=True)
+
+
+def format_summary(table: pd.DataFrame, top: int | None = 15) -> str:
+    """Render a summary table as text, limited to the ``top`` slowest rows."""
+    if table.empty:
+        return "No spans recorded"
+    if top is not None:
+        table = table.head(top)
+    return table.to_string(index=False, na_rep="-")
+
+
+def reset_peak_rss(pid: int | None = None) -> bool:
+    """Reset the memory high-water mark of a process (this one if ``pid`` is None); False if not supported.
+
+    Writing "5" to ``/proc/<pid>/clear_refs`` (Linux) sets VmHWM back to the current resident size, so a later
+    ``peak_rss_mb`` reports the peak since the reset instead of since the process started.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb(pid: int | None = None) -> float | None:
+    """Return the memory high-water mark (VmHWM) of a process in MB, or of this process if ``pid`` is None.
+
+    This is the peak since the process started, or since the last ``reset_peak_rss``.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid is None:
+        try:
+            import resource
+
+            # ru_maxrss is in KB on Linux
+            return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        except (ImportError, OSError):
+            pass
+    return None
+
+
+def invoke_llm(llm, messages, name: str = "llm", tracer: Tracer | None = None, config=None, **attributes):
+    """Invoke a chat model, recording an ``llm`` span when a run is being traced.
+
+    While tracing, the response is streamed to measure the time to first token and its chunks are merged
+    into one message; the prompt, completion and cached token counts reported by the provider are added
+    to the span. Without an active tracer this is a plain ``llm.invoke(messages)``.
+
+    Args:
+        llm: Chat model or runnable returning message chunks
+        messages: Prompt messages
+        name: Span name
+        tracer: Tracer to record to; defaults to the tracer of the run in progress
+        config: Runnable config passed on to the model
+        **attributes: Extra span attributes
+
+    """
+    tracer = tracer if tracer is not None else get_tracer()
+    if tracer is None or not tracer.enabled:
+        return llm.invoke(messages, config=config)
+    from langchain_core.messages import AIMessage
+
+    from biomni.llm import cache_usage
+
+    with tracer.span(name, kind="llm", **attributes) as span:
+        if not hasattr(llm, "stream"):
+            response = llm.invoke(messages, config=config)
+            ttft = None
+        else:
+            # Ask OpenAI-compatible models to report usage at the end of the stream
+            model = getattr(llm, "bound", llm)
+            kwargs = {"stream_usage": True} if "stream_usage" in getattr(type(model), "model_fields", {}) else {}
+            start = time.perf_counter()
+            chunk, ttft = None, None
+            for part in llm.stream(messages, config=config, **kwargs):
+                if ttft is None and part.content:
+                    ttft = time.perf_counter() - start
+                chunk = part if chunk is None else chunk + part
+            if chunk is None:
+                response = AIMessage(content="")
+            else:
+                response = AIMessage(
+                    content=chunk.content,
+                    id=chunk.id,
+                    tool_calls=chunk.tool_calls,
+                    usage_metadata=chunk.usage_metadata,
+                    response_metadata=chunk.response_metadata,
+                )
+        usage = cache_usage(response)
+        span.update(
+            {
+                "prompt_tokens": usage["input_tokens"],
+                "completion_tokens": usage["output_tokens"],
+                "cache_read_tokens": usage["cache_read_tokens"],
+                "cache_write_tokens": usage["cache_write_tokens"],
+                "ttft_seconds": round(ttft, 4) if ttft is not None else None,
+                "output_chars": len(str(response.content)),
+            }
+        )
+    return response
+
+
+def trace_tool(func):
+    """Decorate a database tool so each call is recorded as a ``tool`` span while a run is traced.
+
+    The span holds the call's arguments (truncated), whether it succeeded and its response cache status.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = get_tracer()
+        if tracer is None:
+            return func(*args, **kwargs)
+        arguments = {k: _truncate(v) for k, v in kwargs.items()}
+        if args:
+            arguments["args"] = [_truncate(a) for a in args]
+        with tracer.span(func.__name__, kind="tool", arguments=arguments) as span:
+            result = func(*args, **kwargs)
+            if isinstance(result, dict):
+                if "success" in result:
+                    span["success"] = bool(result["success"])
+                query_info = result.get("query_info")
+                if isinstance(query_info, dict) and isinstance(query_info.get("cache"), dict):
+                    span["cache"] = query_info["cache"].get("status")
+            return result
+
+    return wrapper
+
+
+def _truncate(value, limit: int = 200):
+    text = value if isinstance(value, str) else repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def main():
+    """Command-line entry point: print the summary table of saved traces."""
+    parser = argparse.ArgumentParser(description="Summarize agent traces exported as JSONL")
+    parser.add_argument("path", help="JSONL file written by a tracer")
+    parser.add_argument("--run", help="Summarize only this run (trace id); default: all runs together")
+    parser.add_argument("--per-run", action="store_true", help="Print one table per run")
+    parser.add_argument("--top", type=int, default=15, help="Rows to show per table (default: 15)")
+    args = parser.parse_args()
+
+    spans = load_jsonl(args.path)
+    if args.run:
+        spans = [s for s in spans if s.get("trace_id") == args.run]
+    if not args.per_run:
+        print(format_summary(summarize_spans(spans), top=args.top))
+        return 0
+    runs = {}
+    for span in spans:
+        runs.setdefault(span.get("trace_id"), []).append(span)
+    for run_id, run_spans in runs.items():
+        root = next((s for s in run_spans if s["kind"] == "run"), None)
+        title = f"{root['name']} ({root['seconds']:.1f}s)" if root else ""
+        print(f"Run {run_id} {title}")
+        print(format_summary(summarize_spans(run_spans), top=args.top))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
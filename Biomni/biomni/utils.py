@@ -9,7 +9,6 @@ import tempfile
 import traceback
 import zipfile
 from typing import Any, ClassVar
-from urllib.parse import urljoin
 
 import pandas as pd
 import requests
@@ -188,6 +187,7 @@ def run_with_timeout(func, args=None, kwargs=None, timeout=600):
     if kwargs is None:
         kwargs = {}
 
+    import contextvars
     import ctypes
     import queue
     import threading
@@ -202,8 +202,9 @@ def run_with_timeout(func, args=None, kwargs=None, timeout=600):
         except Exception as e:
             result_queue.put(("error", str(e)))
 
-    # Start a separate thread
-    thread = threading.Thread(target=thread_func, args=(func, args, kwargs, result_queue))
+    # Start a separate thread, in a copy of the caller's context so that tool calls are traced with its run
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(thread_func, func, args, kwargs, result_queue))
     thread.daemon = True  # Set as daemon so it will be killed when main thread exits
     thread.start()
 
@@ -342,8 +343,10 @@ def execute_graphql_query(
     api_address: str = "https://api.genetics.opentargets.org/graphql",
 ) -> dict:
     """Executes a GraphQL query with variables and returns the data as a dictionary."""
+    from biomni.tool.transport import get_transport
+
     headers = {"Content-Type": "application/json"}
-    response = requests.post(api_address, json={"query": query, "variables": variables}, headers=headers)
+    response = get_transport().post(api_address, json={"query": query, "variables": variables}, headers=headers)
     if response.status_code == 200:
         return response.json()
     else:
@@ -606,8 +609,10 @@ def _get_gene_id_entrez(gene_symbol: str):
     """Get the Entrez ID for a gene symbol. If no match found, returns None
     e.g. 1017 (CDK2).
     """
+    from biomni.tool.transport import get_transport
+
     api_call = f"https://mygene.info/v3/query?species=human&q=symbol:{gene_symbol}"
-    response = requests.get(api_call)
+    response = get_transport().get(api_call)
     response_json = response.json()
 
     if len(response_json["hits"]) == 0:
@@ -620,8 +625,10 @@ def _get_gene_id_ensembl(gene_symbol):
     """Get the Ensembl ID for a gene symbol. If no match found, returns None
     e.g. ENSG00000123374.
     """
+    from biomni.tool.transport import get_transport
+
     api_call = f"https://mygene.info/v3/query?species=human&fields=ensembl&q=symbol:{gene_symbol}"
-    response = requests.get(api_call)
+    response = get_transport().get(api_call)
     response_json = response.json()
 
     if len(response_json["hits"]) == 0:
@@ -640,9 +647,11 @@ def _get_gene_id_ensembl_with_version(gene_symbol):
     """Get the Ensembl ID for a gene symbol. If no match found, returns None
     e.g. ENSG00000123374.10.
     """
+    from biomni.tool.transport import get_transport
+
     api_base = "https://gtexportal.org/api/v2/reference/gene"
     params = {"geneId": gene_symbol}
-    response_json = requests.get(api_base, params=params).json()
+    response_json = get_transport().get(api_base, params=params).json()
 
     if len(response_json["data"]) == 0:
         return None
@@ -913,100 +922,68 @@ def download_and_unzip(url: str, dest_dir: str) -> str:
 
 
 def check_and_download_s3_files(
-    s3_bucket_url: str, local_data_lake_path: str, expected_files: list[str], folder: str = "data_lake"
+    s3_bucket_url: str,
+    local_data_lake_path: str,
+    expected_files: list[str],
+    folder: str = "data_lake",
+    max_workers: int = 8,
+    manifest: str | dict | None = None,
+    mirror_dir: str | None = None,
 ) -> dict[str, bool]:
     """Check for missing files in the local data lake and download them from S3 bucket.
 
+    Missing files are downloaded concurrently and resumed from ``.part`` files if a previous transfer
+    was interrupted. See ``biomni.datalake.DataLakeDownloader`` for details.
+
     Args:
-        s3_bucket_url: Base URL of the S3 bucket (e.g., "https://biomni-release.s3.amazonaws.com")
+        s3_bucket_url: Base URL of the S3 bucket (e.g., "https://biomni-release.s3.amazonaws.com") or a file:// URL
         local_data_lake_path: Local path to the data lake directory
         expected_files: List of expected file names in the data lake
         folder: S3 folder name ("data_lake" or "benchmark")
+        max_workers: Maximum number of concurrent downloads
+        manifest: Optional integrity manifest (dict, path or URL) with expected sizes and sha256 checksums
+        mirror_dir: Optional local directory to copy files from instead of downloading them
 
     Returns:
         Dictionary mapping file names to download success status
     """
+    from biomni.datalake.downloader import DataLakeDownloader
 
     os.makedirs(local_data_lake_path, exist_ok=True)
-    download_results = {}
-
-    def download_with_progress(url: str, file_path: str, desc: str) -> bool:
-        """Download file with progress bar."""
-        try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("content-length", 0))
-
-            with open(file_path, "wb") as f:
-                if total_size > 0:
-                    with tqdm.tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, ncols=80) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-            return True
-        except Exception as e:
-            print(f"✗ Failed to download {desc}: {e}")
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass
-            return False
-
-    def cleanup_file(file_path: str):
-        """Clean up file if it exists."""
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except OSError:
-                pass
 
     # Handle benchmark folder (download as zip)
     if folder == "benchmark":
         print(f"Downloading entire {folder} folder structure...")
-        s3_zip_url = urljoin(s3_bucket_url + "/", folder + ".zip")
-
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp_zip:
-            tmp_zip_path = tmp_zip.name
-
-            if download_with_progress(s3_zip_url, tmp_zip_path, f"{folder}.zip"):
-                print(f"Extracting {folder}.zip...")
-                try:
-                    with zipfile.ZipFile(tmp_zip_path, "r") as zip_ref:
-                        zip_ref.extractall(local_data_lake_path)
-                    print(f"✓ Successfully downloaded and extracted {folder} folder")
-                    download_results = dict.fromkeys(expected_files, True)
-                except Exception as e:
-                    print(f"✗ Error extracting {folder}.zip: {e}")
-                    download_results = dict.fromkeys(expected_files, False)
-                finally:
-                    cleanup_file(tmp_zip_path)
-            else:
+        downloader = DataLakeDownloader(
+            s3_bucket_url, local_data_lake_path, folder="", manifest=manifest or {}, mirror_dir=mirror_dir
+        )
+        tmp_zip_path = os.path.join(local_data_lake_path, f"{folder}.zip")
+
+        if downloader.fetch(f"{folder}.zip", dest_path=tmp_zip_path):
+            print(f"Extracting {folder}.zip...")
+            try:
+                with zipfile.ZipFile(tmp_zip_path, "r") as zip_ref:
+                    zip_ref.extractall(local_data_lake_path)
+                print(f"✓ Successfully downloaded and extracted {folder} folder")
+                download_results = dict.fromkeys(expected_files, True)
+            except Exception as e:
+                print(f"✗ Error extracting {folder}.zip: {e}")
                 download_results = dict.fromkeys(expected_files, False)
+            finally:
+                if os.path.exists(tmp_zip_path):
+                    os.remove(tmp_zip_path)
+        else:
+            download_results = dict.fromkeys(expected_files, False)
 
         return download_results
 
-    # Handle data_lake folder (download individual files)
-    for filename in expected_files:
-        local_file_path = os.path.join(local_data_lake_path, filename)
-
-        if os.path.exists(local_file_path):
-            download_results[filename] = True
-            continue
-
-        s3_file_url = urljoin(s3_bucket_url + "/" + folder + "/", filename)
-        print(f"Downloading {filename} from {folder}...")
-
-        if download_with_progress(s3_file_url, local_file_path, filename):
-            print(f"✓ Successfully downloaded: {filename}")
-            download_results[filename] = True
-        else:
-            download_results[filename] = False
-
-    return download_results
+    # Handle data_lake folder (download individual files concurrently)
+    downloader = DataLakeDownloader(
+        s3_bucket_url,
+        local_data_lake_path,
+        folder=folder,
+        max_workers=max_workers,
+        manifest=manifest,
+        mirror_dir=mirror_dir,
+    )
+    return downloader.download(expected_files)
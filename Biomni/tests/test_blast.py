@@ -0,0 +1,182 @@
+import os
+import stat
+import sys
+import threading
+import time
+
+import pytest
+from biomni.tool import blast
+from biomni.tool.blast import BlastJobManager, parse_sequences
+from biomni.tool.response_cache import ResponseCache
+
+BLAST_XML = """<?xml version="1.0"?>
+<BlastOutput>
+  <BlastOutput_program>blastp</BlastOutput_program>
+  <BlastOutput_version>BLASTP 2.15.0+</BlastOutput_version>
+  <BlastOutput_db>nr</BlastOutput_db>
+  <BlastOutput_query-ID>Query_1</BlastOutput_query-ID>
+  <BlastOutput_query-def>query_1</BlastOutput_query-def>
+  <BlastOutput_query-len>8</BlastOutput_query-len>
+  <BlastOutput_param><Parameters><Parameters_expect>10</Parameters_expect></Parameters></BlastOutput_param>
+  <BlastOutput_iterations>
+    <Iteration>
+      <Iteration_iter-num>1</Iteration_iter-num>
+      <Iteration_query-ID>Query_1</Iteration_query-ID>
+      <Iteration_query-def>query_1</Iteration_query-def>
+      <Iteration_query-len>8</Iteration_query-len>
+      <Iteration_hits>
+        <Hit>
+          <Hit_num>1</Hit_num>
+          <Hit_id>sp|P04637|P53_HUMAN</Hit_id>
+          <Hit_def>Cellular tumor antigen p53</Hit_def>
+          <Hit_accession>P04637</Hit_accession>
+          <Hit_len>393</Hit_len>
+          <Hit_hsps>
+            <Hsp>
+              <Hsp_num>1</Hsp_num>
+              <Hsp_bit-score>20.0</Hsp_bit-score>
+              <Hsp_score>40</Hsp_score>
+              <Hsp_evalue>0.001</Hsp_evalue>
+              <Hsp_query-from>1</Hsp_query-from>
+              <Hsp_query-to>8</Hsp_query-to>
+              <Hsp_hit-from>10</Hsp_hit-from>
+              <Hsp_hit-to>17</Hsp_hit-to>
+              <Hsp_identity>8</Hsp_identity>
+              <Hsp_positive>8</Hsp_positive>
+              <Hsp_gaps>0</Hsp_gaps>
+              <Hsp_align-len>8</Hsp_align-len>
+              <Hsp_qseq>MEEPQSDP</Hsp_qseq>
+              <Hsp_hseq>MEEPQSDP</Hsp_hseq>
+              <Hsp_midline>MEEPQSDP</Hsp_midline>
+            </Hsp>
+          </Hit_hsps>
+        </Hit>
+      </Iteration_hits>
+    </Iteration>
+  </BlastOutput_iterations>
+</BlastOutput>
+"""
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeBlastServer:
+    """Answers Put with a RID, reports WAITING for the first ``waiting`` status checks, then returns BLAST_XML."""
+
+    def __init__(self, waiting=1):
+        self.waiting = waiting
+        self.puts = []
+        self.put_retries = []
+        self.polls = 0
+
+    def post(self, url, data, retries=None):
+        self.puts.append(data)
+        self.put_retries.append(retries)
+        return FakeResponse("RID = FAKE123\nRTOE = 0\n")
+
+    def get(self, url, params):
+        if params.get("FORMAT_TYPE") == "XML":
+            return FakeResponse(BLAST_XML)
+        self.polls += 1
+        if self.polls <= self.waiting:
+            return FakeResponse("Status=WAITING")
+        return FakeResponse("Status=READY\nThereAreHits=yes")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeBlastServer()
+    monkeypatch.setattr(blast, "get_transport", lambda: server)
+    return server
+
+
+@pytest.fixture
+def manager(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "blast.sqlite"), stale_while_revalidate=False)
+    return BlastJobManager(cache=cache, poll_min=0.01, poll_max=0.05)
+
+
+def test_parse_sequences():
+    assert parse_sequences("acg t") == {"query_1": "ACGT"}
+    assert parse_sequences(">a desc\nAC\nGT\n>b\nMK\n") == {"a": "ACGT", "b": "MK"}
+    assert parse_sequences({"x": "mk\n"}) == {"x": "MK"}
+
+
+def test_remote_job_polls_until_ready_and_caches_results(manager, server):
+    job_id = manager.submit("MEEPQSDP", program="blastp", database="nr")
+    assert manager.wait(job_id, timeout=10)
+    assert manager.status(job_id)["status"] == "done"
+    assert server.polls == 2
+    results = manager.results(job_id)
+    assert list(results["accession"]) == ["P04637"]
+    assert results["pct_identity"][0] == 100.0
+
+    # The same sequence under a different name is answered from the cache without a request
+    again = manager.submit({"p53_start": "MEEPQSDP"}, program="blastp", database="nr")
+    assert manager.status(again)["cached_queries"] == 1
+    assert len(server.puts) == 1
+    assert server.put_retries == [0]
+    assert list(manager.results(again)["query"]) == ["p53_start"]
+
+
+def test_poller_restarts_after_going_idle(manager, server):
+    server.waiting = 0
+    for _ in range(5):
+        job_id = manager.submit("MEEPQSDP", program="blastp", database="nr", use_cache=False)
+        assert manager.wait(job_id, timeout=10)
+    # Submitting while the previous poller is exiting must never leave a running job without a poller
+    server.waiting = 1
+    job_ids = []
+    threads = [
+        threading.Thread(
+            target=lambda: job_ids.append(manager.submit("MK", program="blastp", database="nr", use_cache=False))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(manager.wait(job_id, timeout=10) for job_id in job_ids)
+
+
+def test_finished_jobs_are_pruned(tmp_path, server):
+    cache = ResponseCache(path=str(tmp_path / "blast.sqlite"))
+    manager = BlastJobManager(cache=cache, poll_min=0.01, max_jobs=2, job_retention=60)
+    job_ids = []
+    for _ in range(4):
+        job_ids.append(manager.submit("MEEPQSDP", program="blastp", database="nr"))
+        assert manager.wait(job_ids[-1], timeout=10)
+    # Jobs are pruned on submission, so the newest job comes on top of the two kept finished ones
+    assert set(manager.jobs) == set(job_ids[1:])
+    with pytest.raises(KeyError):
+        manager.status(job_ids[0])
+
+    manager.jobs[job_ids[1]].finished = time.time() - 120
+    manager.submit("MEEPQSDP", program="blastp", database="nr")
+    assert job_ids[1] not in manager.jobs
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as a fake BLAST+ binary")
+def test_local_backend_runs_blast_process(manager, tmp_path, monkeypatch):
+    script = tmp_path / "bin" / "blastp"
+    script.parent.mkdir()
+    hit = "\t".join(["query_1", "4", "sp|Q9|X", "Protein X", "100", "100.0", "4", "4", "0", "1", "4", "5", "8"])
+    script.write_text(
+        f'#!/bin/sh\nwhile [ "$1" != "-out" ]; do shift; done\nprintf \'{hit}\\t1e-5\\t12.5\\n\' > "$2"\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+
+    job_id = manager.submit("MKVL", program="blastp", database=str(tmp_path / "db"), backend="local")
+    assert manager.wait(job_id, timeout=10)
+    results = manager.results(job_id)
+    assert manager.status(job_id)["status"] == "done"
+    assert list(results["accession"]) == ["Q9"]
+    assert results["evalue"][0] == 1e-5
@@ -0,0 +1,55 @@
+import os
+
+import requests
+from biomni.tool.benchmark import DEFAULT_CASES, _isolated_caches, run_benchmark
+from biomni.tool.cassette import Cassette, CassetteMiss, request_key, use_cassette
+from biomni.tool.database import query_uniprot
+
+# Hand-made stand-ins for recordings of DEFAULT_CASES: trimmed payloads with a fixed 0.25 s per request, only
+# meant to exercise replay. They are not real responses, so they are not used for benchmark numbers.
+FIXTURE_CASSETTES = os.path.join(os.path.dirname(__file__), "fixtures", "cassettes")
+
+
+def test_request_key_ignores_credentials_and_param_order():
+    first = requests.Request("GET", "https://example.org/a?b=2&api_key=SECRET&a=1").prepare()
+    second = requests.Request("GET", "https://example.org/a?a=1&b=2&email=me@example.org").prepare()
+    assert request_key(first) == request_key(second) == "GET https://example.org/a?a=1&b=2"
+
+    body = requests.Request("POST", "https://example.org/a", json={"x": 1, "y": 2}).prepare()
+    reordered = requests.Request("POST", "https://example.org/a", data='{"y": 2, "x": 1}').prepare()
+    reordered.headers["Content-Type"] = "application/json"
+    assert request_key(body) == request_key(reordered)
+
+
+def test_default_cases_replay_offline_from_fixture_cassettes():
+    summary = run_benchmark(cassette_dir=FIXTURE_CASSETTES, repeat=2, latency_scale=0.0, verbose=False)
+    assert list(summary["case"]) == [case["name"] for case in DEFAULT_CASES]
+    assert summary["errors"].sum() == 0, summary["first_error"].dropna().tolist()
+    assert summary["cassette_misses"].sum() == 0
+    assert (summary["http_requests"] >= 1).all()
+    # Warm runs are answered by the response cache, except for the E-utilities calls which it does not cover
+    assert (summary["warm_http_requests"] <= summary["http_requests"]).all()
+    assert summary.set_index("case")["warm_http_requests"]["uniprot_entry"] == 0
+
+
+def test_missing_cassette_is_an_error(tmp_path):
+    summary = run_benchmark(cassette_dir=str(tmp_path), cases=DEFAULT_CASES[:1], repeat=1, verbose=False)
+    assert summary["errors"].sum() == 1
+    assert "No cassette at" in summary["first_error"].iloc[0]
+
+
+def test_replay_serves_recordings_and_misses_unknown_requests(tmp_path):
+    path = str(tmp_path / "uniprot.json")
+    cassette = Cassette(path)
+    cassette.http["GET https://rest.uniprot.org/uniprotkb/P04637"] = [
+        {"status": 200, "reason": "OK", "headers": {"Content-Type": "application/json"}, "text": '{"id": 1}'}
+    ]
+    cassette.save()
+
+    with _isolated_caches(str(tmp_path)), use_cassette(path) as replayed:
+        result = query_uniprot(endpoint="https://rest.uniprot.org/uniprotkb/P04637")
+        assert result["result"] == {"id": 1}
+        missed = query_uniprot(endpoint="https://rest.uniprot.org/uniprotkb/P38398")
+        assert "error" in missed
+    assert replayed.stats.summary()["misses"] == 1
+    assert issubclass(CassetteMiss, requests.exceptions.RequestException)
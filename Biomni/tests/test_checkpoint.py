@@ -0,0 +1,80 @@
+import operator
+import time
+from typing import Annotated, TypedDict
+
+import pytest
+from biomni.agent.checkpoint import SqliteCheckpointer, make_checkpointer
+from langgraph.graph import END, START, StateGraph
+
+
+class State(TypedDict):
+    steps: Annotated[list, operator.add]
+
+
+def build(checkpointer):
+    graph = StateGraph(State)
+    graph.add_node("step", lambda state: {"steps": [len(state["steps"]) + 1]})
+    graph.add_edge(START, "step")
+    graph.add_edge("step", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_thread_resumes_after_reopening_the_file(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = SqliteCheckpointer(path)
+    build(saver).invoke({"steps": []}, config("a"))
+    build(saver).invoke({"steps": []}, config("a"))
+    saver.close()
+
+    reopened = SqliteCheckpointer(path)
+    app = build(reopened)
+    assert app.get_state(config("a")).values["steps"] == [1, 2]
+    assert app.invoke({"steps": []}, config("a"))["steps"] == [1, 2, 3]
+    assert app.get_state(config("b")).values == {}
+
+
+def test_only_the_latest_checkpoints_are_kept():
+    saver = SqliteCheckpointer(keep_last=2)
+    app = build(saver)
+    for _ in range(5):
+        app.invoke({"steps": []}, config("a"))
+    assert app.get_state(config("a")).values["steps"] == [1, 2, 3, 4, 5]
+    assert len(list(saver.list(config("a")))) == 2
+    blobs = saver.stats()["blobs"]
+
+    saver.prune(["a"])
+    assert len(list(saver.list(config("a")))) == 1
+    assert saver.stats()["blobs"] < blobs
+    assert app.get_state(config("a")).values["steps"] == [1, 2, 3, 4, 5]
+
+    saver.prune(["a"], strategy="delete")
+    assert saver.threads() == []
+    with pytest.raises(ValueError):
+        saver.prune(["a"], strategy="oldest")
+
+
+def test_idle_threads_expire():
+    saver = SqliteCheckpointer(ttl_seconds=60)
+    app = build(saver)
+    app.invoke({"steps": []}, config("old"))
+    app.invoke({"steps": []}, config("new"))
+    saver._conn.execute("UPDATE threads SET updated = ? WHERE thread_id = 'old'", (time.time() - 120,))
+
+    assert saver.gc() == 1
+    assert [thread["thread_id"] for thread in saver.threads()] == ["new"]
+    assert app.get_state(config("old")).values == {}
+    assert saver.stats()["checkpoints"] == len(list(saver.list(config("new"))))
+
+
+def test_make_checkpointer(tmp_path):
+    assert make_checkpointer("memory", str(tmp_path / "unused.sqlite")).path == ":memory:"
+    assert make_checkpointer("sqlite", str(tmp_path / "default.sqlite")).path == str(tmp_path / "default.sqlite")
+    saver = SqliteCheckpointer()
+    assert make_checkpointer(saver, "") is saver
+    with pytest.raises(ValueError):
+        make_checkpointer(3, "")
+    assert not (tmp_path / "unused.sqlite").exists()
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from biomni.datalake.columnar import (
+    COLUMNAR_DIR_NAME,
+    annotate_data_lake_dict,
+    compact_data_lake,
+    load_catalog,
+    load_data_lake,
+)
+
+
+@pytest.fixture
+def data_lake(tmp_path):
+    frame = pd.DataFrame({"gene": ["TP53", "EGFR", "KRAS", "MYC"], "score": [0.9, 0.1, 0.7, 0.3]})
+    frame.to_csv(tmp_path / "genes.csv", index=False)
+    frame.assign(score=frame["score"] * 10).to_csv(tmp_path / "genes.tsv", sep="\t", index=False)
+    return tmp_path
+
+
+def test_same_stem_files_get_separate_parquet_copies(data_lake):
+    catalog = compact_data_lake(str(data_lake))
+    assert catalog["genes.csv"]["path"] != catalog["genes.tsv"]["path"]
+    assert (data_lake / COLUMNAR_DIR_NAME / "genes.csv.parquet").exists()
+    assert (data_lake / COLUMNAR_DIR_NAME / "genes.tsv.parquet").exists()
+
+    csv = load_data_lake("genes.csv", columns=["score"], data_lake_path=str(data_lake))
+    tsv = load_data_lake("genes.tsv", columns=["score"], data_lake_path=str(data_lake))
+    assert list(tsv["score"]) == [s * 10 for s in csv["score"]]
+
+
+def test_selective_load_and_recompaction(data_lake):
+    compact_data_lake(str(data_lake), names=["genes.csv"])
+    rows = load_data_lake("genes.csv", columns=["gene"], filters=[("score", ">", 0.5)], data_lake_path=str(data_lake))
+    assert list(rows["gene"]) == ["TP53", "KRAS"]
+
+    mtime = load_catalog(str(data_lake))["genes.csv"]["source_mtime"]
+    compact_data_lake(str(data_lake), names=["genes.csv"])
+    assert load_catalog(str(data_lake))["genes.csv"]["source_mtime"] == mtime
+
+
+def test_annotations_list_columns(data_lake):
+    compact_data_lake(str(data_lake), names=["genes.csv"])
+    annotated = annotate_data_lake_dict({"genes.csv": "Gene scores.", "missing.csv": "Not here."}, str(data_lake))
+    assert annotated["genes.csv"].startswith("Gene scores. Columns: gene (string), score (double)")
+    assert annotated["missing.csv"] == "Not here."
+
+
+def test_large_csv_is_streamed_in_row_groups(tmp_path, monkeypatch):
+    import pyarrow.parquet as pq
+    from biomni.datalake import columnar
+
+    # Small parse blocks so that the file is read as many batches; "dose" is integral in the first block only
+    monkeypatch.setattr(columnar, "_CSV_BLOCK_SIZE", 4096)
+    n = 5000
+    frame = pd.DataFrame({"gene": [f"G{i}" for i in range(n)], "dose": [str(i) for i in range(n - 1)] + ["2.5"]})
+    frame.to_csv(tmp_path / "doses.csv", index=False)
+
+    entry = columnar.compact_file(str(tmp_path), "doses.csv", row_group_size=1000)
+    assert entry["num_rows"] == n
+    assert entry["columns"]["dose"] == "double"
+    metadata = pq.ParquetFile(tmp_path / entry["path"]).metadata
+    assert metadata.num_row_groups == 5
+    assert not (tmp_path / (entry["path"] + ".tmp")).exists()
+
+    rows = load_data_lake(
+        "doses.csv", columns=["dose"], filters=[("gene", "==", "G4999")], data_lake_path=str(tmp_path)
+    )
+    assert list(rows["dose"]) == [2.5]
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+from biomni.agent.context import ContextBudget, count_tokens
+from biomni.tool.projection import load_artifact, spill_text
+from langchain_core.messages import AIMessage, HumanMessage
+
+
+@pytest.fixture(autouse=True)
+def artifacts(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOMNI_ARTIFACT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def observation(text):
+    return AIMessage(content=f"<observation>{text}</observation>")
+
+
+def trajectory(observation_text):
+    return [
+        HumanMessage(content="Find the TP53 pathways"),
+        AIMessage(content="Look up the pathways.\n<execute>print(pathways)</execute>"),
+        observation(observation_text),
+        AIMessage(content="Done.<solution>p53 signaling</solution>"),
+    ]
+
+
+def test_large_older_observations_are_summarized(artifacts):
+    output = "\n".join(f"row {i}" for i in range(500)) + "\nValueError: bad row"
+    budget = ContextBudget(max_tokens=None, keep_recent=1, max_observation_tokens=50)
+    sent = budget.build("system", trajectory(output))
+
+    summary = str(sent[3].content)
+    assert summary.startswith("<observation>[Compacted observation:")
+    assert "Error lines:\nValueError: bad row" in summary
+    assert "row 14\n... (476 lines omitted) ...\nrow 491" in summary
+    path = summary.split("load_artifact('")[1].split("'")[0]
+    assert load_artifact(path) == output
+    assert budget.history[0]["compacted_messages"] == 1
+    assert budget.history[0]["prompt_tokens"] < budget.history[0]["raw_tokens"]
+
+
+def test_existing_artifact_is_reused(artifacts):
+    full = "x\n" * 20000
+    path = spill_text(full, label="observation")
+    truncated = f"The full output was saved to {path} and can be read with load_artifact('{path}').\n" + full[:10000]
+    budget = ContextBudget(max_tokens=None, keep_recent=1, max_observation_tokens=50)
+    sent = budget.build("system", trajectory(truncated))
+
+    assert f"load_artifact('{path}')" in str(sent[3].content)
+    assert os.listdir(artifacts) == [os.path.basename(path)]
+
+
+def test_compaction_cache_is_bounded_and_stable():
+    budget = ContextBudget(max_tokens=None, keep_recent=1, max_observation_tokens=10, cache_size=2)
+    messages = trajectory("word " * 200)
+    first = budget.build("system", messages)
+    assert budget.build("system", messages)[3].content == first[3].content
+
+    for i in range(5):
+        budget.build("system", trajectory(f"other {i} " * 200))
+    assert len(budget._compacted) == 2
+
+
+def test_budget_drops_oldest_messages_when_still_over():
+    messages = [HumanMessage(content="task")]
+    for i in range(10):
+        messages.append(AIMessage(content=f"step {i} " + "reasoning " * 300))
+    step_tokens = count_tokens("reasoning " * 300)
+    budget = ContextBudget(max_tokens=step_tokens * 6, keep_recent=2)
+    budget.build("system", messages)
+    # Shortening the older steps is enough
+    assert budget.history[-1]["compacted_messages"] > 0
+    assert budget.history[-1]["dropped_messages"] == 0
+
+    budget = ContextBudget(max_tokens=step_tokens * 2 + 400, keep_recent=2)
+    sent = budget.build("system", messages)
+    assert sent[1].content == "task"
+    assert sent[-1].content == messages[-1].content
+    assert "earlier messages were omitted" in str(sent[2].content)
+    assert budget.history[-1]["dropped_messages"] > 0
+    assert not budget.history[-1]["over_budget"]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from biomni.datalake.cache import DatasetCache
+
+
+def test_hits_are_isolated_copies(tmp_path):
+    path = tmp_path / "table.csv"
+    pd.DataFrame({"a": [1, 2, 3]}).to_csv(path, index=False)
+    cache = DatasetCache()
+
+    first = cache.get_or_load(str(path))
+    first.loc[0, "a"] = 100
+    first["b"] = 0
+    second = cache.get_or_load(str(path))
+
+    assert list(second.columns) == ["a"]
+    assert list(second["a"]) == [1, 2, 3]
+    assert cache.stats()["hits"] == 1
+
+
+def test_hits_share_memory_until_written(tmp_path):
+    path = tmp_path / "table.csv"
+    pd.DataFrame({"a": np.arange(1000)}).to_csv(path, index=False)
+    cache = DatasetCache()
+    cached = cache.get_or_load(str(path), copy=False)
+
+    hit = cache.get_or_load(str(path))
+    assert np.shares_memory(hit["a"].to_numpy(), cached["a"].to_numpy())
+
+
+def test_changed_file_is_reloaded_and_lru_evicts(tmp_path):
+    a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+    pd.DataFrame({"x": range(100)}).to_csv(a, index=False)
+    pd.DataFrame({"x": range(100)}).to_csv(b, index=False)
+    size = DatasetCache().get_or_load(str(a)).memory_usage(deep=True).sum()
+    cache = DatasetCache(max_bytes=int(size * 1.5))
+
+    cache.get_or_load(str(a))
+    cache.get_or_load(str(b))
+    assert [d["path"] for d in cache.stats()["datasets"]] == [str(b)]
+
+    pd.DataFrame({"x": [1]}).to_csv(b, index=False)
+    assert len(cache.get_or_load(str(b))) == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_concurrent_requests_share_one_load(tmp_path):
+    import threading
+    import time
+
+    path = tmp_path / "table.csv"
+    pd.DataFrame({"a": range(10)}).to_csv(path, index=False)
+    state = {"loads": 0, "running": 0, "max_running": 0}
+    state_lock = threading.Lock()
+
+    def slow_loader(p):
+        with state_lock:
+            state["loads"] += 1
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        time.sleep(0.05)
+        with state_lock:
+            state["running"] -= 1
+        return pd.read_csv(p)
+
+    def hammer(cache):
+        # Staggered starts, so some threads arrive while a load is running and some after it finished
+        threads = [
+            threading.Thread(target=lambda d=i: (time.sleep(d * 0.01), cache.get_or_load(str(path), slow_loader)))
+            for i in range(16)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    cache = DatasetCache()
+    hammer(cache)
+    assert state["loads"] == 1
+    assert cache.stats()["hits"] == 15
+    assert cache._key_locks == {}
+
+    # Objects over the budget are never cached, but loads of the same key still never overlap
+    state.update(loads=0, max_running=0)
+    uncached = DatasetCache(max_bytes=1)
+    hammer(uncached)
+    assert state["loads"] == 16
+    assert state["max_running"] == 1
+    assert uncached._key_locks == {}
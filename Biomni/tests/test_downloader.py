@@ -0,0 +1,60 @@
+import os
+
+from biomni.datalake.downloader import DataLakeDownloader, load_manifest, write_manifest
+
+
+def make_mirror(tmp_path):
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    (mirror / "a.csv").write_bytes(b"x,y\n" + b"1,2\n" * 1000)
+    (mirror / "b.parquet").write_bytes(os.urandom(5000))
+    write_manifest(str(mirror))
+    return mirror
+
+
+def downloader(mirror, dest, **kwargs):
+    return DataLakeDownloader(
+        "https://example.invalid", str(dest), mirror_dir=str(mirror), show_progress=False, chunk_size=512, **kwargs
+    )
+
+
+def test_download_verifies_and_skips_complete_files(tmp_path):
+    mirror = make_mirror(tmp_path)
+    dest = tmp_path / "dest"
+    dl = downloader(mirror, dest)
+
+    assert dl.download(["a.csv", "b.parquet"]) == {"a.csv": True, "b.parquet": True}
+    assert (dest / "b.parquet").read_bytes() == (mirror / "b.parquet").read_bytes()
+    assert dl.report()["files_downloaded"] == 2
+
+    assert dl.download(["a.csv", "b.parquet"]) == {"a.csv": True, "b.parquet": True}
+    assert dl.report()["files_skipped"] == 2
+
+
+def test_partial_file_is_resumed(tmp_path):
+    mirror = make_mirror(tmp_path)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    data = (mirror / "b.parquet").read_bytes()
+    (dest / "b.parquet.part").write_bytes(data[:3000])
+    dl = downloader(mirror, dest)
+
+    assert dl.download(["b.parquet"]) == {"b.parquet": True}
+    report = dl.report()
+    assert report["files_resumed"] == 1
+    assert report["bytes_downloaded"] == len(data) - 3000
+    assert (dest / "b.parquet").read_bytes() == data
+    assert not (dest / "b.parquet.part").exists()
+
+
+def test_checksum_mismatch_is_rejected(tmp_path):
+    mirror = make_mirror(tmp_path)
+    manifest = load_manifest(str(mirror / "manifest.json"))
+    manifest["a.csv"]["sha256"] = "0" * 64
+    dest = tmp_path / "dest"
+    dl = downloader(mirror, dest, manifest=manifest, retries=1)
+
+    assert dl.download(["a.csv"]) == {"a.csv": False}
+    assert "sha256 mismatch" in dl.report()["failures"]["a.csv"]
+    assert not (dest / "a.csv").exists()
+    assert not (dest / "a.csv.part").exists()
@@ -0,0 +1,44 @@
+from biomni.model.embedding import HashingTfidfEmbedder, LangChainEmbedder, ResourceIndex, index_dir_name
+from biomni.model.retriever import ToolRetriever
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+RESOURCES = {
+    "tools": [
+        {"name": "query_uniprot", "description": "Query the UniProt protein sequence and function database"},
+        {"name": "query_clinvar", "description": "Look up clinical significance of human genetic variants"},
+        {"name": "run_blast", "description": "Align a nucleotide sequence against a BLAST database"},
+    ],
+    "data_lake": [{"name": "gene_info.parquet", "description": "Gene symbols, synonyms and genomic locations"}],
+    "libraries": [{"name": "scanpy", "description": "Single-cell RNA-seq analysis"}],
+}
+
+
+def test_search_ranks_relevant_tool_first(tmp_path):
+    index = ResourceIndex(path=str(tmp_path / "index")).build(RESOURCES)
+    hits = index.search("clinical significance of a genetic variant", "tools", top_k=2)
+    assert hits[0][0] == "query_clinvar"
+    assert len(hits) == 2
+
+
+def test_index_round_trips_and_syncs_incrementally(tmp_path):
+    path = str(tmp_path / "index")
+    ResourceIndex(path=path).build(RESOURCES)
+
+    index = ResourceIndex.load_or_create(path)
+    assert len(index.entries) == 5
+    assert index.sync(RESOURCES) == 0
+
+    changed = {**RESOURCES, "tools": RESOURCES["tools"] + [{"name": "query_pdb", "description": "Protein structures"}]}
+    assert index.sync(changed) == 1
+    assert ResourceIndex.load(path).search("protein structures", "tools", top_k=1)[0][0] == "query_pdb"
+
+
+def test_embedders_get_separate_index_directories(tmp_path):
+    fake = LangChainEmbedder(DeterministicFakeEmbedding(size=16), name="langchain:Fake:model/v1")
+    assert index_dir_name(fake) == "langchain-Fake-model-v1"
+    assert index_dir_name(HashingTfidfEmbedder()) == "hashing-tfidf"
+
+    retriever = ToolRetriever(mode="embedding", index_path=str(tmp_path / index_dir_name(fake)), embedder=fake)
+    selected = retriever.retrieve("anything", RESOURCES)
+    assert len(selected["tools"]) == 3
+    assert retriever.get_index().embedder is fake
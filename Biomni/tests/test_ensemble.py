@@ -0,0 +1,51 @@
+import threading
+
+from biomni.agent.ensemble import SolutionTally, extract_solution, normalize_answer
+
+
+def test_extract_solution_takes_the_last_tag():
+    text = "<solution>draft</solution> thinking... <solution>\n TP53 \n</solution>"
+    assert extract_solution(text) == "TP53"
+    assert extract_solution("no answer yet") is None
+    assert extract_solution(None) is None
+
+
+def test_normalize_answer():
+    assert normalize_answer("  The  Answer is TP53. ") == "the answer is tp53"
+    assert normalize_answer("TP53") == normalize_answer("tp53.")
+
+
+def test_quorum_settles_the_answer_and_sets_stop():
+    tally = SolutionTally(quorum=2)
+    assert not tally.add(0, "BRCA1")
+    assert not tally.add(1, None)
+    assert not tally.add(2, "TP53")
+    assert not tally.stop.is_set()
+    assert tally.add(3, "tp53.")
+    assert tally.stop.is_set()
+    assert tally.winner == "tp53"
+    # Later votes do not change the winner
+    assert not tally.add(4, "BRCA1")
+    assert tally.best() == (2, 2)
+    assert tally.distinct() == 2
+
+
+def test_best_without_quorum_prefers_the_first_reached_answer():
+    tally = SolutionTally(quorum=3)
+    assert tally.best() == (None, 0)
+    for index, answer in enumerate(["A", "B", "B", "A"]):
+        tally.add(index, answer)
+    assert tally.winner is None
+    assert tally.best() == (0, 2)
+
+
+def test_concurrent_votes_reach_quorum_once():
+    tally = SolutionTally(quorum=5)
+    settled = []
+    threads = [threading.Thread(target=lambda i=i: settled.append(tally.add(i, "same"))) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert settled.count(True) == 1
+    assert tally.best()[1] == 20
@@ -0,0 +1,133 @@
+import json
+
+import pytest
+from biomni.tool import eutils
+from biomni.tool.database import batch_query_ncbi
+from biomni.tool.eutils import EutilsClient, EutilsError
+from biomni.tool.transport import NCBI_KEYED_BUCKET, HttpTransport
+
+SUMMARIES = {
+    "7157": {"uid": "7157", "name": "TP53", "accessionversion": "NM_000546.6"},
+    "672": {"uid": "672", "name": "BRCA1", "accessionversion": "NM_007294.4"},
+    "675": {"uid": "675", "name": "BRCA2", "accessionversion": "NM_000059.4"},
+}
+
+
+class FakeResponse:
+    def __init__(self, text="", data=None):
+        self.text = text
+        self.content = text.encode()
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeTransport:
+    """Serves EPost/ESummary/EFetch from SUMMARIES; pages listed in ``fail`` raise."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.posted = []
+        self.posts = 0
+        self.requests = []
+        self.rate_keys = []
+
+    def post(self, url, data, rate_key=None):
+        self.posted = data["id"].split(",")
+        self.posts += 1
+        self.rate_keys.append(rate_key)
+        return FakeResponse(f"<ePostResult><QueryKey>{self.posts}</QueryKey><WebEnv>ENV</WebEnv></ePostResult>")
+
+    def get(self, url, params, stream=False, rate_key=None):
+        self.requests.append(params)
+        self.rate_keys.append(rate_key)
+        retstart, retmax = params["retstart"], params["retmax"]
+        if retstart in self.fail:
+            raise ConnectionError("page failed")
+        # NCBI resolves accessions to UIDs; unknown identifiers are silently dropped
+        uids = []
+        for posted in self.posted[retstart : retstart + retmax]:
+            uids += [
+                uid
+                for uid, s in SUMMARIES.items()
+                if posted in (uid, s["accessionversion"], s["accessionversion"].split(".")[0])
+            ]
+        if url.endswith("esummary.fcgi"):
+            result = {"uids": uids, **{uid: SUMMARIES[uid] for uid in uids}}
+            return FakeResponse(data={"result": result})
+        fasta = "".join(f">{SUMMARIES[uid]['accessionversion']} {SUMMARIES[uid]['name']}\nACGT\n" for uid in uids)
+        return FakeResponse(fasta)
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = FakeTransport()
+    monkeypatch.setattr(eutils, "get_transport", lambda: transport)
+    return transport
+
+
+def test_client_pages_through_history_server(transport):
+    client = EutilsClient(batch_size=2)
+    posted = client.epost("gene", ["7157", "672", "675"])
+    assert (posted["webenv"], posted["query_key"], posted["count"]) == ("ENV", "1", 3)
+    assert client.pages(3) == [(0, 2), (2, 1)]
+
+    names = [s["name"] for s in client.iter_summaries("gene", "ENV", "1", 3)]
+    assert names == ["TP53", "BRCA1", "BRCA2"]
+    assert [(r["retstart"], r["retmax"]) for r in transport.requests] == [(0, 2), (2, 1)]
+
+
+def test_long_id_lists_are_posted_under_one_query_key(transport):
+    ids = [str(i) for i in range(12000)]
+    posted = EutilsClient(batch_size=5000).epost("gene", ids)
+    assert transport.posts == 1
+    assert transport.posted == ids
+    assert (posted["query_key"], posted["count"]) == ("1", 12000)
+
+
+def test_keyed_clients_use_their_own_rate_limit(transport, monkeypatch):
+    monkeypatch.delenv("NCBI_API_KEY", raising=False)
+    keyed, anonymous = EutilsClient(api_key="secret"), EutilsClient()
+    keyed.epost("gene", ["7157"])
+    list(keyed.iter_summaries("gene", "ENV", "1", 1))
+    anonymous.epost("gene", ["7157"])
+    assert transport.rate_keys == [NCBI_KEYED_BUCKET, NCBI_KEYED_BUCKET, None]
+
+    # The host bucket keeps the anonymous rate while keyed requests draw from their own bucket
+    http = HttpTransport()
+    assert http._bucket("eutils.ncbi.nlm.nih.gov").rate == 3.0
+    assert http._bucket(NCBI_KEYED_BUCKET).rate == 10.0
+
+
+def test_summary_error_is_raised(monkeypatch):
+    transport = FakeTransport()
+    transport.get = lambda url, params, stream=False, rate_key=None: FakeResponse(data={"error": "Invalid query_key"})
+    monkeypatch.setattr(eutils, "get_transport", lambda: transport)
+    with pytest.raises(EutilsError):
+        list(EutilsClient().iter_summaries("gene", "ENV", "1", 1))
+
+
+def test_batch_keeps_input_ids_and_reports_missing(transport):
+    frame = batch_query_ncbi(["NM_000546.6", "672", "999999"], database="nuccore")
+    assert list(frame["query"]) == ["NM_000546.6", "672", "999999"]
+    assert list(frame["name"].iloc[:2]) == ["TP53", "BRCA1"]
+    assert frame["error"].iloc[2] == "not found"
+    assert frame["error"].iloc[:2].isna().all()
+
+
+def test_batch_failed_page_keeps_other_pages(transport):
+    transport.fail = {2}
+    frame = batch_query_ncbi(["7157", "672", "675"], batch_size=2)
+    rows = json.loads(frame.to_json(orient="records"))
+    assert [r["query"] for r in rows] == ["7157", "672", "675"]
+    assert rows[2]["error"] == "NCBI error: page failed"
+
+
+def test_batch_sequences_map_uids_to_accessions(transport):
+    frame = batch_query_ncbi(["7157", "NM_007294"], database="nuccore", rettype="fasta")
+    assert list(frame["query"]) == ["7157", "NM_007294"]
+    assert list(frame["id"]) == ["NM_000546.6", "NM_007294.4"]
@@ -0,0 +1,61 @@
+import gc
+import json
+
+import pytest
+from biomni.datalake.downloader import DataLakeDownloader
+from biomni.datalake.lazy import ACCESS_LOG_NAME, LazyDataLake
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    for name in ("a.csv", "b.csv", "c.csv"):
+        (mirror / name).write_bytes(name.encode() * 100)
+    return mirror
+
+
+def lazy_lake(mirror, local, **kwargs):
+    downloader = DataLakeDownloader("https://example.invalid", str(local), mirror_dir=str(mirror), show_progress=False)
+    return LazyDataLake(str(local), downloader, ["a.csv", "b.csv", "c.csv"], **kwargs)
+
+
+def test_files_are_fetched_on_first_use(mirror, tmp_path):
+    lake = lazy_lake(mirror, tmp_path / "lake")
+    assert not lake.is_cached("a.csv")
+
+    assert lake.materialize_referenced("pd.read_csv('data_lake/a.csv')") == [lake.local_path("a.csv")]
+    lake.path("a.csv")
+    stats = lake.get_stats()
+    assert (stats["fetches"], stats["hits"], stats["cached_files"]) == (1, 1, 1)
+
+    with pytest.raises(FileNotFoundError):
+        lake.path("unknown.csv")
+    lake.shutdown()
+
+
+def test_quota_evicts_least_recently_used(mirror, tmp_path):
+    lake = lazy_lake(mirror, tmp_path / "lake", quota_bytes=1000)
+    lake.path("a.csv")
+    lake.path("b.csv")
+    lake.path("a.csv")
+    lake.path("c.csv")
+    assert lake.is_cached("a.csv") and lake.is_cached("c.csv")
+    assert not lake.is_cached("b.csv")
+    assert lake.get_stats()["evictions"] == 1
+    lake.shutdown()
+
+
+def test_access_log_is_persisted_without_shutdown(mirror, tmp_path):
+    local = tmp_path / "lake"
+    lake = lazy_lake(mirror, local, access_log_interval=0)
+    lake.path("a.csv")
+    assert "a.csv" in json.loads((local / ACCESS_LOG_NAME).read_text())
+
+    lake = lazy_lake(mirror, local)
+    lake.path("b.csv")
+    del lake
+    gc.collect()
+    log = json.loads((local / ACCESS_LOG_NAME).read_text())
+    assert set(log) == {"a.csv", "b.csv"}
+    assert lazy_lake(mirror, local)._last_access == log
@@ -0,0 +1,88 @@
+import json
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from biomni.tool.mcp_session import MCPSessionManager, _is_connection_error
+from mcp.shared.exceptions import McpError
+
+SERVER = textwrap.dedent(
+    """
+    import os
+
+    from mcp.server.fastmcp import FastMCP
+
+    server = FastMCP("test")
+
+
+    @server.tool()
+    def echo(text: str) -> str:
+        return text
+
+
+    @server.tool()
+    def crash() -> str:
+        os._exit(1)
+
+
+    server.run()
+    """
+)
+
+
+def text(result):
+    # Content items are returned as their JSON payload
+    return json.loads(result)["text"]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(SERVER)
+    manager = MCPSessionManager(call_timeout=30, startup_timeout=30, max_restarts=2, restart_window=60)
+    manager.register_server("test", sys.executable, [str(script)])
+    yield manager
+    manager.shutdown()
+
+
+def test_session_is_reused(manager):
+    assert text(manager.call_tool("test", "echo", {"text": "a"})) == "a"
+    assert text(manager.call_tool("test", "echo", {"text": "b"})) == "b"
+    stats = manager.get_stats()["test"]
+    assert stats["starts"] == 1
+    assert stats["calls"] == 2
+
+
+def test_crashed_call_is_not_resent_and_server_restarts(manager):
+    with pytest.raises(McpError):
+        manager.call_tool("test", "crash")
+    # The failed call was not retried; the next call starts a fresh process
+    assert manager.get_stats()["test"]["starts"] == 1
+    assert text(manager.call_tool("test", "echo", {"text": "again"})) == "again"
+    stats = manager.get_stats()["test"]
+    assert stats["restarts"] == 1
+    assert stats["errors"] == 1
+
+
+def test_restart_limit_is_windowed(manager):
+    for _ in range(2):
+        with pytest.raises(McpError):
+            manager.call_tool("test", "crash")
+    with pytest.raises(McpError):
+        manager.call_tool("test", "crash")
+    with pytest.raises(RuntimeError, match="maximum of 2 restarts"):
+        manager.call_tool("test", "echo", {"text": "x"})
+    # Restarts older than the window no longer count
+    manager.restart_window = 0
+    assert text(manager.call_tool("test", "echo", {"text": "x"})) == "x"
+
+
+def test_timeouts_are_not_connection_errors():
+    assert _is_connection_error(BrokenPipeError())
+    assert _is_connection_error(EOFError())
+    # TimeoutError is an OSError, but a slow call does not mean the server is gone
+    assert not _is_connection_error(TimeoutError())
+    assert not _is_connection_error(ValueError("bad arguments"))
@@ -0,0 +1,103 @@
+import json
+import os
+import time
+
+import pytest
+from biomni.tool import projection
+from biomni.tool.projection import (
+    cleanup_artifacts,
+    extract,
+    load_artifact,
+    project,
+    read_response,
+    spill_text,
+    spilled_result,
+    summarize,
+)
+
+DOCUMENT = {
+    "results": [
+        {"id": "P04637", "gene": {"name": "TP53"}, "length": 393},
+        {"id": "P38398", "gene": {"name": "BRCA1"}, "length": 1863},
+    ],
+    "total": 2,
+}
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, chunk: int = 7):
+        self.body = body
+        self.chunk = chunk
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), self.chunk):
+            yield self.body[i : i + self.chunk]
+
+
+@pytest.fixture(autouse=True)
+def artifacts(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIOMNI_ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setattr(projection, "_last_cleanup", 0.0)
+    return tmp_path
+
+
+def test_extract_and_project():
+    assert extract(DOCUMENT, "$.results[*].gene.name") == ["TP53", "BRCA1"]
+    assert extract(DOCUMENT, "results[1]['id']") == ["P38398"]
+    assert project(DOCUMENT, ["total", "results[*].length", "missing"]) == {
+        "total": 2,
+        "results[*].length": [393, 1863],
+        "missing": None,
+    }
+    with pytest.raises(ValueError):
+        extract(DOCUMENT, "$..name")
+
+
+def test_summarize_keeps_shape_and_samples():
+    sketch = summarize({"items": list(range(10)), "text": "x" * 200}, max_items=2, max_string=5)
+    assert sketch["items"] == {"_summary": "List with 10 items", "_sample": [0, 1]}
+    assert sketch["text"] == "xxxxx... (truncated)"
+
+
+def test_large_responses_are_spilled_and_read_back():
+    body = json.dumps(DOCUMENT).encode()
+    assert read_response(FakeResponse(body), spill_bytes=len(body)) == (body, None, len(body))
+
+    data, path, size = read_response(FakeResponse(body), spill_bytes=10, label="uniprot/search")
+    assert data is None and size == len(body)
+    assert os.path.basename(path).startswith("uniprot_search_")
+    assert load_artifact(path) == DOCUMENT
+    assert load_artifact(path, fields="results[*].id") == {"results[*].id": ["P04637", "P38398"]}
+
+    described = spilled_result(path, size, fields=["total"])
+    assert described["fields"] == {"total": 2}
+    assert described["summary"]["results"]["_summary"] == "List with 2 items"
+
+
+def test_cleanup_by_age_and_size(artifacts):
+    now = time.time()
+    for i, name in enumerate(["old.txt.gz", "a.txt.gz", "b.txt.gz", "c.txt.gz"]):
+        (artifacts / name).write_bytes(b"x" * 100)
+        age = 30 * 86400 if name == "old.txt.gz" else 100 - i
+        os.utime(artifacts / name, (now - age, now - age))
+
+    assert cleanup_artifacts(max_age_days=7, max_bytes=None) == 1
+    assert cleanup_artifacts(max_age_days=7, max_bytes=250) == 1
+    assert sorted(p.name for p in artifacts.iterdir()) == ["b.txt.gz", "c.txt.gz"]
+
+
+def test_spilling_enforces_limits_with_throttling(artifacts, monkeypatch):
+    monkeypatch.setattr(projection, "ARTIFACT_MAX_AGE_DAYS", 7.0)
+    stale = artifacts / "stale.txt.gz"
+    stale.write_bytes(b"x")
+    os.utime(stale, (time.time() - 30 * 86400,) * 2)
+
+    path = spill_text("observation text", label="observation")
+    assert load_artifact(path) == "observation text"
+    assert not stale.exists()
+
+    # Within the cleanup interval no further sweep runs
+    stale.write_bytes(b"x")
+    os.utime(stale, (time.time() - 30 * 86400,) * 2)
+    spill_text("more text")
+    assert stale.exists()
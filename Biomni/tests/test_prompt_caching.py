@@ -0,0 +1,71 @@
+from biomni.llm import apply_prompt_caching, cache_usage, prompt_cache_style
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+
+PREFIX = "You are a helpful biomedical assistant. Tools: ..."
+SYSTEM = PREFIX + "\nRetrieved resources for this query: ..."
+
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def conversation():
+    return [SystemMessage(content=SYSTEM), HumanMessage(content="Which genes?"), AIMessage(content="TP53")]
+
+
+def test_anthropic_gets_prefix_suffix_and_last_message_breakpoints():
+    llm = ChatAnthropic(model="claude-3-5-haiku-20241022", api_key="test")
+    assert prompt_cache_style(llm) == "explicit"
+    original = conversation()
+
+    messages = apply_prompt_caching(original, llm, stable_prefix=PREFIX)
+    assert messages[0].content == [
+        {"type": "text", "text": PREFIX, "cache_control": EPHEMERAL},
+        {"type": "text", "text": SYSTEM[len(PREFIX) :], "cache_control": EPHEMERAL},
+    ]
+    assert messages[1] is original[1]
+    assert messages[2].content == [{"type": "text", "text": "TP53", "cache_control": EPHEMERAL}]
+    # The input messages are not modified
+    assert original[0].content == SYSTEM and original[2].content == "TP53"
+
+
+def test_anthropic_without_a_matching_prefix_marks_the_whole_system_prompt():
+    llm = ChatAnthropic(model="claude-3-5-haiku-20241022", api_key="test")
+    messages = apply_prompt_caching([SystemMessage(content=SYSTEM)], llm, stable_prefix="Something else")
+    assert messages[0].content == [{"type": "text", "text": SYSTEM, "cache_control": EPHEMERAL}]
+
+
+def test_other_providers_get_messages_unchanged():
+    messages = conversation()
+    openai = ChatOpenAI(model="gpt-4o-mini", api_key="test")
+    assert prompt_cache_style(openai) == "automatic"
+    assert apply_prompt_caching(messages, openai, stable_prefix=PREFIX) is messages
+
+    other = FakeListChatModel(responses=["ok"])
+    assert prompt_cache_style(other) is None
+    assert apply_prompt_caching(messages, other, stable_prefix=PREFIX) is messages
+
+
+def test_cache_usage_reads_input_token_details():
+    response = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 1200,
+            "output_tokens": 30,
+            "total_tokens": 1230,
+            "input_token_details": {"cache_read": 1024, "cache_creation": 100},
+        },
+    )
+    assert cache_usage(response) == {
+        "input_tokens": 1200,
+        "output_tokens": 30,
+        "cache_read_tokens": 1024,
+        "cache_write_tokens": 100,
+    }
+    assert cache_usage(AIMessage(content="no usage")) == {
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+    }
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from biomni.tool.query_engine import agather_queries, gather_queries
+
+
+def slow_square(x, delay=0.2):
+    time.sleep(delay)
+    return x * x
+
+
+def failing():
+    raise ValueError("bad input")
+
+
+async def async_double(x):
+    await asyncio.sleep(0.01)
+    return 2 * x
+
+
+def test_calls_run_concurrently_in_input_order():
+    start = time.perf_counter()
+    results = gather_queries([(slow_square, {"x": i}) for i in range(4)], verbose=False)
+    assert time.perf_counter() - start < 0.6
+    assert [r["result"] for r in results] == [0, 1, 4, 9]
+    assert all(r["name"] == "slow_square" and r["error"] is None for r in results)
+
+
+def test_errors_timeouts_and_call_forms_are_reported_per_call():
+    results = gather_queries(
+        [
+            failing,
+            (slow_square, (3,), {"delay": 1.0}),
+            (async_double, (5,)),
+            async_double(7),
+        ],
+        timeout=0.3,
+        verbose=False,
+    )
+    assert results[0]["error"] == "ValueError: bad input"
+    assert results[1]["error"] == "Timed out after 0.3 seconds"
+    assert [r["result"] for r in results[2:]] == [10, 14]
+
+
+def test_inside_a_running_event_loop():
+    async def main():
+        inner = gather_queries([(slow_square, {"x": 2, "delay": 0})], verbose=False)
+        outer = await agather_queries([(slow_square, {"x": 3, "delay": 0})])
+        return inner[0]["result"], outer[0]["result"]
+
+    assert asyncio.run(main()) == (4, 9)
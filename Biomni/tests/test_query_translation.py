@@ -0,0 +1,78 @@
+import pytest
+from biomni.tool import database
+from biomni.tool.response_cache import ResponseCache
+
+SCHEMA = {"endpoints": {"/gene/{id}": "Gene record"}}
+TEMPLATE = "Translate the question into an API call. Schema: {schema}"
+
+
+class FakeLLM:
+    """Records the messages it is asked to answer and returns a fixed endpoint."""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return type("Response", (), {"content": 'Here you go: {"endpoint": "/gene/7157"}'})()
+
+
+@pytest.fixture
+def llms(monkeypatch):
+    llms = {}
+
+    def get_query_llm(model, temperature, api_key):
+        return llms.setdefault(model, FakeLLM(model))
+
+    monkeypatch.setattr(database, "_get_query_llm", get_query_llm)
+    return llms
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(path=str(tmp_path / "translations.sqlite"), stale_while_revalidate=False)
+    monkeypatch.setattr(database, "get_translation_cache", lambda: cache)
+    return cache
+
+
+def translate(prompt, schema=SCHEMA, template=TEMPLATE, model="fake-model", **kwargs):
+    return database._query_llm_for_api(prompt, schema, template, api_key="key", model=model, **kwargs)
+
+
+def test_identical_prompt_is_served_from_the_cache(llms, cache):
+    first = translate("Get  the record of\nTP53")
+    assert first["success"] and first["cached"] is False
+    assert first["data"] == {"endpoint": "/gene/7157"}
+
+    # Whitespace differences do not matter
+    second = translate("Get the record of TP53")
+    assert second["cached"] is True
+    assert second["data"] == first["data"]
+    assert len(llms["fake-model"].calls) == 1
+
+    assert translate("Get the record of TP53", use_cache=False)["cached"] is False
+    assert len(llms["fake-model"].calls) == 2
+
+
+def test_key_changes_with_schema_template_and_model(llms, cache):
+    translate("Get TP53")
+    assert translate("Get TP53", schema={**SCHEMA, "version": 2})["cached"] is False
+    assert translate("Get TP53", template=TEMPLATE + " Answer in JSON.")["cached"] is False
+    assert translate("Get TP53", model="other-model")["cached"] is False
+    assert len(llms["fake-model"].calls) == 3
+    assert len(llms["other-model"].calls) == 1
+
+    # The system prompt sent to the model carries the schema
+    system_message = llms["fake-model"].calls[0][0]
+    assert "/gene/{id}" in system_message.content
+
+
+def test_cache_only_mode_reports_a_miss(llms, cache):
+    translate("Get TP53")
+    cache.mode = "cache_only"
+    assert translate("Get TP53")["cached"] is True
+
+    result = translate("Get EGFR")
+    assert result == {"success": False, "error": "No cached API translation for this prompt in cache-only mode"}
+    assert len(llms["fake-model"].calls) == 1
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from biomni.tool.response_cache import DAY, ResponseCache
+
+URL = "https://rest.uniprot.org/uniprotkb/P04637"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(path=str(tmp_path / "cache.sqlite"), ttls={"example.org": 10})
+
+
+def test_round_trip_and_ttl_per_host(cache):
+    key = ResponseCache.make_key("GET", URL, params={"format": "json"})
+    assert cache.lookup(key)[0] == "miss"
+    cache.put(key, URL, {"accession": "P04637"})
+    status, value, _ = cache.lookup(key)
+    assert (status, value) == ("hit", {"accession": "P04637"})
+
+    assert cache.ttl_for(URL) == 7 * DAY
+    assert cache.ttl_for("https://www.example.org/x") == 10
+    assert ResponseCache.make_key("GET", URL, params={"format": "json"}) != ResponseCache.make_key("GET", URL)
+
+
+def test_expired_entries_are_stale_then_missing(cache):
+    url = "https://example.org/x"
+    cache.put("k", url, [1])
+    conn = cache._connection()
+    conn.execute("UPDATE responses SET created = ?", (time.time() - 15,))
+    assert cache.lookup("k")[0] == "stale"
+    conn.execute("UPDATE responses SET created = ?", (time.time() - 25,))
+    assert cache.lookup("k")[0] == "miss"
+
+    cache.revalidate("k", url, lambda: [2])
+    for _ in range(100):
+        if cache.lookup("k")[0] == "hit":
+            break
+        time.sleep(0.01)
+    assert cache.lookup("k")[1] == [2]
+
+
+def test_modes_and_eviction(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite"), max_bytes=2000)
+    for i in range(20):
+        cache.put(f"k{i}", URL, {"payload": str(i) * 200, "noise": list(range(i, i + 40))})
+    stats = cache.stats()
+    assert stats["bytes"] <= 2000 and stats["evictions"] > 0
+    assert cache.lookup("k19")[0] == "hit"
+
+    cache.mode = "refresh"
+    assert cache.lookup("k19")[0] == "miss"
+    cache.mode = "cache_only"
+    cache.put("new", URL, 1)
+    assert cache.lookup("new")[0] == "miss"
+    with pytest.raises(ValueError):
+        ResponseCache(path=str(tmp_path / "other.sqlite"), mode="sometimes")
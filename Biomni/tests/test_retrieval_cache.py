@@ -0,0 +1,77 @@
+import time
+
+from biomni.agent.a1 import A1
+from biomni.model.retrieval_cache import RetrievalCache, fingerprint_resources, normalize_query
+from biomni.tracing import Tracer
+
+
+def test_normalization_keeps_every_word():
+    assert normalize_query("  Why is TP53 mutated?? ") == "why is tp53 mutated"
+    assert normalize_query("why is TP53 mutated") != normalize_query("how is TP53 mutated")
+    assert normalize_query("TP53 and BRCA1") != normalize_query("TP53 or BRCA1")
+    assert RetrievalCache.make_key("TP53, BRCA1.", "fp") == RetrievalCache.make_key("tp53 brca1", "fp")
+    assert RetrievalCache.make_key("tp53", "fp") != RetrievalCache.make_key("tp53", "other")
+
+
+def test_entries_expire_after_ttl():
+    cache = RetrievalCache(ttl_seconds=60)
+    cache.put("k", "value")
+    assert cache.get("k") == "value"
+    cache._entries["k"] = (time.time() - 120, "value")
+    assert cache.get("k") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RetrievalCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+class FakeRetriever:
+    mode = "prompt"
+
+    def __init__(self):
+        self.calls = 0
+
+    def retrieve(self, prompt, resources, llm=None):
+        self.calls += 1
+        return {"tools": [], "data_lake": [item["name"] for item in resources["data_lake"]], "libraries": []}
+
+
+def make_agent(tmp_path):
+    agent = A1.__new__(A1)
+    agent.path = str(tmp_path)
+    agent.use_tool_retriever = True
+    agent.data_lake = None
+    agent.data_lake_dict = {}
+    agent.library_content_dict = {}
+    agent.tool_registry = type("Registry", (), {"tools": []})()
+    agent.llm = None
+    agent.tracer = Tracer(enabled=False)
+    agent.retriever = FakeRetriever()
+    agent.retrieval_cache = RetrievalCache()
+    agent.configure = lambda *args, **kwargs: None
+    agent.update_system_prompt_with_selected_resources = lambda selected: setattr(
+        agent, "system_prompt", f"data: {selected['data_lake']}"
+    )
+    return agent
+
+
+def test_adding_a_resource_invalidates_selections(tmp_path):
+    agent = make_agent(tmp_path)
+    agent._select_resources("Which datasets cover TP53?")
+    agent._select_resources("which datasets cover TP53")
+    assert agent.retriever.calls == 1
+
+    assert agent.add_data({"expression.csv": "Gene expression"})
+    assert agent.retrieval_cache.stats()["invalidations"] == 1
+    agent._select_resources("Which datasets cover TP53?")
+    assert agent.retriever.calls == 2
+    assert agent.system_prompt == "data: ['expression.csv']"
+    assert fingerprint_resources({"data_lake": [{"name": "x"}]}) != fingerprint_resources({"data_lake": []})
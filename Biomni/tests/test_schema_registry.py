@@ -0,0 +1,31 @@
+import json
+
+from biomni.tool.schema_registry import API_SCHEMAS, SCHEMA_DIR, SchemaRegistry
+
+
+def test_preload_skips_lookup_tables(tmp_path):
+    (tmp_path / "uniprot.json").write_text(json.dumps({"base_url": "https://rest.uniprot.org"}))
+    registry = SchemaRegistry(str(tmp_path))
+    registry.save("ddinter_drugs", {"aspirin": {}})
+    registry.invalidate()
+
+    registry.preload()
+    assert registry.stats()["loaded"] == ["uniprot"]
+    assert registry.names() == ["ddinter_drugs", "uniprot"]
+
+
+def test_shared_object_and_private_copy(tmp_path):
+    (tmp_path / "kegg.json").write_text(json.dumps({"endpoints": ["list"]}))
+    registry = SchemaRegistry(str(tmp_path))
+
+    shared = registry.get("kegg")
+    assert registry.get("kegg") is shared
+    private = registry.get("kegg", copy=True)
+    private["endpoints"].append("get")
+    assert registry.get("kegg") == {"endpoints": ["list"]}
+    assert registry.version_of(shared) == registry.version("kegg")
+    assert registry.version_of(private) is None
+
+
+def test_bundled_api_schemas_are_listed():
+    assert set(API_SCHEMAS) <= set(SchemaRegistry(SCHEMA_DIR).names())
@@ -0,0 +1,136 @@
+import asyncio
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+SESSION_MODULE = Path(__file__).resolve().parents[2] / "biomni_session.py"
+if not SESSION_MODULE.exists():
+    pytest.skip("biomni_session.py is not part of this checkout", allow_module_level=True)
+
+
+@pytest.fixture(scope="module")
+def sessions():
+    spec = importlib.util.spec_from_file_location("biomni_session", SESSION_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.session_manager.shutdown()
+    return module
+
+
+class FakeAgent:
+    """Stands in for A1: clones are recorded, ``go`` blocks until the test releases it."""
+
+    def __init__(self, thread_id=None, clone_gate=None):
+        self.thread_id = thread_id
+        self.clone_gate = clone_gate
+        self.released = False
+        self.go_gate = threading.Event()
+        self.clones = {}
+
+    def clone_for_session(self, thread_id=None):
+        if self.clone_gate is not None and thread_id == "slow":
+            self.clone_gate.wait(5)
+        clone = FakeAgent(thread_id)
+        clone.go_gate = self.go_gate
+        self.clones[thread_id] = clone
+        return clone
+
+    def go(self, message):
+        self.go_gate.wait(5)
+        return ["log"], f"reply to {message}"
+
+    def release_session(self):
+        self.released = True
+
+
+@pytest.fixture
+def make_manager(sessions):
+    managers = []
+
+    def make(agent=None, **kwargs):
+        sessions.BiomniSessionManager._instance = None
+        manager = sessions.BiomniSessionManager(**kwargs)
+        manager.agent = agent or FakeAgent()
+        manager.initialized = True
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.agent.go_gate.set()
+        manager.shutdown()
+        manager._executor.shutdown(wait=True)
+
+
+def test_messages_beyond_the_pool_are_queued(sessions, make_manager):
+    manager = make_manager(max_concurrent=1, max_queue=2)
+
+    async def scenario():
+        first = asyncio.ensure_future(manager.send_message("a", "hello", is_first_message=True))
+        while manager.queue_position("a") != 0:
+            await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(manager.send_message("b", "hi", is_first_message=True))
+        while manager.queue_position("b") is None:
+            await asyncio.sleep(0.01)
+        assert manager.queue_position("b") == 1
+        assert manager.get_status()["running"] == 1
+
+        with pytest.raises(sessions.SessionBusyError, match="Already processing"):
+            await manager.send_message("a", "again")
+        third = asyncio.ensure_future(manager.send_message("c", "third", is_first_message=True))
+        while manager.queue_position("c") is None:
+            await asyncio.sleep(0.01)
+        with pytest.raises(sessions.SessionBusyError, match="Too many requests"):
+            await manager.send_message("d", "fourth", is_first_message=True)
+
+        manager.agent.go_gate.set()
+        return await asyncio.gather(first, second, third)
+
+    results = asyncio.run(scenario())
+    assert [r[2] for r in results] == ["reply to hello", "reply to hi", "reply to third"]
+    assert manager.get_status()["queued"] == 0
+
+
+def test_sessions_beyond_capacity_are_refused(sessions, make_manager):
+    manager = make_manager(max_sessions=2)
+    manager.open_session("a")
+    manager.open_session("b")
+    assert manager.open_session("a") is manager.sessions["a"]
+    with pytest.raises(sessions.SessionBusyError, match="at capacity"):
+        manager.open_session("c")
+
+    manager.close_session("a")
+    assert manager.open_session("c").initialized
+
+
+def test_idle_sessions_are_reaped(make_manager):
+    manager = make_manager(idle_timeout=0.1, reap_interval=0.05)
+    session = manager.open_session("a")
+    clone = session.agent
+    deadline = time.time() + 5
+    while "a" in manager.sessions and time.time() < deadline:
+        time.sleep(0.02)
+    assert "a" not in manager.sessions
+    assert clone.released
+
+
+def test_slow_clone_does_not_block_other_sessions(make_manager):
+    gate = threading.Event()
+    manager = make_manager(agent=FakeAgent(clone_gate=gate))
+    opener = threading.Thread(target=manager.open_session, args=("slow",))
+    opener.start()
+    while "slow" not in manager.sessions:
+        time.sleep(0.01)
+
+    start = time.time()
+    assert manager.open_session("fast").initialized
+    assert time.time() - start < 1
+    assert not manager.sessions["slow"].initialized
+
+    gate.set()
+    opener.join(5)
+    assert manager.sessions["slow"].initialized
+    assert manager.sessions["slow"].agent.thread_id == "slow"
@@ -0,0 +1,39 @@
+import threading
+
+from biomni.tool.support_tools import run_python_repl
+
+
+def test_namespaces_persist_and_errors_are_reported():
+    namespace = {}
+    assert run_python_repl("x = 21", namespace) == ""
+    assert run_python_repl("```\nprint(x * 2)\n```", namespace) == "42\n"
+    assert run_python_repl("print(y)", namespace) == "Error: name 'y' is not defined"
+
+
+def test_concurrent_executions_capture_only_their_own_output(capsys):
+    barrier = threading.Barrier(4)
+    results = {}
+
+    def run(i):
+        code = f"barrier.wait()\nfor _ in range(200):\n    print('thread {i}')\nbarrier.wait()"
+        results[i] = run_python_repl(code, {"barrier": barrier})
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i in range(4):
+        assert results[i] == f"thread {i}\n" * 200
+
+    # Output outside an execution still reaches the original stream
+    print("after")
+    assert capsys.readouterr().out == "after\n"
+
+
+def test_nested_capture_restores_the_outer_buffer():
+    namespace = {"run_python_repl": run_python_repl}
+    code = "print('outer')\ninner = run_python_repl(\"print('inner')\", {})\nprint('outer again')"
+    assert run_python_repl(code, namespace) == "outer\nouter again\n"
+    assert namespace["inner"] == "inner\n"
@@ -0,0 +1,52 @@
+from biomni.tool.tool_registry import ToolRegistry
+
+
+def schema(name, description="d"):
+    return {"name": name, "description": description, "required_parameters": []}
+
+
+def test_constructor_does_not_modify_caller_schemas():
+    tools = {"biomni.tool.database": [schema("query_uniprot")]}
+    registry = ToolRegistry(tools)
+    assert tools["biomni.tool.database"][0] == schema("query_uniprot")
+    assert registry.get_module_by_name("query_uniprot") == "biomni.tool.database"
+
+
+def test_document_df_is_updated_in_place():
+    registry = ToolRegistry({"m": [schema("a"), schema("b")]})
+    df = registry.document_df
+    assert list(df["docid"]) == [0, 1]
+
+    registry.register_tool(schema("c"))
+    registry.register_tool({**schema("a", "new description"), "module": "m"})
+    registry.remove_tool_by_name("b")
+
+    assert registry.document_df is df
+    assert list(df["docid"]) == [0, 2]
+    assert df.loc[0, "document_content"]["description"] == "new description"
+    assert [t["name"] for t in df["document_content"]] == ["a", "c"]
+
+
+def test_json_round_trip(tmp_path):
+    registry = ToolRegistry({"m": [schema("a"), schema("b")]})
+    registry.remove_tool_by_name("a")
+    path = tmp_path / "registry.json"
+    registry.save_registry(path)
+    loaded = ToolRegistry.load_registry(path)
+    assert loaded.list_tools() == [{"name": "b", "id": 1}]
+    assert loaded.next_id == 2
+
+
+def test_copy_is_independent():
+    registry = ToolRegistry({"m": [schema("a"), schema("b")]})
+    _ = registry.document_df
+    clone = registry.copy()
+
+    clone.register_tool({**schema("c"), "module": "custom"})
+    clone.remove_tool_by_name("a")
+
+    assert "c" not in registry and "a" in registry
+    assert registry.list_modules() == ["m"]
+    assert [t["name"] for t in registry.document_df["document_content"]] == ["a", "b"]
+    assert [t["name"] for t in clone.document_df["document_content"]] == ["b", "c"]
+    assert clone.get_id_by_name("c") == 2
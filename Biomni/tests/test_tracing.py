@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+from biomni.tool.query_engine import gather_queries
+from biomni.tracing import Tracer, get_tracer, peak_rss_mb, reset_peak_rss, summarize_spans, trace_tool
+from biomni.utils import run_with_timeout
+
+
+@trace_tool
+def lookup(gene):
+    return {"success": True, "gene": gene}
+
+
+def tool_spans(tracer):
+    return [span for span in tracer.get_spans() if span["kind"] == "tool"]
+
+
+def test_tool_spans_nest_under_the_run_and_execution():
+    tracer = Tracer()
+    assert get_tracer() is None
+    with tracer.run("agent.go"):
+        with tracer.span("execute", kind="execute"):
+            # Code executions run on their own thread with a copy of the run's context
+            run_with_timeout(lookup, ["TP53"], timeout=10)
+        gather_queries([(lookup, {"gene": "BRCA1"}), (lookup, {"gene": "EGFR"})], verbose=False)
+    assert get_tracer() is None
+
+    spans = {span["name"] + str(span["attributes"].get("arguments", "")): span for span in tracer.get_spans()}
+    execute = next(span for span in tracer.get_spans() if span["kind"] == "execute")
+    root = next(span for span in tracer.get_spans() if span["kind"] == "run")
+    assert len(tool_spans(tracer)) == 3
+    assert spans["lookup{'args': ['TP53']}"]["parent_id"] == execute["span_id"]
+    assert spans["lookup{'gene': 'BRCA1'}"]["parent_id"] == root["span_id"]
+    assert all(span["attributes"]["success"] for span in tool_spans(tracer))
+
+    summary = summarize_spans(tracer.get_spans())
+    assert summary.set_index("name").loc["lookup", "count"] == 3
+
+
+def test_concurrent_runs_record_only_their_own_tool_calls():
+    # Tool calls from execution threads used to be attributed to whichever run started last
+    tracers = [Tracer() for _ in range(4)]
+    barrier = threading.Barrier(len(tracers))
+
+    def run(i):
+        with tracers[i].run("agent.go"):
+            barrier.wait()
+            for _ in range(20):
+                run_with_timeout(lookup, [f"gene{i}"], timeout=10)
+            barrier.wait()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(tracers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i, tracer in enumerate(tracers):
+        spans = tool_spans(tracer)
+        assert len(spans) == 20
+        assert {span["attributes"]["arguments"]["args"][0] for span in spans} == {f"gene{i}"}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.run("agent.go"):
+        assert get_tracer() is None
+        lookup("TP53")
+    assert tracer.get_spans() == []
+
+
+def test_peak_rss_is_reset_between_measurements():
+    if not reset_peak_rss():
+        pytest.skip("resetting the memory high-water mark needs Linux /proc")
+    block = bytearray(200 * 1024 * 1024)
+    block[::4096] = b"x" * len(block[::4096])
+    high = peak_rss_mb()
+    del block
+    assert reset_peak_rss()
+    assert peak_rss_mb() < high - 100
@@ -0,0 +1,124 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from biomni.tool import transport
+from biomni.tool.transport import HttpTransport, TokenBucket, _retry_after_seconds
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers each request with the next ``(status, headers, delay)`` of the server's script, then 200s."""
+
+    def _respond(self):
+        self.server.requests.append(self.command)
+        status, headers, delay = self.server.script.pop(0) if self.server.script else (200, {}, 0)
+        threading.Event().wait(delay)
+        body = b"ok"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    server.script = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/item/123"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(transport.time, "sleep", delays.append)
+    return delays
+
+
+def test_backoff_is_jittered_exponential_and_capped():
+    http = HttpTransport(backoff_base=0.5, backoff_max=3.0)
+    for attempt in range(6):
+        delays = [http._backoff(attempt) for _ in range(200)]
+        assert all(0 <= d <= min(3.0, 0.5 * 2**attempt) for d in delays)
+    assert max(http._backoff(5) for _ in range(200)) > 1.5
+
+
+def test_retry_after_is_honoured_and_capped(server, sleeps):
+    server.script = [(503, {"Retry-After": "2"}, 0), (429, {"Retry-After": "120"}, 0)]
+    http = HttpTransport(backoff_max=30.0)
+    response = http.get(server.url)
+    assert response.status_code == 200
+    assert server.requests == ["GET"] * 3
+    assert sleeps == [2.0, 30.0]
+    stats = http.get_stats()[f"127.0.0.1:{server.server_address[1]}/api/v1/item"]
+    assert (stats["count"], stats["errors"], stats["retries"]) == (3, 2, 2)
+
+
+def test_retry_after_accepts_http_dates():
+    response = requests.Response()
+    assert _retry_after_seconds(response) is None
+    response.headers["Retry-After"] = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 60))
+    assert 55 < _retry_after_seconds(response) <= 60
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(6)]
+    elapsed = time.monotonic() - start
+    # Two tokens of burst, then one token every 50 ms
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.15 <= elapsed < 1.0
+
+
+def test_post_is_not_retried_after_reaching_the_server(server, sleeps):
+    http = HttpTransport(max_retries=3, timeout=(5, 0.2))
+    server.script = [(503, {}, 0)]
+    assert http.post(server.url, data={"a": 1}).status_code == 503
+    assert server.requests == ["POST"]
+
+    # A read timeout means the server may have acted on the request
+    server.script = [(200, {}, 0.5)]
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        http.post(server.url, data={"a": 1})
+    assert server.requests == ["POST", "POST"]
+
+    server.script = [(200, {}, 0.5)]
+    assert http.get(server.url).status_code == 200
+    assert server.requests == ["POST", "POST", "GET", "GET"]
+    assert not server.script
+
+
+def test_post_is_retried_when_the_connection_fails(sleeps):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    http = HttpTransport(max_retries=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http.post(f"http://127.0.0.1:{port}/submit", data={"a": 1})
+    assert len(sleeps) == 2
+    assert http.get_stats()[f"127.0.0.1:{port}/submit"]["errors"] == 3
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http.post(f"http://127.0.0.1:{port}/submit", data={"a": 1}, retries=0)
+    assert len(sleeps) == 2
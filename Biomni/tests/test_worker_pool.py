@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+from biomni.tool.worker_pool import WorkerPool, is_transferable
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(max_workers=1, min_idle=0, preload=[])
+    yield pool
+    pool.shutdown()
+
+
+def test_namespace_is_sticky_per_thread(pool):
+    pool.execute("x = 41", thread_id="a")
+    assert pool.execute("print(x + 1)", thread_id="a").strip() == "42"
+
+
+def test_unpicklable_entries_are_reported_and_skipped(pool, capsys):
+    secret = threading.Lock()
+
+    def closure():
+        return secret
+
+    namespace = {"double": lambda x: 2 * x, "closure": closure, "tau": 6.28}
+    assert not is_transferable(namespace["double"])
+    assert sorted(WorkerPool.unavailable(namespace)) == ["closure", "double"]
+
+    worker, _ = pool._worker_for("a")
+    assert sorted(pool._inject(worker, namespace)) == ["closure", "double"]
+    pool._done(worker)
+    assert "cannot be sent to the Python worker process" in capsys.readouterr().out
+
+    assert pool.execute("print(tau)", thread_id="a", namespace=namespace).strip() == "6.28"
+    assert "name 'double' is not defined" in pool.execute("double(2)", thread_id="a", namespace=namespace)
+
+
+def test_idle_thread_loses_worker_and_is_told(pool):
+    pool.execute("x = 1", thread_id="a")
+    pool.execute("y = 2", thread_id="b")
+    assert pool.get_stats()["evicted_threads"] == 1
+
+    output = pool.execute("print('x' in globals())", thread_id="a")
+    assert output.startswith("Note: The Python session of this thread was released")
+    assert output.strip().endswith("False")
+
+
+def test_busy_workers_are_not_exceeded(pool):
+    threads_seen = []
+    results = {}
+
+    def run(thread_id):
+        results[thread_id] = pool.execute("import time; time.sleep(0.5); print('done')", thread_id=thread_id)
+
+    workers = [threading.Thread(target=run, args=(tid,)) for tid in ("a", "b")]
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers):
+        threads_seen.append(pool.get_stats()["threads"])
+        time.sleep(0.02)
+
+    assert max(threads_seen) <= 1
+    assert all(result.strip().endswith("done") for result in results.values())
+
+
+def test_timeout_kills_worker_and_next_run_gets_a_fresh_one(pool):
+    pool.execute("x = 1", thread_id="a")
+    old_worker = pool._assigned["a"]
+
+    output = pool.execute("import time; time.sleep(30)", thread_id="a", timeout=0.5)
+    assert "timed out after 0.5 seconds" in output
+    assert pool.get_stats()["timeouts"] == 1
+    old_worker.process.join(5)
+    assert not old_worker.process.is_alive()
+
+    assert pool.execute("print('x' in globals())", thread_id="a").strip().endswith("False")
+    assert pool._assigned["a"] is not old_worker
+    assert pool.get_stats()["worker_pids"]["a"] != old_worker.process.pid
+
+
+def test_agent_namespace_is_built_once(pool):
+    from biomni.agent.a1 import A1
+
+    agent = A1.__new__(A1)
+    agent.path = "/tmp/biomni"
+    agent.worker_pool = pool
+    agent.data_lake = None
+    first, second = agent._repl_namespace(), agent._repl_namespace()
+    assert first["load_data_lake"] is second["load_data_lake"]
+
+    # Unchanged entries are not sent to the worker again
+    worker, _ = pool._worker_for("a")
+    pool._inject(worker, first)
+    injected = dict(worker.injected)
+    pool._inject(worker, second)
+    pool._done(worker)
+    assert worker.injected == injected
+    assert "load_data_lake" in injected
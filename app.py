@@ -1,6 +1,5 @@
 import sys
 import os
-import asyncio
 import datetime
 
 # Add the Biomni directory to Python path if needed
@@ -9,10 +8,7 @@ if biomni_path not in sys.path:
     sys.path.insert(0, biomni_path)
 
 from shiny import App, ui, render, reactive
-from biomni_session import BiomniSession
-
-# Create/obtain the global biomni session
-biomni_session = BiomniSession()
+from biomni_session import SessionBusyError, session_manager
 
 app_ui = ui.page_fluid(
     ui.div(
@@ -159,20 +155,33 @@ def server(input, output, session):
     conversation_history = reactive.Value([])
     status_text = reactive.Value("🚀 Initializing Agent...")
     is_processing = reactive.Value(False)
+    # Each browser session gets its own conversation thread and Python namespace
+    session_id = session.id
 
     @reactive.Effect
     def initialize_session():
         try:
-            if biomni_session.initialize():
+            if session_manager.initialize():
+                session_manager.open_session(session_id)
                 status_text.set("✅ Agent initialized successfully! Ready to chat.")
             else:
                 status_text.set("❌ Failed to initialize Agent. Check logs.")
+        except SessionBusyError as e:
+            status_text.set(f"⏳ {str(e)}")
         except Exception as e:
             status_text.set(f"❌ Initialization error: {str(e)}")
 
+    session.on_ended(lambda: session_manager.close_session(session_id))
+
     @output
     @render.text
     def status():
+        # While a message is waiting for a free agent slot, show its place in the queue
+        if is_processing():
+            reactive.invalidate_later(1)
+            position = session_manager.queue_position(session_id)
+            if position:
+                return f"⏳ Waiting in queue (position {position})..."
         return status_text()
 
     def format_message_content(content):
@@ -238,7 +247,7 @@ def server(input, output, session):
     @reactive.event(input.clear_conversation)
     def clear_conversation():
         try:
-            biomni_session.reset_conversation()
+            session_manager.reset_conversation(session_id)
             conversation_history.set([])
             status_text.set("🔄 Conversation cleared. Ready for new chat.")
         except Exception as e:
@@ -273,12 +282,7 @@ def server(input, output, session):
         try:
             is_first = len(current_history) == 0
 
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                biomni_session.send_message,
-                user_message,
-                is_first
-            )
+            result = await session_manager.send_message(session_id, user_message, is_first)
 
             success, conversation_log, final_response = result
 
@@ -299,6 +303,10 @@ def server(input, output, session):
                 conversation_history.set(current_history + [error_exchange])
                 status_text.set("❌ Error processing message")
 
+        except SessionBusyError as e:
+            conversation_history.set(current_history)
+            status_text.set(f"⏳ {str(e)}")
+
         except Exception as e:
             error_exchange = {
                 "user": user_message,
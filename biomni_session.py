@@ -1,6 +1,10 @@
 import os
 import traceback
 import random
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 EMBEDDED_API_KEY = "xxxxxxxxx"
@@ -19,82 +23,44 @@ except Exception:
 
 
 class BiomniSession:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.agent = None
-            cls._instance.model = None
-            cls._instance.initialized = False
-            cls._instance.conversation_count = 0
-            cls._instance.config = {'recursion_limit': 500, 'configurable': {'thread_id': 1}}
-            cls._instance._local_history = []
-        return cls._instance
-
-    def initialize(self, download_fn=None, force_refresh=False, api_key=None, azure_endpoint=None, azure_deployment=None, data_path=None):
-        print("🚀 Initializing agent...")
-        api_key = api_key or EMBEDDED_API_KEY
-        azure_endpoint = azure_endpoint or AZURE_ENDPOINT
-        azure_deployment = azure_deployment or AZURE_DEPLOYMENT
-        data_path = data_path or DATA_PATH
-
-        # Ensure local data files are present
-        try:
-            ok, msg = download_missing_files(REQUIRED_FILES, download_fn or self._noop_download, force_refresh=force_refresh)
-            print(f"ensure data result: {ok} - {msg}")
-        except Exception:
-            print("ensure data call failed, continuing initialization")
-            traceback.print_exc()
-
-        os.environ['AZURE_OPENAI_API_KEY'] = api_key
-        os.environ['OPENAI_API_KEY'] = api_key
-
-        global A1, AzureChatOpenAI, HumanMessage
-        try:
-            if A1 is None or AzureChatOpenAI is None or HumanMessage is None:
-                from Biomni.biomni.agent import A1
-                from langchain_openai import AzureChatOpenAI
-                from langchain_core.messages import HumanMessage
-        except Exception:
-            traceback.print_exc()
-            self.initialized = False
-            return False
-
-        try:
-            self.model = AzureChatOpenAI(
-                azure_endpoint=azure_endpoint,
-                azure_deployment=azure_deployment,
-                openai_api_version='2023-05-15',
-                api_key=api_key,
-            )
-
-            self.agent = A1(path=data_path, llm=azure_deployment, api_key=api_key)
-
+    """One browser session's conversation: its own agent clone, thread id, REPL namespace and history."""
+
+    def __init__(self, session_id, agent=None):
+        self.session_id = session_id
+        self.agent = None
+        self.initialized = False
+        self.conversation_count = 0
+        self.thread_id = 1
+        self.config = {'recursion_limit': 500, 'configurable': {'thread_id': self.thread_id}}
+        self._local_history = []
+        self.last_active = time.time()
+        self.busy = False
+        # Held while the session's agent clone is being created
+        self._attach_lock = threading.Lock()
+        if agent is not None:
+            self.attach_agent(agent)
+
+    def attach_agent(self, agent):
+        """Give the session its agent, e.g. once the shared agent finished initializing after the session opened."""
+        self.agent = agent
+        self.initialized = True
+        self.thread_id = getattr(agent, 'thread_id', 1)
+        self.config = {'recursion_limit': 500, 'configurable': {'thread_id': self.thread_id}}
+        self.conversation_count = 0
+        if HumanMessage is not None:
+            # A durable checkpointer may still hold this thread from before a restart; continue it
             try:
-                self.agent.llm = self.model
+                messages = agent.app.get_state(self.config).values.get('messages', [])
             except Exception:
-                pass
-
-            self.initialized = True
-            self.conversation_count = 0
-            self.config = {'recursion_limit': 500, 'configurable': {'thread_id': 1}}
-            self._local_history = []
-            print("✅ MCICC agent initialized successfully")
-            return True
-
-        except Exception as e:
-            print(f"❌ Failed to initialize agent: {str(e)}")
-            traceback.print_exc()
-            self.initialized = False
-            return False
+                messages = []
+            self.conversation_count = sum(isinstance(m, HumanMessage) for m in messages)
 
     def send_message(self, message, is_first_message=False):
         if not self.initialized:
             return False, "Agent not initialized", None
 
         try:
-            print(f"💬 Processing message #{self.conversation_count + 1}: {message[:50]}...")
+            print(f"💬 [{self.session_id}] Processing message #{self.conversation_count + 1}: {message[:50]}...")
             # Append to local history
             self._local_history.append({'role': 'user', 'content': message})
 
@@ -114,10 +80,14 @@ class BiomniSession:
 
             if current_state:
                 current_messages = current_state.values.get('messages', [])
-                # Append local history user messages to current_messages
-                for entry in self._local_history:
-                    if entry['role'] == 'user':
-                        current_messages.append(HumanMessage(content=entry['content']))
+                if current_messages:
+                    # The checkpoint already holds the earlier turns; only the new message is added
+                    current_messages.append(HumanMessage(content=message))
+                else:
+                    # Append local history user messages to current_messages
+                    for entry in self._local_history:
+                        if entry['role'] == 'user':
+                            current_messages.append(HumanMessage(content=entry['content']))
 
                 inputs = {'messages': current_messages, 'next_step': None}
                 conversation_log = []
@@ -134,7 +104,7 @@ class BiomniSession:
                     final_text = getattr(final_message, 'content', str(final_message))
                     self._local_history.append({'role': 'assistant', 'content': final_text})
                     self.conversation_count += 1
-                    print(f"✅ Received response ({len(final_text)} chars)")
+                    print(f"✅ [{self.session_id}] Received response ({len(final_text)} chars)")
                     return True, conversation_log, final_text
 
             # Fallback to agent.go with last user message
@@ -151,14 +121,29 @@ class BiomniSession:
 
     def reset_conversation(self):
         if self.initialized:
-            new_thread_id = random.randint(1, 10000)
+            # A fresh thread id gives the conversation a new checkpoint; the Python namespace is cleared too
+            self.agent.release_session()
+            old_thread_id = self.thread_id
+            new_thread_id = f"{self.session_id}-{random.randint(1, 10000)}"
+            self.agent.thread_id = new_thread_id
+            self.thread_id = new_thread_id
             self.config = {'recursion_limit': 500, 'configurable': {'thread_id': new_thread_id}}
             self.conversation_count = 0
             self._local_history = []
+            # The old thread can no longer be reached, so drop its checkpoints instead of leaving them behind
+            checkpointer = getattr(self.agent, 'checkpointer', None)
+            if checkpointer is not None:
+                checkpointer.delete_thread(old_thread_id)
             print(f"🔄 Conversation reset with thread_id: {new_thread_id}")
             return True
         return False
 
+    def close(self):
+        if self.agent is not None:
+            self.agent.release_session()
+        self.agent = None
+        self.initialized = False
+
     def get_status(self):
         return {
             'initialized': self.initialized,
@@ -167,6 +152,226 @@ class BiomniSession:
             'conversation_count': self.conversation_count
         }
 
+
+class SessionBusyError(Exception):
+    """Raised when the server cannot admit another session or queued message."""
+
+
+class BiomniSessionManager:
+    """Serves many Shiny sessions from one process.
+
+    The expensive, read-mostly pieces (LLM client, tool registry, retriever, data lake and dataset
+    caches) live in one base agent. Each browser session gets a lightweight clone of it with its own
+    thread id and REPL namespace. Messages run on a bounded thread pool; messages beyond the pool size
+    wait in a FIFO queue whose position can be shown to the user, and sessions idle for longer than
+    ``idle_timeout`` seconds are evicted by a background reaper that checks every ``reap_interval``
+    seconds (and whenever a new session opens).
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._setup(*args, **kwargs)
+        return cls._instance
+
+    def _setup(self, max_concurrent=4, max_queue=16, max_sessions=32, idle_timeout=1800, reap_interval=60):
+        self.max_concurrent = int(os.environ.get('BIOMNI_MAX_CONCURRENT', max_concurrent))
+        self.max_queue = int(os.environ.get('BIOMNI_MAX_QUEUE', max_queue))
+        self.max_sessions = int(os.environ.get('BIOMNI_MAX_SESSIONS', max_sessions))
+        self.idle_timeout = float(os.environ.get('BIOMNI_IDLE_TIMEOUT', idle_timeout))
+        self.reap_interval = float(os.environ.get('BIOMNI_REAP_INTERVAL', reap_interval))
+        self.agent = None
+        self.model = None
+        self.initialized = False
+        self.sessions = {}
+        self._lock = threading.RLock()
+        self._init_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='biomni-session')
+        self._queue = []  # session ids of queued messages, in arrival order
+        self._running = set()
+        # Reclaim idle sessions even when no new sessions arrive to trigger evict_idle
+        self._stop_reaper = threading.Event()
+        self._reaper = threading.Thread(target=self._reap, daemon=True, name='biomni-session-reaper')
+        self._reaper.start()
+
+    def _reap(self):
+        while not self._stop_reaper.wait(self.reap_interval):
+            try:
+                self.evict_idle()
+            except Exception:
+                traceback.print_exc()
+
+    def shutdown(self):
+        """Stop the idle-session reaper and close every session."""
+        self._stop_reaper.set()
+        with self._lock:
+            session_ids = list(self.sessions)
+        for session_id in session_ids:
+            self.close_session(session_id)
+
+    def initialize(self, download_fn=None, force_refresh=False, api_key=None, azure_endpoint=None, azure_deployment=None, data_path=None):
+        # The shared agent is built once; later browser sessions reuse it
+        with self._init_lock:
+            if self.initialized and not force_refresh:
+                return True
+
+            print("🚀 Initializing agent...")
+            api_key = api_key or EMBEDDED_API_KEY
+            azure_endpoint = azure_endpoint or AZURE_ENDPOINT
+            azure_deployment = azure_deployment or AZURE_DEPLOYMENT
+            data_path = data_path or DATA_PATH
+
+            # Ensure local data files are present
+            try:
+                ok, msg = download_missing_files(REQUIRED_FILES, download_fn or self._noop_download, force_refresh=force_refresh)
+                print(f"ensure data result: {ok} - {msg}")
+            except Exception:
+                print("ensure data call failed, continuing initialization")
+                traceback.print_exc()
+
+            os.environ['AZURE_OPENAI_API_KEY'] = api_key
+            os.environ['OPENAI_API_KEY'] = api_key
+
+            global A1, AzureChatOpenAI, HumanMessage
+            try:
+                if A1 is None or AzureChatOpenAI is None or HumanMessage is None:
+                    from Biomni.biomni.agent import A1
+                    from langchain_openai import AzureChatOpenAI
+                    from langchain_core.messages import HumanMessage
+            except Exception:
+                traceback.print_exc()
+                self.initialized = False
+                return False
+
+            try:
+                self.model = AzureChatOpenAI(
+                    azure_endpoint=azure_endpoint,
+                    azure_deployment=azure_deployment,
+                    openai_api_version='2023-05-15',
+                    api_key=api_key,
+                )
+
+                # Code runs in one worker process per session, so namespaces and timeouts are isolated
+                self.agent = A1(
+                    path=data_path,
+                    llm=azure_deployment,
+                    api_key=api_key,
+                    execution_backend='process',
+                    max_workers=self.max_sessions,
+                    # Sessions are keyed by their id, so keep their conversations on disk across restarts
+                    checkpointer='sqlite',
+                )
+
+                try:
+                    self.agent.llm = self.model
+                except Exception:
+                    pass
+
+                self.initialized = True
+                print("✅ MCICC agent initialized successfully")
+                return True
+
+            except Exception as e:
+                print(f"❌ Failed to initialize agent: {str(e)}")
+                traceback.print_exc()
+                self.initialized = False
+                return False
+
+    @staticmethod
+    def _noop_download(fname, dest):
+        return False
+
+    def open_session(self, session_id):
+        """Create (or return) the conversation for a browser session.
+
+        Only the session slot is reserved under the manager lock. Cloning the agent builds a new workflow and
+        can take a while, so it runs under the session's own lock and other sessions are not held up.
+        """
+        if session_id not in self.sessions:
+            self.evict_idle()
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                if len(self.sessions) >= self.max_sessions:
+                    raise SessionBusyError("The server is at capacity. Please try again in a few minutes.")
+                session = BiomniSession(session_id)
+                self.sessions[session_id] = session
+                print(f"👤 Opened session {session_id} ({len(self.sessions)} active)")
+        with session._attach_lock:
+            # Also covers sessions that connected before the shared agent finished initializing
+            if not session.initialized and self.initialized:
+                session.attach_agent(self.agent.clone_for_session(thread_id=session_id))
+        return session
+
+    def close_session(self, session_id):
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+            print(f"👋 Closed session {session_id} ({len(self.sessions)} active)")
+
+    def evict_idle(self):
+        """Close sessions that have not been used for ``idle_timeout`` seconds."""
+        now = time.time()
+        with self._lock:
+            idle = [sid for sid, s in self.sessions.items() if not s.busy and now - s.last_active > self.idle_timeout]
+        for sid in idle:
+            print(f"⏳ Evicting idle session {sid}")
+            self.close_session(sid)
+
+    def queue_position(self, session_id):
+        """Return 0 while the session's message is running, its 1-based place in the queue, or None."""
+        with self._lock:
+            if session_id in self._running:
+                return 0
+            if session_id in self._queue:
+                return self._queue.index(session_id) + 1
+            return None
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'initialized': self.initialized,
+                'sessions': len(self.sessions),
+                'running': len(self._running),
+                'queued': len(self._queue),
+                'max_concurrent': self.max_concurrent,
+            }
+
+    def _run(self, session, message, is_first_message):
+        with self._lock:
+            self._queue.remove(session.session_id)
+            self._running.add(session.session_id)
+        try:
+            return session.send_message(message, is_first_message)
+        finally:
+            with self._lock:
+                self._running.discard(session.session_id)
+                session.busy = False
+                session.last_active = time.time()
+
+    async def send_message(self, session_id, message, is_first_message=False):
+        """Queue a message for a session and wait for the agent's reply without blocking the event loop."""
+        session = await asyncio.to_thread(self.open_session, session_id)
+        with self._lock:
+            if session.busy:
+                raise SessionBusyError("Already processing a message, please wait...")
+            if len(self._queue) >= self.max_queue:
+                raise SessionBusyError("Too many requests are waiting. Please try again shortly.")
+            session.busy = True
+            session.last_active = time.time()
+            self._queue.append(session_id)
+        future = self._executor.submit(self._run, session, message, is_first_message)
+        return await asyncio.wrap_future(future)
+
+    def reset_conversation(self, session_id):
+        with self._lock:
+            session = self.sessions.get(session_id)
+        return session.reset_conversation() if session is not None else False
+
+
 # Download helper functions and manifest logic
 
 import os
@@ -285,5 +490,5 @@ def download_missing_files(required_files, download_fn, force_refresh=False):
         except Exception:
             pass
 
-# global singleton instance
-biomni_session = BiomniSession()
+# global session manager shared by all browser sessions
+session_manager = BiomniSessionManager()